@@ -0,0 +1,597 @@
+##
+# @file differential.py
+# @brief Differential correctness harness.
+#
+#  Every fast engine (vectorized, interpolated, parallel, ...) has to
+#  reproduce the scalar reference, i.e. Orbit.PositionEciByMpe followed by
+#  Site.GetLookAngle. The harness runs the reference and each registered
+#  engine over the curated and randomized TLE sets of workloads.py, checks
+#  the maximum deviation of every component against its tolerance and prints
+#  the deviation next to the speedup.
+#
+#  The reference itself is checked against the published Spacetrack Report #3
+#  test vectors for SGP4 (88888) and SDP4 (11801).
+#
+#  Finally the batch APIs called with out= buffers and a Workspace are
+#  checked, under tracemalloc, not to allocate once warmed up.
+#
+#  e.g.
+#  python3 benchmarks/differential.py
+#  python3 benchmarks/differential.py --random 50 --span 2880 --engines reference-shuffled
+#
+# @author df_justforfun@163.com
+# @version 1.0
+# @date 2026-10-19
+
+import sys
+import math
+import time
+import random
+import argparse
+import datetime
+import tempfile
+import tracemalloc
+
+from workloads import CURATED, SITE, MakeCatalog
+
+from pythonOrbitTools.Core.Tle import Tle
+from pythonOrbitTools.Core.Site import Site
+from pythonOrbitTools.Core.Julian import Julian
+from pythonOrbitTools.Core.TimeContext import TimeContext
+from pythonOrbitTools.Core.Globals import Globals
+from pythonOrbitTools.Core.Coord import Geo
+from pythonOrbitTools.Core.Vector import Vector
+from pythonOrbitTools.Core.Workspace import Workspace
+from pythonOrbitTools.Orbit import Kernels
+from pythonOrbitTools.Orbit.Satellite import Satellite
+from pythonOrbitTools.Orbit.DeepSpace import LunarSolarBatch
+from pythonOrbitTools.Orbit.NoradSDP4 import NoradSDP4
+from pythonOrbitTools.Orbit.Kepler import KeplerSolver, KeplerMethod
+from pythonOrbitTools.Orbit.Doppler import DopplerProfile
+
+# region Tolerances
+
+# Maximum absolute deviation from the reference, per component.
+#   pos   - km
+#   vel   - km/s
+#   az/el - radians
+#   range - km
+#   rate  - km/s
+TOLERANCES = {
+    "pos"   : 1.0e-6,
+    "vel"   : 1.0e-9,
+    "az"    : 1.0e-9,
+    "el"    : 1.0e-9,
+    "range" : 1.0e-6,
+    "rate"  : 1.0e-9,
+}
+
+COMPONENTS = ("pos", "vel", "az", "el", "range", "rate")
+
+# Spacetrack Report #3 test vectors: minutes past epoch, position (km) and
+# velocity (km/s). The report was computed in single precision, hence the
+# tolerances of a few tens of meters.
+PUBLISHED = {
+    "decaying" : [
+        (   0.0, ( 2328.97048951, -5995.22076416,  1719.97067261), ( 2.91207230, -0.98341546, -7.09081703)),
+        ( 360.0, ( 2456.10705566, -6071.93853760,  1222.89727783), ( 2.67938992, -0.44829041, -7.22879231)),
+        ( 720.0, ( 2567.56195068, -6112.50384522,   713.96397400), ( 2.44024599,  0.09810869, -7.31995916)),
+        (1080.0, ( 2663.09078980, -6115.48229980,   196.39640427), ( 2.19611958,  0.65241995, -7.36282432)),
+        (1440.0, ( 2742.55133057, -6079.67144775,  -326.38095856), ( 1.94850229,  1.21106251, -7.35619372)),
+    ],
+    "str3" : [
+        (   0.0, ( 7473.37066650,   428.95261765,  5828.74786377), ( 5.10715130,  6.44468284, -0.18613096)),
+        ( 360.0, (-3305.22537232, 32410.86328125,-24697.17675781), (-1.30113538, -1.15131518, -0.28333528)),
+        ( 720.0, (14271.28759766, 24110.46411133, -4725.76837158), (-0.32050445,  2.67984074, -2.08405289)),
+        (1080.0, (-9990.05883789, 22717.35522461,-23616.89062500), (-1.01667246, -2.29026759,  0.72892364)),
+        (1440.0, ( 9787.86975097, 33753.34667969,-15030.81176758), (-1.09425966,  0.92358845, -1.52230928)),
+    ],
+}
+
+PUBLISHED_TOLERANCES = {
+    "pos" : 2.0e-2,
+    "vel" : 2.0e-5,
+}
+
+# Bytes a warmed-up batch call with out= buffers and a Workspace may allocate,
+# i.e. room for temporary Python objects but not for an array of the samples.
+ALLOCATION_LIMIT = 8192
+
+# endregion
+
+# region Engines
+
+# An engine is a function (satellite, site, mpes) -> dict with the keys of
+# COMPONENTS. "pos" and "vel" are sequences of (x, y, z) in km and km/s, the
+# look-angle components are sequences of floats. Engines that only cover
+# part of the pipeline leave the other keys out. The satellite is freshly
+# built for every engine, so engines may keep state in it.
+
+ENGINES = {}
+
+
+##
+# @brief Register a fast engine with the harness.
+#
+# @param name The engine name used in reports and on the command line.
+# @param func The engine function.
+# @param tolerances Optional per-component tolerances overriding TOLERANCES.
+#
+# @return
+def RegisterEngine(name, func, tolerances=None):
+    limits = dict(TOLERANCES)
+    limits.update(tolerances or {})
+    ENGINES[name] = (func, limits)
+
+
+##
+# @brief The scalar reference: Orbit.PositionEciByMpe and Site.GetLookAngle.
+#
+# @param lookAngle The Site method computing the look angle, so that the
+#        scalar engines can share the loop.
+def Reference(satellite, site, mpes, lookAngle=Site.GetLookAngle):
+    result = {key: [] for key in COMPONENTS}
+
+    for mpe in mpes:
+        eci  = satellite.PositionEciByMpe(mpe)
+        topo = lookAngle(site, eci)
+
+        result["pos"].append((eci.Position.X, eci.Position.Y, eci.Position.Z))
+        result["vel"].append((eci.Velocity.X, eci.Velocity.Y, eci.Velocity.Z))
+        result["az"].append(topo.AzimuthRad)
+        result["el"].append(topo.ElevationRad)
+        result["range"].append(topo.Range)
+        result["rate"].append(topo.RangeRate)
+
+    return result
+
+
+##
+# @brief The reference with one TimeContext per sample, at the instant the
+#        reference propagation dates its result.
+def TimeContextReference(satellite, site, mpes):
+    result = {key: [] for key in COMPONENTS}
+    orbit  = satellite.Orbit
+
+    for mpe in mpes:
+        context = TimeContext(orbit.EpochTime + datetime.timedelta(minutes=mpe))
+        eci     = orbit.PositionEciByMpe(mpe, context.Date)
+        topo    = site.GetLookAngle(eci, context)
+
+        result["pos"].append((eci.Position.X, eci.Position.Y, eci.Position.Z))
+        result["vel"].append((eci.Velocity.X, eci.Velocity.Y, eci.Velocity.Z))
+        result["az"].append(topo.AzimuthRad)
+        result["el"].append(topo.ElevationRad)
+        result["range"].append(topo.Range)
+        result["rate"].append(topo.RangeRate)
+
+    return result
+
+
+##
+# @brief The reference evaluated in random order on one model instance. SDP4
+#        keeps resonance integrator state between calls, so this guards the
+#        path independence that the sorted-sweep engines rely on.
+def ReferenceShuffled(satellite, site, mpes):
+    order = list(range(len(mpes)))
+    random.Random(1).shuffle(order)
+
+    shuffled = Reference(satellite, site, [mpes[i] for i in order])
+    result   = {key: [None] * len(mpes) for key in COMPONENTS}
+
+    for key in COMPONENTS:
+        for k, i in enumerate(order):
+            result[key][i] = shuffled[key][k]
+
+    return result
+
+
+##
+# @brief The reference with a warm-started Halley Kepler solver. Both solvers
+#        stop within 1e-6 rad of the root, which is up to a few tens of meters
+#        at GEO distance, hence the looser tolerances.
+def ReferenceHalleyWarm(satellite, site, mpes):
+    satellite.Orbit.NoradModel.Kepler = KeplerSolver(KeplerMethod.Halley, warmStart=True)
+
+    return Reference(satellite, site, mpes)
+
+
+##
+# @brief The reference propagation with Site.GetLookAngleEcef.
+def LookAngleEcef(satellite, site, mpes):
+    return Reference(satellite, site, mpes, Site.GetLookAngleEcef)
+
+
+##
+# @brief Orbit.PositionEciArrayByMpe and Site.GetLookAngleArray.
+def LookAngleArray(satellite, site, mpes):
+    import numpy as np
+
+    mpes     = np.asarray(mpes, dtype=np.float64)
+    pos, vel = satellite.PositionEciArrayByMpe(mpes)
+
+    return ArrayResult(satellite, site, mpes, pos, vel)
+
+
+##
+# @brief LookAngleArray with the lunar-solar terms of a LunarSolarBatch,
+#        counted from a time a day and a half after the epoch.
+def LunarSolarShared(satellite, site, mpes):
+    import numpy as np
+
+    mpes     = np.asarray(mpes, dtype=np.float64)
+    utc      = satellite.Orbit.EpochTime + datetime.timedelta(days=1.5)
+    batch    = LunarSolarBatch([satellite], utc)
+    row      = batch.Row(satellite)
+
+    if row is None:
+        return LookAngleArray(satellite, site, mpes)
+
+    terms    = batch.Terms(mpes - satellite.Orbit.TPlusEpoch(utc).total_seconds() / 60.0, row, row + 1)
+    pos, vel = satellite.Orbit.PositionEciArrayByMpe(mpes, periodics=[a[0] for a in terms])
+
+    return ArrayResult(satellite, site, mpes, pos, vel)
+
+
+##
+# @brief The look angles of ECI arrays in km and km/s, as a result dict.
+def ArrayResult(satellite, site, mpes, pos, vel):
+    gmst     = Julian.ToGmstArray(satellite.Orbit.Epoch.ToDateArray(mpes / Globals.MinPerDay))
+
+    az, el, rng, rate = site.GetLookAngleArray(pos, vel, gmst)
+
+    return {"pos"   : pos.tolist(),
+            "vel"   : vel.tolist(),
+            "az"    : az.tolist(),
+            "el"    : el.tolist(),
+            "range" : rng.tolist(),
+            "rate"  : rate.tolist()}
+
+
+##
+# @brief The interpreted Kernels.PositionArray loop, i.e. the source the Numba
+#        backend compiles, on fresh integrator state.
+def KernelLoop(satellite, site, mpes):
+    import numpy as np
+
+    model    = satellite.Orbit.NoradModel
+    mpes     = np.asarray(mpes, dtype=np.float64)
+    pos      = np.zeros((mpes.size, 3))
+    vel      = np.zeros((mpes.size, 3))
+    failed   = Kernels.Kernel("PositionArray", "python")(model.KernelConstants(), [0.0, 0.0, 0.0],
+                                                        isinstance(model, NoradSDP4), mpes.tolist(),
+                                                        model.Kepler.Tolerance, model.Kepler.MaxIterations, pos, vel)
+
+    if failed >= 0:
+        raise ValueError("sample {}".format(failed))
+
+    pos *= Globals.Xkmper / Globals.Ae
+    vel *= Globals.Xkmper / Globals.Ae * (Globals.MinPerDay / 86400.0)
+
+    return ArrayResult(satellite, site, mpes, pos, vel)
+
+
+##
+# @brief Orbit.PositionEciArrayByMpe on the Numba backend.
+def NumbaArray(satellite, site, mpes):
+    import numpy as np
+
+    mpes     = np.asarray(mpes, dtype=np.float64)
+    pos, vel = satellite.PositionEciArrayByMpe(mpes, backend="numba")
+
+    return ArrayResult(satellite, site, mpes, pos, vel)
+
+
+##
+# @brief LookAngleArray writing into column views of one file-backed array,
+#        with a Workspace first used for a shorter run.
+def LookAngleArrayOut(satellite, site, mpes):
+    import numpy as np
+
+    n    = len(mpes)
+    mpes = np.asarray(mpes, dtype=np.float64)
+    work = Workspace()
+
+    with tempfile.TemporaryFile() as f:
+        data  = np.memmap(f, dtype=np.float64, mode="w+", shape=(3 * n, 4))
+        pos   = data[:n, :3]
+        vel   = data[n:2 * n, :3]
+        look  = tuple(data[2 * n:, i] for i in range(4))
+        days  = np.empty(n)
+        gmst  = np.empty(n)
+
+        for sample in (mpes[:n // 2], mpes):
+            k = len(sample)
+
+            satellite.PositionEciArrayByMpe(sample, out=(pos[:k], vel[:k]), work=work)
+            np.divide(sample, Globals.MinPerDay, out=days[:k])
+            satellite.Orbit.Epoch.ToDateArray(days[:k], out=days[:k])
+            Julian.ToGmstArray(days[:k], out=gmst[:k], work=work)
+            site.GetLookAngleArray(pos[:k], vel[:k], gmst[:k], out=tuple(c[:k] for c in look), work=work)
+
+        return {"pos"   : pos.tolist(),
+                "vel"   : vel.tolist(),
+                "az"    : look[0].tolist(),
+                "el"    : look[1].tolist(),
+                "range" : look[2].tolist(),
+                "rate"  : look[3].tolist()}
+
+
+##
+# @brief Satellite.IterEphemeris in small reused chunks. The harness samples
+#        are an even grid, which the chunks reproduce.
+def Chunked(satellite, site, mpes):
+    result = {key: [] for key in COMPONENTS}
+
+    for chunk in satellite.IterEphemeris(mpes[0], mpes[-1], mpes[1] - mpes[0], chunk=37, site=site, reuse=True):
+        result["pos"]   += chunk.Position.tolist()
+        result["vel"]   += chunk.Velocity.tolist()
+        result["az"]    += chunk.AzimuthRad.tolist()
+        result["el"]    += chunk.ElevationRad.tolist()
+        result["range"] += chunk.Range.tolist()
+        result["rate"]  += chunk.RangeRate.tolist()
+
+    return result
+
+
+##
+# @brief Chunked with the chunks stored in single precision.
+def ChunkedFloat32(satellite, site, mpes):
+    result = {key: [] for key in COMPONENTS}
+
+    for chunk in satellite.IterEphemeris(mpes[0], mpes[-1], mpes[1] - mpes[0], chunk=37, site=site, reuse=True,
+                                         precision="float32"):
+        result["pos"]   += chunk.Position.tolist()
+        result["vel"]   += chunk.Velocity.tolist()
+        result["az"]    += chunk.AzimuthRad.tolist()
+        result["el"]    += chunk.ElevationRad.tolist()
+        result["range"] += chunk.Range.tolist()
+        result["rate"]  += chunk.RangeRate.tolist()
+
+    return result
+
+
+##
+# @brief DopplerProfile, range and range rate only.
+def Doppler(satellite, site, mpes):
+    profile = DopplerProfile(satellite, site, mpes, 1.0e9)
+
+    return {"range" : profile.Range.tolist(),
+            "rate"  : profile.RangeRate.tolist()}
+
+
+RegisterEngine("reference-shuffled", ReferenceShuffled)
+RegisterEngine("kepler-halley-warm", ReferenceHalleyWarm, {"pos"   : 1.0e-1,
+                                                           "vel"   : 1.0e-4,
+                                                           "az"    : 1.0e-4,
+                                                           "el"    : 1.0e-5,
+                                                           "range" : 1.0e-1,
+                                                           "rate"  : 1.0e-4})
+RegisterEngine("lookangle-ecef", LookAngleEcef)
+RegisterEngine("time-context", TimeContextReference)
+RegisterEngine("array", LookAngleArray)
+RegisterEngine("array-out", LookAngleArrayOut)
+RegisterEngine("lunar-solar-batch", LunarSolarShared)
+RegisterEngine("kernels", KernelLoop)
+
+if "numba" in Kernels.Available():
+    RegisterEngine("numba", NumbaArray)
+
+RegisterEngine("chunked", Chunked)
+RegisterEngine("chunked-float32", ChunkedFloat32, {"pos"   : 5.0e-3,    # relative 6e-8 of the storage
+                                                   "vel"   : 1.0e-6,
+                                                   "az"    : 1.0e-6,
+                                                   "el"    : 1.0e-6,
+                                                   "range" : 5.0e-3,
+                                                   "rate"  : 1.0e-6})
+RegisterEngine("doppler", Doppler)
+
+# endregion
+
+
+##
+# @brief Maximum absolute deviation between two component sequences.
+#        Azimuth differences are wrapped to [-pi, pi].
+def Deviation(key, ref, other):
+    worst = 0.0
+
+    for a, b in zip(ref, other):
+        if key in ("pos", "vel"):
+            diff = max(math.fabs(a[i] - b[i]) for i in range(3))
+        elif key == "az":
+            diff = math.fabs((a - b + math.pi) % (2.0 * math.pi) - math.pi)
+        else:
+            diff = math.fabs(a - b)
+
+        worst = max(worst, diff)
+
+    return worst
+
+
+def Timed(func, *args):
+    t0     = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - t0
+
+
+##
+# @brief Check the reference against the Spacetrack Report #3 vectors.
+#
+# @return True if all vectors are within PUBLISHED_TOLERANCES.
+def CheckPublished():
+    ok = True
+
+    print("{:12s} {:>8s} {:>12s} {:>12s}".format("set", "mpe", "pos [km]", "vel [km/s]"))
+
+    for kind, vectors in PUBLISHED.items():
+        name, line1, line2 = CURATED[kind]
+        satellite = Satellite(Tle(line1, line2, name))
+
+        for mpe, pos, vel in vectors:
+            eci  = satellite.PositionEciByMpe(mpe)
+            dpos = Deviation("pos", [pos], [(eci.Position.X, eci.Position.Y, eci.Position.Z)])
+            dvel = Deviation("vel", [vel], [(eci.Velocity.X, eci.Velocity.Y, eci.Velocity.Z)])
+            good = dpos <= PUBLISHED_TOLERANCES["pos"] and dvel <= PUBLISHED_TOLERANCES["vel"]
+            ok   = ok and good
+
+            print("{:12s} {:8.1f} {:12.6f} {:12.9f} {}".format(kind, mpe, dpos, dvel, "ok" if good else "FAIL"))
+
+    return ok
+
+
+##
+# @brief Run every engine against the reference over the given TLE sets.
+#
+# @param sets List of (label, (name, line1, line2)).
+# @param mpes Sample times, in minutes past epoch.
+# @param engines Engine names to run.
+#
+# @return True if every engine stayed within its tolerances.
+def CheckEngines(sets, mpes, engines):
+    site = Site().InitializeByDegLatAndDegLonAndKmAltAndName(*SITE)
+    ok   = True
+
+    header = "{:20s} {:14s}".format("engine", "set") + \
+             "".join(" {:>9s}".format(key) for key in COMPONENTS) + \
+             " {:>8s}".format("speedup")
+    print(header)
+
+    for engine in engines:
+        func, limits = ENGINES[engine]
+
+        for label, (name, line1, line2) in sets:
+            ref, tRef = Timed(Reference, Satellite(Tle(line1, line2, name)), site, mpes)
+            out, tOut = Timed(func, Satellite(Tle(line1, line2, name)), site, mpes)
+
+            devs = {key: Deviation(key, ref[key], out[key]) for key in COMPONENTS if key in out}
+            bad  = [key for key in devs if not devs[key] <= limits[key]]
+            ok   = ok and not bad
+
+            print("{:20s} {:14s}".format(engine, label) +
+                  "".join(" {:9.2e}".format(devs[key]) if key in devs else " {:>9s}".format("-") for key in COMPONENTS) +
+                  " {:7.2f}x".format(tRef / tOut if tOut > 0.0 else float("inf")) +
+                  (" FAIL " + ",".join(bad) if bad else ""))
+
+    return ok
+
+
+##
+# @brief Check that the batch APIs, given out= buffers and a Workspace, match
+#        their allocating form and allocate (almost) nothing once warmed up,
+#        and that Geo.FromEciArray matches Geo.InitializeByPosAndTheta.
+#
+# @param count Number of samples per call.
+#
+# @return True if all calls stayed within ALLOCATION_LIMIT.
+def CheckAllocations(count):
+    import numpy as np
+
+    name, line1, line2 = CURATED["leo"]
+    satellite = Satellite(Tle(line1, line2, name))
+    site      = Site().InitializeByDegLatAndDegLonAndKmAltAndName(*SITE)
+    epoch     = satellite.Orbit.Epoch
+    work      = Workspace()
+    ok        = True
+
+    mpes      = np.linspace(0.0, 1440.0, count)
+    days      = mpes / Globals.MinPerDay
+    pos, vel  = satellite.PositionEciArrayByMpe(mpes)
+    dates     = epoch.ToDateArray(days)
+    gmst      = Julian.ToGmstArray(dates)
+    look      = site.GetLookAngleArray(pos, vel, gmst)
+    geo       = Geo.FromEciArray(pos, gmst)
+
+    buffers   = np.zeros((2 * count, 4))
+    outPv     = (buffers[:count, :3], buffers[count:, :3])
+    outDates  = np.empty(count)
+    outGmst   = np.empty(count)
+    outLook   = tuple(np.empty(count) for i in range(4))
+    outGeo    = tuple(np.empty(count) for i in range(3))
+
+    calls = [
+        ("PositionEciArrayByMpe", lambda: satellite.PositionEciArrayByMpe(mpes, out=outPv, work=work), (pos, vel), outPv),
+    ]
+
+    # The deep-space orbits, synchronous and half-day resonant, go through SDP4.
+    for key in ("geo", "molniya"):
+        name, line1, line2 = CURATED[key]
+        deep = Satellite(Tle(line1, line2, name))
+        out  = (np.empty((count, 3)), np.empty((count, 3)))
+        calls.append(("  SDP4 " + key, lambda deep=deep, out=out: deep.PositionEciArrayByMpe(mpes, out=out, work=work), deep.PositionEciArrayByMpe(mpes), out))
+
+    calls += [
+        ("ToDateArray",           lambda: epoch.ToDateArray(days, out=outDates), (dates,), (outDates,)),
+        ("ToGmstArray",           lambda: Julian.ToGmstArray(dates, out=outGmst, work=work), (gmst,), (outGmst,)),
+        ("GetLookAngleArray",     lambda: site.GetLookAngleArray(pos, vel, gmst, out=outLook, work=work), look, outLook),
+        ("Geo.FromEciArray",      lambda: Geo.FromEciArray(pos, gmst, out=outGeo, work=work), geo, outGeo),
+    ]
+
+    print("{:22s} {:>10s} {:>10s} {:>6s}".format("call (n={})".format(count), "peak [B]", "net [B]", "equal"))
+
+    for label, call, expected, out in calls:
+        call()
+
+        tracemalloc.start()
+
+        try:
+            before    = tracemalloc.get_traced_memory()[0]
+            call()
+            now, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        equal = all(np.array_equal(a, b) for a, b in zip(expected, out))
+        good  = equal and peak - before <= ALLOCATION_LIMIT and now - before <= ALLOCATION_LIMIT
+        ok    = ok and good
+
+        print("{:22s} {:10d} {:10d} {:>6s}{}".format(label, peak - before, now - before, str(equal), "" if good else " FAIL"))
+
+    # The geodetic conversion against the scalar one, every 97th sample.
+    worst = 0.0
+
+    for i in range(0, count, 97):
+        ref   = Geo().InitializeByPosAndTheta(Vector(*pos[i].tolist()), float(gmst[i]))
+        dlon  = math.fabs((geo[1][i] - (math.atan2(pos[i, 1], pos[i, 0]) - gmst[i]) % Globals.TwoPi + math.pi) % Globals.TwoPi - math.pi)
+        worst = max(worst, math.fabs(geo[0][i] - ref.LatitudeRad), dlon, math.fabs(geo[2][i] - ref.Altitude) / Globals.Xkmper)
+    good = worst <= 1.0e-9
+    ok   = ok and good
+
+    print("{:22s} {:21.2e} {:>6s}{}".format("Geo vs scalar Geo", worst, "", "" if good else " FAIL"))
+
+    return ok
+
+
+def Main(argv=None):
+    parser = argparse.ArgumentParser(description="benchmarks/differential.py")
+    parser.add_argument('--random',  default=10,     type=int,   help="Number of randomized element sets.")
+    parser.add_argument('--seed',    default=0,      type=int,   help="Seed of the randomized element sets.")
+    parser.add_argument('--span',    default=1440.0, type=float, help="Time span, in minutes, starting one span before epoch.")
+    parser.add_argument('--step',    default=7.0,    type=float, help="Step between samples, in minutes.")
+    parser.add_argument('--engines', default="",     type=str,   help="Comma separated engine names, default all.")
+    parser.add_argument('--alloc',   default=10000,  type=int,   help="Samples per call of the allocation check, 0 to skip.")
+    args = parser.parse_args(argv)
+
+    engines = [name for name in args.engines.split(",") if name] or list(ENGINES)
+
+    # Start before epoch so that backward propagation is covered too.
+    count = int(2.0 * args.span / args.step)
+    mpes  = [-args.span + i * args.step for i in range(count + 1)]
+
+    sets  = [(kind, entry) for kind, entry in CURATED.items()]
+    sets += [("random-{}".format(i), entry) for i, entry in enumerate(MakeCatalog(args.random, seed=args.seed))]
+
+    ok = CheckPublished()
+    print()
+    ok = CheckEngines(sets, mpes, engines) and ok
+
+    if args.alloc > 0:
+        print()
+        ok = CheckAllocations(args.alloc) and ok
+
+    print("\n{}".format("PASS" if ok else "FAIL"))
+
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(Main())
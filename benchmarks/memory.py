@@ -0,0 +1,108 @@
+##
+# @file memory.py
+# @brief Memory footprint of the core value classes.
+#
+#  Reports, measured with tracemalloc, the memory retained per instance of
+#  each value class and per sample when the results of PositionEciByMpe and
+#  GetLookAngle are kept in a list, and the time of a property read.
+#
+#  e.g.
+#  python3 benchmarks/memory.py
+#  python3 benchmarks/memory.py --samples 100000 --output /tmp/memory.json
+#
+# @author df_justforfun@163.com
+# @version 1.0
+# @date 2026-10-19
+
+import sys
+import json
+import timeit
+import argparse
+import tracemalloc
+
+from workloads import SITE, CURATED
+
+from pythonOrbitTools.Core.Tle import Tle
+from pythonOrbitTools.Core.Site import Site
+from pythonOrbitTools.Core.Julian import Julian
+from pythonOrbitTools.Core.Vector import Vector
+from pythonOrbitTools.Core.Eci import Eci, EciTime
+from pythonOrbitTools.Core.Coord import Geo, GeoTime, Topo, TopoTime
+from pythonOrbitTools.Orbit.Satellite import Satellite
+
+##
+# @brief Factories of typical instances of the value classes, with a
+#        property to read.
+def MakeFactories():
+    date = Julian().InitializeByYearAndDoy(2018, 233.5)
+    pos  = Vector(1.0, 2.0, 3.0, 4.0)
+    vel  = Vector(5.0, 6.0, 7.0, 8.0)
+
+    return {
+        "Vector"   : (lambda i: Vector(1.0, 2.0, 3.0, 4.0), "X"),
+        "Julian"   : (lambda i: Julian().InitializeByYearAndDoy(2018, 233.5), "Date"),
+        "Eci"      : (lambda i: Eci().InitializeByPosAndVel(pos, vel), "Position"),
+        "EciTime"  : (lambda i: EciTime().InitializeByPosAndVelAndDate(pos, vel, date), "Date"),
+        "Geo"      : (lambda i: Geo().InitializeByRadLatAndRadLonAndKmAlt(0.6, 2.0, 0.07), "Altitude"),
+        "GeoTime"  : (lambda i: GeoTime().InitializeByRadLatAndRadLonAndKmAltAndDate(0.6, 2.0, 0.07, date), "Date"),
+        "Topo"     : (lambda i: Topo(), "Range"),
+        "TopoTime" : (lambda i: TopoTime().InitializeByRadAzAndRadElAndRangeAndRangeRateAndDate(1.0, 0.5, 1000.0, -3.0, date), "Date"),
+    }
+
+
+##
+# @brief Memory retained per element of a list filled by make().
+#
+# @return Bytes per element.
+def Retained(make, samples):
+    tracemalloc.start()
+
+    try:
+        before  = tracemalloc.get_traced_memory()[0]
+        kept    = [make(i) for i in range(samples)]
+        after   = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+    return (after - before - sys.getsizeof(kept)) / len(kept)
+
+
+def Main(argv=None):
+    parser = argparse.ArgumentParser(description="benchmarks/memory.py")
+    parser.add_argument('--samples', default=20000, type=int, help="Samples kept per footprint case.")
+    parser.add_argument('--output',  default="",    type=str, help="Optional JSON result file.")
+    args = parser.parse_args(argv)
+
+    results = {"instances": {}, "samples": {}}
+
+    for name, (make, prop) in MakeFactories().items():
+        size = Retained(make, args.samples)
+        read = min(timeit.repeat("obj." + prop, globals={"obj": make(0)}, number=200000, repeat=5)) / 200000
+
+        results["instances"][name] = {"bytes": size, "read_ns": read * 1.0e9}
+        print("{:18s} {:8.1f} bytes per instance  {:6.1f} ns per .{}".format(name, size, read * 1.0e9, prop))
+
+    name, line1, line2 = CURATED["leo"]
+    satellite = Satellite(Tle(line1, line2, name))
+    site      = Site().InitializeByDegLatAndDegLonAndKmAltAndName(*SITE)
+    ecis      = [satellite.PositionEciByMpe(i / 60.0) for i in range(args.samples)]
+
+    cases = {
+        "PositionEciByMpe" : lambda i: satellite.PositionEciByMpe(i / 60.0),
+        "GetLookAngle"     : lambda i: site.GetLookAngle(ecis[i]),
+    }
+
+    for name, make in cases.items():
+        perSample = Retained(make, args.samples)
+        results["samples"][name] = {"bytes": perSample}
+        print("{:18s} {:8.1f} bytes retained per sample".format(name, perSample))
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(Main())
@@ -0,0 +1,748 @@
+##
+# @file run.py
+# @brief Benchmark runner for the propagation, parsing and look-angle hot paths.
+#
+#  Every benchmark is run for each catalog size and time span, the best of
+#  several repeats is kept and the results are written as JSON. When a
+#  baseline file is given the results are compared against it and the run
+#  fails if any case got slower than the allowed tolerance, or if a case has
+#  no baseline entry yet: a new case is added to the baseline together with
+#  the benchmark (--update-baseline --only <name>). When the startup
+#  benchmarks are run, the run also fails if a cold start is no longer
+#  STARTUP_GAIN faster than with the eager imports of the package before
+#  lazy loading, see CheckStartup.
+#
+#  e.g.
+#  python3 benchmarks/run.py
+#  python3 benchmarks/run.py --sizes 1,10,100 --spans 60,1440 --output /tmp/bench.json
+#  python3 benchmarks/run.py --update-baseline
+#
+# @author df_justforfun@163.com
+# @version 1.0
+# @date 2026-10-19
+
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import datetime
+import tempfile
+import subprocess
+
+from workloads import ROOT_DIR, SITE, CURATED, MakeCatalog
+
+from pythonOrbitTools.Core.Tle import Tle
+from pythonOrbitTools.Core.Site import Site
+from pythonOrbitTools.Core.Julian import Julian
+from pythonOrbitTools.Orbit.Orbit import Orbit
+from pythonOrbitTools.Orbit.Satellite import Satellite
+from pythonOrbitTools.Orbit.Instrument import Instrument
+
+BENCH_DIR     = os.path.join(ROOT_DIR, "benchmarks")
+BASELINE_PATH = os.path.join(BENCH_DIR, "baseline.json")
+RESULTS_DIR   = os.path.join(BENCH_DIR, "results")
+
+# Step between propagated samples, in minutes.
+STEP_MIN = 1.0
+
+# Lazy loading must keep a cold start at least this much faster than the
+# eager import set, see CheckStartup.
+STARTUP_GAIN = 0.05
+
+# region Benchmarks
+
+# Each benchmark is a function (size, span) -> (callable, operations). The
+# callable performs the timed work once; set-up is done outside of it.
+
+def BenchTleParse(size, span):
+    catalog = MakeCatalog(size)
+
+    def run():
+        for name, line1, line2 in catalog:
+            Tle(line1, line2, name)
+
+    return run, size
+
+
+def BenchOrbitInit(size, span):
+    tles = [Tle(line1, line2, name) for name, line1, line2 in MakeCatalog(size)]
+
+    def run():
+        for tle in tles:
+            Orbit(tle)
+
+    return run, size
+
+
+##
+# @brief Satellite construction through a warm SatelliteCache, i.e. hits only.
+def BenchFromLines(size, span):
+    from pythonOrbitTools.Orbit.SatelliteCache import SatelliteCache
+
+    catalog = MakeCatalog(size)
+    cache   = SatelliteCache(maxSize=size)
+
+    for name, line1, line2 in catalog:
+        cache.Get(line1, line2, name)
+
+    def run():
+        for name, line1, line2 in catalog:
+            cache.Get(line1, line2, name)
+
+    return run, size
+
+
+def MakeGetPosition(kind):
+    def bench(size, span):
+        models  = [Orbit(Tle(line1, line2, name)).NoradModel
+                   for name, line1, line2 in MakeCatalog(size, kinds=(kind,))]
+        samples = [i * STEP_MIN for i in range(int(span / STEP_MIN))]
+
+        def run():
+            for model in models:
+                for tsince in samples:
+                    model.GetPosition(tsince)
+
+        return run, size * len(samples)
+
+    return bench
+
+
+def MakeGetPositionArray(kind):
+    def bench(size, span):
+        import numpy as np
+
+        models  = [Orbit(Tle(line1, line2, name)).NoradModel
+                   for name, line1, line2 in MakeCatalog(size, kinds=(kind,))]
+        samples = np.arange(int(span / STEP_MIN)) * STEP_MIN
+
+        def run():
+            for model in models:
+                model.GetPositionArray(samples)
+
+        return run, size * len(samples)
+
+    return bench
+
+
+def MakeLookAngle(method):
+    def bench(size, span):
+        site    = Site().InitializeByDegLatAndDegLonAndKmAltAndName(*SITE)
+        ecis    = []
+        look    = getattr(site, method)
+
+        for name, line1, line2 in MakeCatalog(size):
+            satellite = Satellite(Tle(line1, line2, name))
+            ecis.extend(satellite.PositionEciByMpe(i * STEP_MIN) for i in range(int(span / STEP_MIN)))
+
+        def run():
+            for eci in ecis:
+                look(eci)
+
+        return run, len(ecis)
+
+    return bench
+
+
+def BenchLookAngleArray(size, span):
+    import numpy as np
+
+    site    = Site().InitializeByDegLatAndDegLonAndKmAltAndName(*SITE)
+    samples = np.arange(int(span / STEP_MIN)) * STEP_MIN
+    states  = []
+
+    for name, line1, line2 in MakeCatalog(size):
+        satellite = Satellite(Tle(line1, line2, name))
+        dates     = satellite.Orbit.Epoch.ToDateArray(samples / 1440.0)
+        states.append(satellite.PositionEciArrayByMpe(samples) + (dates,))
+
+    def run():
+        for pos, vel, dates in states:
+            site.GetLookAngleArray(pos, vel, Julian.ToGmstArray(dates))
+
+    return run, size * len(samples)
+
+
+##
+# @brief Magnitude, Dot, Angle and RotateZ of the propagated positions with
+#        Vector objects or with one VectorArray per satellite.
+def MakeGeometry(vectorized):
+    def bench(size, span):
+        import numpy as np
+        from pythonOrbitTools.Core.Vector import Vector
+
+        samples = np.arange(int(span / STEP_MIN)) * STEP_MIN
+        arrays  = [Satellite(Tle(line1, line2, name)).PositionVectorArrayByMpe(samples)[0]
+                   for name, line1, line2 in MakeCatalog(size, kinds=("leo",))]
+        vectors = [array.ToVectors() for array in arrays]
+        axis    = Vector(0.3, -0.8, 0.5)
+
+        def run():
+            for array in arrays:
+                array.Magnitude()
+                array.Dot(axis)
+                array.Angle(axis)
+                array.Copy().RotateZ(0.1)
+
+        def runScalar():
+            for points in vectors:
+                for v in points:
+                    v.Magnitude()
+                    v.Dot(axis)
+                    v.Angle(axis)
+                    Vector(v.X, v.Y, v.Z, v.W).RotateZ(0.1)
+
+        return (run if vectorized else runScalar), size * len(samples)
+
+    return bench
+
+
+##
+# @brief DopplerProfile at 1 s cadence over the span, per satellite.
+def BenchDoppler(size, span):
+    from pythonOrbitTools.Orbit.Doppler import DopplerProfile
+
+    site       = Site().InitializeByDegLatAndDegLonAndKmAltAndName(*SITE)
+    satellites = [Satellite(Tle(line1, line2, name)) for name, line1, line2 in MakeCatalog(size, kinds=("leo",))]
+    startTime  = datetime.datetime(2018, 8, 20, 16, 0, 0)
+    endTime    = startTime + datetime.timedelta(minutes=span)
+
+    def run():
+        for satellite in satellites:
+            DopplerProfile.ByDateTime(satellite, site, startTime, endTime, 1.0, 437.1e6)
+
+    return run, size * (int(span * 60) + 1)
+
+
+##
+# @brief EclipseFinder over the span, 1 min sampling refined to 1 ms, per
+#        satellite.
+def BenchEclipse(size, span):
+    from pythonOrbitTools.Orbit.Eclipse import EclipseFinder
+
+    finders = [EclipseFinder(Satellite(Tle(line1, line2, name))) for name, line1, line2 in MakeCatalog(size, kinds=("leo",))]
+
+    def run():
+        for finder in finders:
+            finder.Intervals(0.0, span)
+
+    return run, size
+
+
+##
+# @brief Catalog.Update with a tenth of the element sets changed, once to the
+#        new catalog and once back.
+def BenchCatalogUpdate(size, span):
+    from pythonOrbitTools.Orbit.Catalog import Catalog
+
+    entries = MakeCatalog(size)
+    fresh   = [b if i % 10 == 0 else a for i, (a, b) in enumerate(zip(entries, MakeCatalog(size, seed=1)))]
+    catalog = Catalog.FromLines(entries)
+
+    def run():
+        catalog.Update(fresh)
+        catalog.Update(entries)
+
+    return run, 2 * size
+
+
+##
+# @brief PassPredictor over the span with a 3 degree mask, per satellite.
+def BenchPassPredict(size, span):
+    from pythonOrbitTools.Orbit.Pass import PassPredictor
+
+    site       = Site().InitializeByDegLatAndDegLonAndKmAltAndName(*SITE)
+    predictors = [PassPredictor(Satellite(Tle(line1, line2, name)), site, 3.0)
+                  for name, line1, line2 in MakeCatalog(size, kinds=("leo",))]
+    startTime  = datetime.datetime(2018, 8, 20, 16, 0, 0)
+    endTime    = startTime + datetime.timedelta(minutes=span)
+
+    def run():
+        for predictor in predictors:
+            predictor.PassesByDateTime(startTime, endTime)
+
+    return run, size
+
+
+##
+# @brief A scheduler's query through a warm PassCache: the window of the span
+#        moved on by one hour, per satellite.
+def BenchPassCache(size, span):
+    from pythonOrbitTools.Orbit.PassCache import PassCache
+
+    site       = Site().InitializeByDegLatAndDegLonAndKmAltAndName(*SITE)
+    satellites = [Satellite(Tle(line1, line2, name)) for name, line1, line2 in MakeCatalog(size, kinds=("leo",))]
+    startTime  = datetime.datetime(2018, 8, 20, 16, 0, 0)
+    cache      = PassCache(maxSize=size * (int(span // 360) + 16))
+
+    for satellite in satellites:
+        cache.Passes(satellite, site, startTime, startTime + datetime.timedelta(minutes=span), 3.0)
+
+    startTime += datetime.timedelta(hours=1)
+    endTime    = startTime + datetime.timedelta(minutes=span)
+
+    def run():
+        for satellite in satellites:
+            cache.Passes(satellite, site, startTime, endTime, 3.0)
+
+    return run, size
+
+
+##
+# @brief PassScheduler over 4 sites of 2 antennas, 1000 random passes per
+#        catalog entry and day of span.
+def BenchPassSchedule(size, span):
+    import random
+    from pythonOrbitTools.Orbit.Pass import Pass
+    from pythonOrbitTools.Orbit.Schedule import PassScheduler
+
+    r         = random.Random(1)
+    startTime = datetime.datetime(2018, 8, 20, 16, 0, 0)
+    count     = max(int(size * 1000 * span / 1440.0), 1)
+    passes    = []
+
+    for i in range(count):
+        aos = startTime + datetime.timedelta(minutes=r.uniform(0.0, span))
+        passes.append(Pass("{:05d}".format(r.randrange(size * 10)), aos, aos + datetime.timedelta(seconds=r.uniform(120.0, 900.0)), aos, 0.5))
+
+    def run():
+        scheduler = PassScheduler(dict.fromkeys(range(4), 2), setupSec=60.0)
+
+        for i in range(4):
+            scheduler.Add(i, passes[i::4])
+
+        scheduler.Schedule()
+
+    return run, count
+
+
+##
+# @brief VisibilityIndex point queries over a horizon of the span, built
+#        outside of the timing.
+def BenchVisibilityQuery(size, span):
+    import random
+    from pythonOrbitTools.Orbit.Visibility import VisibilityIndex
+
+    site       = Site().InitializeByDegLatAndDegLonAndKmAltAndName(*SITE)
+    satellites = [Satellite(Tle(line1, line2, name)) for name, line1, line2 in MakeCatalog(size, kinds=("leo",))]
+    startTime  = datetime.datetime(2018, 8, 20, 16, 0, 0)
+    index      = VisibilityIndex(satellites, {"site": site}, startTime, horizonHours=span / 60.0, minElevationDeg=3.0)
+    r          = random.Random(1)
+    times      = [startTime + datetime.timedelta(minutes=r.uniform(0.0, span)) for i in range(1000)]
+
+    def run():
+        for utc in times:
+            index.VisibleAt("site", utc)
+
+    return run, len(times)
+
+
+##
+# @brief SharedEphemeris: one interpolation per satellite at 1 s cadence
+#        over the span, from tables published outside of the timing.
+def BenchSharedInterpolate(size, span):
+    from pythonOrbitTools.Orbit.SharedEphemeris import SharedEphemeris
+
+    satellites = [Satellite(Tle(line1, line2, name)) for name, line1, line2 in MakeCatalog(size, kinds=("leo",))]
+    startTime  = datetime.datetime(2018, 8, 20, 16, 0, 0)
+    ephemeris  = SharedEphemeris.Create(capacity=size, samples=int(span) + 2, stepMin=1.0)
+    noradIds   = [int(satellite.Orbit.SatNoradId) for satellite in satellites]
+    times      = [startTime + datetime.timedelta(seconds=s) for s in range(0, int(span * 60), max(int(span * 60) // 100, 1))]
+
+    ephemeris.Roll(satellites, startTime)
+
+    def run():
+        for noradId in noradIds:
+            for utc in times:
+                ephemeris.Interpolate(noradId, utc)
+
+    return run, size * len(times)
+
+
+##
+# @brief Catalog ephemeris of deep-space satellites in one hour chunks, where
+#        the satellites share the lunar-solar terms of a chunk.
+def BenchDeepEphemeris(size, span):
+    from pythonOrbitTools.Orbit.Ephemeris import IterCatalogEphemerisByDateTime
+
+    satellites = [Satellite(Tle(line1, line2, name)) for name, line1, line2 in MakeCatalog(size, kinds=("gps", "molniya", "geo"))]
+    startUtc   = datetime.datetime(2018, 8, 20, 16, 0, 0)
+    endUtc     = startUtc + datetime.timedelta(minutes=span)
+
+    def run():
+        for chunk in IterCatalogEphemerisByDateTime(satellites, startUtc, endUtc, STEP_MIN * 60.0, chunk=60, reuse=True):
+            pass
+
+    return run, size * (int(span / STEP_MIN) + 1)
+
+
+##
+# @brief Scalar look angles of a catalog from ten sites, one TimeContext per
+#        1 s step shared by all satellites and sites.
+def BenchTimeContext(size, span):
+    from pythonOrbitTools.Core.TimeContext import TimeContext
+
+    satellites = [Satellite(Tle(line1, line2, name)) for name, line1, line2 in MakeCatalog(size, kinds=("leo",))]
+    sites      = [Site().InitializeByDegLatAndDegLonAndKmAltAndName(SITE[0] + i, SITE[1] - 2.0 * i, SITE[2]) for i in range(10)]
+    startTime  = datetime.datetime(2018, 8, 20, 16, 0, 0)
+    steps      = max(1, int(span / 60.0))
+
+    def run():
+        for k in range(steps):
+            context = TimeContext(startTime + datetime.timedelta(seconds=k))
+
+            for satellite in satellites:
+                eci = satellite.PositionEciByTimeContext(context)
+
+                for site in sites:
+                    site.GetLookAngleEcef(eci, context)
+
+    return run, size * len(sites) * steps
+
+
+##
+# @brief The calculateOrbitTLE.py loop: one satellite, one site, 1 s samples,
+#        elevation mask of 3 degrees, formatted output. The catalog size is
+#        the number of satellites processed in turn.
+def BenchEndToEnd(size, span):
+    site      = Site().InitializeByDegLatAndDegLonAndKmAltAndName(*SITE)
+    catalog   = MakeCatalog(size, kinds=("leo",))
+    startTime = datetime.datetime(2018, 8, 20, 16, 0, 0)
+    endTime   = startTime + datetime.timedelta(minutes=span)
+
+    def run():
+        with tempfile.TemporaryFile("w") as f:
+            for name, line1, line2 in catalog:
+                satellite    = Satellite(Tle(line1, line2, name))
+                dataTime_UTC = startTime
+
+                while dataTime_UTC < endTime:
+                    topoLook = site.GetLookAngle(satellite.PositionEciByDateTime(dataTime_UTC))
+
+                    if topoLook.ElevationDeg >= 3.0:
+                        dataTime = dataTime_UTC + datetime.timedelta(hours=8.0)
+                        f.write("{} {} {}\n".format(dataTime.strftime("%Y/%m/%d %H:%M:%S"),
+                                                   round(topoLook.ElevationDeg, 3),
+                                                   round(topoLook.AzimuthDeg, 3)))
+
+                    dataTime_UTC = dataTime_UTC + datetime.timedelta(seconds=1.0)
+
+    return run, size * int(span * 60)
+
+
+##
+# @brief The end_to_end loop on the fast paths: one TimeContext per sample,
+#        the elevation mask tested with IsAboveMask before the ECEF look
+#        angle is computed.
+def BenchEndToEndMask(size, span):
+    from pythonOrbitTools.Core.TimeContext import TimeContext
+
+    site      = Site().InitializeByDegLatAndDegLonAndKmAltAndName(*SITE)
+    catalog   = MakeCatalog(size, kinds=("leo",))
+    startTime = datetime.datetime(2018, 8, 20, 16, 0, 0)
+    endTime   = startTime + datetime.timedelta(minutes=span)
+
+    def run():
+        with tempfile.TemporaryFile("w") as f:
+            for name, line1, line2 in catalog:
+                satellite    = Satellite(Tle(line1, line2, name))
+                dataTime_UTC = startTime
+
+                while dataTime_UTC < endTime:
+                    context = TimeContext(dataTime_UTC)
+                    eci     = satellite.PositionEciByTimeContext(context)
+
+                    if site.IsAboveMask(eci, 3.0, context):
+                        topoLook = site.GetLookAngleEcef(eci, context)
+
+                        if topoLook.ElevationDeg >= 3.0:
+                            dataTime = dataTime_UTC + datetime.timedelta(hours=8.0)
+                            f.write("{} {} {}\n".format(dataTime.strftime("%Y/%m/%d %H:%M:%S"),
+                                                       round(topoLook.ElevationDeg, 3),
+                                                       round(topoLook.AzimuthDeg, 3)))
+
+                    dataTime_UTC = dataTime_UTC + datetime.timedelta(seconds=1.0)
+
+    return run, size * int(span * 60)
+
+
+# Scripts run in a fresh interpreter by the startup benchmarks. The
+# "propagate" script only uses module paths that exist in every version of
+# the package, so it can be compared across commits. "eager" is the same
+# work with the import set of the package before lazy loading, when Orbit
+# imported the deep-space model up front; it is the reference of
+# CheckStartup.
+PROPAGATE_SCRIPT = "from pythonOrbitTools.Core.Tle import Tle\n" \
+                   "from pythonOrbitTools.Core.Site import Site\n" \
+                   "from pythonOrbitTools.Orbit.Satellite import Satellite\n" \
+                   "site = Site().InitializeByDegLatAndDegLonAndKmAltAndName({site})\n" \
+                   "site.GetLookAngle(Satellite(Tle({tle})).PositionEciByMpe(0.0))\n"
+
+STARTUP_SCRIPTS = {
+    "interpreter" : "pass",
+    "propagate"   : PROPAGATE_SCRIPT,
+    "eager"       : "from pythonOrbitTools.Orbit.NoradSDP4 import NoradSDP4\n" + PROPAGATE_SCRIPT,
+    "package"     : "import pythonOrbitTools as ot\n"
+                    "site = ot.Site().InitializeByDegLatAndDegLonAndKmAltAndName({site})\n"
+                    "site.GetLookAngle(ot.Satellite(ot.Tle({tle})).PositionEciByMpe(0.0))\n",
+}
+
+
+##
+# @brief The command running a startup script in a fresh interpreter.
+def StartupCommand(script):
+    name, line1, line2 = CURATED["leo"]
+    code = STARTUP_SCRIPTS[script].format(site=", ".join(repr(x) for x in SITE),
+                                          tle=", ".join(repr(x) for x in (line1, line2, name)))
+
+    return [sys.executable, "-c", code]
+
+
+##
+# @brief Cold start: a new interpreter imports the package and propagates one
+#        near-earth satellite once. The catalog size is the number of
+#        processes started in turn; "interpreter" is the bare start-up cost.
+def MakeStartup(script):
+    def bench(size, span):
+        command = StartupCommand(script)
+
+        def run():
+            for i in range(size):
+                subprocess.run(command, cwd=ROOT_DIR, check=True)
+
+        return run, size
+
+    return bench
+
+
+BENCHMARKS = {
+    "tle_parse"               : BenchTleParse,
+    "orbit_init"              : BenchOrbitInit,
+    "satellite_fromlines"     : BenchFromLines,
+    "sgp4_getposition"        : MakeGetPosition("leo"),
+    "sgp4_getposition_decay"  : MakeGetPosition("decaying"),
+    "sdp4_getposition"        : MakeGetPosition("gps"),
+    "sdp4_getposition_res12h" : MakeGetPosition("molniya"),
+    "sdp4_getposition_res24h" : MakeGetPosition("geo"),
+    "sgp4_getposition_array"  : MakeGetPositionArray("leo"),
+    "sdp4_getposition_array"  : MakeGetPositionArray("molniya"),
+    "sdp4_catalog_ephemeris"  : BenchDeepEphemeris,
+    "site_lookangle"          : MakeLookAngle("GetLookAngle"),
+    "site_lookangle_ecef"     : MakeLookAngle("GetLookAngleEcef"),
+    "site_lookangle_array"    : BenchLookAngleArray,
+    "site_lookangle_context"  : BenchTimeContext,
+    "vector_geometry"         : MakeGeometry(False),
+    "vectorarray_geometry"    : MakeGeometry(True),
+    "doppler_profile"         : BenchDoppler,
+    "eclipse_intervals"       : BenchEclipse,
+    "catalog_update"          : BenchCatalogUpdate,
+    "pass_predict"            : BenchPassPredict,
+    "pass_cache"              : BenchPassCache,
+    "pass_schedule"           : BenchPassSchedule,
+    "visibility_query"        : BenchVisibilityQuery,
+    "shared_interpolate"      : BenchSharedInterpolate,
+    "end_to_end"              : BenchEndToEnd,
+    "end_to_end_mask"         : BenchEndToEndMask,
+    "startup_interpreter"     : MakeStartup("interpreter"),
+    "startup_propagate"       : MakeStartup("propagate"),
+    "startup_eager"           : MakeStartup("eager"),
+    "startup_package"         : MakeStartup("package"),
+}
+
+# Benchmarks that do not depend on the time span are only run once per size.
+SPAN_FREE = ("tle_parse", "orbit_init", "satellite_fromlines", "startup_interpreter", "startup_propagate", "startup_eager",
+             "startup_package")
+
+# endregion
+
+
+##
+# @brief Time a benchmark, returning the best of several repeats.
+#
+# @param bench The benchmark function.
+# @param size Catalog size.
+# @param span Time span, in minutes.
+# @param repeat Number of repeats.
+# @param instrument Run once more with the hot-path instrumentation enabled
+#        and add its counters to the result.
+#
+# @return A result dict.
+def Measure(bench, size, span, repeat, instrument=False):
+    run, ops = bench(size, span)
+    times    = []
+
+    for i in range(repeat):
+        t0 = time.perf_counter()
+        run()
+        times.append(time.perf_counter() - t0)
+
+    best   = min(times)
+    result = {
+        "size"      : size,
+        "span"      : span,
+        "ops"       : ops,
+        "seconds"   : best,
+        "us_per_op" : best / ops * 1.0e6,
+    }
+
+    if instrument:
+        # Set-up is instrumented too, so build the case again while enabled.
+        Instrument.Reset()
+        Instrument.Enable()
+
+        try:
+            bench(size, span)[0]()
+        finally:
+            Instrument.Disable()
+
+        result["instrument"] = Instrument.ToDict()
+
+    return result
+
+
+##
+# @brief Check that lazy loading pays off: the "propagate" and "package"
+#        startup scripts and the "eager" reference are run in alternating
+#        processes, so that they see the same machine load, and each must
+#        beat the best eager start by STARTUP_GAIN.
+#
+# @param count Number of processes per script.
+#
+# @return (results, failures): the best seconds per start of every script,
+#         and the names of the scripts without the required gain.
+def CheckStartup(count):
+    scripts  = ("eager", "propagate", "package")
+    commands = [StartupCommand(script) for script in scripts]
+    best     = [float("inf")] * len(scripts)
+
+    for i in range(count):
+        for k, command in enumerate(commands):
+            t0 = time.perf_counter()
+            subprocess.run(command, cwd=ROOT_DIR, check=True)
+            best[k] = min(best[k], time.perf_counter() - t0)
+
+    results  = dict(zip(scripts, best))
+    failures = [script for script in scripts[1:] if results[script] > results["eager"] * (1.0 - STARTUP_GAIN)]
+
+    return results, failures
+
+
+##
+# @brief Build the key under which a case is stored in the result file.
+def CaseKey(name, size, span):
+    if name in SPAN_FREE:
+        return "{}[size={}]".format(name, size)
+
+    return "{}[size={},span={}]".format(name, size, span)
+
+
+##
+# @brief Compare results with a baseline.
+#
+# @return (regressions, missing): a list of (key, ratio) for every case
+#         slower than 1 + tolerance, and the keys of the cases the baseline
+#         has no entry for.
+def Compare(results, baseline, tolerance):
+    regressions = []
+    missing     = []
+
+    for key, result in results.items():
+        if key not in baseline:
+            missing.append(key)
+            continue
+
+        ratio = result["us_per_op"] / baseline[key]["us_per_op"]
+        result["ratio"] = ratio
+
+        if ratio > 1.0 + tolerance:
+            regressions.append((key, ratio))
+
+    return regressions, missing
+
+
+def ParseList(string, conv):
+    return [conv(item) for item in string.split(",") if item]
+
+
+def Main(argv=None):
+    parser = argparse.ArgumentParser(description="benchmarks/run.py")
+    parser.add_argument('--sizes',      default="1,10",      type=str,   help="Comma separated catalog sizes.")
+    parser.add_argument('--spans',      default="60,360",    type=str,   help="Comma separated time spans, in minutes.")
+    parser.add_argument('--only',       default="",          type=str,   help="Comma separated benchmark names, default all.")
+    parser.add_argument('--repeat',     default=3,           type=int,   help="Repeats per case; the best time is kept.")
+    parser.add_argument('--output',     default="",          type=str,   help="Result file, default benchmarks/results/<time>.json")
+    parser.add_argument('--baseline',   default=BASELINE_PATH, type=str, help="Baseline file to compare against.")
+    parser.add_argument('--tolerance',  default=0.25,        type=float, help="Allowed slowdown per case, 0.25 = 25%%.")
+    parser.add_argument('--update-baseline', action="store_true",        help="Write the results into the baseline; cases not run are kept.")
+    parser.add_argument('--instrument', action="store_true",             help="Add hot-path counters to every result.")
+    args = parser.parse_args(argv)
+
+    sizes = ParseList(args.sizes, int)
+    spans = ParseList(args.spans, float)
+    names = ParseList(args.only, str) or list(BENCHMARKS)
+
+    results = {}
+
+    for name in names:
+        for size in sizes:
+            for span in (spans[:1] if name in SPAN_FREE else spans):
+                key = CaseKey(name, size, span)
+                results[key] = Measure(BENCHMARKS[name], size, span, args.repeat, args.instrument)
+                print("{:48s} {:12.3f} us/op".format(key, results[key]["us_per_op"]))
+
+    regressions = []
+    missing     = []
+    baseline    = {}
+
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r") as f:
+            baseline = json.load(f)["results"]
+
+        if not args.update_baseline:
+            regressions, missing = Compare(results, baseline, args.tolerance)
+
+        for key, ratio in regressions:
+            print("REGRESSION {:48s} {:6.2f}x baseline".format(key, ratio))
+
+        for key in missing:
+            print("MISSING    {:48s} no baseline entry".format(key))
+
+    slower = []
+
+    if "startup_propagate" in names or "startup_package" in names:
+        startup, slower = CheckStartup(10 * args.repeat)
+
+        for script in ("propagate", "package"):
+            print("STARTUP    {:48s} {:6.2f}x eager".format(script, startup[script] / startup["eager"]))
+
+        for script in slower:
+            print("NO GAIN    {:48s} not {:.0%} faster than eager".format(script, STARTUP_GAIN))
+
+    document = {
+        "created"  : datetime.datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "python"   : platform.python_version(),
+        "platform" : platform.platform(),
+        "results"  : results,
+    }
+
+    if args.update_baseline:
+        document["results"] = dict(baseline, **results)
+        output = args.baseline
+    elif args.output:
+        output = args.output
+    else:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, datetime.datetime.utcnow().strftime("%Y%m%dT%H%M%S") + ".json")
+
+    with open(output, "w") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+
+    print("Results written to {}".format(output))
+
+    return 1 if regressions or missing or slower else 0
+
+
+if __name__ == "__main__":
+    sys.exit(Main())
@@ -0,0 +1,142 @@
+##
+# @file workloads.py
+# @brief Curated and randomized TLE sets shared by the benchmark and validation scripts.
+# @author df_justforfun@163.com
+# @version 1.0
+# @date 2026-10-19
+
+import os
+import sys
+import random
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+# region Curated element sets
+
+# Name, line 1, line 2. Each entry exercises a different branch of the
+# NORAD models:
+#   leo      - SGP4, the satellite shipped in tle.txt
+#   decaying - SGP4 with perigee below 220 km (simplified drag equations),
+#              Spacetrack Report #3 test object 88888
+#   gps      - SDP4 without geopotential resonance
+#   molniya  - SDP4 with 12-hour resonance (e >= 0.5)
+#   geo      - SDP4 with 24-hour (synchronous) resonance
+#   str3     - SDP4, Spacetrack Report #3 test object 11801
+CURATED = {
+    "leo"      : ("AQUA",
+                  "1 27424U 02022A   18232.63485883  .00000062  00000-0  23800-4 0  9991",
+                  "2 27424  98.1977 172.8496 0000593 210.3660 252.0729 14.57127161866769"),
+    "decaying" : ("STR3 88888",
+                  "1 88888U          80275.98708465  .00073094  13844-3  66816-4 0     8",
+                  "2 88888  72.8435 115.9689 0086731  52.6988 110.5714 16.05824518   105"),
+    "gps"      : ("GPS BIIR-2",
+                  "1 24876U 97035A   18232.18215347  .00000027  00000-0  00000+0 0  9999",
+                  "2 24876  55.4684 178.0466 0045765  48.7236 311.6925  2.00563111154085"),
+    "molniya"  : ("MOLNIYA 1-93",
+                  "1 28163U 04005A   18232.38463425  .00000103  00000-0  00000+0 0  9990",
+                  "2 28163  62.7839 257.0839 6970123 287.6268  13.7285  2.00612946106466"),
+    "geo"      : ("GALAXY 15",
+                  "1 28884U 05041A   18232.51782528 -.00000268  00000-0  00000+0 0  9991",
+                  "2 28884   0.0139 284.1460 0002578 140.9574 251.0611  1.00271651 47140"),
+    "str3"     : ("STR3 11801",
+                  "1 11801U          80230.29629788  .01431103  00000-0  14311-1       0",
+                  "2 11801  46.7916 230.4354 7318036  47.4722  10.4117  2.28537848      0"),
+}
+
+# The site and window used by calculateOrbitTLE.py in the readme example.
+SITE = (34.7444, 113.7783, 0.07)
+
+# endregion
+
+
+##
+# @brief Calculate the TLE check sum of the first 68 characters of a line.
+#        Digits count their value, minus signs count 1, everything else 0.
+#
+# @param line A TLE data line.
+#
+# @return The check sum digit as a string.
+def CheckSum(line):
+    total = 0
+
+    for ch in line[:68]:
+        if ch.isdigit():
+            total += int(ch)
+        elif ch == "-":
+            total += 1
+
+    return str(total % 10)
+
+
+##
+# @brief Format line 2 of a TLE from its elements (angles in degrees).
+#
+# @return The 69-character line.
+def FormatLine2(satNum, inc, raan, ecc, argp, ma, mm, rev=0):
+    line = "2 {:05d} {:8.4f} {:8.4f} {:07d} {:8.4f} {:8.4f} {:11.8f}{:5d}".format(satNum,
+                                                                            inc,
+                                                                            raan % 360.0,
+                                                                            int(round(ecc * 1.0e7)),
+                                                                            argp % 360.0,
+                                                                            ma % 360.0,
+                                                                            mm,
+                                                                            rev)
+    return line + CheckSum(line)
+
+
+##
+# @brief Replace the satellite number of a TLE line 1.
+#
+# @return The 69-character line.
+def FormatLine1(template, satNum):
+    line = template[:2] + "{:05d}".format(satNum) + template[7:68]
+    return line + CheckSum(line)
+
+
+##
+# @brief Build a randomized catalog by perturbing the curated element sets.
+#        RAAN, argument of perigee and mean anomaly are drawn uniformly, the
+#        inclination, eccentricity and mean motion are jittered so that every
+#        object stays in the same model branch as its template.
+#
+# @param size Number of objects.
+# @param kinds Template names from CURATED to cycle through.
+# @param seed Random seed, so that runs are repeatable.
+#
+# @return A list of (name, line1, line2) tuples.
+def MakeCatalog(size, kinds=("leo", "decaying", "gps", "molniya", "geo"), seed=0):
+    rnd     = random.Random(seed)
+    catalog = []
+
+    for i in range(size):
+        kind = kinds[i % len(kinds)]
+        name, line1, line2 = CURATED[kind]
+
+        inc  = float(line2[8:16])
+        ecc  = float("0." + line2[26:33])
+        mm   = float(line2[52:63])
+
+        inc  = min(179.9, max(0.01, inc + rnd.uniform(-0.5, 0.5)))
+        ecc  = ecc * rnd.uniform(0.98, 1.02)
+        mm   = mm * rnd.uniform(0.999, 1.001)
+
+        satNum = 90000 + i
+        catalog.append(("{} {}".format(kind.upper(), i),
+                        FormatLine1(line1, satNum),
+                        FormatLine2(satNum,
+                                    inc,
+                                    rnd.uniform(0.0, 360.0),
+                                    ecc,
+                                    rnd.uniform(0.0, 360.0),
+                                    rnd.uniform(0.0, 360.0),
+                                    mm)))
+
+    return catalog
+
+
+if __name__ == "__main__":
+    for entry in MakeCatalog(10):
+        print("\n".join(entry))
@@ -13,6 +13,7 @@ import datetime
 from pythonOrbitTools.Core.Tle import Tle, Field
 from pythonOrbitTools.Orbit.Satellite import Satellite
 from pythonOrbitTools.Core.Site import Site
+from pythonOrbitTools.Core.TimeContext import TimeContext
 
 # ROOT_DIR = "/home/cpf/Documents/OrbitTLE/"
 ROOT_DIR = os.path.split(os.path.realpath(__file__))[0]
@@ -54,12 +55,17 @@ with open(os.path.join(ROOT_DIR, "output.eph"), "w") as f:
 
     while dataTime_UTC <= endTime_UTC:
 
-        topoLook = siteEuqator.GetLookAngle(satellite.PositionEciByDateTime(dataTime_UTC))
+        context = TimeContext(dataTime_UTC)
+        eci     = satellite.PositionEciByTimeContext(context)
 
-        if topoLook.ElevationDeg >= 3.0:
-            dataTime = dataTime_UTC + datetime.timedelta(hours=8.0)
-            string = "{} {} {}\n".format(dataTime.strftime("%Y/%m/%d %H:%M:%S"), round(topoLook.ElevationDeg, 3), round(topoLook.AzimuthDeg, 3))
-            f.write(string)
+        # the look angle only for the samples above the mask
+        if siteEuqator.IsAboveMask(eci, 3.0, context):
+            topoLook = siteEuqator.GetLookAngleEcef(eci, context)
+
+            if topoLook.ElevationDeg >= 3.0:
+                dataTime = dataTime_UTC + datetime.timedelta(hours=8.0)
+                string = "{} {} {}\n".format(dataTime.strftime("%Y/%m/%d %H:%M:%S"), round(topoLook.ElevationDeg, 3), round(topoLook.AzimuthDeg, 3))
+                f.write(string)
 
         dataTime_UTC = dataTime_UTC + datetime.timedelta(seconds=1.0)
 
@@ -12,6 +12,8 @@ from pythonOrbitTools.Core.Globals import Globals
 # @brief Class to encapsulate geocentric coordinates.
 class Geo(object):
 
+    __slots__ = ("_latitudeRad", "_longitudeRad", "_altitude")
+
     # region Properties
 
     @property
@@ -103,6 +105,17 @@ class Geo(object):
         self.InitializeByPosAndTheta(eci.Position, (Globals.AcTan(eci.Position.Y, eci.Position.X) - date.ToGmst()) % Globals.TwoPi)
         return self
 
+    ##
+    # @brief InitializeByEciAndDate with the sidereal time of a TimeContext.
+    #
+    # @param eci The ECI coordinates.
+    # @param context The TimeContext of the instant of eci.
+    #
+    # @return 
+    def InitializeByEciAndTimeContext(self, eci, context):
+        self.InitializeByPosAndTheta(eci.Position, (Globals.AcTan(eci.Position.Y, eci.Position.X) - context.Gmst) % Globals.TwoPi)
+        return self
+
 
     ##
     # @brief Initialize the instance of the class with the given XYZ coordinates.
@@ -142,6 +155,97 @@ class Geo(object):
 
 
 
+    ##
+    # @brief Array form of InitializeByEciAndDate: the geodetic coordinates of
+    #        ECI positions, each element iterated as InitializeByPosAndTheta
+    #        does until its latitude moves by no more than 1e-7 rad.
+    #
+    # @param pos ECI positions, numpy array of shape (n, 3), km.
+    # @param gmst Greenwich Mean Sidereal Time of each position, radians
+    #        (see Julian.ToGmstArray).
+    # @param out Optional (latitude, longitude, altitude) arrays to write the
+    #        result into.
+    # @param work Optional Workspace; with out and work given, a repeated
+    #        call allocates nothing.
+    #
+    # @return (latitude, longitude, altitude) numpy arrays, in radians and km;
+    #         the longitude is in [0, 2pi).
+    @staticmethod
+    def FromEciArray(pos, gmst, out=None, work=None):
+        import numpy as np
+        from pythonOrbitTools.Core.Workspace import Workspace
+
+        DELTA   = 1.0e-07
+        e2      = Globals.F * (2.0 - Globals.F)
+
+        n       = pos.shape[0]
+        work    = Workspace() if work is None else work
+        mul     = np.multiply
+
+        if out is None:
+            lat, lon, alt = np.empty(n), np.empty(n), np.empty(n)
+        else:
+            lat, lon, alt = out
+
+        r       = work.Get("geo.r", n)
+        c       = work.Get("geo.c", n)
+        sinphi  = work.Get("geo.sinphi", n)
+        cnew    = work.Get("geo.cnew", n)
+        latnew  = work.Get("geo.latnew", n)
+        active  = work.Get("geo.active", n, np.bool_)
+        moving  = work.Get("geo.moving", n, np.bool_)
+
+        px, py, pz = pos[:, 0], pos[:, 1], pos[:, 2]
+
+        np.arctan2(py, px, out=lon)
+        np.subtract(lon, gmst, out=lon)
+        np.mod(lon, Globals.TwoPi, out=lon)
+
+        mul(px, px, out=r)
+        mul(py, py, out=c)
+        np.add(r, c, out=r)
+        np.sqrt(r, out=r)
+        np.arctan2(pz, r, out=lat)
+
+        active.fill(True)
+
+        # Converges in a few iterations; bounded in case of NaN input.
+        for i in range(50):
+            # c = 1 / sqrt(1 - e2 * sin(phi)^2), lat = atan2(z + Xkmper * c * e2 * sin(phi), r)
+            np.sin(lat, out=sinphi)
+            mul(sinphi, sinphi, out=cnew)
+            mul(e2, cnew, out=cnew)
+            np.subtract(1.0, cnew, out=cnew)
+            np.sqrt(cnew, out=cnew)
+            np.divide(1.0, cnew, out=cnew)
+            mul(Globals.Xkmper, cnew, out=latnew)
+            mul(latnew, e2, out=latnew)
+            mul(latnew, sinphi, out=latnew)
+            np.add(pz, latnew, out=latnew)
+            np.arctan2(latnew, r, out=latnew)
+
+            np.copyto(c, cnew, where=active)
+
+            # Elements stop once their latitude moved by no more than DELTA.
+            np.subtract(latnew, lat, out=sinphi)
+            np.abs(sinphi, out=sinphi)
+            np.greater(sinphi, DELTA, out=moving)
+            np.logical_and(moving, active, out=moving)
+            np.copyto(lat, latnew, where=active)
+
+            active, moving = moving, active
+
+            if not active.any():
+                break
+
+        # alt = r / cos(lat) - Xkmper * c
+        np.cos(lat, out=alt)
+        np.divide(r, alt, out=alt)
+        mul(Globals.Xkmper, c, out=c)
+        np.subtract(alt, c, out=alt)
+
+        return lat, lon, alt
+
     ##
     # @brief Converts to a string representation of the form "38.0N 45.0W 500m"
     #
@@ -166,6 +270,8 @@ class Geo(object):
 # @brief Class to encapsulate a geocentric coordinate and associated time.
 class GeoTime(Geo):
 
+    __slots__ = ("_date",)
+
     # region Properties
 
     @property
@@ -231,12 +337,27 @@ class GeoTime(Geo):
         self._date = date
         return self
 
+    ##
+    # @brief Initialize the instance of the class with the given ECI coordinates
+    #        and the TimeContext of their instant.
+    #
+    # @param eci The ECI coordinates.
+    # @param context The TimeContext.
+    #
+    # @return 
+    def InitializeByEciAndTimeContext(self, eci, context):
+        super().InitializeByEciAndTimeContext(eci, context)
+        self._date = context.Date
+        return self
+
 
 
 ##
 # @brief Class to encapsulate topo-centric coordinates.
 class Topo(object):
 
+    __slots__ = ("_azimuthRad", "_elevationRad", "_range", "_rangeRate")
+
     # region Properties
 
     @property
@@ -323,6 +444,8 @@ class Topo(object):
 # @brief Class to encapsulate topo-centric coordinates and a time.
 class TopoTime(Topo):
 
+    __slots__ = ("_date",)
+
     # region Properties
 
     @property
@@ -355,7 +478,7 @@ class TopoTime(Topo):
                                                               topo.ElevationRad,
                                                               topo.Range,
                                                               topo.RangeRate)
-        this._date = date
+        self._date = date
         return self
 
     ##
@@ -13,6 +13,8 @@ from pythonOrbitTools.Core.Vector import Vector
 # @brief Encapsulates an Earth-Centered Inertial coordinate position/velocity
 class Eci(object):
 
+    __slots__ = ("_pos", "_vel")
+
     # region Properties
 
     @property
@@ -117,6 +119,8 @@ class Eci(object):
 # @brief: Encapsulates an Earth Centered Inertial coordinate and associated time. 
 class EciTime(Eci):
 
+    __slots__ = ("_date",)
+
     # region Properties
 
     @property
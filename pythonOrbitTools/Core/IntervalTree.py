@@ -0,0 +1,140 @@
+##
+# @file IntervalTree.py
+# @brief A static centered interval tree.
+#
+#  The tree is built once from (start, end, item) triples and answers which
+#  intervals overlap a query interval in O(log n + k). Every node holds the
+#  intervals containing its centre, sorted by start and by end, and the
+#  intervals entirely left and right of it go to its subtrees. The centres
+#  are medians of the interval ends, so any ordered type works: numbers,
+#  datetimes, ...
+#
+#  Intervals are half-open, [start, end): intervals that only touch do not
+#  overlap, e.g.
+#  tree = IntervalTree([(p.Aos, p.Los, p) for p in passes])
+#  tree.Overlapping(aos, los), tree.At(utc)
+#
+# @author df_justforfun@163.com
+# @version 1.0
+# @date 2026-10-19
+
+##
+# @brief Static interval tree; build a new one when the intervals change.
+class IntervalTree(object):
+
+    __slots__ = ("_root", "_size")
+
+    ##
+    # @brief Builds the tree.
+    #
+    # @param intervals (start, end, item) triples with start <= end.
+    #
+    # @return
+    def __init__(self, intervals=()):
+        intervals = list(intervals)
+
+        for start, end, item in intervals:
+            if end < start:
+                raise ValueError("interval ({}, {})".format(start, end))
+
+        self._size = len(intervals)
+        self._root = IntervalTree._Build(intervals)
+
+    ##
+    # @brief The items of the intervals overlapping [start, end), i.e. with
+    #        s < end and e > start.
+    #
+    # @return A list of items, in no particular order.
+    def Overlapping(self, start, end):
+        # An empty query interval overlaps nothing.
+        if not start < end or self._root is None:
+            return []
+
+        found = []
+        stack = [self._root]
+
+        while stack:
+            centre, byStart, byEnd, left, right = stack.pop()
+
+            if end <= centre:
+                # Nodes on the right begin after the centre.
+                for s, e, item in byStart:
+                    if s >= end:
+                        break
+                    found.append(item)
+
+                if left is not None:
+                    stack.append(left)
+            elif start >= centre:
+                # Nodes on the left end before the centre.
+                for s, e, item in byEnd:
+                    if e <= start:
+                        break
+                    found.append(item)
+
+                if right is not None:
+                    stack.append(right)
+            else:
+                found.extend(item for s, e, item in byStart)
+
+                if left is not None:
+                    stack.append(left)
+
+                if right is not None:
+                    stack.append(right)
+
+        return found
+
+    ##
+    # @brief The items of the intervals containing a point.
+    #
+    # @return A list of items, in no particular order.
+    def At(self, point):
+        found = []
+        node  = self._root
+
+        while node is not None:
+            centre, byStart, byEnd, left, right = node
+
+            if point < centre:
+                for s, e, item in byStart:
+                    if s > point:
+                        break
+                    found.append(item)
+
+                node = left
+            else:
+                for s, e, item in byEnd:
+                    if e <= point:
+                        break
+                    found.append(item)
+
+                node = right
+
+        return found
+
+    def __len__(self):
+        return self._size
+
+    # region Utility
+
+    ##
+    # @brief Builds the node (centre, byStart, byEnd, left, right). Each side
+    #        gets at most half of the interval ends, so the depth is at most
+    #        log2(2n).
+    @staticmethod
+    def _Build(intervals):
+        if not intervals:
+            return None
+
+        points  = sorted(p for s, e, item in intervals for p in (s, e))
+        centre  = points[len(points) // 2]
+        here    = [i for i in intervals if i[0] <= centre <= i[1]]
+
+        return (centre,
+                sorted(here, key=lambda i: i[0]),
+                sorted(here, key=lambda i: i[1], reverse=True),
+                IntervalTree._Build([i for i in intervals if i[1] < centre]),
+                IntervalTree._Build([i for i in intervals if i[0] > centre]))
+
+    # endregion
@@ -27,6 +27,8 @@ from pythonOrbitTools.Core.Globals import Globals
 # @brief Encapsulates a Julian date.
 class Julian(object):
 
+    __slots__ = ("_m_Date", "_m_Year", "_m_Day")
+
     EPOCH_JAN0_12H_1900 = 2415020.0  # Dec 31.5 1899 = Dec 31 1899 12h UTC
     EPOCH_JAN1_00H_1900 = 2415020.5  # Jan  1.0 1900 = Jan  1 1900 00h UTC
     EPOCH_JAN1_12H_1900 = 2415021.0  # Jan  1.5 1900 = Jan  1 1900 12h UTC
@@ -108,19 +110,28 @@ class Julian(object):
         self._m_Day  = doy
 
         # Now calculate Julian date
-        # Ref: "Astronomical Formulate for Calculators", Jean Meeus, pages 23-25
+        self._m_Date = Julian._NewYears(year) + doy
 
-        year -= 1
+        return self
 
-        # Centuries are not leap years unless they divide by 400
-        A = int(year/100)
-        B = 2 - A + int(A/4)
+    ##
+    # @brief Julian dates of this date plus an array of offsets. The offsets
+    #        are added to the day of year first, as InitializeByYearAndDoy
+    #        does, so the dates round like those of individually built objects.
+    #
+    # @param days Offsets in days, numpy array.
+    # @param out Optional array to write the dates into.
+    #
+    # @return Julian dates, numpy array.
+    def ToDateArray(self, days, out=None):
+        if out is None:
+            return Julian._NewYears(self._m_Year) + (self._m_Day + days)
 
-        NewYears = int(365.25 * year) + int(30.6001 * 14) + 1720994.5 + B
+        import numpy as np
 
-        self._m_Date = NewYears + doy
+        np.add(self._m_Day, days, out=out)
 
-        return self
+        return np.add(Julian._NewYears(self._m_Year), out, out=out)
 
     ##
     # @brief Calculates the time difference between two Julian dates.
@@ -156,6 +167,49 @@ class Julian(object):
 
         return (Globals.TwoPi * (GMST / Globals.SecPerDay))
 
+    ##
+    # @brief Array form of ToGmst.
+    #
+    # @param dates Julian dates, numpy array.
+    # @param out Optional array to write the result into.
+    # @param work Optional Workspace for the intermediate arrays.
+    #
+    # @return Greenwich Mean Sidereal Time of each date, in radians.
+    @staticmethod
+    def ToGmstArray(dates, out=None, work=None):
+        import numpy as np
+        from pythonOrbitTools.Core.Workspace import Workspace
+
+        n    = np.shape(dates)[0]
+        work = Workspace() if work is None else work
+        UT   = work.Get("gmst.ut", n)
+        TU   = work.Get("gmst.tu", n)
+
+        if out is None:
+            out = np.empty(n)
+
+        np.add(dates, 0.5, out=UT)
+        np.mod(UT, 1.0, out=UT)
+        np.subtract(dates, Julian.EPOCH_JAN1_12H_2000, out=TU)
+        np.subtract(TU, UT, out=TU)
+        np.divide(TU, 36525.0, out=TU)
+
+        # GMST = 24110.54841 + TU * (8640184.812866 + TU * (0.093104 - TU * 6.2e-06))
+        GMST = out
+        np.multiply(TU, 6.2e-06, out=GMST)
+        np.subtract(0.093104, GMST, out=GMST)
+        np.multiply(TU, GMST, out=GMST)
+        np.add(8640184.812866, GMST, out=GMST)
+        np.multiply(TU, GMST, out=GMST)
+        np.add(24110.54841, GMST, out=GMST)
+
+        np.multiply(Globals.SecPerDay * Globals.OmegaE, UT, out=UT)
+        np.add(GMST, UT, out=GMST)
+        np.mod(GMST, Globals.SecPerDay, out=GMST)
+        np.divide(GMST, Globals.SecPerDay, out=GMST)
+
+        return np.multiply(Globals.TwoPi, GMST, out=GMST)
+
     ##
     # @brief Calculate Local Mean Sidereal Time for this Julian date at the given longitude. 
     #
@@ -179,6 +233,23 @@ class Julian(object):
 
         return dt
 
+    # region Utility
+
+    ##
+    # @brief Julian date of Jan 0.0 of the given year.
+    #        Ref: "Astronomical Formulate for Calculators", Jean Meeus, pages 23-25
+    @staticmethod
+    def _NewYears(year):
+        year -= 1
+
+        # Centuries are not leap years unless they divide by 400
+        A = int(year/100)
+        B = 2 - A + int(A/4)
+
+        return int(365.25 * year) + int(30.6001 * 14) + 1720994.5 + B
+
+    # endregion
+
 if __name__ == "__main__":
     utcnow = datetime.datetime.utcnow()
     print("utcnow           : {}".format(utcnow))
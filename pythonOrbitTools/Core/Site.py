@@ -83,6 +83,7 @@ class Site(object):
     def __init__(self):
         self._geo  = None
         self._name = None
+        self._mask = (None, 0.0) # (degrees, sine) of the last elevation mask
 
     ##
     # @brief Initialize the instance of the class with the given components.
@@ -98,6 +99,7 @@ class Site(object):
                                                               Globals.ToRadians(degLon),
                                                               kmAlt)
         self._name = name
+        self.Precompute()
         return self
 
     ##
@@ -108,8 +110,44 @@ class Site(object):
     # @return 
     def InitializeByGeo(self, geo):
         self._geo = Geo().InitializeByGeo(geo)
+        self.Precompute()
         return self
 
+    ##
+    # @brief Calculate the time-independent constants of the ECEF look-angle
+    #        path: the site`s earth-fixed position, the velocity the earth`s
+    #        rotation gives it, and the rotation from ECEF into the local
+    #        south-east-zenith (SEZ) frame. Called by the Initialize methods.
+    #
+    # @return 
+    def Precompute(self):
+        lat = self._geo.LatitudeRad
+        lon = self._geo.LongitudeRad
+        alt = self._geo.Altitude
+
+        sin_lat = math.sin(lat)
+        cos_lat = math.cos(lat)
+        sin_lon = math.sin(lon)
+        cos_lon = math.cos(lon)
+
+        # As in Eci.InitializeByGeoAndDate, with the sidereal time replaced by the longitude.
+        c     = 1.0 / math.sqrt(1.0+Globals.F*(Globals.F-2.0)*Globals.Sqr(sin_lat))
+        s     = Globals.Sqr(1.0-Globals.F)*c
+        achcp = (Globals.Xkmper*c+alt)*cos_lat
+
+        x = achcp * cos_lon # km
+        y = achcp * sin_lon # km
+        z = (Globals.Xkmper*s+alt)*sin_lat # km
+
+        mfactor = Globals.TwoPi*(Globals.OmegaE/Globals.SecPerDay)
+
+        self._m_ecefPos = (x, y, z)
+        self._m_ecefVel = (-mfactor*y, mfactor*x) # km / sec, z component is 0
+
+        self._m_sez     = ( sin_lat * cos_lon,  sin_lat * sin_lon, -cos_lat,
+                           -sin_lon,            cos_lon,
+                            cos_lat * cos_lon,  cos_lat * sin_lon,  sin_lat)
+
     ##
     # @brief Calculates the ECI coordinates of the site
     #
@@ -128,18 +166,30 @@ class Site(object):
     def PositionEciByDateTime(self, utc):
         return EciTime().InitializeByGeoAndDate(self._geo, Julian().InitializeByUTC(utc))
 
+    ##
+    # @brief Calculates the ECI coordinates of the site at the instant of a
+    #        TimeContext, once per context.
+    #
+    # @param context A TimeContext.
+    #
+    # @return The site`s ECI coordinates, shared by the calls with the context.
+    def PositionEciByTimeContext(self, context):
+        return context.SiteEci(self)
+
 
     ##
     # @brief Returns the topo-centric (azimuth, elevation, etc.) coordinates for
     #        a target object described by the given ECI coordinates.
     #
     # @param eci The ECI coordinates of the target object.
+    # @param context Optional TimeContext of the instant of eci; the site`s
+    #        ECI coordinates and sidereal time are then taken from it.
     #
     # @return The look angle to the target object.
-    def GetLookAngle(self, eci):
+    def GetLookAngle(self, eci, context=None):
         # Calculate the ECI coordinates for this Site object at the time of interest
         date = eci.Date
-        eciSite = self.PositionEciByJulianTime(date)
+        eciSite = self.PositionEciByJulianTime(date) if context is None else context.SiteEci(self)
         vecRgRate = Vector(eci.Velocity.X - eciSite.Velocity.X,
                            eci.Velocity.Y - eciSite.Velocity.Y,
                            eci.Velocity.Z - eciSite.Velocity.Z)
@@ -152,7 +202,7 @@ class Site(object):
         vecRange = Vector(x, y, z, w)
 
         # The site`s Local Mean Sidereal Time at the time of interest.
-        theta = date.ToLmst(self.LongitudeRad)
+        theta = date.ToLmst(self.LongitudeRad) if context is None else context.Lmst(self.LongitudeRad)
 
         sin_lat     = math.sin(self.LatitudeRad)
         cos_lat     = math.cos(self.LatitudeRad)
@@ -192,9 +242,289 @@ class Site(object):
 
 
 
+    ##
+    # @brief Returns the same look angle as GetLookAngle through the ECEF frame:
+    #        the target state is rotated into ECEF with one GMST rotation and
+    #        compared with the precomputed site constants, without building
+    #        the site`s ECI position or any Vector.
+    #
+    # @param eci The ECI coordinates of the target object.
+    # @param context Optional TimeContext of the instant of eci, giving the
+    #        GMST rotation.
+    #
+    # @return The look angle to the target object.
+    def GetLookAngleEcef(self, eci, context=None):
+        date    = eci.Date
+
+        if context is None:
+            gmst    = date.ToGmst()
+            sin_g   = math.sin(gmst)
+            cos_g   = math.cos(gmst)
+        else:
+            sin_g   = context.SinGmst
+            cos_g   = context.CosGmst
+
+        pos     = eci.Position
+        vel     = eci.Velocity
+        px, py  = pos.X, pos.Y
+        vx, vy  = vel.X, vel.Y
+
+        sx, sy, sz      = self._m_ecefPos
+        svx, svy        = self._m_ecefVel
+        s0, s1, s2, e0, e1, z0, z1, z2 = self._m_sez
+
+        # Range and range rate in ECEF components.
+        x   =  cos_g * px + sin_g * py - sx
+        y   = -sin_g * px + cos_g * py - sy
+        z   =  pos.Z - sz
+        dx  =  cos_g * vx + sin_g * vy - svx
+        dy  = -sin_g * vx + cos_g * vy - svy
+        dz  =  vel.Z
+        w   = math.sqrt(x * x + y * y + z * z)
+
+        top_s = s0 * x + s1 * y + s2 * z
+        top_e = e0 * x + e1 * y
+        top_z = z0 * x + z1 * y + z2 * z
+
+        az    = math.atan2(top_e, -top_s) % Globals.TwoPi
+        el    = math.asin(top_z / w)
+        rate  = (x * dx + y * dy + z * dz) / w
+
+        return TopoTime().InitializeByRadAzAndRadElAndRangeAndRangeRateAndDate(az, el, w, rate, date)
+
+    ##
+    # @brief Whether a target is at or above an elevation mask, without the
+    #        look angle: the zenith component of the range vector is compared
+    #        with range * sin(mask), in the frame of GetLookAngleEcef. No
+    #        inverse trigonometry and no object is built, so samples below
+    #        the mask, mostly the majority, are discarded cheaply.
+    #
+    # @param eci The ECI coordinates of the target object.
+    # @param minElevationDeg Elevation mask, in degrees.
+    # @param context Optional TimeContext of the instant of eci, giving the
+    #        GMST rotation.
+    #
+    # @return True if the elevation is at or above the mask.
+    def IsAboveMask(self, eci, minElevationDeg=0.0, context=None):
+        if context is None:
+            gmst    = eci.Date.ToGmst()
+            sin_g   = math.sin(gmst)
+            cos_g   = math.cos(gmst)
+        else:
+            sin_g   = context.SinGmst
+            cos_g   = context.CosGmst
+
+        pos     = eci.Position
+        px, py  = pos.X, pos.Y
+
+        sx, sy, sz  = self._m_ecefPos
+        z0, z1, z2  = self._m_sez[5:]
+
+        x   =  cos_g * px + sin_g * py - sx
+        y   = -sin_g * px + cos_g * py - sy
+        z   =  pos.Z - sz
+
+        return z0 * x + z1 * y + z2 * z >= math.sqrt(x * x + y * y + z * z) * self._MaskSine(minElevationDeg)
+
+    ##
+    # @brief Array form of GetLookAngleEcef.
+    #
+    # @param pos Target ECI positions, numpy array of shape (n, 3), km.
+    # @param vel Target ECI velocities, numpy array of shape (n, 3), km/sec.
+    # @param gmst Greenwich Mean Sidereal Time of each sample, radians
+    #        (see Julian.ToGmstArray).
+    # @param out Optional (azimuth, elevation, range, range rate) arrays to
+    #        write the result into.
+    # @param work Optional Workspace; with out and work given, a repeated
+    #        call allocates nothing.
+    #
+    # @return (azimuth, elevation, range, range rate) numpy arrays, in radians,
+    #         km and km/sec.
+    def GetLookAngleArray(self, pos, vel, gmst, out=None, work=None):
+        import numpy as np
+        from pythonOrbitTools.Core.Workspace import Workspace
+
+        n       = pos.shape[0]
+        work    = Workspace() if work is None else work
+        mul     = np.multiply
+        add     = np.add
+        sub     = np.subtract
+
+        if out is None:
+            az, el, w, rate = np.empty(n), np.empty(n), np.empty(n), np.empty(n)
+        else:
+            az, el, w, rate = out
+
+        sin_g   = work.Get("look.sin_g", n)
+        cos_g   = work.Get("look.cos_g", n)
+        x       = work.Get("look.x", n)
+        y       = work.Get("look.y", n)
+        z       = work.Get("look.z", n)
+        dx      = work.Get("look.dx", n)
+        dy      = work.Get("look.dy", n)
+        t       = work.Get("look.t", n)
+
+        np.sin(gmst, out=sin_g)
+        np.cos(gmst, out=cos_g)
+
+        sx, sy, sz      = self._m_ecefPos
+        svx, svy        = self._m_ecefVel
+        s0, s1, s2, e0, e1, z0, z1, z2 = self._m_sez
+
+        px, py, pz = pos[:, 0], pos[:, 1], pos[:, 2]
+        vx, vy, vz = vel[:, 0], vel[:, 1], vel[:, 2]
+
+        # Range and range rate in ECEF components:
+        #   x  =  cos_g * px + sin_g * py - sx,   dx =  cos_g * vx + sin_g * vy - svx
+        #   y  = -sin_g * px + cos_g * py - sy,   dy = -sin_g * vx + cos_g * vy - svy
+        #   z  =  pz - sz
+        for r, a, b, c in ((x, px, py, sx), (dx, vx, vy, svx)):
+            mul(cos_g, a, out=r)
+            mul(sin_g, b, out=t)
+            add(r, t, out=r)
+            sub(r, c, out=r)
+
+        np.negative(sin_g, out=sin_g)
+
+        for r, a, b, c in ((y, px, py, sy), (dy, vx, vy, svy)):
+            mul(sin_g, a, out=r)
+            mul(cos_g, b, out=t)
+            add(r, t, out=r)
+            sub(r, c, out=r)
+
+        sub(pz, sz, out=z)
+
+        # w = sqrt(x * x + y * y + z * z)
+        mul(x, x, out=w)
+        mul(y, y, out=t)
+        add(w, t, out=w)
+        mul(z, z, out=t)
+        add(w, t, out=w)
+        np.sqrt(w, out=w)
+
+        # rate = (x * dx + y * dy + z * vz) / w
+        mul(x, dx, out=rate)
+        mul(y, dy, out=t)
+        add(rate, t, out=rate)
+        mul(z, vz, out=t)
+        add(rate, t, out=rate)
+        np.divide(rate, w, out=rate)
+
+        # top_s = s0 * x + s1 * y + s2 * z, into dx
+        mul(s0, x, out=dx)
+        mul(s1, y, out=t)
+        add(dx, t, out=dx)
+        mul(s2, z, out=t)
+        add(dx, t, out=dx)
+
+        # top_e = e0 * x + e1 * y, into dy
+        mul(e0, x, out=dy)
+        mul(e1, y, out=t)
+        add(dy, t, out=dy)
+
+        # top_z = z0 * x + z1 * y + z2 * z, into el
+        mul(z0, x, out=el)
+        mul(z1, y, out=t)
+        add(el, t, out=el)
+        mul(z2, z, out=t)
+        add(el, t, out=el)
+
+        np.negative(dx, out=dx)
+        np.arctan2(dy, dx, out=az)
+        np.mod(az, Globals.TwoPi, out=az)
+        np.divide(el, w, out=el)
+        np.arcsin(el, out=el)
+
+        return az, el, w, rate
+
+    ##
+    # @brief Array form of IsAboveMask, e.g. to select the samples that need
+    #        GetLookAngleArray.
+    #
+    # @param pos Target ECI positions, numpy array of shape (n, 3), km.
+    # @param gmst Greenwich Mean Sidereal Time of each sample, radians.
+    # @param minElevationDeg Elevation mask, in degrees.
+    # @param out Optional boolean array to write the result into.
+    # @param work Optional Workspace; with out and work given, a repeated
+    #        call allocates nothing.
+    #
+    # @return Boolean numpy array, True where the elevation is at or above the mask.
+    def IsAboveMaskArray(self, pos, gmst, minElevationDeg=0.0, out=None, work=None):
+        import numpy as np
+        from pythonOrbitTools.Core.Workspace import Workspace
+
+        n       = pos.shape[0]
+        work    = Workspace() if work is None else work
+        mul     = np.multiply
+        add     = np.add
+        sub     = np.subtract
+
+        if out is None:
+            out = np.empty(n, np.bool_)
+
+        sin_g   = work.Get("mask.sin_g", n)
+        cos_g   = work.Get("mask.cos_g", n)
+        x       = work.Get("mask.x", n)
+        y       = work.Get("mask.y", n)
+        z       = work.Get("mask.z", n)
+        w       = work.Get("mask.w", n)
+        t       = work.Get("mask.t", n)
+
+        np.sin(gmst, out=sin_g)
+        np.cos(gmst, out=cos_g)
+
+        sx, sy, sz  = self._m_ecefPos
+        z0, z1, z2  = self._m_sez[5:]
+
+        px, py, pz = pos[:, 0], pos[:, 1], pos[:, 2]
+
+        # x = cos_g * px + sin_g * py - sx, y = -sin_g * px + cos_g * py - sy
+        mul(cos_g, px, out=x)
+        mul(sin_g, py, out=t)
+        add(x, t, out=x)
+        sub(x, sx, out=x)
+        mul(cos_g, py, out=y)
+        mul(sin_g, px, out=t)
+        sub(y, t, out=y)
+        sub(y, sy, out=y)
+        sub(pz, sz, out=z)
+
+        # w = sqrt(x * x + y * y + z * z) * sin(mask)
+        mul(x, x, out=w)
+        mul(y, y, out=t)
+        add(w, t, out=w)
+        mul(z, z, out=t)
+        add(w, t, out=w)
+        np.sqrt(w, out=w)
+        mul(w, self._MaskSine(minElevationDeg), out=w)
+
+        # top_z = z0 * x + z1 * y + z2 * z
+        mul(z0, x, out=x)
+        mul(z1, y, out=t)
+        add(x, t, out=x)
+        mul(z2, z, out=t)
+        add(x, t, out=x)
+
+        return np.greater_equal(x, w, out=out)
+
     ##
     # @brief Converts to a string representation of the form "120.00N 90.00W 500m"
     #
     # @return The formatted string.
     def __str__(self):
         return self._geo.__str__()
+
+    # region Utility
+
+    ##
+    # @brief sin(minElevationDeg), kept for the mask of the previous call.
+    def _MaskSine(self, minElevationDeg):
+        degrees, sine = self._mask
+
+        if degrees != minElevationDeg:
+            sine        = math.sin(Globals.ToRadians(minElevationDeg))
+            self._mask  = (minElevationDeg, sine)
+
+        return sine
+
+    # endregion
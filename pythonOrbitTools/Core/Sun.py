@@ -0,0 +1,99 @@
+##
+# @file Sun.py
+# @brief Low-precision solar ephemeris.
+#
+#  The geocentric position of the sun from the low-precision formulae of the
+#  Astronomical Almanac (page C24), good to about 0.01 degree between 1950
+#  and 2050. The position is referred to the mean equator and equinox of
+#  date, which is close enough to the TEME frame of the NORAD models for
+#  shadow and illumination tests.
+#
+#  References:
+#       The 1992 Astronomical Almanac, page C24.
+#       "Fundamentals of Astrodynamics and Applications", David A. Vallado,
+#       2nd Edition, 2001, Algorithm 29
+#
+# @author df_justforfun@163.com
+# @version 1.0
+# @date 2026-10-19
+
+import math
+from pythonOrbitTools.Core.Globals import Globals
+from pythonOrbitTools.Core.Julian import Julian
+from pythonOrbitTools.Core.Vector import Vector
+
+##
+# @brief Position of the sun.
+class Sun(object):
+
+    ##
+    # @brief Calculate the ECI position of the sun.
+    #
+    # @param date Julian date.
+    #
+    # @return The position, in km.
+    @staticmethod
+    def PositionEci(date):
+        T       = date.FromJan1_12h_2000 / 36525.0
+
+        lonMean = Globals.ToRadians(280.460 + 36000.771 * T)
+        anomaly = Globals.ToRadians(357.5291092 + 35999.05034 * T)
+        lon     = lonMean + Globals.ToRadians(1.914666471 * math.sin(anomaly) + 0.019994643 * math.sin(2.0 * anomaly))
+        obliq   = Globals.ToRadians(23.439291 - 0.0130042 * T)
+        dist    = (1.000140612 - 0.016708617 * math.cos(anomaly) - 0.000139589 * math.cos(2.0 * anomaly)) * Globals.Au
+
+        return Vector(dist * math.cos(lon),
+                      dist * math.cos(obliq) * math.sin(lon),
+                      dist * math.sin(obliq) * math.sin(lon),
+                      dist)
+
+    ##
+    # @brief Array form of PositionEci.
+    #
+    # @param dates Julian dates, numpy array.
+    #
+    # @return ECI positions, numpy array of shape (n, 3), in km.
+    @staticmethod
+    def PositionArray(dates):
+        import numpy as np
+
+        T       = (np.asarray(dates, dtype=np.float64) - Julian.EPOCH_JAN1_12H_2000) / 36525.0
+
+        lonMean = np.radians(280.460 + 36000.771 * T)
+        anomaly = np.radians(357.5291092 + 35999.05034 * T)
+        lon     = lonMean + np.radians(1.914666471 * np.sin(anomaly) + 0.019994643 * np.sin(2.0 * anomaly))
+        obliq   = np.radians(23.439291 - 0.0130042 * T)
+        dist    = (1.000140612 - 0.016708617 * np.cos(anomaly) - 0.000139589 * np.cos(2.0 * anomaly)) * Globals.Au
+
+        sin_lon = np.sin(lon)
+
+        return np.stack((dist * np.cos(lon),
+                         dist * np.cos(obliq) * sin_lon,
+                         dist * np.sin(obliq) * sin_lon), axis=1)
+
+    ##
+    # @brief Elevation of the sun seen from a site, e.g. to tell whether the
+    #        site is in darkness (civil twilight ends at -6 degrees, nautical
+    #        at -12, astronomical at -18).
+    #
+    # @param site The site.
+    # @param dates Julian dates, numpy array.
+    #
+    # @return Elevations, numpy array, in radians.
+    @staticmethod
+    def ElevationArray(site, dates):
+        import numpy as np
+
+        pos = Sun.PositionArray(dates)
+        _, el, _, _ = site.GetLookAngleArray(pos, np.zeros_like(pos), Julian.ToGmstArray(dates))
+
+        return el
+
+
+if __name__ == "__main__":
+    import datetime
+
+    date = Julian().InitializeByUTC(datetime.datetime(2018, 8, 21, 0, 0, 0))
+    sun  = Sun.PositionEci(date)
+
+    print(sun.X, sun.Y, sun.Z, sun.W / Globals.Au)
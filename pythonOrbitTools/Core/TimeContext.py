@@ -0,0 +1,185 @@
+##
+# @file TimeContext.py
+# @brief The time-dependent quantities shared by everything computed for one
+#        instant.
+#
+#  Propagating N satellites and looking at them from M sites at one instant
+#  needs the Julian date, the Greenwich Mean Sidereal Time and the ECI<->ECEF
+#  rotation of that instant N x M times over, and every site`s ECI state M x N
+#  times. A TimeContext computes them once; the propagation, look-angle and
+#  geodetic methods taking a context use them instead of their own, with the
+#  same results, e.g.
+#
+#  context = TimeContext(utc)
+#  for satellite in satellites:
+#      eci = satellite.PositionEciByTimeContext(context)
+#      for site in sites:
+#          topoLook = site.GetLookAngleEcef(eci, context)
+#      geo = GeoTime().InitializeByEciAndTimeContext(eci, context)
+#
+# @author df_justforfun@163.com
+# @version 1.0
+# @date 2026-10-19
+
+import math
+from pythonOrbitTools.Core.Globals import Globals
+from pythonOrbitTools.Core.Julian import Julian
+
+##
+# @brief Julian date, sidereal time and earth rotation of one instant.
+class TimeContext(object):
+
+    __slots__ = ("_utc", "_date", "_gmst", "_sinGmst", "_cosGmst", "_sites")
+
+    # region Properties
+
+    @property
+    ##
+    # @brief The instant (UTC).
+    #
+    # @return A datetime.
+    def Utc(self):
+        return self._utc
+
+    @property
+    ##
+    # @brief The instant as a Julian object, shared by the EciTime objects
+    #        built with this context.
+    #
+    # @return
+    def Date(self):
+        return self._date
+
+    @property
+    def Jd(self):
+        return self._date.Date
+
+    @property
+    ##
+    # @brief Greenwich Mean Sidereal Time, radians, see Julian.ToGmst.
+    #
+    # @return
+    def Gmst(self):
+        return self._gmst
+
+    @property
+    def SinGmst(self):
+        return self._sinGmst
+
+    @property
+    def CosGmst(self):
+        return self._cosGmst
+
+    # endregion
+
+    ##
+    # @brief Creates the context of an instant.
+    #
+    # @param utc The instant (UTC).
+    # @param date Optional Julian object of utc, if already at hand.
+    #
+    # @return
+    def __init__(self, utc, date=None):
+        self._utc       = utc
+        self._date      = Julian().InitializeByUTC(utc) if date is None else date
+        self._gmst      = self._date.ToGmst()
+        self._sinGmst   = math.sin(self._gmst)
+        self._cosGmst   = math.cos(self._gmst)
+        self._sites     = {}
+
+    ##
+    # @brief Creates the context of a Julian date.
+    #
+    # @return
+    @classmethod
+    def FromJulian(cls, date):
+        return cls(date.ToTime(), date)
+
+    ##
+    # @brief Local Mean Sidereal Time, see Julian.ToLmst.
+    #
+    # @param lon The longitude, in radians.
+    #
+    # @return
+    def Lmst(self, lon):
+        return (self._gmst + lon) % Globals.TwoPi
+
+    ##
+    # @brief Rotate ECI components into the earth-fixed frame.
+    #
+    # @return (x, y, z).
+    def EciToEcef(self, x, y, z):
+        return (self._cosGmst * x + self._sinGmst * y, -self._sinGmst * x + self._cosGmst * y, z)
+
+    ##
+    # @brief Rotate earth-fixed components into the ECI frame.
+    #
+    # @return (x, y, z).
+    def EcefToEci(self, x, y, z):
+        return (self._cosGmst * x - self._sinGmst * y, self._sinGmst * x + self._cosGmst * y, z)
+
+    ##
+    # @brief The ECI state of a site at this instant, computed on the first
+    #        call for the site.
+    #
+    # @param site A Site.
+    #
+    # @return An EciTime, shared by the calls; do not scale it.
+    def SiteEci(self, site):
+        eci = self._sites.get(site)
+
+        if eci is None:
+            eci = site.PositionEciByJulianTime(self._date)
+            self._sites[site] = eci
+
+        return eci
+
+    def __repr__(self):
+        return "TimeContext({!r})".format(self._utc)
+
+
+if __name__ == "__main__":
+    import time
+    import datetime
+    from pythonOrbitTools.Core.Tle import Tle
+    from pythonOrbitTools.Core.Site import Site
+    from pythonOrbitTools.Core.Coord import GeoTime
+    from pythonOrbitTools.Orbit.Satellite import Satellite
+
+    line1 = "1 27424U 02022A   18232.63485883  .00000062  00000-0  23800-4 0  9991"
+    line2 = "2 27424  98.1977 172.8496 0000593 210.3660 252.0729 14.57127161866769"
+
+    satellites = [Satellite(Tle("1 {:05d}".format(90000 + i) + line1[7:],
+                                "2 {:05d}".format(90000 + i) + line2[7:43] + "{:8.4f}".format((252.0729 + 3.0 * i) % 360.0) + line2[51:],
+                                "SAT{}".format(i)))
+                  for i in range(100)]
+    sites      = [Site().InitializeByDegLatAndDegLonAndKmAltAndName(34.7444 + i, 113.7783 - 2.0 * i, 0.07, "S{}".format(i))
+                  for i in range(10)]
+    startUtc   = datetime.datetime(2018, 8, 21, 0, 0, 0)
+    steps      = [startUtc + datetime.timedelta(seconds=10.0 * k) for k in range(10)]
+
+    t0 = time.perf_counter()
+    old = [(site.GetLookAngle(eci), site.GetLookAngleEcef(eci))
+           for utc in steps for eci in (s.PositionEciByDateTime(utc) for s in satellites) for site in sites]
+    t1 = time.perf_counter()
+
+    new = []
+
+    for utc in steps:
+        context = TimeContext(utc)
+
+        for satellite in satellites:
+            eci  = satellite.PositionEciByTimeContext(context)
+            new += [(site.GetLookAngle(eci, context), site.GetLookAngleEcef(eci, context)) for site in sites]
+
+    t2 = time.perf_counter()
+
+    print("{} satellites x {} sites x {} steps: {:.3f} s, with a TimeContext {:.3f} s".format(
+        len(satellites), len(sites), len(steps), t1 - t0, t2 - t1))
+    print("largest difference {:.2e} rad".format(max(abs(a.ElevationRad - b.ElevationRad) + abs(a.AzimuthRad - b.AzimuthRad)
+                                                    for p, q in zip(old, new) for a, b in zip(p, q))))
+
+    context = TimeContext(startUtc)
+    eci     = satellites[0].PositionEciByTimeContext(context)
+    geo     = GeoTime().InitializeByEciAndTimeContext(eci, context)
+    print("{}: gmst {:.6f} rad, sub-satellite point {:.4f} {:.4f} deg".format(context, context.Gmst, geo.LatitudeDeg, geo.LongitudeDeg))
@@ -245,6 +245,21 @@ class Tle(object):
 
     # end region
 
+    ##
+    # @brief A copy sharing the parsed fields, optionally under another name.
+    #
+    # @param name The name of the copy; None keeps the name.
+    #
+    # @return A Tle.
+    def Copy(self, name=None):
+        tle = Tle.__new__(Tle)
+        tle.__dict__.update(self.__dict__)
+
+        if name is not None:
+            tle._m_Line0 = name
+
+        return tle
+
     def Initialize(self):
         self._m_Field[Field.NoradNum] = self._m_Line1[Tle.TLE1_COL_SATNUM:
                                                       Tle.TLE1_COL_SATNUM+Tle.TLE1_LEN_SATNUM]
@@ -11,6 +11,9 @@ import math
 # @brief Encapsulates a simple 4-component vector
 class Vector(object):
 
+    # Created several times per propagated sample, so no instance dict.
+    __slots__ = ("_x", "_y", "_z", "_w")
+
 
 
     ##
@@ -0,0 +1,331 @@
+##
+# @file VectorArray.py
+# @brief Array of 4-component vectors, the vectorized form of Vector.
+#
+#  A VectorArray wraps an (N, 4) float64 numpy array, one X, Y, Z, W row per
+#  vector, without copying it. The in-place operations of Vector (Mul, Sub,
+#  RotateX/Y/Z, Translate) and its geometric helpers (Angle, Magnitude, Dot,
+#  Distance) apply to all rows at once; the other operand may be a
+#  VectorArray of the same length or a single Vector, and factors and angles
+#  may be scalars or one value per row.
+#
+#  The array propagation paths write into (N, 4) buffers and return (N, 3)
+#  views of them, which FromXyz wraps without a copy, e.g.
+#  pos, vel = satellite.Orbit.PositionVectorArrayByMpe(mpe)
+#  alt      = pos.Magnitude() - Globals.Xkmper
+#
+# @author df_justforfun@163.com
+# @version 1.0
+# @date 2026-10-19
+
+from pythonOrbitTools.Core.Vector import Vector
+
+##
+# @brief Encapsulates an array of 4-component vectors. Needs numpy.
+class VectorArray(object):
+
+    __slots__ = ("_data",)
+
+    ##
+    # @brief Wraps an array, without copying it.
+    #
+    # @param data numpy float64 array of shape (N, 4).
+    #
+    # @return
+    def __init__(self, data):
+        import numpy as np
+
+        if not isinstance(data, np.ndarray) or data.dtype != np.float64 or data.ndim != 2 or data.shape[1] != 4:
+            raise ValueError("data")
+
+        self._data = data
+
+    # region Properties
+
+    @property
+    ##
+    # @brief The (N, 4) array itself.
+    #
+    # @return
+    def Data(self):
+        return self._data
+
+    @property
+    ##
+    # @brief The X, Y, Z columns, an (N, 3) view.
+    #
+    # @return
+    def Xyz(self):
+        return self._data[:, :3]
+
+    @property
+    def X(self):
+        return self._data[:, 0]
+
+    @property
+    def Y(self):
+        return self._data[:, 1]
+
+    @property
+    def Z(self):
+        return self._data[:, 2]
+
+    @property
+    def W(self):
+        return self._data[:, 3]
+
+    # endregion
+
+    ##
+    # @brief Creates an array of n zero vectors.
+    #
+    # @return
+    @classmethod
+    def Zeros(cls, n):
+        import numpy as np
+
+        return cls(np.zeros((n, 4)))
+
+    ##
+    # @brief Creates an array from X, Y, Z rows. An (N, 3) view of the first
+    #        columns of an (N, 4) float64 array, as returned by the array
+    #        propagation paths, is wrapped without a copy when w is None.
+    #
+    # @param xyz Array of shape (N, 3).
+    # @param w The W components, scalar or one per row, default 0.0.
+    #
+    # @return
+    @classmethod
+    def FromXyz(cls, xyz, w=None):
+        import numpy as np
+
+        base = getattr(xyz, "base", None)
+
+        if w is None and isinstance(base, np.ndarray) and base.dtype == np.float64 and\
+           base.shape == (len(xyz), 4) and xyz.shape[1:] == (3,) and\
+           xyz.strides == base.strides and xyz.ctypes.data == base.ctypes.data:
+            return cls(base)
+
+        xyz  = np.asarray(xyz, dtype=np.float64)
+        data = np.empty((xyz.shape[0], 4))
+
+        data[:, :3] = xyz
+        data[:, 3]  = 0.0 if w is None else w
+
+        return cls(data)
+
+    ##
+    # @brief Creates an array from Vector objects.
+    #
+    # @return
+    @classmethod
+    def FromVectors(cls, vectors):
+        import numpy as np
+
+        return cls(np.array([(v.X, v.Y, v.Z, v.W) for v in vectors], dtype=np.float64).reshape(-1, 4))
+
+    ##
+    # @brief Converts to a list of Vector objects.
+    #
+    # @return
+    def ToVectors(self):
+        return [Vector(x, y, z, w) for x, y, z, w in self._data.tolist()]
+
+    ##
+    # @brief Returns a VectorArray with a copy of the data.
+    #
+    # @return
+    def Copy(self):
+        return VectorArray(self._data.copy())
+
+    ##
+    # @brief: Multiply each component of each vector by a given factor.
+    #
+    # @param factor: The factor, scalar or one per row.
+    #
+    # @return
+    def Mul(self, factor):
+        import numpy as np
+
+        factor = VectorArray._Column(factor)
+
+        self._data[:, :3] *= factor
+        self._data[:, 3:] *= np.fabs(factor)
+
+    ##
+    # @brief: Subtracts vectors from these vectors, W included, as Vector.Sub.
+    #
+    # @param vec: A VectorArray or a Vector.
+    #
+    # @return
+    def Sub(self, vec):
+        self._data -= VectorArray._Operand(vec)
+
+    ##
+    # @brief: Calculates the angles, in radians, between these vectors and
+    #         others. Rounding cannot push the cosine out of [-1, 1].
+    #
+    # @param vec: A VectorArray or a Vector.
+    #
+    # @return: numpy array of angles, in radians.
+    def Angle(self, vec):
+        import numpy as np
+
+        other = VectorArray._Operand(vec)
+        norm  = self.Magnitude() * np.sqrt(np.sum(other[..., :3] * other[..., :3], axis=-1))
+
+        return np.arccos(np.clip(self.Dot(vec) / norm, -1.0, 1.0))
+
+    ##
+    # @brief: Calculates the magnitude of each vector.
+    #
+    # @return: numpy array of magnitudes.
+    def Magnitude(self):
+        import numpy as np
+
+        xyz = self._data[:, :3]
+
+        return np.sqrt(np.einsum("ij,ij->i", xyz, xyz))
+
+    ##
+    # @brief: Calculates the dot products of these vectors and others.
+    #
+    # @param vec: A VectorArray or a Vector.
+    #
+    # @return: numpy array of dot products.
+    def Dot(self, vec):
+        import numpy as np
+
+        return np.sum(self._data[:, :3] * VectorArray._Operand(vec)[..., :3], axis=1)
+
+    ##
+    # @brief: Calculates the distances between these vectors and others as
+    #         points in XYZ space.
+    #
+    # @param vec: A VectorArray or a Vector.
+    #
+    # @return: numpy array of distances.
+    def Distance(self, vec):
+        import numpy as np
+
+        diff = self._data[:, :3] - VectorArray._Operand(vec)[..., :3]
+
+        return np.sqrt(np.einsum("ij,ij->i", diff, diff))
+
+    ##
+    # @brief: Rotates the XYZ coordinates around the X-axis
+    #
+    # @param radians Scalar or one per row.
+    #
+    # @return
+    def RotateX(self, radians):
+        self._Rotate(radians, 1, 2)
+
+    ##
+    # @brief: Rotates the XYZ coordinates around the Y-axis
+    #
+    # @param radians Scalar or one per row.
+    #
+    # @return
+    def RotateY(self, radians):
+        self._Rotate(radians, 2, 0)
+
+    ##
+    # @brief: Rotates the XYZ coordinates around the Z-axis.
+    #
+    # @param radians Scalar or one per row.
+    #
+    # @return
+    def RotateZ(self, radians):
+        self._Rotate(radians, 0, 1)
+
+    ##
+    # @brief: Offset the XYZ coordinates.
+    #
+    # @param x, y, z Scalars or one per row.
+    #
+    # @return
+    def Translate(self, x, y, z):
+        self._data[:, 0] += x
+        self._data[:, 1] += y
+        self._data[:, 2] += z
+
+    def __len__(self):
+        return self._data.shape[0]
+
+    ##
+    # @brief An integer index returns a Vector (a copy); slices and index
+    #        arrays return a VectorArray (a view for slices, as in numpy).
+    #
+    # @return
+    def __getitem__(self, index):
+        import numpy as np
+
+        if isinstance(index, (int, np.integer)):
+            return Vector(*self._data[index].tolist())
+
+        return VectorArray(self._data[index])
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None:
+            return self._data
+
+        return self._data.astype(dtype)
+
+    # region Utility
+
+    ##
+    # @brief Rotation in the plane of columns i and j, by the angle from i towards j.
+    def _Rotate(self, radians, i, j):
+        import numpy as np
+
+        c  = np.cos(radians)
+        s  = np.sin(radians)
+        a  = self._data[:, i].copy()
+        b  = self._data[:, j]
+
+        self._data[:, i] = c * a - s * b
+        self._data[:, j] = s * a + c * b
+
+    @staticmethod
+    def _Column(value):
+        import numpy as np
+
+        value = np.asarray(value, dtype=np.float64)
+
+        return value[:, None] if value.ndim == 1 else value
+
+    @staticmethod
+    def _Operand(vec):
+        import numpy as np
+
+        if isinstance(vec, VectorArray):
+            return vec._data
+
+        return np.array((vec.X, vec.Y, vec.Z, vec.W), dtype=np.float64)
+
+    # endregion
+
+
+if __name__ == "__main__":
+    import math
+    import numpy as np
+
+    rng     = np.random.default_rng(1)
+    vectors = [Vector(*v) for v in rng.normal(size=(5, 4)).tolist()]
+    other   = Vector(2.0, 1.0, 3.0, 0.5)
+    array   = VectorArray.FromVectors(vectors)
+
+    print("Magnitude", np.allclose(array.Magnitude(), [v.Magnitude() for v in vectors]))
+    print("Dot      ", np.allclose(array.Dot(other), [v.Dot(other) for v in vectors]))
+    print("Angle    ", np.allclose(array.Angle(other), [v.Angle(other) for v in vectors]))
+    print("Distance ", np.allclose(array.Distance(other), [v.Distance(other) for v in vectors]))
+
+    for method, args in (("Mul", (-1.5,)), ("Sub", (other,)), ("RotateX", (math.pi/4,)),
+                         ("RotateY", (math.pi/4,)), ("RotateZ", (math.pi/4,)), ("Translate", (-1, 3, 1.5))):
+        getattr(array, method)(*args)
+
+        for v in vectors:
+            getattr(v, method)(*args)
+
+        print("{:9s}".format(method), np.allclose(array.Data, [(v.X, v.Y, v.Z, v.W) for v in vectors]))
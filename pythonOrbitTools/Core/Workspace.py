@@ -0,0 +1,75 @@
+##
+# @file Workspace.py
+# @brief Reusable scratch arrays for the array code paths.
+#
+#  The array forms of the propagation, look-angle and geodetic conversions
+#  accept preallocated outputs (out=) and a Workspace (work=) holding their
+#  intermediate arrays. A caller that keeps both and repeats a computation of
+#  the same size allocates nothing after the first call, e.g.
+#
+#  work     = Workspace()
+#  pos, vel = numpy.empty((n, 3)), numpy.empty((n, 3))
+#  while tracking:
+#      orbit.PositionEciArrayByMpe(mpe, out=(pos, vel), work=work)
+#
+#  Without a workspace every call uses a fresh one. Each function uses its
+#  own names, so one workspace can serve a whole pipeline; the arrays grow to
+#  the largest size asked for (Clear releases them). A workspace must not be
+#  used by two threads at once, and is not pickled with its owner.
+#
+# @author df_justforfun@163.com
+# @version 1.0
+# @date 2026-10-19
+
+##
+# @brief Named scratch arrays, reallocated only when their shape changes.
+class Workspace(object):
+
+    __slots__ = ("_arrays",)
+
+    def __init__(self):
+        self._arrays = {}
+
+    # region Properties
+
+    @property
+    ##
+    # @brief Total size of the scratch arrays, in bytes.
+    #
+    # @return
+    def Bytes(self):
+        return sum(a.nbytes for a in self._arrays.values())
+
+    # endregion
+
+    ##
+    # @brief Returns the scratch array of the given name, its content undefined.
+    #        A shorter request than the array held returns a view of its
+    #        start, so alternating sizes do not reallocate.
+    #
+    # @param name The name, unique within the workspace.
+    # @param n The length of the array.
+    # @param dtype numpy dtype, default float64.
+    #
+    # @return A 1-D numpy array.
+    def Get(self, name, n, dtype=None):
+        a = self._arrays.get(name)
+
+        if a is None or a.shape[0] < n or (dtype is not None and a.dtype != dtype):
+            import numpy as np
+
+            a = np.empty(n, dtype=np.float64 if dtype is None else dtype)
+            self._arrays[name] = a
+
+        return a if a.shape[0] == n else a[:n]
+
+    ##
+    # @brief Release all scratch arrays.
+    #
+    # @return
+    def Clear(self):
+        self._arrays.clear()
+
+    def __reduce__(self):
+        # Unpickles as an empty workspace.
+        return (Workspace, ())
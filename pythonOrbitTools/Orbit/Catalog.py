@@ -0,0 +1,354 @@
+##
+# @file Catalog.py
+# @brief A catalog of satellites keyed by NORAD number.
+#
+#  A Catalog holds one Satellite per NORAD number, in insertion order, and
+#  is built from (name, line1, line2) entries or from a two- or three-line
+#  element file. IterEphemerisByDateTime propagates the whole catalog over a
+#  UTC window in fixed-size chunks, see Ephemeris.py, e.g.
+#
+#  catalog = Catalog.FromFile("active.txt")
+#  for chunk in catalog.IterEphemerisByDateTime(startUtc, endUtc, 1.0, site=site, reuse=True):
+#      ...
+#
+#  Update applies a fresh catalog incrementally: only satellites whose
+#  element set changed are rebuilt. Every change replaces the table of
+#  satellites as a whole, so readers on other threads see either the old or
+#  the new catalog, never a mix, and an iteration keeps the satellites it
+#  started with. Subscribers are called with the NORAD numbers of the
+#  changed satellites, so that results cached for them can be dropped.
+#
+# @author df_justforfun@163.com
+# @version 1.0
+# @date 2026-10-19
+
+import threading
+from collections import OrderedDict
+from pythonOrbitTools.Core.Tle import Tle
+from pythonOrbitTools.Orbit.Satellite import Satellite
+
+##
+# @brief Satellites keyed by NORAD number.
+class Catalog(object):
+
+    # region Properties
+
+    @property
+    ##
+    # @brief The satellites, in insertion order.
+    #
+    # @return A list of Satellite.
+    def Satellites(self):
+        return [satellite for signature, satellite in self._entries.values()]
+
+    @property
+    ##
+    # @brief Number of changes so far, increased by every Add, Remove and
+    #        Update that changed the catalog.
+    #
+    # @return
+    def Revision(self):
+        return self._revision
+
+    # endregion
+
+    ##
+    # @brief
+    #
+    # @param satellites Optional initial satellites; a later one replaces an
+    #        earlier one with the same NORAD number.
+    #
+    # @return
+    def __init__(self, satellites=()):
+        self._entries     = OrderedDict()
+        self._lock        = threading.Lock()
+        self._subscribers = []
+        self._revision    = 0
+
+        for satellite in satellites:
+            self._entries[Catalog.Key(satellite.Orbit.SatNoradId)] = (Catalog.Signature(satellite), satellite)
+
+    ##
+    # @brief Build a catalog from element sets.
+    #
+    # @param entries (name, line1, line2) tuples.
+    #
+    # @return
+    @classmethod
+    def FromLines(cls, entries):
+        return cls(Satellite(Tle(line1, line2, name)) for name, line1, line2 in entries)
+
+    ##
+    # @brief Build a catalog from an element file, in the two-line format or
+    #        the three-line format with a name line before each element set.
+    #
+    # @param path The file path.
+    #
+    # @return
+    @classmethod
+    def FromFile(cls, path):
+        with open(path, "r") as f:
+            return cls.FromLines(Catalog.ParseLines(f.read().splitlines()))
+
+    ##
+    # @brief Split the lines of an element file into (name, line1, line2)
+    #        entries; blank lines are skipped.
+    #
+    # @param lines The lines of the file.
+    #
+    # @return A list of (name, line1, line2).
+    @staticmethod
+    def ParseLines(lines):
+        lines   = [line.strip() for line in lines if line.strip()]
+        entries = []
+        i       = 0
+
+        while i < len(lines):
+            if lines[i].startswith("1 ") and i + 1 < len(lines) and lines[i + 1].startswith("2 "):
+                entries.append(("", lines[i], lines[i + 1]))
+                i += 2
+            elif i + 2 < len(lines) and lines[i + 1].startswith("1 ") and lines[i + 2].startswith("2 "):
+                entries.append((lines[i], lines[i + 1], lines[i + 2]))
+                i += 3
+            else:
+                raise ValueError("line {}: {!r}".format(i + 1, lines[i]))
+
+        return entries
+
+    ##
+    # @brief The normalized key of a NORAD number given as int or string.
+    #
+    # @return
+    @staticmethod
+    def Key(noradId):
+        return str(noradId).strip().zfill(5)
+
+    ##
+    # @brief The identity of an element set: its normalized lines, as the
+    #        key of SatelliteCache, and its name. A new epoch, new elements,
+    #        a new checksum or a new name all change it.
+    #
+    # @param satellite A Satellite, or a (name, line1, line2) entry.
+    #
+    # @return
+    @staticmethod
+    def Signature(satellite):
+        if isinstance(satellite, Satellite):
+            tle = satellite.Orbit.Tle
+            return (tle.Line1.strip(), tle.Line2.strip(), satellite.Name.strip())
+
+        name, line1, line2 = satellite
+        return (line1.strip(), line2.strip(), name.strip())
+
+    ##
+    # @brief Register a function called as callback(noradIds) after every
+    #        change, with the set of keys (see Key) of the satellites added,
+    #        rebuilt or removed.
+    #
+    # @return
+    def Subscribe(self, callback):
+        with self._lock:
+            self._subscribers = self._subscribers + [callback]
+
+    ##
+    # @brief Remove a callback; bound methods compare equal, not identical.
+    #
+    # @return
+    def Unsubscribe(self, callback):
+        with self._lock:
+            self._subscribers = [s for s in self._subscribers if s != callback]
+
+    ##
+    # @brief Add a satellite, replacing the one with the same NORAD number.
+    #
+    # @return
+    def Add(self, satellite):
+        key = Catalog.Key(satellite.Orbit.SatNoradId)
+
+        with self._lock:
+            entries      = OrderedDict(self._entries)
+            entries[key] = (Catalog.Signature(satellite), satellite)
+
+            self._Swap(entries)
+
+        self._Notify({key})
+
+    ##
+    # @brief Remove the satellite of a NORAD number.
+    #
+    # @return The removed satellite, None if there was none.
+    def Remove(self, noradId):
+        key = Catalog.Key(noradId)
+
+        with self._lock:
+            if key not in self._entries:
+                return None
+
+            entries = OrderedDict(self._entries)
+            removed = entries.pop(key)[1]
+
+            self._Swap(entries)
+
+        self._Notify({key})
+
+        return removed
+
+    ##
+    # @brief Apply fresh element sets. Satellites whose element set is
+    #        unchanged (see Signature) are kept as they are, changed and new
+    #        ones are built; the new table then replaces the old one at once.
+    #        A malformed element set raises and leaves the catalog unchanged.
+    #
+    # @param entries (name, line1, line2) tuples; of several for one NORAD
+    #        number the last one is used.
+    # @param full The entries are a complete catalog: satellites missing from
+    #        it, i.e. decayed or withdrawn objects, are removed.
+    # @param utc Optional time (UTC): satellites which the model finds decayed
+    #        at that time are removed too.
+    #
+    # @return A dict with the keys (see Key) "added", "changed" and "removed",
+    #         and the number of "unchanged" satellites.
+    def Update(self, entries, full=True, utc=None):
+        fresh = OrderedDict()
+
+        for entry in entries:
+            # The NORAD number columns of line 1, as Tle reads them.
+            fresh[Catalog.Key(entry[1][Tle.TLE1_COL_SATNUM:Tle.TLE1_COL_SATNUM + Tle.TLE1_LEN_SATNUM])] = entry
+
+        with self._lock:
+            current = self._entries
+            table   = OrderedDict() if full else OrderedDict(current)
+            added   = []
+            changed = []
+
+            for key, entry in fresh.items():
+                signature = Catalog.Signature(entry)
+                old       = current.get(key)
+
+                if old is not None and old[0] == signature:
+                    table[key] = old
+                    continue
+
+                name, line1, line2 = entry
+                table[key] = (signature, Satellite(Tle(line1.strip(), line2.strip(), name.strip())))
+                (added if old is None else changed).append(key)
+
+            removed = [key for key in current if key not in table]
+
+            if utc is not None:
+                decayed  = [key for key, (signature, satellite) in table.items() if Catalog._Decayed(satellite, utc)]
+                removed += decayed
+                added    = [key for key in added if key not in decayed]
+                changed  = [key for key in changed if key not in decayed]
+
+                for key in decayed:
+                    del table[key]
+
+            # A key both new and decayed never was in the catalog.
+            removed = [key for key in removed if key in current]
+
+            if added or changed or removed:
+                self._Swap(table)
+
+        self._Notify(set(added) | set(changed) | set(removed))
+
+        return {"added"     : added,
+                "changed"   : changed,
+                "removed"   : removed,
+                "unchanged" : len(table) - len(added) - len(changed)}
+
+    ##
+    # @brief The satellite of a NORAD number.
+    #
+    # @return The satellite, None if there is none.
+    def Get(self, noradId):
+        entry = self._entries.get(Catalog.Key(noradId))
+
+        return None if entry is None else entry[1]
+
+    ##
+    # @brief Propagate all satellites over a UTC window in fixed-size chunks,
+    #        see Ephemeris.IterCatalogEphemerisByDateTime.
+    #
+    # @param startUtc Start of the window (UTC).
+    # @param endUtc End of the window (UTC), included.
+    # @param stepSec Step between samples, in seconds.
+    # @param chunk Maximum number of samples per chunk.
+    # @param site Optional ground station; the chunks then have look angles.
+    # @param reuse Yield views into the same buffers for every chunk.
+    # @param precision "float64", or "float32" to store positions, velocities
+    #        and look angles in single precision.
+    #
+    # @return A generator of EphemerisChunk.
+    def IterEphemerisByDateTime(self, startUtc, endUtc, stepSec, chunk=None, site=None, reuse=False, precision="float64"):
+        from pythonOrbitTools.Orbit import Ephemeris
+
+        return Ephemeris.IterCatalogEphemerisByDateTime(self.Satellites, startUtc, endUtc, stepSec,
+                                                        chunk or Ephemeris.CHUNK, site, reuse, precision)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self.Satellites)
+
+    def __contains__(self, noradId):
+        return Catalog.Key(noradId) in self._entries
+
+    def __getitem__(self, noradId):
+        return self._entries[Catalog.Key(noradId)][1]
+
+    # region Utility
+
+    ##
+    # @brief Replace the table; called with the lock held.
+    def _Swap(self, entries):
+        self._entries   = entries
+        self._revision += 1
+
+    def _Notify(self, keys):
+        if keys:
+            for callback in self._subscribers:
+                callback(keys)
+
+    @staticmethod
+    def _Decayed(satellite, utc):
+        try:
+            satellite.PositionEciByDateTime(utc)
+        except ValueError:
+            return True
+
+        return False
+
+    # endregion
+
+
+if __name__ == "__main__":
+    import os
+    import time
+    import datetime
+    from pythonOrbitTools.Core.Site import Site
+    from pythonOrbitTools.Orbit.Ephemeris import AboveMask
+
+    root    = os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__))))
+    catalog = Catalog.FromFile(os.path.join(root, "tle.txt"))
+    site    = Site().InitializeByDegLatAndDegLonAndKmAltAndName(34.7444, 113.7783, 0.07)
+    start   = datetime.datetime(2018, 8, 20, 16, 0, 0)
+
+    print("{} satellite(s): {}".format(len(catalog), ", ".join(s.Name for s in catalog)))
+
+    for chunk in AboveMask(catalog.IterEphemerisByDateTime(start, start + datetime.timedelta(days=1), 1.0,
+                                                           chunk=3600, site=site), 3.0):
+        times = chunk.DateTimes()
+        print("{:10s} {} .. {} {:5d} samples above 3 deg".format(chunk.Satellite.Name, times[0], times[-1], len(chunk)))
+
+    # A refresh with the element set of the same satellite one day later.
+    name, line1, line2 = Catalog.ParseLines(open(os.path.join(root, "tle.txt")).read().splitlines())[0]
+    later = line1[:20] + "{:012.8f}".format(float(line1[20:32]) + 1.0) + line1[32:]
+
+    catalog.Subscribe(lambda keys: print("invalidate {}".format(sorted(keys))))
+
+    for entries in ([(name, line1, line2)], [(name, later, line2)]):
+        t0     = time.perf_counter()
+        result = catalog.Update(entries, utc=start)
+        print("{} in {:.1f} us, revision {}".format(result, (time.perf_counter() - t0) * 1.0e6, catalog.Revision))
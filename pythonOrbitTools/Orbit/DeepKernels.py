@@ -0,0 +1,268 @@
+##
+# @file DeepKernels.py
+# @brief The SDP4 propagation kernels, see Kernels.
+#
+#  The deep-space part of the kernel source: the lunar-solar and resonance
+#  constants, the SDP4 block of the constants layout, the resonance
+#  integrator state and the kernels of the SDP4 secular and periodic update.
+#  It is imported by NoradSDP4 and DeepSpace only, so a near-earth
+#  propagation never loads it; the kernels register with Kernels like the
+#  common ones and compile together with them.
+#
+# @author df_justforfun@163.com
+# @version 1.0
+# @date 2026-10-19
+
+import math
+from pythonOrbitTools.Orbit.Kernels import Register, AcTan, PI, XKE, BASE_SIZE, \
+    INCL, ECC, M0, W0, RAAN0, BSTAR, XNODP, COSIO, SINIO, XMDOT, OMGDOT, XNODOT, XNODCF, C1, C4, T2COF
+
+# region Constants
+
+# Lunar-solar and resonance constants of SDP4.
+ZNS     = 1.19459E-5
+ZES     = 0.01675
+ZNL     = 1.5835218E-4
+ZEL     = 0.05490
+THDT    = 4.3752691E-3
+
+# SDP4 constants, see NoradSDP4.KernelConstants.
+(RESO, SYNC, THGR, XQNCL, OMEGAQ, XLAMO, XFACT, STEPP, STEPN, STEP2,
+ SSL, SSG, SSH, SSE, SSI, DEL1, DEL2, DEL3,
+ D2201, D2211, D3210, D3222, D4410, D4422, D5220, D5232, D5421, D5433,
+ ZMOS, SE2, SE3, SI2, SI3, SL2, SL3, SL4, SGH2, SGH3, SGH4, SH2, SH3,
+ ZMOL, EE2, E3, XI2, XI3, XL2, XL3, XL4, XGH2, XGH3, XGH4, XH2, XH3) = range(BASE_SIZE, BASE_SIZE + 54)
+
+# SDP4 resonance integrator state.
+(XLI, XNI, ATIME) = range(3)
+
+# endregion
+
+# region Kernels
+
+##
+# @brief SDP4 resonance dot terms at the integrator state.
+#
+# @return (xndot, xnddt, xldot).
+@Register
+def DeepDotTerms(c, s):
+    xli = s[XLI]
+
+    if c[SYNC] != 0.0:
+        fasx2   = 0.13130908
+        fasx4   = 2.8843198
+        fasx6   = 0.37448087
+
+        xndot   = c[DEL1] * math.sin(xli - fasx2) + \
+                    c[DEL2] * math.sin(2.0 * (xli - fasx4)) + \
+                    c[DEL3] * math.sin(3.0 * (xli - fasx6))
+        xnddt   = c[DEL1] * math.cos(xli - fasx2) + \
+                    2.0 * c[DEL2] * math.cos(2.0 * (xli - fasx4)) + \
+                    3.0 * c[DEL3] * math.cos(3.0 * (xli - fasx6))
+    else:
+        g54     = 4.4108898
+        g52     = 1.0508330
+        g44     = 1.8014998
+        g22     = 5.7686396
+        g32     = 0.95240898
+
+        xomi    = c[OMEGAQ] + c[OMGDOT] * s[ATIME]
+        x2omi   = xomi + xomi
+        x2li    = xli + xli
+
+        xndot   = c[D2201] * math.sin(x2omi + xli - g22) + \
+                    c[D2211] * math.sin(xli - g22) + \
+                    c[D3210] * math.sin( xomi + xli - g32) + \
+                    c[D3222] * math.sin(-xomi + xli - g32) + \
+                    c[D4410] * math.sin(x2omi + x2li - g44) + \
+                    c[D4422] * math.sin(x2li - g44) + \
+                    c[D5220] * math.sin( xomi + xli - g52) + \
+                    c[D5232] * math.sin(-xomi + xli - g52) + \
+                    c[D5421] * math.sin( xomi + x2li - g54) + \
+                    c[D5433] * math.sin(-xomi + x2li - g54)
+
+        xnddt   = c[D2201] * math.cos(x2omi + xli - g22) + \
+                    c[D2211] * math.cos(xli - g22) + \
+                    c[D3210] * math.cos( xomi + xli - g32) + \
+                    c[D3222] * math.cos(-xomi + xli - g32) + \
+                    c[D5220] * math.cos( xomi + xli - g52) + \
+                    c[D5232] * math.cos(-xomi + xli - g52) + \
+                    2.0 * (c[D4410] * math.cos(x2omi + x2li - g44) + \
+                    c[D4422] * math.cos(x2li - g44) + \
+                    c[D5421] * math.cos( xomi + x2li - g54) + \
+                    c[D5433] * math.cos(-xomi + x2li - g54))
+
+    xldot = s[XNI] + c[XFACT]
+    xnddt = xnddt * xldot
+
+    return xndot, xnddt, xldot
+
+##
+# @brief One step of the resonance integrator, updating s in place.
+#
+# @return The dot terms at the start of the step.
+@Register
+def DeepStep(c, s, delta):
+    xndot, xnddt, xldot = DeepDotTerms(c, s)
+
+    s[XLI]      = s[XLI] + xldot * delta + xndot * c[STEP2]
+    s[XNI]      = s[XNI] + xndot * delta + xnddt * c[STEP2]
+    s[ATIME]    = s[ATIME] + delta
+
+    return xndot, xnddt, xldot
+
+##
+# @brief SDP4 deep space secular effects, including the resonance
+#        integration, which updates s in place.
+#
+# @return (xmdf, omgadf, xnode, emm, xincc, xnn).
+@Register
+def DeepSecular(c, s, xmdf, omgadf, xnode, xnn, tsince):
+    xmdf    = xmdf + c[SSL] * tsince
+    omgadf  = omgadf + c[SSG] * tsince
+    xnode   = xnode + c[SSH] * tsince
+    emm     = c[ECC] + c[SSE] * tsince
+    xincc   = c[INCL] + c[SSI] * tsince
+
+    if xincc < 0.0:
+        xincc   = -xincc
+        xnode   = xnode  + PI
+        omgadf  = omgadf - PI
+
+    if c[RESO] != 0.0:
+        # Restart at epoch when the target time lies behind the integrator
+        # or on the other side of epoch. Stepping the integrator backwards
+        # is not the inverse of stepping it forwards, so this keeps the
+        # result independent of the order in which times are requested.
+        if s[ATIME] == 0.0 or \
+            (tsince >= 0.0 and s[ATIME] < 0.0) or \
+            (tsince < 0.0 and s[ATIME] >= 0.0) or \
+            math.fabs(tsince) < math.fabs(s[ATIME]):
+            # Epoch restart
+            s[ATIME]    = 0.0
+            s[XNI]      = c[XNODP]
+            s[XLI]      = c[XLAMO]
+
+        delt = c[STEPN] if tsince < 0.0 else c[STEPP]
+
+        while math.fabs(tsince - s[ATIME]) >= c[STEPP]:
+            DeepStep(c, s, delt)
+
+        ft = tsince - s[ATIME]
+
+        xndot, xnddt, xldot = DeepDotTerms(c, s)
+
+        xnn  = s[XNI] + xndot * ft + xnddt * ft * ft * 0.5
+
+        xl   = s[XLI] + xldot * ft + xndot * ft * ft * 0.5
+        temp = -xnode + c[THGR] + tsince * THDT
+
+        xmdf = xl - omgadf + temp
+
+        if c[SYNC] == 0.0:
+            xmdf = xl + temp + temp
+
+    return xmdf, omgadf, xnode, emm, xincc, xnn
+
+##
+# @brief SDP4 lunar-solar periodics.
+#
+# @return (e, xincc, omgadf, xnode, xmam).
+@Register
+def DeepPeriodics(c, e, xincc, omgadf, xnode, xmam, tsince):
+    sinis   = math.sin(xincc)
+    cosis   = math.cos(xincc)
+
+    zm      = c[ZMOS] + ZNS * tsince
+    zf      = zm + 2.0 * ZES * math.sin(zm)
+    sinzf   = math.sin(zf)
+    f2      =  0.5 * sinzf * sinzf - 0.25
+    f3      = -0.5 * sinzf * math.cos(zf)
+    ses     = c[SE2] * f2 + c[SE3] * f3
+    sis     = c[SI2] * f2 + c[SI3] * f3
+    sls     = c[SL2] * f2 + c[SL3] * f3 + c[SL4] * sinzf
+
+    sghs    = c[SGH2] * f2 + c[SGH3] * f3 + c[SGH4] * sinzf
+    shs     = c[SH2] * f2 + c[SH3] * f3
+    zm      = c[ZMOL] + ZNL * tsince
+    zf      = zm + 2.0 * ZEL * math.sin(zm)
+    sinzf   = math.sin(zf)
+    f2      =  0.5 * sinzf * sinzf - 0.25
+    f3      = -0.5 * sinzf * math.cos(zf)
+
+    sel     = c[EE2] * f2 + c[E3] * f3
+    sil     = c[XI2] * f2 + c[XI3] * f3
+    sll     = c[XL2] * f2 + c[XL3] * f3 + c[XL4] * sinzf
+
+    sghl    = c[XGH2] * f2 + c[XGH3] * f3 + c[XGH4] * sinzf
+    shl     = c[XH2] * f2 + c[XH3] * f3
+    pe      = ses + sel
+    pinc    = sis + sil
+    pl      = sls + sll
+
+    pgh     = sghs + sghl
+    ph      = shs + shl
+
+    xincc   = xincc + pinc
+    e       = e + pe
+
+    if c[XQNCL] >= 0.2:
+        # Apply periodics directly
+        ph      = ph / c[SINIO]
+        pgh     = pgh - c[COSIO] * ph
+        omgadf  = omgadf + pgh
+        xnode   = xnode + ph
+        xmam    = xmam + pl
+    else:
+        # Apply periodics with Lyddane modification
+        sinok   = math.sin(xnode)
+        cosok   = math.cos(xnode)
+        alfdp   = sinis * sinok
+        betdp   = sinis * cosok
+        dalf    =  ph * cosok + pinc * cosis * sinok
+        dbet    = -ph * sinok + pinc * cosis * cosok
+
+        alfdp   = alfdp + dalf
+        betdp   = betdp + dbet
+
+        xls     = xmam + omgadf + cosis * xnode
+        dls     = pl + pgh - pinc * xnode * sinis
+
+        xls     = xls + dls
+        xnode   = AcTan(alfdp, betdp)
+        xmam    = xmam + pl
+        omgadf  = xls - xmam - math.cos(xincc) * xnode
+
+    return e, xincc, omgadf, xnode, xmam
+
+##
+# @brief SDP4 secular and periodic update; s is updated in place.
+#
+# @return (incl, omega, e, a, xl, xnode, xn) for FinalPosition.
+@Register
+def Sdp4Elements(c, s, tsince):
+    xmdf    = c[M0] + c[XMDOT] * tsince
+    omgadf  = c[W0] + c[OMGDOT] * tsince
+    xnoddf  = c[RAAN0] + c[XNODOT] * tsince
+    tsq     = tsince * tsince
+    xnode   = xnoddf + c[XNODCF] * tsq
+    tempa   = 1.0 - c[C1] * tsince
+    tempe   = c[BSTAR] * c[C4] * tsince
+    templ   = c[T2COF] * tsq
+    xn      = c[XNODP]
+
+    xmdf, omgadf, xnode, em, xinc, xn = DeepSecular(c, s, xmdf, omgadf, xnode, xn, tsince)
+
+    a       = math.pow(XKE / xn, 2.0 / 3.0) * (tempa * tempa)
+    e       = em - tempe
+    xmam    = xmdf + c[XNODP] * templ
+
+    e, xinc, omgadf, xnode, xmam = DeepPeriodics(c, e, xinc, omgadf, xnode, xmam, tsince)
+
+    xl      = xmam + omgadf + xnode
+
+    xn      = XKE / math.pow(a, 1.5)
+
+    return xinc, omgadf, e, a, xl, xnode, xn
+
+# endregion
@@ -0,0 +1,231 @@
+##
+# @file DeepSpace.py
+# @brief Lunar-solar periodics of many deep-space satellites at once.
+#
+#  The SDP4 lunar-solar periodics of a satellite are series in the mean
+#  anomalies of the sun and the moon, zm = zmos + zns * tsince and
+#  zm = zmol + znl * tsince. zmos and zmol are taken at the TLE epoch, so
+#  with tsince = t0 + t, t minutes after a common time, the anomaly is
+#  phase + zns * t with phase = zmos + zns * t0 constant per satellite:
+#  sin(zns * t) and cos(zns * t) are shared by the whole catalog, and
+#  sin(zm) = sin(phase) cos(zns * t) + cos(phase) sin(zns * t).
+#
+#  A LunarSolarBatch evaluates the terms of the SDP4 satellites of a
+#  catalog over one time grid as (satellites, times) arrays, a block of
+#  satellites at a time; for short time grids this saves most of the
+#  per-satellite overhead of NoradSDP4.LunarSolarArray, e.g.
+#
+#  batch = LunarSolarBatch(satellites, startUtc)
+#  row   = batch.Row(satellite)
+#  terms = batch.Terms(minutes, row, row + 1)
+#  pos, vel = satellite.Orbit.PositionEciArrayByMpe(mpe, periodics=[a[0] for a in terms])
+#
+# @author df_justforfun@163.com
+# @version 1.0
+# @date 2026-10-19
+
+from pythonOrbitTools.Orbit import DeepKernels
+
+# Coefficients of the solar and of the lunar series in DeepKernels, in the order
+# (e: f2, f3), (i: f2, f3), (l: f2, f3, sinzf), (gh: f2, f3, sinzf), (h: f2, f3).
+SOLAR = (DeepKernels.SE2, DeepKernels.SE3, DeepKernels.SI2, DeepKernels.SI3,
+         DeepKernels.SL2, DeepKernels.SL3, DeepKernels.SL4,
+         DeepKernels.SGH2, DeepKernels.SGH3, DeepKernels.SGH4, DeepKernels.SH2, DeepKernels.SH3)
+LUNAR = (DeepKernels.EE2, DeepKernels.E3, DeepKernels.XI2, DeepKernels.XI3,
+         DeepKernels.XL2, DeepKernels.XL3, DeepKernels.XL4,
+         DeepKernels.XGH2, DeepKernels.XGH3, DeepKernels.XGH4, DeepKernels.XH2, DeepKernels.XH3)
+
+##
+# @brief The solar or the lunar periodic terms, see DeepKernels.DeepPeriodics.
+#
+# @param k The 12 coefficients of SOLAR or LUNAR: floats, or columns of
+#        shape (satellites, 1) broadcast against the anomalies.
+# @param zm Mean anomaly array.
+# @param sinzm Its sine.
+# @param ecc DeepKernels.ZES or DeepKernels.ZEL.
+# @param out Optional (e, i, l, gh, h) arrays to write the result into; for
+#        floats k and 1-D anomalies only.
+# @param work Workspace for the intermediate arrays, required with out.
+#
+# @return (e, i, l, gh, h) arrays.
+def Periodics(k, zm, sinzm, ecc, out=None, work=None):
+    import numpy as np
+
+    if out is None:
+        zf      = zm + 2.0 * ecc * sinzm
+        sinzf   = np.sin(zf)
+        f2      =  0.5 * sinzf * sinzf - 0.25
+        f3      = -0.5 * sinzf * np.cos(zf)
+
+        return (k[0] * f2 + k[1] * f3,
+                k[2] * f2 + k[3] * f3,
+                k[4] * f2 + k[5] * f3 + k[6] * sinzf,
+                k[7] * f2 + k[8] * f3 + k[9] * sinzf,
+                k[10] * f2 + k[11] * f3)
+
+    n       = zm.size
+    mul     = np.multiply
+    add     = np.add
+    zf      = work.Get("periodics.zf", n)
+    sinzf   = work.Get("periodics.sinzf", n)
+    f2      = work.Get("periodics.f2", n)
+    f3      = work.Get("periodics.f3", n)
+    t       = work.Get("periodics.t", n)
+
+    mul(2.0 * ecc, sinzm, out=zf)
+    add(zm, zf, out=zf)
+    np.sin(zf, out=sinzf)
+    mul(0.5, sinzf, out=f2)
+    mul(f2, sinzf, out=f2)
+    np.subtract(f2, 0.25, out=f2)
+    mul(-0.5, sinzf, out=t)
+    np.cos(zf, out=f3)
+    mul(t, f3, out=f3)
+
+    for term, (i, j, l) in zip(out, ((0, 1, None), (2, 3, None), (4, 5, 6), (7, 8, 9), (10, 11, None))):
+        mul(k[i], f2, out=term)
+        mul(k[j], f3, out=t)
+        add(term, t, out=term)
+
+        if l is not None:
+            mul(k[l], sinzf, out=t)
+            add(term, t, out=term)
+
+    return out
+
+
+##
+# @brief Lunar-solar periodic terms of the SDP4 satellites of a catalog.
+class LunarSolarBatch(object):
+
+    # Elements of the (rows, times) arrays of one Terms call in Ephemeris;
+    # larger blocks fall out of the cache.
+    ELEMENTS = 16384
+
+    # region Properties
+
+    @property
+    ##
+    # @brief The time the minutes of Terms count from.
+    def Utc(self):
+        return self._utc
+
+    # endregion
+
+    ##
+    # @brief Collects the constants of the SDP4 satellites; the others are
+    #        left out.
+    #
+    # @param satellites Satellite objects.
+    # @param utc The common time (UTC) of Terms.
+    #
+    # @return
+    def __init__(self, satellites, utc):
+        import numpy as np
+        from pythonOrbitTools.Orbit.NoradSDP4 import NoradSDP4
+
+        models      = []
+        starts      = []
+
+        for satellite in satellites:
+            model = satellite.Orbit.NoradModel
+
+            if isinstance(model, NoradSDP4):
+                models.append(model)
+                starts.append(satellite.Orbit.TPlusEpoch(utc).total_seconds() / 60.0)
+
+        consts      = np.array([model._m_consts for model in models]).reshape(len(models), -1) if models else \
+                      np.zeros((0, max(SOLAR + LUNAR + (DeepKernels.ZMOS, DeepKernels.ZMOL)) + 1))
+        starts      = np.array(starts)
+
+        self._utc   = utc
+        self._rows  = dict((id(model), i) for i, model in enumerate(models))
+        self._sides = []
+
+        for k, zm, zn, ecc in ((SOLAR, DeepKernels.ZMOS, DeepKernels.ZNS, DeepKernels.ZES),
+                               (LUNAR, DeepKernels.ZMOL, DeepKernels.ZNL, DeepKernels.ZEL)):
+            phase = consts[:, zm] + zn * starts
+
+            self._sides.append(([consts[:, i:i + 1] for i in k], phase[:, None],
+                                np.sin(phase)[:, None], np.cos(phase)[:, None], zn, ecc))
+
+    ##
+    # @brief The row of a satellite in Terms.
+    #
+    # @return An int, or None for a satellite not in the batch.
+    def Row(self, satellite):
+        return self._rows.get(id(satellite.Orbit.NoradModel))
+
+    ##
+    # @brief The lunar-solar terms of the rows first..stop.
+    #
+    # @param minutes Times in minutes after Utc (array-like).
+    # @param first First row.
+    # @param stop Row after the last; None for all.
+    #
+    # @return (pe, pinc, pl, pgh, ph) arrays of shape (rows, times), see
+    #         NoradSDP4.GetPositionArray.
+    def Terms(self, minutes, first=0, stop=None):
+        import numpy as np
+
+        minutes = np.atleast_1d(np.asarray(minutes, dtype=np.float64))
+        terms   = None
+
+        for k, phase, sinp, cosp, zn, ecc in self._sides:
+            rows    = slice(first, stop)
+            arg     = zn * minutes
+            zm      = phase[rows] + arg
+            sinzm   = sinp[rows] * np.cos(arg) + cosp[rows] * np.sin(arg)
+            side    = Periodics([c[rows] for c in k], zm, sinzm, ecc)
+            terms   = side if terms is None else tuple(s + l for s, l in zip(terms, side))
+
+        return terms
+
+    ##
+    # @brief Rows per Terms call for n times, see ELEMENTS.
+    #
+    # @return
+    def Block(self, n):
+        return max(1, self.ELEMENTS // max(1, n))
+
+    def __len__(self):
+        return len(self._rows)
+
+
+if __name__ == "__main__":
+    import time
+    import datetime
+    import numpy as np
+    from pythonOrbitTools.Core.Tle import Tle
+    from pythonOrbitTools.Orbit.Satellite import Satellite
+
+    line1 = "1 28884U 05041A   18232.51782528 -.00000268  00000-0  00000+0 0  9991"
+    line2 = "2 28884   0.0139 284.1460 0002578 140.9574 251.0611  1.00271651 47140"
+
+    # Geostationary satellites 0.5 degree apart, with epochs a day apart.
+    satellites = [Satellite(Tle("1 {:05d}".format(90000 + i) + line1[7:20] + "{:012.8f}".format(232.51782528 - i % 10) + line1[32:],
+                                "2 {:05d}".format(90000 + i) + line2[7:43] + "{:8.4f}".format((251.0611 + 0.5 * i) % 360.0) + line2[51:],
+                                "GEO{}".format(i)))
+                  for i in range(500)]
+    startUtc   = datetime.datetime(2018, 8, 21, 0, 0, 0)
+    minutes    = np.arange(60.0)                                  # an hour chunk at 1 min
+    batch      = LunarSolarBatch(satellites, startUtc)
+    block      = batch.Block(minutes.size)
+
+    t0         = time.perf_counter()
+    blocks     = [batch.Terms(minutes, first, first + block) for first in range(0, len(batch), block)]
+    terms      = [np.concatenate(rows) for rows in zip(*blocks)]
+    t1         = time.perf_counter()
+    own        = [s.Orbit.NoradModel.LunarSolarArray(minutes + s.Orbit.TPlusEpoch(startUtc).total_seconds() / 60.0)
+                  for s in satellites]
+    t2         = time.perf_counter()
+
+    print("{} satellites x {} times: batch {:.3f} s, per satellite {:.3f} s".format(len(batch), minutes.size, t1 - t0, t2 - t1))
+    print("largest difference {:.2e}".format(max(np.abs(a[i] - b).max() for i, s in enumerate(own) for a, b in zip(terms, s))))
+
+    satellite  = satellites[3]
+    mpe        = minutes + satellite.Orbit.TPlusEpoch(startUtc).total_seconds() / 60.0
+    row        = batch.Row(satellite)
+    pos, vel   = satellite.Orbit.PositionEciArrayByMpe(mpe, periodics=[a[row] for a in terms])
+    ref, _     = satellite.Orbit.PositionEciArrayByMpe(mpe)
+    print("position difference {:.2e} km".format(np.abs(pos - ref).max()))
@@ -0,0 +1,250 @@
+##
+# @file Doppler.py
+# @brief Vectorized range, range-rate and Doppler curves for pass planning.
+#
+#  A DopplerProfile propagates a satellite over an array of times with
+#  Orbit.PositionEciArrayByMpe, computes the look angles with
+#  Site.GetLookAngleArray and derives the first-order Doppler shift of a
+#  carrier and its rate of change. Needs numpy.
+#
+#  Sign conventions: a positive range rate means the satellite is receding,
+#  which lowers the received frequency.
+#       downlink receive frequency  = f * (1 - rangeRate / c)
+#       uplink transmit frequency   = f * (1 + rangeRate / c)
+#  so that the satellite hears the uplink on f.
+#
+#  e.g.
+#  profile = DopplerProfile.ByDateTime(satellite, site, startUtc, endUtc, 1.0, 437.1e6)
+#  with open("doppler.txt", "w") as f:
+#      profile.WriteTuningTable(f, minElevationDeg=3.0)
+#
+# @author df_justforfun@163.com
+# @version 1.0
+# @date 2026-10-19
+
+import datetime
+from pythonOrbitTools.Core.Globals import Globals
+from pythonOrbitTools.Core.Julian import Julian
+
+##
+# @brief Range, range-rate and Doppler shift of a carrier over a time array.
+class DopplerProfile(object):
+
+    # Speed of light, km/sec.
+    SPEED_OF_LIGHT = 299792.458
+
+    # region Properties
+
+    @property
+    ##
+    # @brief Sample times, in minutes past the TLE epoch.
+    #
+    # @return
+    def Mpe(self):
+        return self._mpe
+
+    @property
+    ##
+    # @brief Carrier frequency, in Hz.
+    #
+    # @return
+    def Frequency(self):
+        return self._frequency
+
+    @property
+    def AzimuthRad(self):
+        return self._az
+
+    @property
+    def ElevationRad(self):
+        return self._el
+
+    @property
+    ##
+    # @brief Range, in km.
+    #
+    # @return
+    def Range(self):
+        return self._range
+
+    @property
+    ##
+    # @brief Range rate, in km/sec.
+    #
+    # @return
+    def RangeRate(self):
+        return self._rate
+
+    @property
+    ##
+    # @brief Doppler shift of the downlink carrier, in Hz.
+    #
+    # @return
+    def Shift(self):
+        return self._shift
+
+    @property
+    ##
+    # @brief Rate of change of the Doppler shift, in Hz/sec.
+    #
+    # @return
+    def ShiftRate(self):
+        return self._shiftRate
+
+    # endregion
+
+    ##
+    # @brief Compute the profile.
+    #
+    # @param satellite The satellite.
+    # @param site The ground station.
+    # @param mpe Sample times, in minutes past the TLE epoch, at least two,
+    #        in increasing order.
+    # @param frequency Carrier frequency, in Hz.
+    #
+    # @return
+    def __init__(self, satellite, site, mpe, frequency):
+        import numpy as np
+
+        mpe = np.asarray(mpe, dtype=np.float64)
+
+        if mpe.ndim != 1 or mpe.size < 2:
+            raise ValueError("mpe")
+
+        orbit    = satellite.Orbit
+        pos, vel = orbit.PositionEciArrayByMpe(mpe)
+        gmst     = Julian.ToGmstArray(orbit.Epoch.ToDateArray(mpe / Globals.MinPerDay))
+
+        self._satellite = satellite
+        self._mpe       = mpe
+        self._frequency = frequency
+
+        self._az, self._el, self._range, self._rate = site.GetLookAngleArray(pos, vel, gmst)
+
+        # Range acceleration from the range rate, second order accurate also
+        # for uneven steps.
+        accel = np.gradient(self._rate, mpe * 60.0)
+
+        self._shift     = -frequency * self._rate / DopplerProfile.SPEED_OF_LIGHT
+        self._shiftRate = -frequency * accel / DopplerProfile.SPEED_OF_LIGHT
+
+    ##
+    # @brief Compute the profile for a UTC time window.
+    #
+    # @param satellite The satellite.
+    # @param site The ground station.
+    # @param startUtc Start of the window (UTC).
+    # @param endUtc End of the window (UTC), included.
+    # @param stepSec Step between samples, in seconds.
+    # @param frequency Carrier frequency, in Hz.
+    #
+    # @return
+    @classmethod
+    def ByDateTime(cls, satellite, site, startUtc, endUtc, stepSec, frequency):
+        import numpy as np
+
+        start = satellite.Orbit.TPlusEpoch(startUtc).total_seconds()
+        count = int((endUtc - startUtc).total_seconds() / stepSec) + 1
+
+        return cls(satellite, site, (start + np.arange(count) * stepSec) / 60.0, frequency)
+
+    ##
+    # @brief Downlink receive frequencies: the carrier plus the Doppler shift.
+    #
+    # @param frequency Carrier frequency, in Hz, default the profile`s.
+    #
+    # @return numpy array, in Hz.
+    def Downlink(self, frequency=None):
+        if frequency is None:
+            frequency = self._frequency
+
+        return frequency * (1.0 - self._rate / DopplerProfile.SPEED_OF_LIGHT)
+
+    ##
+    # @brief Uplink transmit frequencies which reach the satellite on the
+    #        carrier frequency.
+    #
+    # @param frequency Carrier frequency, in Hz, default the profile`s.
+    #
+    # @return numpy array, in Hz.
+    def Uplink(self, frequency=None):
+        if frequency is None:
+            frequency = self._frequency
+
+        return frequency * (1.0 + self._rate / DopplerProfile.SPEED_OF_LIGHT)
+
+    ##
+    # @brief Tuning table of the samples above an elevation mask.
+    #
+    # @param frequency Carrier frequency, in Hz, default the profile`s.
+    # @param uplink Uplink transmit instead of downlink receive frequencies.
+    # @param minElevationDeg Elevation mask, in degrees.
+    #
+    # @return A list of (UTC datetime, elevation deg, azimuth deg, frequency Hz),
+    #         the times rounded to milliseconds.
+    def TuningTable(self, frequency=None, uplink=False, minElevationDeg=0.0):
+        import numpy as np
+
+        freq    = self.Uplink(frequency) if uplink else self.Downlink(frequency)
+        visible = np.flatnonzero(self._el >= Globals.ToRadians(minElevationDeg))
+        epoch   = self._satellite.Orbit.EpochTime
+        rows    = []
+
+        for mpe, el, az, f in zip(self._mpe[visible].tolist(),
+                                  self._el[visible].tolist(),
+                                  self._az[visible].tolist(),
+                                  freq[visible].tolist()):
+            # The epoch has microseconds, round them away so that samples
+            # built from whole seconds print as such.
+            utc = epoch + datetime.timedelta(minutes=mpe, microseconds=500)
+            utc = utc.replace(microsecond=utc.microsecond - utc.microsecond % 1000)
+
+            rows.append((utc, Globals.ToDegrees(el), Globals.ToDegrees(az), f))
+
+        return rows
+
+    ##
+    # @brief Write a tuning table, one "time elevation azimuth frequency"
+    #        line per sample, in the format of output.eph with milliseconds.
+    #
+    # @param f An open text file.
+    # @param frequency Carrier frequency, in Hz, default the profile`s.
+    # @param uplink Uplink transmit instead of downlink receive frequencies.
+    # @param minElevationDeg Elevation mask, in degrees.
+    # @param utcOffsetHours Offset of the written times from UTC, in hours.
+    #
+    # @return The number of lines written.
+    def WriteTuningTable(self, f, frequency=None, uplink=False, minElevationDeg=0.0, utcOffsetHours=0.0):
+        offset = datetime.timedelta(hours=utcOffsetHours)
+        rows   = self.TuningTable(frequency, uplink, minElevationDeg)
+
+        for utc, el, az, freq in rows:
+            local = utc + offset
+            f.write("{}.{:03d} {} {} {:.1f}\n".format(local.strftime("%Y/%m/%d %H:%M:%S"),
+                                                      local.microsecond // 1000,
+                                                      round(el, 3),
+                                                      round(az, 3),
+                                                      freq))
+
+        return len(rows)
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+    from pythonOrbitTools.Core.Tle import Tle
+    from pythonOrbitTools.Core.Site import Site
+    from pythonOrbitTools.Orbit.Satellite import Satellite
+
+    line1 = "1 27424U 02022A   18232.63485883  .00000062  00000-0  23800-4 0  9991"
+    line2 = "2 27424  98.1977 172.8496 0000593 210.3660 252.0729 14.57127161866769"
+
+    satellite = Satellite(Tle(line1, line2, "AQUA"))
+    site      = Site().InitializeByDegLatAndDegLonAndKmAltAndName(34.7444, 113.7783, 0.07)
+    startUtc  = datetime.datetime(2018, 8, 20, 16, 0, 0)
+
+    t0      = time.perf_counter()
+    profile = DopplerProfile.ByDateTime(satellite, site, startUtc, startUtc + datetime.timedelta(days=1), 1.0, 8160.0e6)
+    print("{} samples in {:.1f} ms".format(profile.Mpe.size, (time.perf_counter() - t0) * 1.0e3))
+
+    profile.WriteTuningTable(sys.stdout, minElevationDeg=74.0, utcOffsetHours=8.0)
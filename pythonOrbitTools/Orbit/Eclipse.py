@@ -0,0 +1,338 @@
+##
+# @file Eclipse.py
+# @brief Earth shadow tests and eclipse prediction over time arrays.
+#
+#  The shadow tests work on batched satellite and sun positions. The
+#  cylindrical model treats the shadow as a cylinder of one earth radius
+#  behind the earth. The conical model compares the apparent disks of the
+#  earth and the sun seen from the satellite, giving umbra, penumbra and the
+#  sunlit fraction of the solar disk.
+#
+#  An EclipseFinder samples a satellite`s shadow function over a window with
+#  one array propagation, brackets the sign changes and refines all of them
+#  together by bisection, one array propagation per step, so whole catalogs
+#  are searched without a Python loop over samples. Eclipses shorter than the
+#  sampling step can be missed. Needs numpy.
+#
+#  e.g.
+#  finder = EclipseFinder(satellite)
+#  for begin, end in finder.IntervalsByDateTime(startUtc, endUtc):
+#      print(begin, end)
+#
+#  References:
+#       "Satellite Orbits", Oliver Montenbruck and Eberhard Gill, 2000,
+#       section 3.4.2
+#
+# @author df_justforfun@163.com
+# @version 1.0
+# @date 2026-10-19
+
+import datetime
+import math
+from enum import Enum, unique
+from pythonOrbitTools.Core.Globals import Globals
+from pythonOrbitTools.Core.Julian import Julian
+from pythonOrbitTools.Core.Sun import Sun
+
+@unique
+class ShadowModel(Enum):
+    Cylindrical = 0  # umbra only, sharp edge
+    Conical     = 1  # umbra and penumbra from the apparent disks
+
+##
+# @brief Shadow function of the satellites at the given positions: negative
+#        inside the shadow, positive outside, and continuous, so that its
+#        roots are the shadow boundaries.
+#
+# @param pos Satellite ECI positions, numpy array of shape (n, 3), km.
+# @param sun Sun ECI positions, numpy array of shape (n, 3), km.
+# @param model The shadow model.
+# @param umbra For the conical model, the umbra instead of the penumbra boundary.
+#
+# @return numpy array; km for the cylindrical model, radians for the conical one.
+def ShadowFunction(pos, sun, model=ShadowModel.Conical, umbra=False):
+    import numpy as np
+
+    if model is ShadowModel.Cylindrical:
+        sunDir = sun / np.linalg.norm(sun, axis=1)[:, None]
+        along  = np.einsum("ij,ij->i", pos, sunDir)
+        # Distance from the shadow axis on the night side, from the earth`s
+        # centre on the day side; the two agree where along is 0.
+        perp2  = np.einsum("ij,ij->i", pos, pos) - np.minimum(along, 0.0) ** 2
+
+        return np.sqrt(perp2) - Globals.Xkmper
+
+    earthAngle, sunAngle, separation = _Disks(pos, sun)
+
+    if umbra:
+        return separation - (earthAngle - sunAngle)
+
+    return separation - (earthAngle + sunAngle)
+
+##
+# @brief Sunlit fraction of the solar disk seen from the satellites.
+#
+# @param pos Satellite ECI positions, numpy array of shape (n, 3), km.
+# @param sun Sun ECI positions, numpy array of shape (n, 3), km.
+# @param model The shadow model.
+#
+# @return numpy array, 0.0 in umbra, 1.0 in full sunlight.
+def Illumination(pos, sun, model=ShadowModel.Conical):
+    import numpy as np
+
+    if model is ShadowModel.Cylindrical:
+        return (ShadowFunction(pos, sun, model) >= 0.0).astype(np.float64)
+
+    a, b, c = _Disks(pos, sun)
+    a, b    = b, a # a: sun, b: earth
+
+    # Overlap of the two disks, in the plane of the sky.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x       = (c * c + a * a - b * b) / (2.0 * c)
+        y       = np.sqrt(np.maximum(a * a - x * x, 0.0))
+        overlap = a * a * np.arccos(np.clip(x / a, -1.0, 1.0)) +\
+                  b * b * np.arccos(np.clip((c - x) / b, -1.0, 1.0)) - c * y
+
+    lit = 1.0 - overlap / (math.pi * a * a)
+    lit = np.where(c >= a + b, 1.0, lit)                  # no overlap
+    lit = np.where(c <= b - a, 0.0, lit)                  # umbra
+    lit = np.where(c <= a - b, 1.0 - (b * b) / (a * a), lit) # annular
+
+    return np.clip(lit, 0.0, 1.0)
+
+##
+# @brief Finds the eclipses of a satellite.
+class EclipseFinder(object):
+
+    # region Properties
+
+    @property
+    def Satellite(self):
+        return self._satellite
+
+    @property
+    def Model(self):
+        return self._model
+
+    @property
+    def Umbra(self):
+        return self._umbra
+
+    @property
+    ##
+    # @brief Sampling step, in minutes.
+    #
+    # @return
+    def Step(self):
+        return self._step
+
+    @property
+    ##
+    # @brief Width of the bracket at which the refinement stops, in seconds.
+    #
+    # @return
+    def Tolerance(self):
+        return self._tolerance
+
+    # endregion
+
+    ##
+    # @brief Creates a finder.
+    #
+    # @param satellite The satellite.
+    # @param model The shadow model.
+    # @param umbra For the conical model, eclipses are the umbra phases
+    #        instead of everything that is not full sunlight.
+    # @param step Sampling step, in minutes.
+    # @param tolerance Accuracy of the entry and exit times, in seconds.
+    #
+    # @return
+    def __init__(self, satellite, model=ShadowModel.Conical, umbra=False, step=1.0, tolerance=1.0e-3):
+        if step <= 0.0:
+            raise ValueError("step")
+
+        if tolerance <= 0.0:
+            raise ValueError("tolerance")
+
+        self._satellite = satellite
+        self._model     = model
+        self._umbra     = umbra
+        self._step      = step
+        self._tolerance = tolerance
+
+    ##
+    # @brief Shadow function of the satellite, see ShadowFunction.
+    #
+    # @param mpe Times, in minutes past the TLE epoch, numpy array.
+    #
+    # @return numpy array, negative in eclipse.
+    def ShadowArray(self, mpe):
+        pos, sun = self._Positions(mpe)
+
+        return ShadowFunction(pos, sun, self._model, self._umbra)
+
+    ##
+    # @brief Sunlit fraction of the solar disk, see Illumination.
+    #
+    # @param mpe Times, in minutes past the TLE epoch, numpy array.
+    #
+    # @return numpy array, 0.0 in umbra, 1.0 in full sunlight.
+    def IlluminationArray(self, mpe):
+        pos, sun = self._Positions(mpe)
+
+        return Illumination(pos, sun, self._model)
+
+    ##
+    # @brief Optical visibility from a site: the satellite is above the
+    #        elevation mask and out of the shadow while the site is dark.
+    #
+    # @param site The site.
+    # @param mpe Times, in minutes past the TLE epoch, numpy array.
+    # @param minElevationDeg Elevation mask of the satellite, in degrees.
+    # @param maxSunElevationDeg Highest elevation of the sun at the site, in
+    #        degrees; -6 is the end of civil twilight.
+    #
+    # @return Boolean numpy array.
+    def VisibleArray(self, site, mpe, minElevationDeg=0.0, maxSunElevationDeg=-6.0):
+        import numpy as np
+
+        orbit    = self._satellite.Orbit
+        mpe      = np.asarray(mpe, dtype=np.float64)
+        dates    = orbit.Epoch.ToDateArray(mpe / Globals.MinPerDay)
+        gmst     = Julian.ToGmstArray(dates)
+        pos, vel = orbit.PositionEciArrayByMpe(mpe)
+        sun      = Sun.PositionArray(dates)
+
+        _, el, _, _     = site.GetLookAngleArray(pos, vel, gmst)
+        _, sunEl, _, _  = site.GetLookAngleArray(sun, np.zeros_like(sun), gmst)
+
+        return (el >= Globals.ToRadians(minElevationDeg)) &\
+               (sunEl <= Globals.ToRadians(maxSunElevationDeg)) &\
+               (ShadowFunction(pos, sun, self._model, self._umbra) >= 0.0)
+
+    ##
+    # @brief Eclipses within a time window.
+    #
+    # @param startMpe Start of the window, in minutes past the TLE epoch.
+    # @param endMpe End of the window, in minutes past the TLE epoch.
+    #
+    # @return A list of (entry, exit) times in minutes past the TLE epoch; an
+    #         eclipse in progress at either end of the window is cut there.
+    def Intervals(self, startMpe, endMpe):
+        import numpy as np
+
+        count = max(int(math.ceil((endMpe - startMpe) / self._step)), 1) + 1
+        mpe   = np.linspace(startMpe, endMpe, count)
+        dark  = self.ShadowArray(mpe) < 0.0
+
+        edges = np.flatnonzero(dark[1:] != dark[:-1])
+        times = self._Refine(mpe[edges], mpe[edges + 1], dark[edges]).tolist()
+
+        # Edges alternate between entries and exits.
+        if dark[0]:
+            times.insert(0, startMpe)
+
+        if dark[-1]:
+            times.append(endMpe)
+
+        return list(zip(times[0::2], times[1::2]))
+
+    ##
+    # @brief Eclipses within a UTC time window.
+    #
+    # @param startUtc Start of the window (UTC).
+    # @param endUtc End of the window (UTC).
+    #
+    # @return A list of (entry, exit) UTC datetimes.
+    def IntervalsByDateTime(self, startUtc, endUtc):
+        orbit = self._satellite.Orbit
+        epoch = orbit.EpochTime
+
+        intervals = self.Intervals(orbit.TPlusEpoch(startUtc).total_seconds() / 60.0,
+                                   orbit.TPlusEpoch(endUtc).total_seconds() / 60.0)
+
+        return [(epoch + datetime.timedelta(minutes=begin), epoch + datetime.timedelta(minutes=end))
+                for begin, end in intervals]
+
+    # region Utility
+
+    def _Positions(self, mpe):
+        import numpy as np
+
+        orbit  = self._satellite.Orbit
+        mpe    = np.asarray(mpe, dtype=np.float64)
+        pos, _ = orbit.PositionEciArrayByMpe(mpe)
+
+        return pos, Sun.PositionArray(orbit.Epoch.ToDateArray(mpe / Globals.MinPerDay))
+
+    ##
+    # @brief Bisection of all brackets at once.
+    #
+    # @param lo Bracket starts, numpy array.
+    # @param hi Bracket ends, numpy array.
+    # @param darkLo Whether the satellite is in eclipse at lo.
+    #
+    # @return The boundaries, numpy array.
+    def _Refine(self, lo, hi, darkLo):
+        import numpy as np
+
+        if lo.size == 0:
+            return lo
+
+        width = self._step * 60.0
+        steps = max(int(math.ceil(math.log2(width / self._tolerance))), 0)
+
+        lo = lo.copy()
+        hi = hi.copy()
+
+        for _ in range(steps):
+            mid   = 0.5 * (lo + hi)
+            same  = (self.ShadowArray(mid) < 0.0) == darkLo
+            lo    = np.where(same, mid, lo)
+            hi    = np.where(same, hi, mid)
+
+        return 0.5 * (lo + hi)
+
+    # endregion
+
+# region Utility
+
+##
+# @brief Apparent radii of the earth and the sun seen from the satellites and
+#        the angle between their centres.
+def _Disks(pos, sun):
+    import numpy as np
+
+    toSun       = sun - pos
+    distEarth   = np.linalg.norm(pos, axis=1)
+    distSun     = np.linalg.norm(toSun, axis=1)
+
+    earthAngle  = np.arcsin(np.minimum(Globals.Xkmper / distEarth, 1.0))
+    sunAngle    = np.arcsin(Globals.Sr / distSun)
+    cosSep      = -np.einsum("ij,ij->i", pos, toSun) / (distEarth * distSun)
+    separation  = np.arccos(np.clip(cosSep, -1.0, 1.0))
+
+    return earthAngle, sunAngle, separation
+
+# endregion
+
+
+if __name__ == "__main__":
+    import time
+    from pythonOrbitTools.Core.Tle import Tle
+    from pythonOrbitTools.Orbit.Satellite import Satellite
+
+    line1 = "1 27424U 02022A   18232.63485883  .00000062  00000-0  23800-4 0  9991"
+    line2 = "2 27424  98.1977 172.8496 0000593 210.3660 252.0729 14.57127161866769"
+
+    satellite = Satellite(Tle(line1, line2, "AQUA"))
+    startUtc  = datetime.datetime(2018, 8, 20, 16, 0, 0)
+
+    for model, umbra in ((ShadowModel.Cylindrical, False), (ShadowModel.Conical, True), (ShadowModel.Conical, False)):
+        t0        = time.perf_counter()
+        intervals = EclipseFinder(satellite, model, umbra).IntervalsByDateTime(startUtc, startUtc + datetime.timedelta(days=1))
+
+        print("{} umbra={}: {} eclipses in {:.1f} ms".format(model.name, umbra, len(intervals), (time.perf_counter() - t0) * 1.0e3))
+
+        for begin, end in intervals[:2]:
+            print("    {} {} {:.3f} min".format(begin, end, (end - begin).total_seconds() / 60.0))
@@ -0,0 +1,466 @@
+##
+# @file Ephemeris.py
+# @brief Chunked array propagation over long time spans.
+#
+#  IterEphemeris propagates a satellite, IterCatalogEphemerisByDateTime a
+#  list of satellites, over an evenly spaced time grid and yields the result
+#  as EphemerisChunk objects of at most `chunk` samples. Only one chunk is
+#  computed at a time, so a month at 1 s runs in the memory of one chunk and
+#  the first chunk is available at once. Needs numpy.
+#
+#  With reuse=True all chunks are views into the same buffers, which the
+#  next chunk overwrites, and the iteration allocates nothing in the steady
+#  state; keep a chunk past the next step with chunk.Copy().
+#
+#  With precision="float32" the positions, velocities and look angles of
+#  the chunks are stored in single precision, which halves their memory and
+#  bandwidth, e.g. for coverage maps and visibility pre-filters. Everything
+#  is still computed in double precision, the sample times in particular,
+#  and only rounded when stored, to a relative 6e-8: within about 0.5 m in
+#  LEO and 2 m at GEO distance, 5e-7 km/sec in velocity and range rate and
+#  2.4e-7 rad (0.05 arc seconds) in the angles, see the chunked-float32
+#  engine of benchmarks/differential.py. The sample times (Mpe, Date) stay
+#  in double precision.
+#
+#  The generators compose with filters and writers, e.g.
+#  chunks = satellite.IterEphemerisByDateTime(startUtc, endUtc, 1.0, site=site, reuse=True)
+#  WriteLookAngles(f, AboveMask(chunks, 3.0), utcOffsetHours=8.0)
+#
+# @author df_justforfun@163.com
+# @version 1.0
+# @date 2026-10-19
+
+import datetime
+from pythonOrbitTools.Core.Globals import Globals
+from pythonOrbitTools.Core.Julian import Julian
+from pythonOrbitTools.Core.Workspace import Workspace
+from pythonOrbitTools.Orbit import Kernels
+
+# Default number of samples per chunk. Throughput is flat from about 4096 to
+# 16384 samples; with look angles the buffers and scratch arrays take about
+# 0.7 KB per sample.
+CHUNK = 8192
+
+# Storage precisions of the chunks, the default first.
+PRECISIONS = ("float64", "float32")
+
+##
+# @brief A block of consecutive ephemeris samples of one satellite.
+class EphemerisChunk(object):
+
+    __slots__ = ("_satellite", "_start", "_mpe", "_date", "_pos", "_vel", "_look")
+
+    ##
+    # @brief
+    #
+    # @param satellite The satellite.
+    # @param start Index of the first sample in the whole time grid.
+    # @param mpe Sample times, in minutes past the TLE epoch.
+    # @param date Sample times, Julian dates.
+    # @param pos ECI positions, (n, 3), km.
+    # @param vel ECI velocities, (n, 3), km/sec.
+    # @param look Optional (azimuth, elevation, range, range rate) arrays.
+    #
+    # @return
+    def __init__(self, satellite, start, mpe, date, pos, vel, look=None):
+        self._satellite = satellite
+        self._start     = start
+        self._mpe       = mpe
+        self._date      = date
+        self._pos       = pos
+        self._vel       = vel
+        self._look      = look
+
+    # region Properties
+
+    @property
+    def Satellite(self):
+        return self._satellite
+
+    @property
+    ##
+    # @brief Index of the first sample in the whole time grid.
+    #
+    # @return
+    def Start(self):
+        return self._start
+
+    @property
+    ##
+    # @brief Sample times, in minutes past the TLE epoch.
+    #
+    # @return
+    def Mpe(self):
+        return self._mpe
+
+    @property
+    ##
+    # @brief Sample times, Julian dates.
+    #
+    # @return
+    def Date(self):
+        return self._date
+
+    @property
+    ##
+    # @brief ECI positions, numpy array of shape (n, 3), in km.
+    #
+    # @return
+    def Position(self):
+        return self._pos
+
+    @property
+    ##
+    # @brief ECI velocities, numpy array of shape (n, 3), in km/sec.
+    #
+    # @return
+    def Velocity(self):
+        return self._vel
+
+    @property
+    ##
+    # @brief True if the chunk was computed for a site.
+    #
+    # @return
+    def HasLookAngles(self):
+        return self._look is not None
+
+    @property
+    def AzimuthRad(self):
+        return self._look[0]
+
+    @property
+    def ElevationRad(self):
+        return self._look[1]
+
+    @property
+    ##
+    # @brief Range, in km.
+    #
+    # @return
+    def Range(self):
+        return self._look[2]
+
+    @property
+    ##
+    # @brief Range rate, in km/sec.
+    #
+    # @return
+    def RangeRate(self):
+        return self._look[3]
+
+    # endregion
+
+    def __len__(self):
+        return self._mpe.shape[0]
+
+    ##
+    # @brief The samples selected by a boolean mask or index array, copied.
+    #
+    # @return An EphemerisChunk.
+    def Where(self, mask):
+        look = None if self._look is None else tuple(a[mask] for a in self._look)
+
+        return EphemerisChunk(self._satellite, self._start, self._mpe[mask], self._date[mask],
+                              self._pos[mask], self._vel[mask], look)
+
+    ##
+    # @brief A copy which does not share the buffers of a reused iteration.
+    #
+    # @return An EphemerisChunk.
+    def Copy(self):
+        return self.Where(slice(None))
+
+    ##
+    # @brief The sample times as UTC datetimes, rounded to milliseconds.
+    #
+    # @return A list of datetime.
+    def DateTimes(self):
+        epoch = self._satellite.Orbit.EpochTime
+        times = []
+
+        for mpe in self._mpe.tolist():
+            # As DopplerProfile.TuningTable: whole seconds print as such.
+            utc = epoch + datetime.timedelta(minutes=mpe, microseconds=500)
+            times.append(utc.replace(microsecond=utc.microsecond - utc.microsecond % 1000))
+
+        return times
+
+
+##
+# @brief Propagate a satellite over startMpe, startMpe + stepMin, ... up to
+#        and including endMpe, one chunk at a time.
+#
+# @param satellite The satellite.
+# @param startMpe Start time, in minutes past the TLE epoch.
+# @param endMpe End time, in minutes past the TLE epoch, included.
+# @param stepMin Step between samples, in minutes.
+# @param chunk Maximum number of samples per chunk.
+# @param site Optional ground station; the chunks then have look angles.
+# @param reuse Yield views into the same buffers for every chunk.
+# @param precision "float64", or "float32" to store positions, velocities
+#        and look angles in single precision.
+#
+# @return A generator of EphemerisChunk.
+def IterEphemeris(satellite, startMpe, endMpe, stepMin, chunk=CHUNK, site=None, reuse=False, precision="float64"):
+    count = _Count(endMpe - startMpe, stepMin, chunk)
+
+    return _Iterate([satellite], [startMpe], stepMin, 1.0, count, chunk, site, reuse, precision)
+
+
+##
+# @brief IterEphemeris over a UTC time window.
+#
+# @param satellite The satellite.
+# @param startUtc Start of the window (UTC).
+# @param endUtc End of the window (UTC), included.
+# @param stepSec Step between samples, in seconds.
+#
+# @return A generator of EphemerisChunk.
+def IterEphemerisByDateTime(satellite, startUtc, endUtc, stepSec, chunk=CHUNK, site=None, reuse=False, precision="float64"):
+    return IterCatalogEphemerisByDateTime([satellite], startUtc, endUtc, stepSec, chunk, site, reuse, precision)
+
+
+##
+# @brief IterEphemerisByDateTime for a list of satellites. For every time
+#        chunk the satellites are yielded in turn, so memory is bounded by
+#        one chunk whatever the window and results for the whole catalog
+#        arrive chunk by chunk.
+#
+# @param satellites The satellites.
+# @param startUtc Start of the window (UTC).
+# @param endUtc End of the window (UTC), included.
+# @param stepSec Step between samples, in seconds.
+#
+# @return A generator of EphemerisChunk.
+def IterCatalogEphemerisByDateTime(satellites, startUtc, endUtc, stepSec, chunk=CHUNK, site=None, reuse=False,
+                                   precision="float64"):
+    satellites = list(satellites)
+    count      = _Count((endUtc - startUtc).total_seconds(), stepSec, chunk)
+    starts     = [satellite.Orbit.TPlusEpoch(startUtc).total_seconds() for satellite in satellites]
+    batch      = None
+
+    # Deep-space satellites share the sun and moon terms of a chunk, unless
+    # the compiled kernels propagate them.
+    if len(satellites) > 1 and Kernels.Resolve(None) == "python":
+        from pythonOrbitTools.Orbit.DeepSpace import LunarSolarBatch
+
+        batch = LunarSolarBatch(satellites, startUtc)
+        batch = batch if len(batch) > 1 else None
+
+    # The sample times as DopplerProfile.ByDateTime: seconds, then minutes.
+    return _Iterate(satellites, starts, stepSec, 60.0, count, chunk, site, reuse, precision, batch)
+
+
+##
+# @brief Filter: the samples at or above an elevation mask. Empty chunks
+#        are dropped.
+#
+# @param chunks EphemerisChunk objects with look angles.
+# @param minElevationDeg Elevation mask, in degrees.
+#
+# @return A generator of EphemerisChunk.
+def AboveMask(chunks, minElevationDeg=0.0):
+    minEl = Globals.ToRadians(minElevationDeg)
+
+    for chunk in chunks:
+        mask = chunk.ElevationRad >= minEl
+
+        if mask.any():
+            yield chunk.Where(mask)
+
+
+##
+# @brief Writer: one "time elevation azimuth" line per sample, in the format
+#        of output.eph.
+#
+# @param f An open text file.
+# @param chunks EphemerisChunk objects with look angles.
+# @param utcOffsetHours Offset of the written times from UTC, in hours.
+# @param names Start each line with the satellite name.
+#
+# @return The number of lines written.
+def WriteLookAngles(f, chunks, utcOffsetHours=0.0, names=False):
+    offset = datetime.timedelta(hours=utcOffsetHours)
+    lines  = 0
+
+    for chunk in chunks:
+        prefix = chunk.Satellite.Name + " " if names else ""
+
+        for utc, el, az in zip(chunk.DateTimes(), chunk.ElevationRad.tolist(), chunk.AzimuthRad.tolist()):
+            f.write("{}{} {} {}\n".format(prefix,
+                                          (utc + offset).strftime("%Y/%m/%d %H:%M:%S"),
+                                          round(Globals.ToDegrees(el), 3),
+                                          round(Globals.ToDegrees(az), 3)))
+
+        lines += len(chunk)
+
+    return lines
+
+
+# region Utility
+
+##
+# @brief Number of samples of a span, the end included.
+def _Count(span, step, chunk):
+    if step <= 0.0:
+        raise ValueError("step")
+
+    if chunk < 1:
+        raise ValueError("chunk")
+
+    if span < 0.0:
+        # int() truncates toward zero: a reversed span shorter than one
+        # step would still count one sample.
+        return 0
+
+    return int(span / step) + 1
+
+
+##
+# @brief The sample times of satellite k, chunk at `first`, are
+#        (starts[k] + i * step) / scale for i in first, first + 1, ...
+#        The times of the optional LunarSolarBatch are i * step / scale.
+def _Iterate(satellites, starts, step, scale, count, chunk, site, reuse, precision, batch=None):
+    import numpy as np
+
+    if precision not in PRECISIONS:
+        raise ValueError("precision")
+
+    work    = Workspace()
+    size    = min(chunk, count)
+    dtype   = np.dtype(precision)
+    shared  = _Buffers(size, site, dtype) if reuse else None
+    ramp    = np.arange(size, dtype=np.float64)
+
+    # In single precision the chunk is computed into these and rounded.
+    single  = dtype != np.float64
+    scratch = _Buffers(size, site, np.float64) if single else None
+
+    for first in range(0, count, chunk):
+        n      = min(chunk, count - first)
+        index  = work.Get("ephemeris.index", n)
+
+        np.add(ramp[:n], first, out=index)
+
+        # Lunar-solar terms of the rows block..block + len(terms[0]).
+        block   = 0
+        terms   = None
+
+        for satellite, start in zip(satellites, starts):
+            mpe, date, pos, vel, look = _Slice(shared, n) if reuse else _Buffers(n, site, dtype)
+            orbit = satellite.Orbit
+            row   = None if batch is None else batch.Row(satellite)
+
+            if row is not None and (terms is None or not block <= row < block + len(terms[0])):
+                block = row
+                terms = batch.Terms(index * step / scale, row, row + batch.Block(n))
+
+            if single:
+                pos64, vel64, look64 = _Slice(scratch, n)[2:]
+            else:
+                pos64, vel64, look64 = pos, vel, look
+
+            np.multiply(index, step, out=mpe)
+            np.add(start, mpe, out=mpe)
+            np.divide(mpe, scale, out=mpe)
+
+            if row is None:
+                orbit.PositionEciArrayByMpe(mpe, out=(pos64, vel64), work=work)
+            else:
+                orbit.PositionEciArrayByMpe(mpe, out=(pos64, vel64), work=work, periodics=[a[row - block] for a in terms])
+
+            np.divide(mpe, Globals.MinPerDay, out=date)
+            orbit.Epoch.ToDateArray(date, out=date)
+
+            if site is not None:
+                gmst = Julian.ToGmstArray(date, out=work.Get("ephemeris.gmst", n), work=work)
+                site.GetLookAngleArray(pos64, vel64, gmst, out=look64, work=work)
+
+            if single:
+                np.copyto(pos, pos64, casting="same_kind")
+                np.copyto(vel, vel64, casting="same_kind")
+
+                for a, b in zip(look or (), look64 or ()):
+                    np.copyto(a, b, casting="same_kind")
+
+            yield EphemerisChunk(satellite, first, mpe, date, pos, vel, look)
+
+
+##
+# @brief Output arrays of one chunk: the times in double precision, the
+#        rest in dtype; in double precision the positions and velocities are
+#        views of (n, 4) arrays, as those of Orbit.PositionEciArrayByMpe.
+def _Buffers(n, site, dtype=None):
+    import numpy as np
+
+    dtype = np.dtype(np.float64 if dtype is None else dtype)
+    look  = None if site is None else tuple(np.empty(n, dtype) for i in range(4))
+
+    if dtype == np.float64:
+        return np.empty(n), np.empty(n), np.zeros((n, 4))[:, :3], np.zeros((n, 4))[:, :3], look
+
+    return np.empty(n), np.empty(n), np.empty((n, 3), dtype), np.empty((n, 3), dtype), look
+
+
+def _Slice(buffers, n):
+    mpe, date, pos, vel, look = buffers
+
+    return mpe[:n], date[:n], pos[:n], vel[:n], None if look is None else tuple(a[:n] for a in look)
+
+# endregion
+
+
+if __name__ == "__main__":
+    import io
+    import os
+    import time
+    import tracemalloc
+    from pythonOrbitTools.Core.Tle import Tle
+    from pythonOrbitTools.Core.Site import Site
+    from pythonOrbitTools.Orbit.Satellite import Satellite
+
+    line1 = "1 27424U 02022A   18232.63485883  .00000062  00000-0  23800-4 0  9991"
+    line2 = "2 27424  98.1977 172.8496 0000593 210.3660 252.0729 14.57127161866769"
+
+    satellite = Satellite(Tle(line1, line2, "AQUA"))
+    site      = Site().InitializeByDegLatAndDegLonAndKmAltAndName(34.7444, 113.7783, 0.07)
+
+    # The day of output.eph, local time UTC+8, streamed through the mask.
+    startUtc  = datetime.datetime(2018, 8, 20, 16, 0, 0)
+    endUtc    = datetime.datetime(2018, 8, 21, 15, 59, 59)
+    f         = io.StringIO()
+
+    chunks    = IterEphemerisByDateTime(satellite, startUtc, endUtc, 1.0, chunk=3600, site=site, reuse=True)
+    lines     = WriteLookAngles(f, AboveMask(chunks, 3.0), utcOffsetHours=8.0)
+
+    path      = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))), "output.eph")
+
+    if os.path.exists(path):
+        with open(path) as g:
+            expected = g.read().splitlines()
+
+        got = f.getvalue().splitlines()
+        print("output.eph lines {}, streamed {}, differing {}".format(
+            len(expected), lines, sum(a != b for a, b in zip(expected, got)) + abs(len(expected) - len(got))))
+
+    # A day at 1 s kept in memory, in double and in single precision.
+    for precision in PRECISIONS:
+        chunks = list(IterEphemerisByDateTime(satellite, startUtc, endUtc, 1.0, site=site, precision=precision))
+        size   = sum(c.Position.nbytes + c.Velocity.nbytes + 4 * c.Range.nbytes for c in chunks)
+        print("{}: {} samples, states and look angles {:.1f} MB".format(precision, sum(len(c) for c in chunks), size / 1.0e6))
+
+    # Thirty days at 1 s in bounded memory.
+    tracemalloc.start()
+    t0    = time.perf_counter()
+    total = 0
+
+    for chunk in IterEphemerisByDateTime(satellite, startUtc, startUtc + datetime.timedelta(days=30), 1.0,
+                                         site=site, reuse=True):
+        total += len(chunk)
+
+    elapsed    = time.perf_counter() - t0
+    peak       = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    print("30 days at 1 s: {} samples in {:.2f} s, peak traced memory {:.1f} MB".format(total, elapsed, peak / 1.0e6))
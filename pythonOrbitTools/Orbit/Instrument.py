@@ -0,0 +1,237 @@
+##
+# @file Instrument.py
+# @brief Opt-in hot-path instrumentation of the NORAD models and Site.
+#
+#  The probes are installed by wrapping the instrumented methods when
+#  Instrument.Enable() is called and removed again by Instrument.Disable(),
+#  so a disabled instrument costs nothing on the hot path.
+#
+#  For every probe the number of calls, the cumulative time and the self
+#  time (cumulative time minus the time spent in nested probes) are kept.
+#  The secular update has its own probes, Kernels.Sgp4Elements and
+#  DeepKernels.Sdp4Elements; the self time of the latter excludes the nested
+#  DeepSecular and DeepPeriodics. FinalPosition feeds a histogram of Kepler
+#  solver iterations and DeepKernels.DeepSecular a histogram of resonance
+#  integrator steps. The kernels are probed in the Kernels and DeepKernels
+#  modules, where the models and the interpreted array loop look them up;
+#  compiled kernels are not probed.
+#
+#  e.g.
+#  Instrument.Enable()
+#  ... propagate ...
+#  Instrument.Disable()
+#  print(Instrument.ToJson())
+#
+# @author df_justforfun@163.com
+# @version 1.0
+# @date 2026-10-19
+
+import json
+import time
+import functools
+import importlib
+
+##
+# @brief Collects call counts, timings and histograms of the hot paths.
+class Instrument(object):
+
+    # region Probes
+
+    # (module, class, method, probe name); a class of None probes a module
+    # function, e.g. the Kernels the models call.
+    PROBES = (
+        ("pythonOrbitTools.Orbit.NoradBase", "NoradBase", "Initialize",         "NoradBase.Initialize"),
+        ("pythonOrbitTools.Orbit.NoradSGP4", "NoradSGP4", "__init__",           "NoradSGP4.__init__"),
+        ("pythonOrbitTools.Orbit.NoradSDP4", "NoradSDP4", "__init__",           "NoradSDP4.__init__"),
+        ("pythonOrbitTools.Orbit.NoradSGP4", "NoradSGP4", "GetPosition",        "NoradSGP4.GetPosition"),
+        ("pythonOrbitTools.Orbit.NoradSDP4", "NoradSDP4", "GetPosition",        "NoradSDP4.GetPosition"),
+        ("pythonOrbitTools.Orbit.Kernels",   None,        "Sgp4Elements",       "Kernels.Sgp4Elements"),
+        ("pythonOrbitTools.Orbit.DeepKernels", None,      "Sdp4Elements",       "DeepKernels.Sdp4Elements"),
+        ("pythonOrbitTools.Orbit.DeepKernels", None,      "DeepSecular",        "DeepKernels.DeepSecular"),
+        ("pythonOrbitTools.Orbit.DeepKernels", None,      "DeepPeriodics",      "DeepKernels.DeepPeriodics"),
+        ("pythonOrbitTools.Orbit.DeepKernels", None,      "DeepStep",           "DeepKernels.DeepStep"),
+        ("pythonOrbitTools.Orbit.NoradBase", "NoradBase", "FinalPosition",      "NoradBase.FinalPosition"),
+        ("pythonOrbitTools.Core.Site",       "Site",      "GetLookAngle",       "Site.GetLookAngle"),
+        ("pythonOrbitTools.Core.Site",       "Site",      "GetLookAngleEcef",   "Site.GetLookAngleEcef"),
+        ("pythonOrbitTools.Core.Site",       "Site",      "GetLookAngleArray",  "Site.GetLookAngleArray"),
+        ("pythonOrbitTools.Core.Site",       "Site",      "IsAboveMask",        "Site.IsAboveMask"),
+        ("pythonOrbitTools.Core.Site",       "Site",      "IsAboveMaskArray",   "Site.IsAboveMaskArray"),
+    )
+
+    # endregion
+
+    _enabled    = False
+    _patched    = []    # (class, method name, original function)
+    _counters   = {}    # probe name -> [calls, seconds, self seconds]
+    _kepler     = {}    # iterations -> count
+    _resonance  = {}    # integrator steps per DeepSecular call -> count
+    _stack      = []    # time spent in nested probes, one entry per active probe
+
+    ##
+    # @brief Whether the probes are currently installed.
+    #
+    # @return
+    @classmethod
+    def IsEnabled(cls):
+        return cls._enabled
+
+    ##
+    # @brief Install the probes. Counters are kept across Enable/Disable
+    #        cycles until Reset() is called.
+    #
+    # @return
+    @classmethod
+    def Enable(cls):
+        if cls._enabled:
+            return
+
+        for moduleName, className, methodName, probeName in cls.PROBES:
+            module   = importlib.import_module(moduleName)
+            klass    = module if className is None else getattr(module, className)
+            original = klass.__dict__[methodName]
+
+            setattr(klass, methodName, cls._Wrap(original, probeName))
+            cls._patched.append((klass, methodName, original))
+
+        cls._enabled = True
+
+    ##
+    # @brief Remove the probes and restore the original methods.
+    #
+    # @return
+    @classmethod
+    def Disable(cls):
+        for klass, methodName, original in reversed(cls._patched):
+            setattr(klass, methodName, original)
+
+        cls._patched = []
+        cls._enabled = False
+
+    ##
+    # @brief Clear all counters and histograms.
+    #
+    # @return
+    @classmethod
+    def Reset(cls):
+        # Installed probes hold on to their counter lists, so clear in place.
+        for counter in cls._counters.values():
+            counter[:] = [0, 0.0, 0.0]
+
+        cls._kepler    = {}
+        cls._resonance = {}
+
+    ##
+    # @brief Export the collected data.
+    #
+    # @return A dict with the keys "enabled", "counters", "kepler_iterations"
+    #         and "resonance_steps".
+    @classmethod
+    def ToDict(cls):
+        counters = {}
+
+        for name, (calls, seconds, selfSeconds) in sorted(cls._counters.items()):
+            if calls == 0:
+                continue
+
+            counters[name] = {
+                "calls"        : calls,
+                "seconds"      : seconds,
+                "self_seconds" : selfSeconds,
+            }
+
+        steps = cls._Counter("DeepKernels.DeepStep")[0]
+
+        return {
+            "enabled"           : cls._enabled,
+            "counters"          : counters,
+            "kepler_iterations" : dict(sorted(cls._kepler.items())),
+            "resonance_steps"   : {"total"    : steps,
+                                   "per_call" : dict(sorted(cls._resonance.items()))},
+        }
+
+    ##
+    # @brief Export the collected data as a JSON string.
+    #
+    # @param indent Passed on to json.dumps.
+    #
+    # @return
+    @classmethod
+    def ToJson(cls, indent=2):
+        return json.dumps(cls.ToDict(), indent=indent)
+
+    # region Utility
+
+    @classmethod
+    def _Wrap(cls, func, name):
+        counter    = cls._Counter(name)
+        integrator = cls._Counter("DeepKernels.DeepStep")
+        stack      = cls._stack
+        clock      = time.perf_counter
+
+        if name == "NoradBase.FinalPosition":
+            after = cls._AfterFinalPosition
+        elif name == "DeepKernels.DeepSecular":
+            after = cls._AfterDeepSecular
+        else:
+            after = None
+
+        @functools.wraps(func)
+        def probe(self, *args, **kwargs):
+            steps = integrator[0]
+
+            stack.append(0.0)
+            t0 = clock()
+
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                elapsed = clock() - t0
+                nested  = stack.pop()
+
+                counter[0] += 1
+                counter[1] += elapsed
+                counter[2] += elapsed - nested
+
+                if stack:
+                    stack[-1] += elapsed
+
+                if after is not None:
+                    after(self, integrator[0] - steps)
+
+        return probe
+
+    @classmethod
+    def _Counter(cls, name):
+        return cls._counters.setdefault(name, [0, 0.0, 0.0])
+
+    @classmethod
+    def _AfterFinalPosition(cls, model, steps):
+        iterations = model.Kepler.LastIterations
+        cls._kepler[iterations] = cls._kepler.get(iterations, 0) + 1
+
+    @classmethod
+    def _AfterDeepSecular(cls, model, steps):
+        cls._resonance[steps] = cls._resonance.get(steps, 0) + 1
+
+    # endregion
+
+
+if __name__ == "__main__":
+    from pythonOrbitTools.Core.Tle import Tle
+    from pythonOrbitTools.Core.Site import Site
+    from pythonOrbitTools.Orbit.Satellite import Satellite
+
+    line1 = "1 28163U 04005A   18232.38463425  .00000103  00000-0  00000+0 0  9990"
+    line2 = "2 28163  62.7839 257.0839 6970123 287.6268  13.7285  2.00612946106466"
+
+    Instrument.Enable()
+
+    satellite = Satellite(Tle(line1, line2, "MOLNIYA 1-93"))
+    site      = Site().InitializeByDegLatAndDegLonAndKmAltAndName(34.7444, 113.7783, 0.07)
+
+    for mpe in range(0, 1440, 10):
+        site.GetLookAngle(satellite.PositionEciByMpe(mpe))
+
+    Instrument.Disable()
+
+    print(Instrument.ToJson())
@@ -0,0 +1,389 @@
+##
+# @file Kepler.py
+# @brief Solver for the modified Kepler equation of the NORAD models.
+#
+#  FinalPosition solves
+#
+#       capu = E - axn * sin(E) + ayn * cos(E)
+#
+#  for the eccentric longitude E. The default solver reproduces the original
+#  loop exactly: Newton updates starting at capu, a tolerance of 1e-6 on the
+#  update and at most 10 iterations. On request it uses Halley updates and,
+#  in sequential time-series propagation, starts from capu plus the offset
+#  E - capu of the previous sample`s solution.
+#
+#  Like the original loop, the solver returns the sine and cosine of the last
+#  iterate at which they were evaluated, i.e. the update that satisfied the
+#  tolerance is not applied.
+#
+# @author df_justforfun@163.com
+# @version 1.0
+# @date 2026-10-19
+
+import math
+from enum import Enum, unique
+from pythonOrbitTools.Core.Globals import Globals
+
+@unique
+class KeplerMethod(Enum):
+    Newton = 0  # second order, as in the original NORAD code
+    Halley = 1  # third order, same number of sin/cos evaluations per iteration;
+                # falls back to Newton steps far from the root
+
+##
+# @brief Kepler equation solver with optional warm start and Halley updates.
+#        A warm-started solver keeps state, so every model needs its own.
+class KeplerSolver(object):
+
+    # Warm starts are only used when capu moved less than this, in radians.
+    WARM_START_LIMIT = 0.5
+
+    # SolveArray compacts the active elements once more than this fraction
+    # of them converged.
+    COMPACT = 0.75
+
+    # region Properties
+
+    @property
+    def Method(self):
+        return self._method
+
+    @property
+    def Tolerance(self):
+        return self._tolerance
+
+    @property
+    def MaxIterations(self):
+        return self._maxIter
+
+    @property
+    def WarmStart(self):
+        return self._warmStart
+
+    @property
+    ##
+    # @brief Number of Solve/SolveArray elements solved since the last reset.
+    #
+    # @return
+    def Calls(self):
+        return self._calls
+
+    @property
+    ##
+    # @brief Number of iterations, i.e. sin/cos pairs evaluated, since the
+    #        last reset.
+    #
+    # @return
+    def Iterations(self):
+        return self._iterations
+
+    @property
+    ##
+    # @brief Iterations taken by the last scalar Solve call.
+    #
+    # @return
+    def LastIterations(self):
+        return self._lastIter
+
+    # endregion
+
+    ##
+    # @brief Creates a solver.
+    #
+    # @param method KeplerMethod.Newton or KeplerMethod.Halley.
+    # @param tolerance Convergence limit on the update, in radians.
+    # @param maxIter Maximum number of iterations.
+    # @param warmStart Start scalar solves from the previous solution.
+    #
+    # @return
+    def __init__(self, method=KeplerMethod.Newton, tolerance=1.0e-06, maxIter=10, warmStart=False):
+        self._method     = method
+        self._tolerance  = tolerance
+        self._maxIter    = maxIter
+        self._warmStart  = warmStart
+
+        self._lastCapu   = None
+        self._lastEpw    = None
+        self._lastIter   = 0
+
+        self._calls      = 0
+        self._iterations = 0
+
+    ##
+    # @brief A solver with the same settings and its own warm-start state
+    #        and counters.
+    #
+    # @return A KeplerSolver.
+    def Copy(self):
+        return KeplerSolver(self._method, self._tolerance, self._maxIter, self._warmStart)
+
+    ##
+    # @brief Reset the call and iteration counters.
+    #
+    # @return
+    def ResetCounters(self):
+        self._calls      = 0
+        self._iterations = 0
+
+    ##
+    # @brief Returns the counters as a dict.
+    #
+    # @return
+    def Statistics(self):
+        return {
+            "method"     : self._method.name,
+            "warm_start" : self._warmStart,
+            "calls"      : self._calls,
+            "iterations" : self._iterations,
+            "mean"       : self._iterations / self._calls if self._calls else 0.0,
+        }
+
+    ##
+    # @brief Solve the Kepler equation for one element.
+    #
+    # @param capu Modified mean longitude, in [0, 2pi).
+    # @param axn e * cos(omega), including long period periodics.
+    # @param ayn e * sin(omega), including long period periodics.
+    #
+    # @return (sin(E), cos(E)) of the last iterate.
+    def Solve(self, capu, axn, ayn):
+        temp2 = capu
+
+        if self._warmStart and self._lastEpw is not None:
+            # Carry the previous offset E - capu over to the new capu.
+            delta = (capu - self._lastCapu + Globals.Pi) % Globals.TwoPi - Globals.Pi
+
+            if math.fabs(delta) < KeplerSolver.WARM_START_LIMIT:
+                temp2 = capu + (self._lastEpw - self._lastCapu)
+
+        halley = self._method == KeplerMethod.Halley
+        sinepw = 0.0
+        cosepw = 0.0
+
+        i = 1
+        while i <= self._maxIter:
+            sinepw  = math.sin(temp2)
+            cosepw  = math.cos(temp2)
+            temp3   = axn * sinepw
+            temp4   = ayn * cosepw
+            temp5   = axn * cosepw
+            temp6   = ayn * sinepw
+
+            if halley:
+                f   = temp2 - temp3 + temp4 - capu
+                df  = 1.0 - temp5 - temp6
+                hc  = 1.0 - 0.5 * f * (temp3 - temp4) / (df * df)
+
+                # The curvature correction is only trusted close to the root,
+                # far away a Newton step is taken instead.
+                if hc < 0.5 or hc > 2.0:
+                    hc = 1.0
+
+                epw = temp2 - f / (df * hc)
+            else:
+                epw = (capu - temp4 + temp3 - temp2) / (1.0 - temp5 - temp6) + temp2
+
+            if math.fabs(epw - temp2) <= self._tolerance:
+                break
+
+            temp2 = epw
+            i += 1
+
+        self._lastIter    = min(i, self._maxIter)
+        self._calls      += 1
+        self._iterations += self._lastIter
+
+        if self._warmStart:
+            self._lastCapu = capu
+            self._lastEpw  = temp2
+
+        return sinepw, cosepw
+
+    ##
+    # @brief Solve the Kepler equation for an array of elements. Once more
+    #        than a quarter of the active elements converged (COMPACT), the
+    #        ones still moving are compacted into a second set of arrays and
+    #        the converged ones cost no further work. Statistics counts every
+    #        element evaluated, i.e. the sin/cos pairs computed. The iteration
+    #        stops when all have converged.
+    #
+    # @param capu Modified mean longitudes, numpy array.
+    # @param axn e * cos(omega), array of the same shape.
+    # @param ayn e * sin(omega), array of the same shape.
+    # @param guess Optional array of starting values, default capu.
+    # @param out Optional (sin(E), cos(E)) arrays to write the result into.
+    # @param work Optional Workspace for the intermediate arrays.
+    #
+    # @return (sin(E), cos(E)) arrays of the last iterates.
+    def SolveArray(self, capu, axn, ayn, guess=None, out=None, work=None):
+        import numpy as np
+        from pythonOrbitTools.Core.Workspace import Workspace
+
+        n      = np.shape(capu)[0]
+        work   = Workspace() if work is None else work
+        halley = self._method == KeplerMethod.Halley
+
+        if out is None:
+            sinepw, cosepw = np.empty(n), np.empty(n)
+        else:
+            sinepw, cosepw = out
+
+        s      = work.Get("kepler.sin", n)
+        c      = work.Get("kepler.cos", n)
+        temp3  = work.Get("kepler.temp3", n)
+        temp4  = work.Get("kepler.temp4", n)
+        df     = work.Get("kepler.df", n)
+        epw    = work.Get("kepler.epw", n)
+        moving = work.Get("kepler.moving", n, np.bool_)
+        rank   = work.Get("kepler.rank", n, np.intp)
+        moved  = work.Get("kepler.moved", n + 1, np.intp)
+        order  = work.Get("kepler.order", n, np.intp)
+
+        if halley:
+            f    = work.Get("kepler.f", n)
+            hc   = work.Get("kepler.hc", n)
+            flat = work.Get("kepler.flat", n, np.bool_)
+
+        # E of the active elements, and two sets of their (capu, axn, ayn,
+        # input index) to compact from one into the other.
+        temp2  = work.Get("kepler.temp2", n)
+        sets   = [[work.Get("kepler.{}{}".format(name, k), n) for name in ("capu", "axn", "ayn")] +
+                  [work.Get("kepler.index{}".format(k), n, np.intp)] for k in (0, 1)]
+        spare  = 0
+
+        # 0, 1, ..., n - 1
+        order.fill(1)
+        np.cumsum(order, out=order)
+        np.subtract(order, 1, out=order)
+
+        # The first iteration runs on the inputs.
+        m      = n
+        e      = capu if guess is None else guess
+        owned  = False # whether e is held in temp2
+        u, x, y, index = capu, axn, ayn, None
+
+        self._calls += n
+
+        for i in range(self._maxIter):
+            sm, cm, t3, t4, d, ep, mv = (a[:m] for a in (s, c, temp3, temp4, df, epw, moving))
+
+            np.sin(e, out=sm)
+            np.cos(e, out=cm)
+            self._iterations += m
+
+            if index is None:
+                np.copyto(sinepw, sm)
+                np.copyto(cosepw, cm)
+            else:
+                np.put(sinepw, index, sm)
+                np.put(cosepw, index, cm)
+
+            np.multiply(x, sm, out=t3)
+            np.multiply(y, cm, out=t4)
+
+            # df = 1 - axn * cos(E) - ayn * sin(E)
+            np.multiply(x, cm, out=d)
+            np.subtract(1.0, d, out=d)
+            np.multiply(y, sm, out=ep)
+            np.subtract(d, ep, out=d)
+
+            if halley:
+                fm, hm, fl = f[:m], hc[:m], flat[:m]
+
+                # f = E - temp3 + temp4 - capu
+                np.subtract(e, t3, out=fm)
+                np.add(fm, t4, out=fm)
+                np.subtract(fm, u, out=fm)
+
+                # hc = 1 - 0.5 * f * (temp3 - temp4) / (df * df), 1 outside [0.5, 2]
+                np.multiply(fm, 0.5, out=ep)
+                np.subtract(t3, t4, out=hm)
+                np.multiply(ep, hm, out=hm)
+                np.multiply(d, d, out=ep)
+                np.divide(hm, ep, out=hm)
+                np.subtract(1.0, hm, out=hm)
+                np.less(hm, 0.5, out=mv)
+                np.greater(hm, 2.0, out=fl)
+                np.logical_or(mv, fl, out=fl)
+                np.copyto(hm, 1.0, where=fl)
+
+                # epw = E - f / (df * hc)
+                np.multiply(d, hm, out=hm)
+                np.divide(fm, hm, out=hm)
+                np.subtract(e, hm, out=ep)
+            else:
+                # epw = (capu - temp4 + temp3 - E) / df + E
+                np.subtract(u, t4, out=ep)
+                np.add(ep, t3, out=ep)
+                np.subtract(ep, e, out=ep)
+                np.divide(ep, d, out=ep)
+                np.add(ep, e, out=ep)
+
+            # Elements still moving by more than the tolerance take the update.
+            np.subtract(ep, e, out=t3)
+            np.abs(t3, out=t3)
+            np.greater(t3, self._tolerance, out=mv)
+            count = int(np.count_nonzero(mv))
+
+            if count == 0 or i + 1 == self._maxIter:
+                break
+
+            if count > self.COMPACT * m:
+                # Few converged: the moving elements take the update in
+                # place. The others keep their E, so evaluating them again
+                # repeats their result exactly.
+                if not owned:
+                    np.copyto(temp2[:m], e)
+                    owned = True
+
+                e = temp2[:m]
+                np.copyto(e, ep, where=mv)
+                continue
+
+            # Positions of the elements still moving: each element is put at
+            # its rank among them, the others into the spare slot m.
+            np.copyto(rank[:m], mv)
+            np.cumsum(rank[:m], out=rank[:m])
+            np.subtract(rank[:m], 1, out=rank[:m])
+            np.logical_not(mv, out=mv)
+            np.copyto(rank[:m], m, where=mv)
+            np.put(moved, rank[:m], order[:m])
+
+            # Compact them into the other set.
+            rows  = moved[:count]
+            u2, x2, y2, index2 = (a[:count] for a in sets[spare])
+            spare = 1 - spare
+
+            np.take(ep, rows, out=temp2[:count], mode="clip")
+            np.take(u, rows, out=u2, mode="clip")
+            np.take(x, rows, out=x2, mode="clip")
+            np.take(y, rows, out=y2, mode="clip")
+
+            if index is None:
+                np.copyto(index2, rows)
+            else:
+                np.take(index, rows, out=index2, mode="clip")
+
+            m = count
+            e, u, x, y, index = temp2[:m], u2, x2, y2, index2
+            owned = True
+
+        return sinepw, cosepw
+
+if __name__ == "__main__":
+    from pythonOrbitTools.Core.Tle import Tle
+    from pythonOrbitTools.Orbit.Orbit import Orbit
+
+    line1 = "1 28163U 04005A   18232.38463425  .00000103  00000-0  00000+0 0  9990"
+    line2 = "2 28163  62.7839 257.0839 6970123 287.6268  13.7285  2.00612946106466"
+
+    # One day of a Molniya orbit in 1 minute steps.
+    for method in KeplerMethod:
+        for warmStart in (False, True):
+            orbit = Orbit(Tle(line1, line2, "MOLNIYA 1-93"))
+            orbit.NoradModel.Kepler = KeplerSolver(method, warmStart=warmStart)
+
+            for mpe in range(1440):
+                orbit.PositionEciByMpe(mpe)
+
+            print(orbit.NoradModel.Kepler.Statistics())
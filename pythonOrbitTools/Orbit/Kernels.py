@@ -0,0 +1,424 @@
+##
+# @file Kernels.py
+# @brief Propagation kernels shared by the reference models and the
+#        compiled backend.
+#
+#  The arithmetic of SGP4/SDP4 lives here once, as plain functions on floats
+#  and on two flat sequences per model:
+#
+#    c - the time-independent constants, laid out by the indices below:
+#        the common block of NoradBase, then the SGP4 block, or the SDP4
+#        block of DeepKernels.
+#    s - the SDP4 resonance integrator state (xli, xni, atime).
+#
+#  This module holds the common and the SGP4 kernels. The SDP4 kernels are
+#  in DeepKernels, which only the deep-space model imports, so that a
+#  near-earth propagation does not load them.
+#
+#  The reference models call these functions directly, so the interpreted
+#  kernels are the reference. With Numba installed the same source is also
+#  compiled, on first use, and the array methods of the models can run the
+#  compiled PositionArray loop, which also covers the sequential resonance
+#  integrator that numpy cannot vectorize.
+#
+#  The backend is chosen per call, e.g. GetPositionArray(t, backend="numba"),
+#  or globally with SetBackend. "auto", the default, uses Numba when it can
+#  be imported and Python otherwise.
+#
+#  The kernels only use what Numba compiles: floats, ints, math, tuples and
+#  indexing; constants are module-level floats and indices module-level ints.
+#
+# @author df_justforfun@163.com
+# @version 1.0
+# @date 2026-10-19
+
+import math
+from _thread import allocate_lock
+from pythonOrbitTools.Core.Globals import Globals
+
+# region Constants
+
+BACKENDS = ("auto", "python", "numba")
+
+PI      = Globals.Pi
+TWOPI   = Globals.TwoPi
+AE      = Globals.Ae
+XKE     = Globals.Xke
+CK2     = Globals.Ck2
+XKMPER  = Globals.Xkmper
+
+# Common constants, see NoradBase.KernelConstants.
+(INCL, ECC, M0, W0, RAAN0, BSTAR, AODP, XNODP, COSIO, SINIO, X3THM1, X1MTH2, X7THM1, XLCOF, AYCOF,
+ XMDOT, OMGDOT, XNODOT, XNODCF, C1, C4, T2COF) = range(22)
+
+BASE_SIZE = 22
+
+# SGP4 constants, see NoradSGP4.KernelConstants.
+(ISIMP, D2, D3, D4, T3COF, T4COF, T5COF, OMGCOF, XMCOF, ETA, DELMO, SINMO, C5) = range(BASE_SIZE, BASE_SIZE + 13)
+
+# endregion
+
+_kernels  = {}
+_compiled = None
+_backend  = "auto"
+_lock     = allocate_lock()   # not threading.Lock, threading is slow to import
+
+# region Backend
+
+##
+# @brief Register a function as a kernel. The function itself is returned,
+#        so the reference models call the interpreted kernel directly.
+def Register(func):
+    _kernels[func.__name__] = func
+    return func
+
+##
+# @brief Set the backend used when a call does not choose one.
+#
+# @param backend "auto", "python" or "numba".
+#
+# @return
+def SetBackend(backend):
+    global _backend
+
+    if backend not in BACKENDS:
+        raise ValueError("backend: {!r}".format(backend))
+
+    if backend == "numba":
+        import numba
+
+    _backend = backend
+
+def GetBackend():
+    return _backend
+
+##
+# @brief The backends that can be used here.
+#
+# @return A tuple, "python" first.
+def Available():
+    try:
+        import numba
+    except ImportError:
+        return ("python",)
+
+    return ("python", "numba")
+
+##
+# @brief The backend a call runs on.
+#
+# @param backend "auto", "python", "numba", or None for the global backend.
+#
+# @return "python" or "numba"; "numba" raises ImportError without Numba.
+def Resolve(backend=None):
+    backend = _backend if backend is None else backend
+
+    if backend not in BACKENDS:
+        raise ValueError("backend: {!r}".format(backend))
+
+    if backend == "auto":
+        return Available()[-1]
+
+    if backend == "numba":
+        import numba
+
+    return backend
+
+##
+# @brief A kernel function of a backend; the Numba kernels are compiled on
+#        first use of the backend.
+#
+# @param name The kernel name, e.g. "PositionArray".
+# @param backend See Resolve.
+#
+# @return
+def Kernel(name, backend=None):
+    if Resolve(backend) == "python":
+        return _kernels[name]
+
+    return _Compile()[name]
+
+##
+# @brief Compiles all kernels, including those of DeepKernels, with Numba.
+#        Each kernel is cloned into a namespace in which the other kernels
+#        are the compiled dispatchers, so kernels calling kernels compile
+#        into one another.
+def _Compile():
+    global _compiled
+
+    with _lock:
+        if _compiled is None:
+            import types
+            import numba
+            from pythonOrbitTools.Orbit import DeepKernels
+
+            namespace = dict(globals())
+            namespace.update(vars(DeepKernels))
+
+            for name, func in _kernels.items():
+                clone           = types.FunctionType(func.__code__, namespace, name, func.__defaults__)
+                namespace[name] = numba.njit(cache=False)(clone)
+
+            _compiled = dict((name, namespace[name]) for name in _kernels)
+
+    return _compiled
+
+# endregion
+
+# region Kernels
+
+@Register
+def Fmod2p(arg):
+    modu = arg % TWOPI
+
+    if modu < 0.0:
+        modu += TWOPI
+
+    return modu
+
+@Register
+def AcTan(sinx, cosx):
+    if cosx == 0.0:
+        if sinx > 0.0:
+            ret = PI / 2.0
+        else:
+            ret = 3.0 * PI / 2.0
+    else:
+        if cosx > 0.0:
+            ret = math.atan(sinx / cosx)
+        else:
+            ret = PI + math.atan(sinx / cosx)
+
+    return ret
+
+##
+# @brief SGP4 secular update for gravity and atmospheric drag.
+#
+# @return (incl, omega, e, a, xl, xnode, xn) for FinalPosition.
+@Register
+def Sgp4Elements(c, tsince):
+    xmdf    = c[M0] + c[XMDOT] * tsince
+    omgadf  = c[W0] + c[OMGDOT] * tsince
+    xnoddf  = c[RAAN0] + c[XNODOT] * tsince
+    omega   = omgadf
+    xmp     = xmdf
+    tsq     = tsince * tsince
+    xnode   = xnoddf + c[XNODCF] * tsq
+    tempa   = 1.0 - c[C1] * tsince
+    tempe   = c[BSTAR] * c[C4] * tsince
+    templ   = c[T2COF] * tsq
+
+    if c[ISIMP] == 0.0:
+        delomg  = c[OMGCOF] * tsince
+        delm    = c[XMCOF] * (math.pow(1.0 + c[ETA] * math.cos(xmdf), 3.0) - c[DELMO])
+        temp    = delomg + delm
+
+        xmp     = xmdf + temp
+        omega   = omgadf - temp
+
+        tcube   = tsq * tsince
+        tfour   = tsince * tcube
+
+        tempa   = tempa - c[D2] * tsq - c[D3] * tcube - c[D4] * tfour
+        tempe   = tempe + c[BSTAR] * c[C5] * (math.sin(xmp) - c[SINMO])
+        templ   = templ + c[T3COF] * tcube + tfour * (c[T4COF] + tsince * c[T5COF])
+
+    a   = c[AODP] * (tempa * tempa)
+    e   = c[ECC] - tempe
+
+    xl  = xmp + omega + xnode + c[XNODP] * templ
+    xn  = XKE / math.pow(a, 1.5)
+
+    return c[INCL], omega, e, a, xl, xnode, xn
+
+##
+# @brief The SDP4 secular and periodic update of PositionArray, forwarded to
+#        DeepKernels.Sdp4Elements. Not a kernel: the compiled PositionArray
+#        calls the compiled DeepKernels.Sdp4Elements directly.
+#
+# @return (incl, omega, e, a, xl, xnode, xn) for FinalPosition.
+def Sdp4Elements(c, s, tsince):
+    from pythonOrbitTools.Orbit import DeepKernels
+
+    return DeepKernels.Sdp4Elements(c, s, tsince)
+
+##
+# @brief Long period periodics of FinalPosition, up to the Kepler equation.
+#        The caller checks e * e <= 1.
+#
+# @return (capu, axn, ayn) for the Kepler solver.
+@Register
+def FinalLongPeriodics(c, omega, e, a, xl, xnode):
+    beta    = math.sqrt(1.0 - e*e)
+
+    axn     = e * math.cos(omega)
+    temp    = 1.0 / (a * beta * beta)
+    xll     = temp * c[XLCOF] * axn
+    aynl    = temp * c[AYCOF]
+    xlt     = xl + xll
+    ayn     = e * math.sin(omega) + aynl
+
+    capu    = Fmod2p(xlt - xnode)
+
+    return capu, axn, ayn
+
+##
+# @brief The Kepler equation solved by Newton iteration, exactly as
+#        KeplerSolver with KeplerMethod.Newton and no warm start.
+#
+# @return (sin(E), cos(E)) of the last iterate.
+@Register
+def KeplerNewton(capu, axn, ayn, tolerance, maxIter):
+    temp2   = capu
+    sinepw  = 0.0
+    cosepw  = 0.0
+
+    i = 1
+    while i <= maxIter:
+        sinepw  = math.sin(temp2)
+        cosepw  = math.cos(temp2)
+        temp3   = axn * sinepw
+        temp4   = ayn * cosepw
+        temp5   = axn * cosepw
+        temp6   = ayn * sinepw
+        epw     = (capu - temp4 + temp3 - temp2) / (1.0 - temp5 - temp6) + temp2
+
+        if math.fabs(epw - temp2) <= tolerance:
+            break
+
+        temp2 = epw
+        i += 1
+
+    return sinepw, cosepw
+
+##
+# @brief Short period periodics and orientation of FinalPosition, from the
+#        solution of the Kepler equation.
+#
+# @return (x, y, z, xdot, ydot, zdot), AU-based.
+@Register
+def FinalShortPeriodics(c, incl, a, xnode, xn, axn, ayn, sinepw, cosepw):
+    temp3   = axn * sinepw
+    temp4   = ayn * cosepw
+    temp5   = axn * cosepw
+    temp6   = ayn * sinepw
+
+    # Short period preliminary quantities
+    ecose   = temp5 + temp6
+    esine   = temp3 - temp4
+    elsq    = axn * axn + ayn * ayn
+    temp    = 1.0 - elsq
+    pl      = a * temp
+    r       = a * (1.0 - ecose)
+    temp1   = 1.0 / r
+    rdot    = XKE * math.sqrt(a) * esine * temp1
+    rfdot   = XKE * math.sqrt(pl) * temp1
+    temp2   = a * temp1
+    betal   = math.sqrt(temp)
+    temp3   = 1.0 / (1.0 + betal)
+    cosu    = temp2 * (cosepw - axn + ayn * esine * temp3)
+    sinu    = temp2 * (sinepw - ayn - axn * esine * temp3)
+    u       = AcTan(sinu, cosu)
+    sin2u   = 2.0 * sinu * cosu
+    cos2u   = 2.0 * cosu * cosu - 1.0
+
+    temp    = 1.0 / pl
+    temp1   = CK2 * temp
+    temp2   = temp1 * temp
+
+    # Update for short periodics
+    rk      = r * (1.0 - 1.5 * temp2 * betal * c[X3THM1]) + 0.5 * temp1 * c[X1MTH2] * cos2u
+    uk      = u - 0.25 * temp2 * c[X7THM1] * sin2u
+    xnodek  = xnode + 1.5 * temp2 * c[COSIO] * sin2u
+    xinck   = incl + 1.5 * temp2 * c[COSIO] * c[SINIO] * cos2u
+    rdotk   = rdot - xn * temp1 * c[X1MTH2] * sin2u
+    rfdotk  = rfdot + xn * temp1 * (c[X1MTH2] * cos2u + 1.5 * c[X3THM1])
+
+    # Orientation vectors
+    sinuk   = math.sin(uk)
+    cosuk   = math.cos(uk)
+    sinik   = math.sin(xinck)
+    cosik   = math.cos(xinck)
+    sinnok  = math.sin(xnodek)
+    cosnok  = math.cos(xnodek)
+    xmx     = -sinnok * cosik
+    xmy     =  cosnok * cosik
+    ux      = xmx * sinuk + cosnok * cosuk
+    uy      = xmy * sinuk + sinnok * cosuk
+    uz      = sinik * sinuk
+    vx      = xmx * cosuk - cosnok * sinuk
+    vy      = xmy * cosuk - sinnok * sinuk
+    vz      = sinik * cosuk
+
+    return (rk * ux, rk * uy, rk * uz,
+            rdotk * ux + rfdotk * vx, rdotk * uy + rfdotk * vy, rdotk * uz + rfdotk * vz)
+
+##
+# @brief GetPosition for an array of times, written into pos and vel.
+#
+# @param c The model constants.
+# @param s The SDP4 integrator state, updated in place; ignored for SGP4.
+# @param deep True for SDP4.
+# @param tsince Times, in minutes past epoch.
+# @param tolerance Kepler tolerance, see KeplerNewton.
+# @param maxIter Kepler iteration limit.
+# @param pos (n, 3) output array, AU-based.
+# @param vel (n, 3) output array.
+#
+# @return -1, or the index of the first sample failing like GetPosition
+#         (e * e > 1 or below the surface); later samples are not written.
+@Register
+def PositionArray(c, s, deep, tsince, tolerance, maxIter, pos, vel):
+    for k in range(len(tsince)):
+        if deep:
+            incl, omega, e, a, xl, xnode, xn = Sdp4Elements(c, s, tsince[k])
+        else:
+            incl, omega, e, a, xl, xnode, xn = Sgp4Elements(c, tsince[k])
+
+        if (e*e) > 1.0:
+            return k
+
+        capu, axn, ayn = FinalLongPeriodics(c, omega, e, a, xl, xnode)
+        sinepw, cosepw = KeplerNewton(capu, axn, ayn, tolerance, maxIter)
+        x, y, z, xdot, ydot, zdot = FinalShortPeriodics(c, incl, a, xnode, xn, axn, ayn, sinepw, cosepw)
+
+        if math.sqrt((x*x) + (y*y)+ (z*z)) * (XKMPER / AE) < XKMPER:
+            return k
+
+        pos[k, 0] = x
+        pos[k, 1] = y
+        pos[k, 2] = z
+        vel[k, 0] = xdot
+        vel[k, 1] = ydot
+        vel[k, 2] = zdot
+
+    return -1
+
+# endregion
+
+
+if __name__ == "__main__":
+    import time
+    import numpy as np
+    from pythonOrbitTools.Core.Tle import Tle
+    from pythonOrbitTools.Orbit.Orbit import Orbit
+
+    # The Spacetrack Report #3 SDP4 test case, a 12 hour resonant orbit.
+    orbit = Orbit(Tle("1 11801U          80230.29629788  .01431103  00000-0  14311-1       8",
+                      "2 11801  46.7916 230.4354 7318036  47.4722  10.4117  2.28537848     6", "STR3"))
+    mpe   = np.arange(0.0, 7.0 * 1440.0, 1.0)
+
+    print("backends: {}, default {} -> {}".format(Available(), GetBackend(), Resolve()))
+
+    for backend in Available():
+        orbit.NoradModel.GetPositionArray(mpe[:2], backend=backend)
+
+        t0       = time.perf_counter()
+        pos, vel = orbit.NoradModel.GetPositionArray(mpe, backend=backend)
+        print("{:6s} {} samples in {:8.2f} ms".format(backend, mpe.size, (time.perf_counter() - t0) * 1.0e3))
+
+    # The array loop reproduces the scalar reference.
+    eci = orbit.NoradModel.GetPosition(mpe[-1])
+    print("last sample deviation: {:.3e} AU".format(max(abs(pos[-1, 0] - eci.Position.X),
+                                                        abs(pos[-1, 1] - eci.Position.Y),
+                                                        abs(pos[-1, 2] - eci.Position.Z))))
@@ -13,6 +13,8 @@ from pythonOrbitTools.Core.Globals import Globals
 from pythonOrbitTools.Core.Vector import Vector
 from pythonOrbitTools.Core.Eci import EciTime
 from pythonOrbitTools.Core.Julian import Julian
+from pythonOrbitTools.Orbit.Kepler import KeplerSolver, KeplerMethod
+from pythonOrbitTools.Orbit import Kernels
 
 ##
 # @brief This class provides a base class for the NORAD SGP4/SDP4 orbit models.
@@ -22,10 +24,58 @@ class NoradBase(metaclass=ABCMeta):
     def Orbit(self):
         return self._orbit
 
+    @property
+    ##
+    # @brief The Kepler equation solver used by FinalPosition.
+    #
+    # @return 
+    def Kepler(self):
+        return self._m_kepler
+
+    @Kepler.setter
+    def Kepler(self, solver):
+        self._m_kepler = solver
+
     @abstractmethod
-    def GetPosition(self, tsince):
+    def GetPosition(self, tsince, date=None):
         pass
 
+    ##
+    # @brief Calculate satellite ECI position/velocity for an array of times.
+    #        Models without a vectorized implementation run the
+    #        Kernels.PositionArray loop of the backend, or, with a Kepler
+    #        solver the loop does not reproduce, GetPosition sample by sample.
+    #
+    # @param tsince Target times, in minutes-past-epoch format.
+    # @param out Optional (position, velocity) arrays of shape (n, 3) to write
+    #        the result into.
+    # @param work Optional Workspace for the intermediate arrays.
+    # @param backend "auto", "python" or "numba", default Kernels.GetBackend().
+    #
+    # @return (position, velocity) numpy arrays of shape (n, 3), AU-based;
+    #         without out, views of (n, 4) buffers with W = 0.
+    def GetPositionArray(self, tsince, out=None, work=None, backend=None):
+        import numpy as np
+
+        tsince = np.atleast_1d(np.asarray(tsince, dtype=np.float64))
+
+        if out is None:
+            pos = np.zeros((tsince.size, 4))[:, :3]
+            vel = np.zeros((tsince.size, 4))[:, :3]
+        else:
+            pos, vel = out
+
+        if self._UseKernel():
+            self._KernelArray(tsince, pos, vel, backend)
+            return pos, vel
+
+        for k, t in enumerate(tsince.tolist()):
+            eci    = self.GetPosition(t)
+            pos[k] = (eci.Position.X, eci.Position.Y, eci.Position.Z)
+            vel[k] = (eci.Velocity.X, eci.Velocity.Y, eci.Velocity.Z)
+
+        return pos, vel
+
     def __init__(self, orbit):
         self._orbit = orbit
         self.Initialize()
@@ -85,7 +135,7 @@ class NoradBase(metaclass=ABCMeta):
         c2 = self._m_coef1 * self._m_xnodp *\
                 (self._m_aodp * (1.0 + 1.5 * self._m_etasq + self._m_eeta * (4.0 + self._m_etasq)) +\
                  0.75 * Globals.Ck2 * self._m_tsi / psisq * self._m_x3thm1 *\
-                 (0.8 + 3.0 * self._m_etasq * (8.0 + self._m_etasq)))
+                 (8.0 + 3.0 * self._m_etasq * (8.0 + self._m_etasq)))
 
 
         self._m_c1      = self.Orbit.BStar * c2
@@ -129,120 +179,342 @@ class NoradBase(metaclass=ABCMeta):
         self._m_aycof   = 0.25 * a3ovk2 * self._m_sinio
         self._m_x7thm1  = 7.0 * self._m_theta2 - 1.0
 
+        # Default solver, identical to the original NORAD iteration.
+        self._m_kepler  = KeplerSolver()
+
+
+    ##
+    # @brief A model of another Orbit object sharing the constants, with its
+    #        own mutable state: a copy of the Kepler solver and, for SDP4, of
+    #        the resonance integrator.
+    #
+    # @param orbit The Orbit the copy belongs to.
+    #
+    # @return
+    def Copy(self, orbit):
+        model           = type(self).__new__(type(self))
+        model.__dict__.update(self.__dict__)
+        model._orbit    = orbit
+        model._m_kepler = self._m_kepler.Copy()
+
+        return model
 
-    def FinalPosition(self, incl, omega, e, a, xl, xnode, xn, tsince):
+    ##
+    # @brief The time-independent constants in the layout of Kernels; derived
+    #        classes append their own block and keep the list in _m_consts.
+    #
+    # @return A list of floats.
+    def KernelConstants(self):
+        return [self._m_satInc, self._m_satEcc, self.Orbit.MeanAnomaly, self.Orbit.ArgPerigee, self.Orbit.RAAN,
+                self.Orbit.BStar, self._m_aodp, self._m_xnodp, self._m_cosio, self._m_sinio, self._m_x3thm1,
+                self._m_x1mth2, self._m_x7thm1, self._m_xlcof, self._m_aycof, self._m_xmdot, self._m_omgdot,
+                self._m_xnodot, self._m_xnodcf, self._m_c1, self._m_c4, self._m_t2cof]
+
+    def FinalPosition(self, incl, omega, e, a, xl, xnode, xn, tsince, date=None):
         if (e*e) > 1.0:
             raise ValueError("Error in satellite data")
 
-        beta = math.sqrt(1.0 - e*e)
+        # Long period periodics, then Kepler`s Equation
+        capu, axn, ayn  = Kernels.FinalLongPeriodics(self._m_consts, omega, e, a, xl, xnode)
+        sinepw, cosepw  = self._m_kepler.Solve(capu, axn, ayn)
+
+        # Short period periodics and orientation
+        x, y, z, xdot, ydot, zdot = Kernels.FinalShortPeriodics(self._m_consts, incl, a, xnode, xn, axn, ayn, sinepw, cosepw)
+
+        vecPos  = Vector(x, y, z)
+
+        # Validate on altitude
+        altKm   = (vecPos.Magnitude() * (Globals.Xkmper / Globals.Ae))
+        if altKm < Globals.Xkmper:
+            raise ValueError(str(self.Orbit.EpochTime + datetime.timedelta(minutes=tsince))+self.Orbit.SatNameLong)
+
+        vecVel  = Vector(xdot, ydot, zdot)
+
+        if date is None:
+            date = Julian().InitializeByUTC(self.Orbit.EpochTime + datetime.timedelta(minutes=tsince))
+
+        return EciTime().InitializeByPosAndVelAndDate(vecPos, vecVel, date)
+
+    ##
+    # @brief Array form of FinalPosition. The arguments are numpy arrays of
+    #        one value per sample (incl may be a scalar); the Kepler equation
+    #        is solved by KeplerSolver.SolveArray. Every step writes into an
+    #        output or workspace array, so with both given nothing is
+    #        allocated.
+    #
+    # @param out Optional (position, velocity) arrays of shape (n, 3) to write
+    #        the result into, e.g. views of shared memory.
+    # @param work Optional Workspace for the intermediate arrays.
+    #
+    # @return (position, velocity) numpy arrays of shape (n, 3), AU-based;
+    #         without out, views of (n, 4) buffers with W = 0 that
+    #         VectorArray.FromXyz wraps without a copy.
+    def FinalPositionArray(self, incl, omega, e, a, xl, xnode, xn, tsince, out=None, work=None):
+        import numpy as np
+        from pythonOrbitTools.Core.Workspace import Workspace
+
+        n       = tsince.size
+        work    = Workspace() if work is None else work
+        mul     = np.multiply
+        add     = np.add
+        sub     = np.subtract
+        div     = np.divide
+
+        if out is None:
+            pos = np.zeros((n, 4))[:, :3]
+            vel = np.zeros((n, 4))[:, :3]
+        else:
+            pos, vel = out
+
+        t       = work.Get("final.t", n)
+        flag    = work.Get("final.flag", n, np.bool_)
+
+        beta    = work.Get("final.beta", n)
+        mul(e, e, out=beta)
+
+        if np.greater(beta, 1.0, out=flag).any():
+            raise ValueError("Error in satellite data")
 
-        # Long period periodics 
-        axn     = e * math.cos(omega)
-        temp    = 1.0 / (a * beta * beta)
-        xll     = temp * self._m_xlcof * axn
-        aynl    = temp * self._m_aycof
-        xlt     = xl + xll
-        ayn     = e * math.sin(omega) + aynl
+        sub(1.0, beta, out=beta)
+        np.sqrt(beta, out=beta)
+
+        # Long period periodics
+        axn     = work.Get("final.axn", n)
+        ayn     = work.Get("final.ayn", n)
+        temp    = work.Get("final.temp", n)
+        xlt     = work.Get("final.xlt", n)
+
+        np.cos(omega, out=axn)
+        mul(e, axn, out=axn)
+        mul(a, beta, out=temp)
+        mul(temp, beta, out=temp)
+        div(1.0, temp, out=temp)
+        mul(temp, self._m_xlcof, out=xlt)
+        mul(xlt, axn, out=xlt)
+        add(xl, xlt, out=xlt)
+        np.sin(omega, out=ayn)
+        mul(e, ayn, out=ayn)
+        mul(temp, self._m_aycof, out=temp)
+        add(ayn, temp, out=ayn)
 
         # Solve Kepler`s Equation
-        capu    = Globals.Fmod2p(xlt - xnode)
-        temp2   = capu
-        temp3   = 0.0
-        temp4   = 0.0
-        temp5   = 0.0
-        temp6   = 0.0
-        sinepw  = 0.0
-        cosepw  = 0.0
-        fDone   = False
-
-        i = 1
-        while ((i <= 10) and (not fDone)):
-            sinepw  = math.sin(temp2)
-            cosepw  = math.cos(temp2)
-            temp3   = axn * sinepw
-            temp4   = ayn * cosepw
-            temp5   = axn * cosepw
-            temp6   = ayn * sinepw
-
-            epw     = (capu - temp4 + temp3 - temp2) / (1.0 - temp5 -temp6) + temp2
-
-            if math.fabs(epw - temp2) <= 1.0e-06:
-                fDone = True
-            else:
-                temp2 = epw
+        capu    = work.Get("final.capu", n)
+        sinepw  = work.Get("final.sinepw", n)
+        cosepw  = work.Get("final.cosepw", n)
+
+        sub(xlt, xnode, out=capu)
+        np.mod(capu, Globals.TwoPi, out=capu)
 
-            i += 1
+        self._m_kepler.SolveArray(capu, axn, ayn, out=(sinepw, cosepw), work=work)
 
         # Short period preliminary quantities
-        ecose   = temp5 + temp6
-        esine   = temp3 - temp4
-        elsq    = axn * axn + ayn * ayn
-        temp    = 1.0 - elsq
-        pl      = a * temp
-        r       = a * (1.0 - ecose)
-        temp1   = 1.0 / r
-        rdot    = Globals.Xke * math.sqrt(a) * esine * temp1
-        rfdot   = Globals.Xke * math.sqrt(pl) * temp1
-        temp2   = a * temp1
-        betal   = math.sqrt(temp)
-        temp3   = 1.0 / (1.0 + betal)
-        cosu    = temp2 * (cosepw - axn + ayn * esine * temp3)
-        sinu    = temp2 * (sinepw - ayn - axn * esine * temp3)
-        u       = Globals.AcTan(sinu, cosu)
-        sin2u   = 2.0 * sinu * cosu
-        cos2u   = 2.0 * cosu * cosu - 1.0
-
-
-        temp    = 1.0 / pl
-        temp1   = Globals.Ck2 * temp
-        temp2   = temp1 * temp
+        ecose   = work.Get("final.ecose", n)
+        esine   = work.Get("final.esine", n)
+        pl      = work.Get("final.pl", n)
+        r       = work.Get("final.r", n)
+        temp1   = work.Get("final.temp1", n)
+        temp2   = work.Get("final.temp2", n)
+        temp3   = work.Get("final.temp3", n)
+        rdot    = work.Get("final.rdot", n)
+        rfdot   = work.Get("final.rfdot", n)
+        betal   = work.Get("final.betal", n)
+        cosu    = work.Get("final.cosu", n)
+        sinu    = work.Get("final.sinu", n)
+        u       = work.Get("final.u", n)
+        sin2u   = work.Get("final.sin2u", n)
+        cos2u   = work.Get("final.cos2u", n)
+
+        mul(axn, cosepw, out=ecose)
+        mul(ayn, sinepw, out=t)
+        add(ecose, t, out=ecose)
+        mul(axn, sinepw, out=esine)
+        mul(ayn, cosepw, out=t)
+        sub(esine, t, out=esine)
+        mul(axn, axn, out=temp)                 # elsq
+        mul(ayn, ayn, out=t)
+        add(temp, t, out=temp)
+        sub(1.0, temp, out=temp)                # temp = 1 - elsq
+        mul(a, temp, out=pl)
+        sub(1.0, ecose, out=r)
+        mul(a, r, out=r)
+        div(1.0, r, out=temp1)
+        np.sqrt(a, out=rdot)
+        mul(Globals.Xke, rdot, out=rdot)
+        mul(rdot, esine, out=rdot)
+        mul(rdot, temp1, out=rdot)
+        np.sqrt(pl, out=rfdot)
+        mul(Globals.Xke, rfdot, out=rfdot)
+        mul(rfdot, temp1, out=rfdot)
+        mul(a, temp1, out=temp2)
+        np.sqrt(temp, out=betal)
+        add(1.0, betal, out=temp3)
+        div(1.0, temp3, out=temp3)
+        mul(ayn, esine, out=t)                  # cosu = temp2 * (cosepw - axn + ayn * esine * temp3)
+        mul(t, temp3, out=t)
+        sub(cosepw, axn, out=cosu)
+        add(cosu, t, out=cosu)
+        mul(temp2, cosu, out=cosu)
+        mul(axn, esine, out=t)                  # sinu = temp2 * (sinepw - ayn - axn * esine * temp3)
+        mul(t, temp3, out=t)
+        sub(sinepw, ayn, out=sinu)
+        sub(sinu, t, out=sinu)
+        mul(temp2, sinu, out=sinu)
+        np.arctan2(sinu, cosu, out=u)
+        mul(2.0, sinu, out=sin2u)
+        mul(sin2u, cosu, out=sin2u)
+        mul(2.0, cosu, out=cos2u)
+        mul(cos2u, cosu, out=cos2u)
+        sub(cos2u, 1.0, out=cos2u)
+
+        div(1.0, pl, out=temp)
+        mul(Globals.Ck2, temp, out=temp1)
+        mul(temp1, temp, out=temp2)
 
         # Update for short periodics
-        rk      = r * (1.0 - 1.5 * temp2 * betal * self._m_x3thm1) + 0.5 * temp1 * self._m_x1mth2 * cos2u
-        uk      = u - 0.25 * temp2 * self._m_x7thm1 * sin2u
-        xnodek  = xnode + 1.5 * temp2 * self._m_cosio * sin2u
-        xinck   = incl + 1.5 * temp2 * self._m_cosio * self._m_sinio * cos2u
-        rdotk   = rdot - xn * temp1 * self._m_x1mth2 * sin2u
-        rfdotk  = rfdot + xn * temp1 * (self._m_x1mth2 * cos2u + 1.5 * self._m_x3thm1)
+        rk      = work.Get("final.rk", n)
+        uk      = work.Get("final.uk", n)
+        xnodek  = work.Get("final.xnodek", n)
+        xinck   = work.Get("final.xinck", n)
+        rdotk   = work.Get("final.rdotk", n)
+        rfdotk  = work.Get("final.rfdotk", n)
+
+        mul(1.5, temp2, out=rk)                 # rk = r * (1 - 1.5 * temp2 * betal * x3thm1) + 0.5 * temp1 * x1mth2 * cos2u
+        mul(rk, betal, out=rk)
+        mul(rk, self._m_x3thm1, out=rk)
+        sub(1.0, rk, out=rk)
+        mul(r, rk, out=rk)
+        mul(0.5, temp1, out=t)
+        mul(t, self._m_x1mth2, out=t)
+        mul(t, cos2u, out=t)
+        add(rk, t, out=rk)
+        mul(0.25, temp2, out=t)                 # uk = u - 0.25 * temp2 * x7thm1 * sin2u
+        mul(t, self._m_x7thm1, out=t)
+        mul(t, sin2u, out=t)
+        sub(u, t, out=uk)
+        mul(1.5, temp2, out=t)                  # xnodek = xnode + 1.5 * temp2 * cosio * sin2u
+        mul(t, self._m_cosio, out=t)
+        mul(t, sin2u, out=t)
+        add(xnode, t, out=xnodek)
+        mul(1.5, temp2, out=t)                  # xinck = incl + 1.5 * temp2 * cosio * sinio * cos2u
+        mul(t, self._m_cosio, out=t)
+        mul(t, self._m_sinio, out=t)
+        mul(t, cos2u, out=t)
+        add(incl, t, out=xinck)
+        mul(xn, temp1, out=t)                   # rdotk = rdot - xn * temp1 * x1mth2 * sin2u
+        mul(t, self._m_x1mth2, out=t)
+        mul(t, sin2u, out=t)
+        sub(rdot, t, out=rdotk)
+        mul(self._m_x1mth2, cos2u, out=rfdotk)  # rfdotk = rfdot + xn * temp1 * (x1mth2 * cos2u + 1.5 * x3thm1)
+        add(rfdotk, 1.5 * self._m_x3thm1, out=rfdotk)
+        mul(xn, temp1, out=t)
+        mul(t, rfdotk, out=t)
+        add(rfdot, t, out=rfdotk)
 
         # Orientation vectors
-        sinuk   = math.sin(uk)
-        cosuk   = math.cos(uk)
-        sinik   = math.sin(xinck)
-        cosik   = math.cos(xinck)
-        sinnok  = math.sin(xnodek)
-        cosnok  = math.cos(xnodek)
-        xmx     = -sinnok * cosik
-        xmy     =  cosnok * cosik
-        ux      = xmx * sinuk + cosnok * cosuk
-        uy      = xmy * sinuk + sinnok * cosuk
-        uz      = sinik * sinuk
-        vx      = xmx * cosuk - cosnok * sinuk
-        vy      = xmy * cosuk - sinnok * sinuk
-        vz      = sinik * cosuk
-
-        # Position
-        x       = rk * ux
-        y       = rk * uy
-        z       = rk * uz
-
-        vecPos  = Vector(x, y, z)
-        gmt     = self.Orbit.EpochTime + datetime.timedelta(minutes=tsince)
+        sinuk   = work.Get("final.sinuk", n)
+        cosuk   = work.Get("final.cosuk", n)
+        sinik   = work.Get("final.sinik", n)
+        cosik   = work.Get("final.cosik", n)
+        sinnok  = work.Get("final.sinnok", n)
+        cosnok  = work.Get("final.cosnok", n)
+        xmx     = work.Get("final.xmx", n)
+        xmy     = work.Get("final.xmy", n)
+
+        np.sin(uk, out=sinuk)
+        np.cos(uk, out=cosuk)
+        np.sin(xinck, out=sinik)
+        np.cos(xinck, out=cosik)
+        np.sin(xnodek, out=sinnok)
+        np.cos(xnodek, out=cosnok)
+        np.negative(sinnok, out=xmx)
+        mul(xmx, cosik, out=xmx)
+        mul(cosnok, cosik, out=xmy)
+
+        # Position and velocity, one column at a time:
+        #   u = (xmx * sinuk + cosnok * cosuk, xmy * sinuk + sinnok * cosuk, sinik * sinuk)
+        #   v = (xmx * cosuk - cosnok * sinuk, xmy * cosuk - sinnok * sinuk, sinik * cosuk)
+        #   pos = rk * u, vel = rdotk * u + rfdotk * v
+        uc      = work.Get("final.uc", n)
+        vc      = work.Get("final.vc", n)
+
+        for k, (m, trig) in enumerate(((xmx, cosnok), (xmy, sinnok), (None, sinik))):
+            if m is None:
+                mul(trig, sinuk, out=uc)
+                mul(trig, cosuk, out=vc)
+            else:
+                mul(m, sinuk, out=uc)
+                mul(trig, cosuk, out=t)
+                add(uc, t, out=uc)
+                mul(m, cosuk, out=vc)
+                mul(trig, sinuk, out=t)
+                sub(vc, t, out=vc)
+
+            mul(rk, uc, out=pos[:, k])
+            mul(rdotk, uc, out=vel[:, k])
+            mul(rfdotk, vc, out=t)
+            add(vel[:, k], t, out=vel[:, k])
 
         # Validate on altitude
-        altKm   = (vecPos.Magnitude() * (Globals.Xkmper / Globals.Ae))
-        if altKm < Globals.Xkmper:
+        mul(pos[:, 0], pos[:, 0], out=t)
+        mul(pos[:, 1], pos[:, 1], out=uc)
+        add(t, uc, out=t)
+        mul(pos[:, 2], pos[:, 2], out=uc)
+        add(t, uc, out=t)
+        np.sqrt(t, out=t)
+        mul(t, Globals.Xkmper / Globals.Ae, out=t)
+
+        if np.less(t, Globals.Xkmper, out=flag).any():
+            gmt = self.Orbit.EpochTime + datetime.timedelta(minutes=float(tsince[np.flatnonzero(flag)[0]]))
             raise ValueError(str(gmt)+self.Orbit.SatNameLong)
 
-        # Velocity
-        xdot    = rdotk * ux + rfdotk * vx
-        ydot    = rdotk * uy + rfdotk * vy
-        zdot    = rdotk * uz + rfdotk * vz
+        return pos, vel
 
-        vecVel  = Vector(xdot, ydot, zdot)
+    # region Utility
+
+    ##
+    # @brief Whether the Kernels.PositionArray loop can stand in for
+    #        GetPosition: with the default Kepler solver, which the loop
+    #        reproduces.
+    #
+    # @return
+    def _UseKernel(self):
+        kepler = self._m_kepler
+
+        return kepler.Method == KeplerMethod.Newton and not kepler.WarmStart
+
+    ##
+    # @brief Run the Kernels.PositionArray loop of a backend into pos and vel.
+    #
+    # @return
+    def _KernelArray(self, tsince, pos, vel, backend):
+        import numpy as np
+
+        backend = Kernels.Resolve(backend)
+        state   = self._KernelState()
+
+        if backend == "numba":
+            s       = np.array(state, dtype=np.float64)
+            failed  = Kernels.Kernel("PositionArray", backend)(np.array(self._m_consts, dtype=np.float64), s,
+                                                              self._KernelDeep(), tsince, self._m_kepler.Tolerance,
+                                                              self._m_kepler.MaxIterations, pos, vel)
+            state[:] = s.tolist()
+        else:
+            failed  = Kernels.PositionArray(self._m_consts, state, self._KernelDeep(), tsince.tolist(),
+                                            self._m_kepler.Tolerance, self._m_kepler.MaxIterations, pos, vel)
+
+        # GetPosition raises the error of the failing sample.
+        if failed >= 0:
+            self.GetPosition(float(tsince[failed]))
+
+    ##
+    # @brief The integrator state passed to the kernels, see NoradSDP4.
+    def _KernelState(self):
+        return []
 
-        return EciTime().InitializeByPosAndVelAndDate(vecPos, vecVel, Julian().InitializeByUTC(gmt))
+    def _KernelDeep(self):
+        return False
 
+    # endregion
 
 if __name__ == "__main__":
     pass
@@ -7,6 +7,8 @@
 
 import math
 from pythonOrbitTools.Orbit.NoradBase import NoradBase
+from pythonOrbitTools.Orbit import Kernels
+from pythonOrbitTools.Orbit import DeepKernels
 from pythonOrbitTools.Core.Globals import Globals
 
 ##
@@ -15,11 +17,11 @@ class NoradSDP4(NoradBase):
 
     # region Constants
 
-    zns     = 1.19459E-5
-    zes     = 0.01675
-    znl     = 1.5835218E-4
-    zel     = 0.05490
-    thdt    = 4.3752691E-3
+    zns     = DeepKernels.ZNS
+    zes     = DeepKernels.ZES
+    znl     = DeepKernels.ZNL
+    zel     = DeepKernels.ZEL
+    thdt    = DeepKernels.THDT
 
     # endregion
 
@@ -71,8 +73,8 @@ class NoradSDP4(NoradBase):
         dpi_zcosgl = math.cos(dpi_zx)
         dpi_zsingl = math.sin(dpi_zx)
 
-        dp_zmos = 6.2565837 + 0.017201977 * day
-        dp_zmos = Globals.Fmod2p(dp_zmos)
+        self._dp_zmos = 6.2565837 + 0.017201977 * day
+        self._dp_zmos = Globals.Fmod2p(self._dp_zmos)
 
         zcosis  =  0.91744867
         zsinis  =  0.39785416
@@ -123,7 +125,7 @@ class NoradSDP4(NoradBase):
             x7  =  a5 * cosarg
             x8  =  a6 * cosarg
             z31 =  12.0 * x1 * x1 - 3.0 * x3 * x3
-            z32 =  24.0 * x1 * x1 - 6.0 * x3 * x4
+            z32 =  24.0 * x1 * x2 - 6.0 * x3 * x4
             z33 =  12.0 * x2 * x2 - 3.0 * x4 * x4
             z1  =  3.0 * (a1 * a1 + a2 * a2) + z31 * eosq
             z2  =  6.0 * (a1 * a3 + a2 * a4) + z32 * eosq
@@ -336,251 +338,449 @@ class NoradSDP4(NoradBase):
             self._dp_xfact  = bfact - self._m_xnodp
 
             # Initialize integrator
-            self._dp_xli    =  self._dp_xlamo
-            self._dp_xni    =  self._m_xnodp
-            dp_atime        =  0.0; # performed by runtime
             self._dp_stepp  =  720.0
             self._dp_stepn  = -720.0
             self._dp_step2  =  259200.0
 
+        # Integrator state (xli, xni, atime), see DeepKernels.
+        self._dp_int    = [getattr(self, "_dp_xlamo", 0.0), self._m_xnodp, 0.0]
+        self._m_consts  = self.KernelConstants()
+
+    def Copy(self, orbit):
+        model           = super().Copy(orbit)
+        model._dp_int   = list(self._dp_int)
+
+        return model
+
+    ##
+    # @brief The constants of NoradBase followed by the SDP4 block of
+    #        DeepKernels; the resonance terms of other orbits are zero.
+    #
+    # @return A list of floats.
+    def KernelConstants(self):
+        names = ("thgr", "xqncl", "omegaq", "xlamo", "xfact", "stepp", "stepn", "step2",
+                 "ssl", "ssg", "ssh", "sse", "ssi", "del1", "del2", "del3",
+                 "d2201", "d2211", "d3210", "d3222", "d4410", "d4422", "d5220", "d5232", "d5421", "d5433",
+                 "zmos", "se2", "se3", "si2", "si3", "sl2", "sl3", "sl4", "sgh2", "sgh3", "sgh4", "sh2", "sh3",
+                 "zmol", "ee2", "e3", "xi2", "xi3", "xl2", "xl3", "xl4", "xgh2", "xgh3", "xgh4", "xh2", "xh3")
+
+        return super().KernelConstants() + [1.0 if self._gp_reso else 0.0, 1.0 if self._gp_sync else 0.0] +\
+               [getattr(self, "_dp_" + name, 0.0) for name in names]
+
     def DeepCalcDotTerms(self, pxndot, pxnddt, pxldot):
         # Dot terms calculated
-        if self._gp_sync:
-            fasx2   = 0.13130908
-            fasx4   = 2.8843198
-            fasx6   = 0.37448087
-
-            pxndot  = self._dp_del1 * math.sin(self._dp_xli - fasx2) + \
-                        self._dp_del2 * math.sin(2.0 * (self._dp_xli - fasx4)) + \
-                        self._dp_del3 * math.sin(3.0 * (self._dp_xli - fasx6))
-            pxnddt  = self._dp_del1 * math.cos(self._dp_xli - fasx2) + \
-                        2.0 * self._dp_del2 * math.cos(2.0 * (self._dp_xli - fasx4)) + \
-                        3.0 * self._dp_del3 * math.cos(3.0 * (self._dp_xli - fasx6))
-        else:
-            g54     = 4.4108898
-            g52     = 1.0508330
-            g44     = 1.8014998
-            g22     = 5.7686396
-            g32     = 0.95240898
-
-            xomi    = self._dp_omegaq + self._m_omgdot * self._dp_atime
-            x2omi   = xomi + xomi
-            x2li    = self._dp_xli + self._dp_xli
-
-            pxndot  = self._dp_d2201 * math.sin(x2omi + self._dp_xli - g22) + \
-                        self._dp_d2211 * math.sin(self._dp_xli - g22) + \
-                        self._dp_d3210 * math.sin( xomi + self._dp_xli - g32) + \
-                        self._dp_d3222 * math.sin(-xomi + self._dp_xli - g32) + \
-                        self._dp_d4410 * math.sin(x2omi + x2li - g44) + \
-                        self._dp_d4422 * math.sin(x2li - g44) + \
-                        self._dp_d5220 * math.sin( xomi + self._dp_xli - g52) + \
-                        self._dp_d5232 * math.sin(-xomi + self._dp_xli - g52) + \
-                        self._dp_d5421 * math.sin( xomi + x2li - g54) + \
-                        self._dp_d5433 * math.sin(-xomi + x2li - g54)
-
-            pxnddt  = self._dp_d2201 * math.cos(x2omi + self._dp_xli - g22) + \
-                        self._dp_d2211 * math.cos(self._dp_xli - g22) + \
-                        self._dp_d3210 * math.cos( xomi + self._dp_xli - g32) + \
-                        self._dp_d3222 * math.cos(-xomi + self._dp_xli - g32) + \
-                        self._dp_d5220 * math.cos( xomi + self._dp_xli - g52) + \
-                        self._dp_d5232 * math.cos(-xomi + self._dp_xli - g52) + \
-                        2.0 * (self._dp_d4410 * math.cos(x2omi + x2li - g44) + \
-                        self._dp_d4422 * math.cos(x2li - g44) + \
-                        self._dp_d5421 * math.cos( xomi + x2li - g54) + \
-                        self._dp_d5433 * math.cos(-xomi + x2li - g54))
-
-        pxldot = self._dp_xni + self._dp_xfact
-        pxnddt = pxnddt * pxldot
+        pxndot, pxnddt, pxldot = DeepKernels.DeepDotTerms(self._m_consts, self._dp_int)
 
         return True, pxndot, pxnddt, pxldot
 
     def DeepCalcIntegrator(self, pxndot, pxnddt, pxldot, delta):
-        _, pxndot, pxnddt, pxldot = self.DeepCalcDotTerms(pxndot, pxnddt, pxldot)
+        return DeepKernels.DeepStep(self._m_consts, self._dp_int, delta)
 
-        self._dp_xli    = self._dp_xli + pxldot * delta + pxndot * self._dp_step2
-        self._dp_xni    = self._dp_xni + pxndot * delta + pxnddt * self._dp_step2
-        self._dp_atime  = self._dp_atime + delta
+    def DeepSecular(self, xmdf, omgadf, xnode, emm, xincc, xnn, tsince):
+        # Deep space secular effects
+        xmdf, omgadf, xnode, emm, xincc, xnn = DeepKernels.DeepSecular(self._m_consts, self._dp_int, xmdf, omgadf, xnode, xnn, tsince)
 
-        return pxndot, pxnddt, pxldot
+        return True, xmdf, omgadf, xnode, emm, xincc, xnn, tsince
+
+    def DeepPeriodics(self, e, xincc, omgadf, xnode, xmam, tsince):
+        # Lunar-solar periodics
+        e, xincc, omgadf, xnode, xmam = DeepKernels.DeepPeriodics(self._m_consts, e, xincc, omgadf, xnode, xmam, tsince)
+
+        return True, e, xincc, omgadf, xnode, xmam
+
+    ##
+    # @brief Calculate satellite ECI position/velocity for a given time
+    #        This procedure returns the ECI position and velocity for the satellite
+    #        in the orbit at the given number of minutes since the TLE epoch time.
+    #        The algorithm uses NORAD`s Simplified General Perturbation 4 deep space
+    #        orbit model
+    #
+    # @param tsince Target time, in minutes-past-epoch format. 
+    # @param date Optional Julian date of the target time, e.g. of a
+    #        TimeContext; by default built from tsince.
+    #
+    # @return AU-based position/velocity ECI coordinates.
+    def GetPosition(self, tsince, date=None):
+        # Secular gravity and drag, deep space secular effects and lunar-solar
+        # periodics.
+        incl, omgadf, e, a, xl, xnode, xn = DeepKernels.Sdp4Elements(self._m_consts, self._dp_int, tsince)
+
+        return self.FinalPosition(incl, omgadf, e, a, xl, xnode, xn, tsince, date)
+
+    ##
+    # @brief Calculate satellite ECI positions/velocities for an array of times.
+    #        The secular terms, the lunar-solar periodics and FinalPosition
+    #        are evaluated on whole arrays. The resonance integrator, a
+    #        sequence of 720 minute steps from epoch, is swept once on each
+    #        side of epoch up to the farthest time; every time then starts
+    #        from the state of its last whole step, which is the state
+    #        GetPosition reaches for it, so the times may come in any order.
+    #        The numba backend runs the compiled kernel loop instead, unless
+    #        the lunar-solar terms are given.
+    #
+    # @param tsince Target times, in minutes-past-epoch format (array-like).
+    # @param out Optional (position, velocity) arrays of shape (n, 3).
+    # @param work Optional Workspace for the intermediate arrays.
+    # @param backend "auto", "python" or "numba"; None for the default.
+    # @param periodics Optional lunar-solar terms (pe, pinc, pl, pgh, ph) for
+    #        the times, e.g. from DeepSpace.LunarSolarBatch.
+    #
+    # @return (position, velocity) numpy arrays of shape (n, 3), AU-based.
+    def GetPositionArray(self, tsince, out=None, work=None, backend=None, periodics=None):
+        import numpy as np
+        from pythonOrbitTools.Core.Workspace import Workspace
+
+        if periodics is None and self._UseKernel() and Kernels.Resolve(backend) == "numba":
+            return NoradBase.GetPositionArray(self, tsince, out, work, backend)
+
+        tsince  = np.atleast_1d(np.asarray(tsince, dtype=np.float64))
+        n       = tsince.size
+        work    = Workspace() if work is None else work
+        mul     = np.multiply
+        add     = np.add
+        sub     = np.subtract
+        c       = self._m_consts
+
+        xmdf    = work.Get("sdp4.xmdf", n)
+        omgadf  = work.Get("sdp4.omgadf", n)
+        xnode   = work.Get("sdp4.xnode", n)
+        tsq     = work.Get("sdp4.tsq", n)
+        tempa   = work.Get("sdp4.tempa", n)
+        tempe   = work.Get("sdp4.tempe", n)
+        templ   = work.Get("sdp4.templ", n)
+        e       = work.Get("sdp4.e", n)
+        xinc    = work.Get("sdp4.xinc", n)
+        t       = work.Get("sdp4.t", n)
+
+        # Update for secular gravity and atmospheric drag
+        mul(c[Kernels.XMDOT], tsince, out=xmdf)
+        add(c[Kernels.M0], xmdf, out=xmdf)
+        mul(c[Kernels.OMGDOT], tsince, out=omgadf)
+        add(c[Kernels.W0], omgadf, out=omgadf)
+        mul(tsince, tsince, out=tsq)
+        mul(c[Kernels.XNODOT], tsince, out=xnode)
+        add(c[Kernels.RAAN0], xnode, out=xnode)
+        mul(c[Kernels.XNODCF], tsq, out=t)
+        add(xnode, t, out=xnode)
+        mul(c[Kernels.C1], tsince, out=tempa)
+        sub(1.0, tempa, out=tempa)
+        mul(c[Kernels.BSTAR] * c[Kernels.C4], tsince, out=tempe)
+        mul(c[Kernels.T2COF], tsq, out=templ)
+        xn      = c[Kernels.XNODP]
 
-    def DeepSecular(self, xmdf, omgadf, xnode, emm, xincc, xnn, tsince):
         # Deep space secular effects
-        xmdf    = xmdf + self._dp_ssl * tsince
-        omgadf  = omgadf + self._dp_ssg * tsince
-        xnode   = xnode + self._dp_ssh * tsince
-        emm     = self.Orbit.Eccentricity + self._dp_sse * tsince
-        xincc   = self.Orbit.Inclination + self._dp_ssi * tsince
+        mul(c[DeepKernels.SSL], tsince, out=t)
+        add(xmdf, t, out=xmdf)
+        mul(c[DeepKernels.SSG], tsince, out=t)
+        add(omgadf, t, out=omgadf)
+        mul(c[DeepKernels.SSH], tsince, out=t)
+        add(xnode, t, out=xnode)
+        mul(c[DeepKernels.SSE], tsince, out=e)                  # em
+        add(c[Kernels.ECC], e, out=e)
+        mul(c[DeepKernels.SSI], tsince, out=xinc)
+        add(c[Kernels.INCL], xinc, out=xinc)
+
+        flag    = work.Get("sdp4.flag", n, np.bool_)
+        np.less(xinc, 0.0, out=flag)
+
+        if flag.any():
+            np.negative(xinc, out=xinc, where=flag)
+            add(xnode, Kernels.PI, out=xnode, where=flag)
+            sub(omgadf, Kernels.PI, out=omgadf, where=flag)
 
-        if xincc < 0.0:
-            xincc   = -xincc
-            xnode   = xnode  + Globals.Pi
-            omgadf  = omgadf - Globals.Pi
+        if self._gp_reso:
+            xmdf, xn = self._ResonanceArray(tsince, xnode, omgadf, work)
 
-        xnddt   = 0.0
-        xndot   = 0.0
-        xldot   = 0.0
-        ft      = 0.0
-        delt    = 0.0
+        a       = work.Get("sdp4.a", n)
+        xmam    = work.Get("sdp4.xmam", n)
 
-        fDone   = False
+        # a = (xke / xn)^(2/3) * tempa^2
+        mul(tempa, tempa, out=t)
 
         if self._gp_reso:
-            while not fDone:
-                if self._dp_atime == 0.0 or \
-                    (tsince >= 0.0 and self._dp_atime < 0.0) or \
-                    (tsince < 0.0 and self._dp_atime >= 0.0):
-                    delt = self._dp_stepn if tsince < 0 else self._dp_stepp
-
-                    # Epoch restart
-                    self._dp_atime  = 0.0
-                    self._dp_xni    = self._m_xnodp
-                    self._dp_xli    = self._dp_xlamo
-
-                    fDone = True
-                else:
-                    if math.fabs(tsince) < math.fabs(self._dp_atime):
-                        delt = self._dp_stepp
+            np.divide(Kernels.XKE, xn, out=a)
+            np.power(a, 2.0 / 3.0, out=a)
+            mul(a, t, out=a)
+        else:
+            mul(np.power(Kernels.XKE / xn, 2.0 / 3.0), t, out=a)
 
-                        if tsince >= 0.0:
-                            delt = self._dp_stepn
+        sub(e, tempe, out=e)
+        mul(c[Kernels.XNODP], templ, out=t)
+        add(xmdf, t, out=xmam)
 
-                        xndot, xnddt, xldot = self.DeepCalcIntegrator(xnddt, xnddt, xldot, delt)
-                    else:
-                        delt = self._dp_stepn
+        e, xinc, omgadf, xnode, xmam = self._DeepPeriodicsArray(e, xinc, omgadf, xnode, xmam, tsince, periodics, work)
 
-                        if tsince > 0.0:
-                            delt = self._dp_stepp
+        xl      = work.Get("sdp4.xl", n)
+        xn      = work.Get("sdp4.xn", n)
 
-                        fDone = True
+        add(xmam, omgadf, out=xl)
+        add(xl, xnode, out=xl)
+        np.power(a, 1.5, out=xn)
+        np.divide(Kernels.XKE, xn, out=xn)
 
-            while math.fabs(tsince - self._dp_atime) >= self._dp_stepp:
-                xndot, xnddt, xldot = self.DeepCalcIntegrator(xndot, xnddt, xldot, delt)
+        return self.FinalPositionArray(xinc, omgadf, e, a, xl, xnode, xn, tsince, out, work)
 
-            ft = tsince - self._dp_atime
+    # region Utility
 
-            _, xndot, xnddt, xldot = self.DeepCalcDotTerms(xndot, xnddt, xldot)
+    ##
+    # @brief The resonance terms for an array of times, see DeepKernels.DeepSecular.
+    #        Each side of epoch is integrated once, as far as its farthest
+    #        time, keeping the state and the dot terms of every step in a
+    #        table of the workspace, one column per quantity.
+    #
+    # @return (xmdf, xnn) arrays of the workspace.
+    def _ResonanceArray(self, tsince, xnode, omgadf, work):
+        import numpy as np
+
+        n       = tsince.size
+        mul     = np.multiply
+        add     = np.add
+        sub     = np.subtract
+        c       = self._m_consts
+        stepp   = c[DeepKernels.STEPP]
+
+        at      = work.Get("sdp4.at", n)
+        steps   = work.Get("sdp4.steps", n)
+        index   = work.Get("sdp4.index", n, np.intp)
+        flag    = work.Get("sdp4.flag", n, np.bool_)
+        back    = work.Get("sdp4.back", n, np.bool_)
+        t       = work.Get("sdp4.t", n)
+
+        # Number of whole steps GetPosition takes: it stops at the first
+        # atime with |tsince - atime| < stepp.
+        np.abs(tsince, out=at)
+        np.divide(at, stepp, out=steps)
+        np.floor(steps, out=steps)
+        mul(steps, stepp, out=t)
+        np.greater(t, at, out=flag)
+        sub(steps, 1.0, out=steps, where=flag)
+        mul(steps, stepp, out=t)
+        sub(at, t, out=t)
+        np.greater_equal(t, stepp, out=flag)
+        add(steps, 1.0, out=steps, where=flag)
+        np.copyto(index, steps, casting="unsafe")
+
+        # Rows of each side: 0 .. the most steps of a time on that side.
+        np.less(tsince, 0.0, out=back)
+        np.logical_not(back, out=flag)
+
+        sides   = ((flag, stepp, int(np.max(index, where=flag, initial=-1)) + 1),
+                   (back, c[DeepKernels.STEPN], int(np.max(index, where=back, initial=-1)) + 1))
+        size    = sides[0][2] + sides[1][2]
+        table   = work.Get("sdp4.table", 6 * size)
+        first   = 0
+
+        for side, delt, rows in sides:
+            s = [c[DeepKernels.XLAMO], c[Kernels.XNODP], 0.0]
+
+            for i in range(first, first + rows):
+                table[i]            = s[DeepKernels.XLI]
+                table[size + i]     = s[DeepKernels.XNI]
+                table[2 * size + i] = s[DeepKernels.ATIME]
+
+                table[3 * size + i], table[4 * size + i], table[5 * size + i] = DeepKernels.DeepStep(c, s, delt)
+
+            if first:
+                add(index, first, out=index, where=side)
+
+            first += rows
+
+        xli, xni, atime, xndot, xnddt, xldot = [np.take(table[k * size:(k + 1) * size], index, mode="clip",
+                                                        out=work.Get("sdp4.row{}".format(k), n))
+                                                for k in range(6)]
+
+        ft      = work.Get("sdp4.ft", n)
+        xnn     = work.Get("sdp4.xnn", n)
+        xl      = work.Get("sdp4.res_xl", n)
+        temp    = work.Get("sdp4.temp", n)
+        xmdf    = work.Get("sdp4.res_xmdf", n)
+
+        # xnn = xni + xndot * ft + xnddt * ft * ft * 0.5
+        sub(tsince, atime, out=ft)
+        mul(xndot, ft, out=t)
+        add(xni, t, out=xnn)
+        mul(xnddt, ft, out=t)
+        mul(t, ft, out=t)
+        mul(t, 0.5, out=t)
+        add(xnn, t, out=xnn)
+
+        # xl = xli + xldot * ft + xndot * ft * ft * 0.5
+        mul(xldot, ft, out=t)
+        add(xli, t, out=xl)
+        mul(xndot, ft, out=t)
+        mul(t, ft, out=t)
+        mul(t, 0.5, out=t)
+        add(xl, t, out=xl)
+
+        # temp = -xnode + thgr + tsince * thdt
+        np.negative(xnode, out=temp)
+        add(temp, c[DeepKernels.THGR], out=temp)
+        mul(tsince, DeepKernels.THDT, out=t)
+        add(temp, t, out=temp)
 
-            xnn  = self._dp_xni + xndot * ft + xnddt * ft * ft * 0.5
+        if self._gp_sync:
+            sub(xl, omgadf, out=xmdf)
+            add(xmdf, temp, out=xmdf)
+        else:
+            add(xl, temp, out=xmdf)
+            add(xmdf, temp, out=xmdf)
 
-            xl   = self._dp_xli + xldot * ft + xndot * ft * ft * 0.5
-            temp = -xnode + self._dp_thgr + tsince * NoradSDP4.thdt
+        return xmdf, xnn
 
-            xmdf = xl - omgadf + temp
+    ##
+    # @brief The lunar-solar periodic terms for an array of times.
+    #
+    # @param tsince Target times, in minutes-past-epoch format.
+    # @param out Optional (pe, pinc, pl, pgh, ph) arrays to write the result
+    #        into.
+    # @param work Optional Workspace for the intermediate arrays.
+    #
+    # @return (pe, pinc, pl, pgh, ph) arrays.
+    def LunarSolarArray(self, tsince, out=None, work=None):
+        import numpy as np
+        from pythonOrbitTools.Core.Workspace import Workspace
+        from pythonOrbitTools.Orbit import DeepSpace
 
-            if not self._gp_sync:
-                xmdf = xl + temp + temp
+        tsince  = np.asarray(tsince, dtype=np.float64)
+        n       = tsince.size
+        work    = Workspace() if work is None else work
+        c       = self._m_consts
 
-        return True, xmdf, omgadf, xnode, emm, xincc, xnn, tsince
+        if out is None:
+            out = tuple(np.empty(n) for i in range(5))
 
-    def DeepPeriodics(self, e, xincc, omgadf, xnode, xmam, tsince):
-        # Lunar-solar periodics
-        sinis   = math.sin(xincc)
-        cosis   = math.cos(xincc)
-
-        sghs    = 0.0
-        shs     = 0.0
-        shl     = 0.0
-        pe      = 0.0
-        pinc    = 0.0
-        pl      = 0.0
-        sghl    = 0.0
-
-        zm      = self._dp_zmos + NoradSDP4.zns * tsince
-        zf      = zm + 2.0 * NoradSDP4.zes * math.sin(zm)
-        sinzf   = math.sin(zf)
-        f2      =  0.5 * sinzf * sinzf - 0.25
-        f3      = -0.5 * sinzf * math.cos(zf)
-        ses     = self._dp_se2 * f2 + self._dp_se3 * f3
-        sis     = self._dp_si2 * f2 + self._dp_si3 * f3
-        sls     = self._dp_sl2 * f2 + self._dp_sl3 * f3 + self._dp_sl4 * sinzf
-
-        sghs    = self._dp_sgh2 * f2 + self._dp_sgh3 * f3 + self._dp_sgh4 * sinzf
-        shs     = self._dp_sh2 * f2 + self._dp_sh3 * f3
-        zm      = self._dp_zmol + NoradSDP4.znl * tsince
-        zf      = zm + 2.0 * NoradSDP4.zel * math.sin(zm)
-        sinzf   = math.sin(zf)
-        f2      =  0.5 * sinzf * sinzf - 0.25
-        f3      = -0.5 * sinzf * math.cos(zf)
-
-        sel     = self._dp_ee2 * f2 + self._dp_e3 * f3
-        sil     = self._dp_xi2 * f2 + self._dp_xi3 * f3
-        sll     = self._dp_xl2 * f2 + self._dp_xl3 * f3 + self._dp_xl4 * sinzf
-
-        sghl    = self._dp_xgh2 * f2 + self._dp_xgh3 * f3 + self._dp_xgh4 * sinzf
-        sh1     = self._dp_xh2 * f2 + self._dp_xh3 * f3
-        pe      = ses + sel
-        pinc    = sis + sil
-        pl      = sls + sll
-
-        pgh     = sghs + sghl
-        ph      = shs + shl
-
-        xincc   = xincc + pinc
-        e       = e + pe
-
-        if self._dp_xqncl >= 0.2:
-            # Apply periodics directly
-            ph      = ph / self._m_sinio
-            pgh     = pgh - self._m_cosio * ph
-            omgadf  = omgadf + pgh
-            xnode   = xnode + ph
-            xmam    = xmam + pl
-        else:
-            # Apply periodics with Lyddane modification
-            sinok   = math.sin(xnode)
-            cosok   = math.cos(xnode)
-            alfdp   = sinis * sinok
-            betdp   = sinis * cosok
-            dalf    =  ph * cosok + pinc * cosis * sinok
-            dbet    = -ph * sinok + pinc * cosis * cosok
+        zm      = work.Get("lunar.zm", n)
+        sinzm   = work.Get("lunar.sinzm", n)
+        lunar   = (work.Get("lunar.e", n), work.Get("lunar.i", n), work.Get("lunar.l", n),
+                   work.Get("lunar.gh", n), work.Get("lunar.h", n))
 
-            alfdp   = alfdp + dalf
-            betdp   = betdp + dbet
+        np.multiply(DeepKernels.ZNS, tsince, out=zm)
+        np.add(c[DeepKernels.ZMOS], zm, out=zm)
+        DeepSpace.Periodics([c[i] for i in DeepSpace.SOLAR], zm, np.sin(zm, out=sinzm), DeepKernels.ZES, out, work)
 
-            xls     = xmam + omgadf + cosis * xnode
-            dls     = pl + pgh - pinc * xnode * sinis
+        np.multiply(DeepKernels.ZNL, tsince, out=zm)
+        np.add(c[DeepKernels.ZMOL], zm, out=zm)
+        DeepSpace.Periodics([c[i] for i in DeepSpace.LUNAR], zm, np.sin(zm, out=sinzm), DeepKernels.ZEL, lunar, work)
 
-            xls     = xls + dls
-            xnode   = Globals.AcTan(alfdp, betdp)
-            xmam    = xmam + pl
-            omgadf  = xls - xmam - math.cos(xincc) * xnode
+        for s, l in zip(out, lunar):
+            np.add(s, l, out=s)
 
-        return True, e, xincc, omgadf, xnode, xmam
+        return out
 
     ##
-    # @brief Calculate satellite ECI position/velocity for a given time
-    #        This procedure returns the ECI position and velocity for the satellite
-    #        in the orbit at the given number of minutes since the TLE epoch time.
-    #        The algorithm uses NORAD`s Simplified General Perturbation 4 deep space
-    #        orbit model
+    # @brief Lunar-solar periodics for arrays, see DeepKernels.DeepPeriodics.
+    #        e, xincc, omgadf, xnode and xmam are updated in place.
     #
-    # @param tsince Target time, in minutes-past-epoch format. 
+    # @param periodics Optional (pe, pinc, pl, pgh, ph) for the times, see
+    #        LunarSolarArray; they are not modified.
+    # @param work Workspace for the intermediate arrays.
     #
-    # @return AU-based position/velocity ECI coordinates.
-    def GetPosition(self, tsince):
-        # Update for secular gravity and atmospheric drag
-        xmdf    = self.Orbit.MeanAnomaly + self._m_xmdot * tsince
-        omgadf  = self.Orbit.ArgPerigee + self._m_omgdot * tsince
-        xnoddf  = self.Orbit.RAAN + self._m_xnodot * tsince
-        tsq     = tsince * tsince
-        xnode   = xnoddf * self._m_xnodcf * tsq
-        tempa   = 1.0 - self._m_c1 * tsince
-        tempe   = self.Orbit.BStar * self._m_c4 * tsince
-        templ   = self._m_t2cof * tsq
-        xn      = self._m_xnodp
-        em      = 0.0
-        xinc    = 0.0
+    # @return (e, xincc, omgadf, xnode, xmam) arrays.
+    def _DeepPeriodicsArray(self, e, xincc, omgadf, xnode, xmam, tsince, periodics, work):
+        import numpy as np
 
-        _, xmdf, omgadf, xnode, em, xinc, xn, tsince = self.DeepSecular(xmdf, omgadf, xnode, em, xinc, xn, tsince)
+        n       = tsince.size
+        mul     = np.multiply
+        add     = np.add
+        sub     = np.subtract
+        c       = self._m_consts
+        t       = work.Get("sdp4.t", n)
 
-        a       = math.pow(Globals.Xke / xn, 2.0 / 3.0) * Globals.Sqr(tempa)
-        e       = em - tempe
-        xmam    = xmdf + self._m_xnodp * templ
+        if periodics is None:
+            periodics = self.LunarSolarArray(tsince, (work.Get("sdp4.pe", n), work.Get("sdp4.pinc", n),
+                                                      work.Get("sdp4.pl", n), work.Get("sdp4.pgh", n),
+                                                      work.Get("sdp4.ph", n)), work)
 
-        _, e, xinc, omgadf, xnode, xmam = self.DeepPeriodics(e, xinc, omgadf, xnode, xmam, tsince)
+        pe, pinc, pl, pgh, ph = periodics
 
-        xl      = xmam + omgadf + xnode
+        if c[DeepKernels.XQNCL] >= 0.2:
+            add(xincc, pinc, out=xincc)
+            add(e, pe, out=e)
 
-        xn      = Globals.Xke / math.pow(a, 1.5)
+            # Apply periodics directly
+            phs     = work.Get("sdp4.phs", n)
+            np.divide(ph, c[Kernels.SINIO], out=phs)
+            mul(c[Kernels.COSIO], phs, out=t)
+            sub(pgh, t, out=t)                                  # pgh - cosio * ph
+            add(omgadf, t, out=omgadf)
+            add(xnode, phs, out=xnode)
+            add(xmam, pl, out=xmam)
+        else:
+            # Apply periodics with Lyddane modification
+            sinis   = work.Get("sdp4.sinis", n)
+            cosis   = work.Get("sdp4.cosis", n)
+            sinok   = work.Get("sdp4.sinok", n)
+            cosok   = work.Get("sdp4.cosok", n)
+            alfdp   = work.Get("sdp4.alfdp", n)
+            betdp   = work.Get("sdp4.betdp", n)
+            xls     = work.Get("sdp4.xls", n)
+            pc      = work.Get("sdp4.pc", n)
+            flag    = work.Get("sdp4.flag", n, np.bool_)
+            up      = work.Get("sdp4.up", n, np.bool_)
+
+            np.sin(xincc, out=sinis)
+            np.cos(xincc, out=cosis)
+            add(xincc, pinc, out=xincc)
+            add(e, pe, out=e)
+
+            np.sin(xnode, out=sinok)
+            np.cos(xnode, out=cosok)
+            mul(pinc, cosis, out=pc)
+
+            # alfdp = sinis * sinok + ph * cosok + pinc * cosis * sinok
+            mul(ph, cosok, out=alfdp)
+            mul(pc, sinok, out=t)
+            add(alfdp, t, out=alfdp)
+            mul(sinis, sinok, out=t)
+            add(t, alfdp, out=alfdp)
+
+            # betdp = sinis * cosok - ph * sinok + pinc * cosis * cosok
+            mul(ph, sinok, out=betdp)
+            np.negative(betdp, out=betdp)
+            mul(pc, cosok, out=t)
+            add(betdp, t, out=betdp)
+            mul(sinis, cosok, out=t)
+            add(t, betdp, out=betdp)
+
+            # xls = xmam + omgadf + cosis * xnode + pl + pgh - pinc * xnode * sinis
+            add(xmam, omgadf, out=xls)
+            mul(cosis, xnode, out=t)
+            add(xls, t, out=xls)
+            add(pl, pgh, out=pc)
+            mul(pinc, xnode, out=t)
+            mul(t, sinis, out=t)
+            sub(pc, t, out=pc)
+            add(xls, pc, out=xls)
+
+            # AcTan: the node lies in [-pi/2, 3pi/2), which matters below
+            # as it is not a whole turn apart from arctan2.
+            with np.errstate(divide="ignore", invalid="ignore"):
+                np.divide(alfdp, betdp, out=xnode)
+
+            np.arctan(xnode, out=xnode)
+            np.greater(betdp, 0.0, out=flag)
+            np.logical_not(flag, out=flag)
+            add(Kernels.PI, xnode, out=xnode, where=flag)
+            np.equal(betdp, 0.0, out=flag)
+            np.copyto(xnode, 3.0 * Kernels.PI / 2.0, where=flag)
+            np.greater(alfdp, 0.0, out=up)
+            np.logical_and(flag, up, out=up)
+            np.copyto(xnode, Kernels.PI / 2.0, where=up)
+
+            add(xmam, pl, out=xmam)
+
+            # omgadf = xls - xmam - cos(xincc) * xnode
+            np.cos(xincc, out=t)
+            mul(t, xnode, out=t)
+            sub(xls, xmam, out=omgadf)
+            sub(omgadf, t, out=omgadf)
+
+        return e, xincc, omgadf, xnode, xmam
+
+    def _KernelState(self):
+        return self._dp_int
+
+    def _KernelDeep(self):
+        return True
 
-        return self.FinalPosition(xinc, omgadf, e, a, xl, xnode, xn, tsince)
+    # endregion
@@ -7,6 +7,7 @@
 
 import math
 from pythonOrbitTools.Orbit.NoradBase import NoradBase
+from pythonOrbitTools.Orbit import Kernels
 # from pythonOrbitTools.Orbit.Orbit import Orbit
 from pythonOrbitTools.Core.Globals import Globals
 
@@ -24,18 +25,14 @@ class NoradSGP4(NoradBase):
         self._m_xmcof   = -(2.0 / 3.0) * self._m_coef * self.Orbit.BStar * Globals.Ae / self._m_eeta
         self._m_delmo   = math.pow(1.0 + self._m_eta * math.cos(self.Orbit.MeanAnomaly), 3.0)
         self._m_sinmo   = math.sin(self.Orbit.MeanAnomaly)
+        self._m_consts  = self.KernelConstants()
 
     ##
-    # @brief Calculate satellite ECI position/velocity for a given time.
-    #        This procedure returns the ECI position and velocity for the satellite
-    #        in the orbit at the given number of minutes since the TLE epoch time.
-    #        The algorithm uses NORAD`s Simplified General Perturbation 4 near earth
-    #        orbit model.
+    # @brief The constants of NoradBase followed by the SGP4 block of
+    #        Kernels.
     #
-    # @param tsince Target time, in minutes-past-epoch format.
-    #
-    # @return AU-based position/velocity ECI coordinates.
-    def GetPosition(self, tsince):
+    # @return A list of floats.
+    def KernelConstants(self):
         # For m_perigee less than 220 kilometers, the isimp flag is set and
         # the equations are truncated to linear variation in square root of a
         # and quadratic variation in mean anomaly. Also, the m_c3 term, the
@@ -67,41 +64,142 @@ class NoradSGP4(NoradBase):
             t4cof   = 0.25 * (3.0 * d3 + self._m_c1 * (12.0 * d2 + 10.0 * c1sq))
             t5cof   = 0.2 * (3.0 * d4 + 12.0 * self._m_c1 * d3 + 6.0 * d2 * d2 + 15.0 * c1sq * (2.0 * d2 + c1sq))
 
-        # Update for secular gravity and atmospheric drag.
-        xmdf    = self.Orbit.MeanAnomaly + self._m_xmdot * tsince
-        omgadf  = self.Orbit.ArgPerigee + self._m_omgdot * tsince
-        xnoddf  = self.Orbit.RAAN + self._m_xnodot * tsince
-        omega   = omgadf
-        xmp     = xmdf
-        tsq     = tsince * tsince
-        xnode   = xnoddf + self._m_xnodcf * tsq
-        tempa   = 1.0 - self._m_c1 * tsince
-        tempe   = self.Orbit.BStar * self._m_c4 * tsince
-        templ   = self._m_t2cof * tsq
-
-        if not isimp:
-            delomg  = self._m_omgcof * tsince
-            delm    = self._m_xmcof * (math.pow(1.0 + self._m_eta * math.cos(xmdf), 3.0) - self._m_delmo)
-            temp    = delomg + delm
-
-            xmp     = xmdf + temp
-            omega   = omgadf - temp
-
-            tcube   = tsq * tsince
-            tfour   = tsince * tcube
-
-            tempa   = tempa - d2 * tsq - d3 * tcube - d4 * tfour
-            tempe   = tempe + self.Orbit.BStar * self._m_c5 * (math.sin(xmp) - self._m_sinmo)
-            templ   = templ + t3cof * tcube + tfour * (t4cof + tsince * t5cof)
-
-        a   = self._m_aodp * Globals.Sqr(tempa)
-        e   = self._m_satEcc - tempe
-
-        xl  = xmp + omega + xnode + self._m_xnodp * templ
-        xn  = Globals.Xke / math.pow(a, 1.5)
-
-        return self.FinalPosition(self._m_satInc, omgadf, e, a, xl, xnode, xn, tsince)
+        return super().KernelConstants() + [1.0 if isimp else 0.0, d2, d3, d4, t3cof, t4cof, t5cof, self._m_omgcof,
+                                            self._m_xmcof, self._m_eta, self._m_delmo, self._m_sinmo, self._m_c5]
 
+    ##
+    # @brief Calculate satellite ECI position/velocity for a given time.
+    #        This procedure returns the ECI position and velocity for the satellite
+    #        in the orbit at the given number of minutes since the TLE epoch time.
+    #        The algorithm uses NORAD`s Simplified General Perturbation 4 near earth
+    #        orbit model.
+    #
+    # @param tsince Target time, in minutes-past-epoch format.
+    # @param date Optional Julian date of the target time, e.g. of a
+    #        TimeContext; by default built from tsince.
+    #
+    # @return AU-based position/velocity ECI coordinates.
+    def GetPosition(self, tsince, date=None):
+        # Update for secular gravity and atmospheric drag.
+        incl, omega, e, a, xl, xnode, xn = Kernels.Sgp4Elements(self._m_consts, tsince)
 
+        return self.FinalPosition(incl, omega, e, a, xl, xnode, xn, tsince, date)
 
+    ##
+    # @brief Array form of GetPosition: the secular update is evaluated for all
+    #        times at once and FinalPositionArray does the rest. The Numba
+    #        backend runs the compiled kernels instead, see NoradBase.
+    #
+    # @param tsince Target times, in minutes-past-epoch format.
+    # @param out Optional (position, velocity) arrays of shape (n, 3) to write
+    #        the result into.
+    # @param work Optional Workspace for the intermediate arrays; with out
+    #        and work given, a repeated call allocates nothing.
+    # @param backend "auto", "python" or "numba", default Kernels.GetBackend().
+    #
+    # @return (position, velocity) numpy arrays of shape (n, 3), AU-based.
+    def GetPositionArray(self, tsince, out=None, work=None, backend=None):
+        import numpy as np
+        from pythonOrbitTools.Core.Workspace import Workspace
+
+        if self._UseKernel() and Kernels.Resolve(backend) == "numba":
+            return NoradBase.GetPositionArray(self, tsince, out, work, backend)
+
+        tsince  = np.atleast_1d(np.asarray(tsince, dtype=np.float64))
+        n       = tsince.size
+        work    = Workspace() if work is None else work
+        mul     = np.multiply
+        add     = np.add
+        sub     = np.subtract
+        c       = self._m_consts
+
+        xmdf    = work.Get("sgp4.xmdf", n)
+        omgadf  = work.Get("sgp4.omgadf", n)
+        xnode   = work.Get("sgp4.xnode", n)
+        tsq     = work.Get("sgp4.tsq", n)
+        tempa   = work.Get("sgp4.tempa", n)
+        tempe   = work.Get("sgp4.tempe", n)
+        templ   = work.Get("sgp4.templ", n)
+        t       = work.Get("sgp4.t", n)
 
+        # Update for secular gravity and atmospheric drag.
+        mul(c[Kernels.XMDOT], tsince, out=xmdf)
+        add(c[Kernels.M0], xmdf, out=xmdf)
+        mul(c[Kernels.OMGDOT], tsince, out=omgadf)
+        add(c[Kernels.W0], omgadf, out=omgadf)
+        mul(c[Kernels.XNODOT], tsince, out=xnode)               # xnoddf
+        add(c[Kernels.RAAN0], xnode, out=xnode)
+        omega   = omgadf
+        xmp     = xmdf
+        mul(tsince, tsince, out=tsq)
+        mul(c[Kernels.XNODCF], tsq, out=t)
+        add(xnode, t, out=xnode)
+        mul(c[Kernels.C1], tsince, out=tempa)
+        sub(1.0, tempa, out=tempa)
+        mul(c[Kernels.BSTAR] * c[Kernels.C4], tsince, out=tempe)
+        mul(c[Kernels.T2COF], tsq, out=templ)
+
+        if c[Kernels.ISIMP] == 0.0:
+            delm    = work.Get("sgp4.delm", n)
+            tcube   = work.Get("sgp4.tcube", n)
+            tfour   = work.Get("sgp4.tfour", n)
+            xmp     = work.Get("sgp4.xmp", n)
+            omega   = work.Get("sgp4.omega", n)
+
+            # temp = omgcof * tsince + xmcof * ((1 + eta * cos(xmdf))^3 - delmo)
+            np.cos(xmdf, out=delm)
+            mul(c[Kernels.ETA], delm, out=delm)
+            add(1.0, delm, out=delm)
+            np.power(delm, 3.0, out=delm)
+            sub(delm, c[Kernels.DELMO], out=delm)
+            mul(c[Kernels.XMCOF], delm, out=delm)
+            mul(c[Kernels.OMGCOF], tsince, out=t)
+            add(t, delm, out=t)
+
+            add(xmdf, t, out=xmp)
+            sub(omgadf, t, out=omega)
+
+            mul(tsq, tsince, out=tcube)
+            mul(tsince, tcube, out=tfour)
+
+            # tempa = tempa - d2 * tsq - d3 * tcube - d4 * tfour
+            mul(c[Kernels.D2], tsq, out=t)
+            sub(tempa, t, out=tempa)
+            mul(c[Kernels.D3], tcube, out=t)
+            sub(tempa, t, out=tempa)
+            mul(c[Kernels.D4], tfour, out=t)
+            sub(tempa, t, out=tempa)
+
+            # tempe = tempe + BStar * c5 * (sin(xmp) - sinmo)
+            np.sin(xmp, out=t)
+            sub(t, c[Kernels.SINMO], out=t)
+            mul(c[Kernels.BSTAR] * c[Kernels.C5], t, out=t)
+            add(tempe, t, out=tempe)
+
+            # templ = templ + t3cof * tcube + tfour * (t4cof + tsince * t5cof)
+            mul(c[Kernels.T3COF], tcube, out=t)
+            add(templ, t, out=templ)
+            mul(tsince, c[Kernels.T5COF], out=t)
+            add(c[Kernels.T4COF], t, out=t)
+            mul(tfour, t, out=t)
+            add(templ, t, out=templ)
+
+        a       = work.Get("sgp4.a", n)
+        e       = work.Get("sgp4.e", n)
+        xl      = work.Get("sgp4.xl", n)
+        xn      = work.Get("sgp4.xn", n)
+
+        mul(c[Kernels.AODP], tempa, out=a)
+        mul(a, tempa, out=a)
+        sub(c[Kernels.ECC], tempe, out=e)
+
+        # xl = xmp + omega + xnode + xnodp * templ
+        add(xmp, omega, out=xl)
+        add(xl, xnode, out=xl)
+        mul(c[Kernels.XNODP], templ, out=t)
+        add(xl, t, out=xl)
+
+        np.power(a, 1.5, out=xn)
+        np.divide(Kernels.XKE, xn, out=xn)
+
+        return self.FinalPositionArray(c[Kernels.INCL], omega, e, a, xl, xnode, xn, tsince, out, work)
@@ -11,7 +11,6 @@ from pythonOrbitTools.Core.Tle import Unit
 from pythonOrbitTools.Core.Tle import Field
 from pythonOrbitTools.Core.Globals import Globals
 from pythonOrbitTools.Orbit.NoradSGP4 import NoradSGP4
-from pythonOrbitTools.Orbit.NoradSDP4 import NoradSDP4
 
 ##
 # @brief This class accepts a single satellite`s NORAD two-line element
@@ -111,7 +110,7 @@ class Orbit(object):
 
     @property
     def SatNoradId(self):
-        return self._tle.NoradNumber
+        return self._tle.NoradNum
 
     @property
     def SatName(self):
@@ -181,21 +180,44 @@ class Orbit(object):
 
 
         if (self.Period.total_seconds() / 60.0) >= 225.0:
-            # SDP4 - period >= 225 minutes.
+            # SDP4 - period >= 225 minutes. The deep-space model is only
+            # imported when the first deep-space orbit is created.
+            from pythonOrbitTools.Orbit.NoradSDP4 import NoradSDP4
+
             self._noradModel = NoradSDP4(self)
         else:
             # SGP4 - period < 225 minutes.
             self._noradModel = NoradSGP4(self)
 
+    ##
+    # @brief A copy sharing the elements and the model constants, with its
+    #        own propagation state, see NoradBase.Copy.
+    #
+    # @param tle Optional Tle of the same element set, e.g. under another
+    #        name; by default the Tle is shared.
+    #
+    # @return An Orbit.
+    def Copy(self, tle=None):
+        orbit = Orbit.__new__(Orbit)
+        orbit.__dict__.update(self.__dict__)
+
+        if tle is not None:
+            orbit._tle = tle
+
+        orbit._noradModel = self._noradModel.Copy(orbit)
+
+        return orbit
+
     ##
     # @brief Calculate ECI position/velocity for a given time.
     #
     # @param mpe Target time, in minutes past the TLE epoch.
+    # @param date Optional Julian date of the target time.
     #
     # @return Kilometer-based position/velocity ECI coordinates. 
-    def PositionEciByMpe(self, mpe):
+    def PositionEciByMpe(self, mpe, date=None):
 
-        eci         = self.NoradModel.GetPosition(mpe)
+        eci         = self.NoradModel.GetPosition(mpe, date)
 
         # Convert ECI vector units from AU to kilometers.
         radiusAe    = Globals.Xkmper / Globals.Ae
@@ -205,6 +227,51 @@ class Orbit(object):
 
         return eci
 
+    ##
+    # @brief Calculate ECI positions/velocities for an array of times. Needs numpy.
+    #
+    # @param mpe Target times, in minutes past the TLE epoch.
+    # @param out Optional (position, velocity) arrays of shape (n, 3) to write
+    #        the result into, e.g. views of shared memory or of an mmap.
+    # @param work Optional Workspace; with out and work given, a repeated
+    #        call allocates nothing.
+    # @param backend Propagation backend, "auto", "python" or "numba"; see
+    #        Kernels.
+    # @param periodics Optional lunar-solar terms of an SDP4 orbit for the
+    #        times, see DeepSpace.LunarSolarBatch.
+    #
+    # @return (position, velocity) numpy arrays of shape (n, 3), in km and km/sec.
+    def PositionEciArrayByMpe(self, mpe, out=None, work=None, backend=None, periodics=None):
+
+        if periodics is None:
+            pos, vel    = self.NoradModel.GetPositionArray(mpe, out, work, backend)
+        else:
+            pos, vel    = self.NoradModel.GetPositionArray(mpe, out, work, backend, periodics)
+
+        # Convert ECI vector units from AU to kilometers.
+        radiusAe    = Globals.Xkmper / Globals.Ae
+
+        # Column by column: the strided 1-D updates need no iterator buffer.
+        for i in range(3):
+            pos[:, i] *= radiusAe # km
+            vel[:, i] *= radiusAe * (Globals.MinPerDay / 86400.0) # km /sec
+
+        return pos, vel
+
+    ##
+    # @brief PositionEciArrayByMpe returning VectorArray objects over the
+    #        propagation buffers, without a copy.
+    #
+    # @param mpe Target times, in minutes past the TLE epoch.
+    #
+    # @return (position, velocity) VectorArray objects, in km and km/sec.
+    def PositionVectorArrayByMpe(self, mpe):
+        from pythonOrbitTools.Core.VectorArray import VectorArray
+
+        pos, vel    = self.PositionEciArrayByMpe(mpe)
+
+        return VectorArray.FromXyz(pos), VectorArray.FromXyz(vel)
+
     ##
     # @brief Calculate ECI position/velocity for a given time.
     #
@@ -214,6 +281,16 @@ class Orbit(object):
     def PositionEciByDateTime(self, utc):
         return self.PositionEciByMpe(self.TPlusEpoch(utc).total_seconds()/60.0)
 
+    ##
+    # @brief Calculate ECI position/velocity at the instant of a TimeContext;
+    #        the result carries the context`s Julian date.
+    #
+    # @param context A TimeContext.
+    #
+    # @return Kilometer-based position/velocity ECI coordinates.
+    def PositionEciByTimeContext(self, context):
+        return self.PositionEciByMpe(self.TPlusEpoch(context.Utc).total_seconds()/60.0, context.Date)
+
 
     ##
     # @brief Returns elspaed time from epoch to given time or current time. 
@@ -0,0 +1,455 @@
+##
+# @file Pass.py
+# @brief Pass prediction: rise, set and culmination of a satellite at a site.
+#
+#  A PassPredictor samples the elevation of a satellite at a site on a grid
+#  of whole steps past the TLE epoch, brackets the crossings of the
+#  elevation mask and refines them all together by bisection, and refines
+#  the culmination of each pass by golden section search, one array
+#  propagation per iteration. Passes shorter than the sampling step can be
+#  missed. Needs numpy.
+#
+#  The grid is cut into segments of equal length. A segment is computed on
+#  its own and holds the above-mask stretches within it; passes are stitched
+#  from the stretches of consecutive segments. A pass in progress at either
+#  end of the requested window is completed from the neighbouring segments
+#  (at most MAX_EXTEND of them), so the result does not depend on where the
+#  window starts, and segments can be cached and shared between overlapping
+#  windows, see PassCache.py.
+#
+#  e.g.
+#  predictor = PassPredictor(satellite, site, minElevationDeg=3.0)
+#  for p in predictor.PassesByDateTime(startUtc, endUtc):
+#      print(p.Aos, p.Los, p.MaxElevationDeg)
+#
+# @author df_justforfun@163.com
+# @version 1.0
+# @date 2026-10-19
+
+import datetime
+import math
+from pythonOrbitTools.Core.Globals import Globals
+from pythonOrbitTools.Core.Julian import Julian
+from pythonOrbitTools.Core.Workspace import Workspace
+
+##
+# @brief A pass of a satellite over a site.
+class Pass(object):
+
+    __slots__ = ("_noradId", "_aos", "_los", "_tca", "_maxElevationRad", "_complete")
+
+    ##
+    # @brief
+    #
+    # @param noradId NORAD number of the satellite.
+    # @param aos Acquisition of signal, the rise above the mask (UTC).
+    # @param los Loss of signal, the set below the mask (UTC).
+    # @param tca Time of the highest elevation (UTC).
+    # @param maxElevationRad Highest elevation, in radians.
+    # @param complete False if the rise or the set lies beyond the search
+    #        limit; aos or los then is the limit.
+    #
+    # @return
+    def __init__(self, noradId, aos, los, tca, maxElevationRad, complete=True):
+        self._noradId         = noradId
+        self._aos             = aos
+        self._los             = los
+        self._tca             = tca
+        self._maxElevationRad = maxElevationRad
+        self._complete        = complete
+
+    # region Properties
+
+    @property
+    def NoradId(self):
+        return self._noradId
+
+    @property
+    def Aos(self):
+        return self._aos
+
+    @property
+    def Los(self):
+        return self._los
+
+    @property
+    def Tca(self):
+        return self._tca
+
+    @property
+    def MaxElevationRad(self):
+        return self._maxElevationRad
+
+    @property
+    def MaxElevationDeg(self):
+        return Globals.ToDegrees(self._maxElevationRad)
+
+    @property
+    def Complete(self):
+        return self._complete
+
+    @property
+    def Duration(self):
+        return self._los - self._aos
+
+    # endregion
+
+    def __eq__(self, other):
+        return isinstance(other, Pass) and self._Tuple() == other._Tuple()
+
+    def __hash__(self):
+        return hash(self._Tuple())
+
+    def __repr__(self):
+        return "Pass({}, {}, {}, {}, {:.3f} deg{})".format(self._noradId, self._aos, self._los, self._tca,
+                                                           self.MaxElevationDeg, "" if self._complete else ", incomplete")
+
+    def _Tuple(self):
+        return (self._noradId, self._aos, self._los, self._tca, self._maxElevationRad, self._complete)
+
+
+##
+# @brief Predicts the passes of one satellite over one site. A predictor
+#        keeps a Workspace and must not be used by two threads at once.
+class PassPredictor(object):
+
+    # Neighbouring segments searched for the rise or set of a pass in
+    # progress at either end of a window.
+    MAX_EXTEND = 4
+
+    # region Properties
+
+    @property
+    def Satellite(self):
+        return self._satellite
+
+    @property
+    def Site(self):
+        return self._site
+
+    @property
+    def MinElevationDeg(self):
+        return Globals.ToDegrees(self._mask)
+
+    @property
+    ##
+    # @brief Sampling step, in minutes.
+    #
+    # @return
+    def Step(self):
+        return self._step
+
+    @property
+    ##
+    # @brief Segment length, in minutes; a whole number of steps.
+    #
+    # @return
+    def Segment(self):
+        return self._samples * self._step
+
+    @property
+    ##
+    # @brief Width of the bracket at which the refinement stops, in seconds.
+    #
+    # @return
+    def Tolerance(self):
+        return self._tolerance
+
+    # endregion
+
+    ##
+    # @brief Creates a predictor.
+    #
+    # @param satellite The satellite.
+    # @param site The site.
+    # @param minElevationDeg Elevation mask, in degrees.
+    # @param step Sampling step, in minutes.
+    # @param tolerance Accuracy of the pass times, in seconds.
+    # @param segment Segment length, in minutes, rounded to whole steps.
+    #
+    # @return
+    def __init__(self, satellite, site, minElevationDeg=0.0, step=1.0, tolerance=1.0e-3, segment=360.0):
+        if step <= 0.0:
+            raise ValueError("step")
+
+        if tolerance <= 0.0:
+            raise ValueError("tolerance")
+
+        self._satellite = satellite
+        self._site      = site
+        self._mask      = Globals.ToRadians(minElevationDeg)
+        self._step      = step
+        self._tolerance = tolerance
+        self._samples   = max(int(round(segment / step)), 1)
+        self._work      = Workspace()
+
+    ##
+    # @brief Elevation of the satellite at the site.
+    #
+    # @param mpe Times, in minutes past the TLE epoch, numpy array.
+    #
+    # @return numpy array, in radians.
+    def ElevationArray(self, mpe):
+        import numpy as np
+
+        orbit    = self._satellite.Orbit
+        work     = self._work
+        mpe      = np.asarray(mpe, dtype=np.float64)
+        pos, vel = orbit.PositionEciArrayByMpe(mpe, None, work)
+        gmst     = Julian.ToGmstArray(orbit.Epoch.ToDateArray(mpe / Globals.MinPerDay), None, work)
+
+        return self._site.GetLookAngleArray(pos, vel, gmst, None, work)[1]
+
+    ##
+    # @brief The above-mask stretches within segments, all segments sampled
+    #        and refined together.
+    #
+    # @param indices Segment indices; segment i starts i segment lengths
+    #        after the TLE epoch.
+    #
+    # @return One list per segment of (begin, end, rise, set, tca,
+    #         maxElevationRad), the times in minutes past the TLE epoch. rise
+    #         (set) is False if the stretch begins (ends) with the segment
+    #         instead of a crossing.
+    def ComputeSegments(self, indices):
+        import numpy as np
+
+        indices = list(indices)
+        size    = self._samples + 1
+
+        if not indices:
+            return []
+
+        first   = np.array(indices, dtype=np.float64)[:, None] * self._samples
+        mpe     = (first + np.arange(size, dtype=np.float64)) * self._step
+        el      = self.ElevationArray(mpe.ravel()).reshape(mpe.shape)
+        above   = el >= self._mask
+
+        rows, cols  = np.nonzero(above[:, 1:] != above[:, :-1])
+        times       = self._Refine(mpe[rows, cols], mpe[rows, cols + 1], above[rows, cols]).tolist()
+        rising      = (~above[rows, cols]).tolist()
+        crossings   = [[] for i in indices]
+
+        for row, col, time, rise in zip(rows.tolist(), cols.tolist(), times, rising):
+            crossings[row].append((col, time, rise))
+
+        # Stretches as sample ranges [a, b] of a row with their begin and end
+        # times and flags.
+        stretches = []
+
+        for row in range(len(indices)):
+            current = [row, 0, None, mpe[row, 0], None, False] if above[row, 0] else None
+            found   = []
+
+            for col, time, rise in crossings[row]:
+                if rise:
+                    current = [row, col + 1, None, time, None, True]
+                else:
+                    current[2], current[4] = col, time
+                    found.append(current + [True])
+                    current = None
+
+            if current is not None:
+                current[2], current[4] = self._samples, mpe[row, -1]
+                found.append(current + [False])
+
+            stretches.append(found)
+
+        flat = [stretch for found in stretches for stretch in found]
+
+        if flat:
+            best        = np.array([(row, a + int(np.argmax(el[row, a:b + 1]))) for row, a, b, _, _, _, _ in flat])
+            tca, maxEl  = self._Peak(mpe[best[:, 0], best[:, 1]])
+            peaks       = iter(zip(tca.tolist(), maxEl.tolist()))
+
+        return [[(float(begin), float(end), rise, fall) + next(peaks) for _, _, _, begin, end, rise, fall in found]
+                for found in stretches]
+
+    ##
+    # @brief The above-mask stretches within one segment, see ComputeSegments.
+    #
+    # @return
+    def ComputeSegment(self, index):
+        return self.ComputeSegments([index])[0]
+
+    ##
+    # @brief Passes overlapping a time window, completed beyond its ends.
+    #
+    # @param startMpe Start of the window, in minutes past the TLE epoch.
+    # @param endMpe End of the window, in minutes past the TLE epoch.
+    # @param segments Optional function indices -> ComputeSegments(indices),
+    #        e.g. a cache; default ComputeSegments.
+    #
+    # @return A list of (aos, los, tca, maxElevationRad, complete), the times
+    #         in minutes past the TLE epoch.
+    def Passes(self, startMpe, endMpe, segments=None):
+        segments = segments or self.ComputeSegments
+        length   = self._samples * self._step
+        first    = int(math.floor(startMpe / length))
+        last     = max(int(math.floor(endMpe / length)), first)
+
+        stretches = [stretch for found in segments(range(first, last + 1)) for stretch in found]
+
+        # Complete the passes in progress at the window ends.
+        for _ in range(PassPredictor.MAX_EXTEND):
+            if not stretches or stretches[0][2] or stretches[0][0] != first * length:
+                break
+
+            first     -= 1
+            stretches  = list(segments([first])[0]) + stretches
+
+        for _ in range(PassPredictor.MAX_EXTEND):
+            if not stretches or stretches[-1][3] or stretches[-1][1] != (last + 1) * length:
+                break
+
+            last      += 1
+            stretches += segments([last])[0]
+
+        # Stretches ending and beginning on a segment boundary are one pass.
+        passes = []
+
+        for begin, end, rise, fall, tca, maxEl in stretches:
+            if passes and not passes[-1][5] and not rise:
+                merged     = passes[-1]
+                merged[1]  = end
+                merged[5]  = fall
+
+                if maxEl > merged[3]:
+                    merged[2], merged[3] = tca, maxEl
+            else:
+                passes.append([begin, end, tca, maxEl, rise, fall])
+
+        return [(aos, los, tca, maxEl, rise and fall)
+                for aos, los, tca, maxEl, rise, fall in passes if los > startMpe and aos < endMpe]
+
+    ##
+    # @brief Passes overlapping a UTC time window, completed beyond its ends.
+    #
+    # @param startUtc Start of the window (UTC).
+    # @param endUtc End of the window (UTC).
+    # @param segments Optional function indices -> ComputeSegments(indices).
+    #
+    # @return A list of Pass, in time order.
+    def PassesByDateTime(self, startUtc, endUtc, segments=None):
+        orbit   = self._satellite.Orbit
+        epoch   = orbit.EpochTime
+        noradId = orbit.SatNoradId.strip()
+        passes  = self.Passes(orbit.TPlusEpoch(startUtc).total_seconds() / 60.0,
+                              orbit.TPlusEpoch(endUtc).total_seconds() / 60.0,
+                              segments)
+
+        return [Pass(noradId,
+                     epoch + datetime.timedelta(minutes=aos),
+                     epoch + datetime.timedelta(minutes=los),
+                     epoch + datetime.timedelta(minutes=tca),
+                     maxEl,
+                     complete)
+                for aos, los, tca, maxEl, complete in passes]
+
+    # region Utility
+
+    ##
+    # @brief Bisection of all mask crossings at once.
+    #
+    # @param lo Bracket starts, numpy array.
+    # @param hi Bracket ends, numpy array.
+    # @param aboveLo Whether the satellite is above the mask at lo.
+    #
+    # @return The crossing times, numpy array.
+    def _Refine(self, lo, hi, aboveLo):
+        import numpy as np
+
+        if lo.size == 0:
+            return lo
+
+        steps = max(int(math.ceil(math.log2(self._step * 60.0 / self._tolerance))), 0)
+
+        for _ in range(steps):
+            mid   = 0.5 * (lo + hi)
+            same  = (self.ElevationArray(mid) >= self._mask) == aboveLo
+            lo    = np.where(same, mid, lo)
+            hi    = np.where(same, hi, mid)
+
+        return 0.5 * (lo + hi)
+
+    ##
+    # @brief Golden section search of the highest elevation within one step
+    #        of each of the given sample times, all at once.
+    #
+    # @return (tca, maxElevationRad) numpy arrays.
+    def _Peak(self, centre):
+        import numpy as np
+
+        ratio   = (math.sqrt(5.0) - 1.0) / 2.0
+        steps   = max(int(math.ceil(math.log(2.0 * self._step * 60.0 / self._tolerance) / math.log(1.0 / ratio))), 0)
+
+        lo      = centre - self._step
+        hi      = centre + self._step
+        c       = hi - ratio * (hi - lo)
+        d       = lo + ratio * (hi - lo)
+        fc      = self.ElevationArray(c)
+        fd      = self.ElevationArray(d)
+
+        for _ in range(steps):
+            # The maximum is in [lo, d] if f(c) > f(d), else in [c, hi]; the
+            # inner point kept is reused, one new point is evaluated.
+            left    = fc > fd
+            lo      = np.where(left, lo, c)
+            hi      = np.where(left, d, hi)
+            x       = np.where(left, hi - ratio * (hi - lo), lo + ratio * (hi - lo))
+            fx      = self.ElevationArray(x)
+
+            c, d    = np.where(left, x, d), np.where(left, c, x)
+            fc, fd  = np.where(left, fx, fd), np.where(left, fc, fx)
+
+        return np.where(fc > fd, c, d), np.maximum(fc, fd)
+
+    # endregion
+
+
+if __name__ == "__main__":
+    import os
+    import time
+    from pythonOrbitTools.Core.Tle import Tle
+    from pythonOrbitTools.Core.Site import Site
+    from pythonOrbitTools.Orbit.Satellite import Satellite
+
+    line1 = "1 27424U 02022A   18232.63485883  .00000062  00000-0  23800-4 0  9991"
+    line2 = "2 27424  98.1977 172.8496 0000593 210.3660 252.0729 14.57127161866769"
+
+    satellite = Satellite(Tle(line1, line2, "AQUA"))
+    site      = Site().InitializeByDegLatAndDegLonAndKmAltAndName(34.7444, 113.7783, 0.07)
+
+    # The day of output.eph, local time UTC+8.
+    startUtc  = datetime.datetime(2018, 8, 20, 16, 0, 0)
+    endUtc    = datetime.datetime(2018, 8, 21, 15, 59, 59)
+    offset    = datetime.timedelta(hours=8.0)
+
+    t0        = time.perf_counter()
+    passes    = PassPredictor(satellite, site, minElevationDeg=3.0).PassesByDateTime(startUtc, endUtc)
+    print("{} passes in {:.1f} ms".format(len(passes), (time.perf_counter() - t0) * 1.0e3))
+
+    for p in passes:
+        print("    AOS {} LOS {} TCA {} max {:6.3f} deg".format((p.Aos + offset).strftime("%H:%M:%S.%f")[:-3],
+                                                                 (p.Los + offset).strftime("%H:%M:%S.%f")[:-3],
+                                                                 (p.Tca + offset).strftime("%H:%M:%S.%f")[:-3],
+                                                                 p.MaxElevationDeg))
+
+    # The passes as runs of consecutive seconds in output.eph.
+    path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.realpath(__file__)))), "output.eph")
+
+    if os.path.exists(path):
+        runs = []
+
+        with open(path) as f:
+            for line in f:
+                date, clock, el, az = line.split()
+                t = datetime.datetime.strptime(date + " " + clock, "%Y/%m/%d %H:%M:%S")
+
+                if runs and t - runs[-1][1] == datetime.timedelta(seconds=1):
+                    runs[-1][1], runs[-1][2] = t, max(runs[-1][2], float(el))
+                else:
+                    runs.append([t, t, float(el)])
+
+        for (first, last, el), p in zip(runs, passes):
+            print("    output.eph {} .. {} max {:6.3f} deg".format(first.strftime("%H:%M:%S"), last.strftime("%H:%M:%S"), el))
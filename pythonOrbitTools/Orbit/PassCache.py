@@ -0,0 +1,360 @@
+##
+# @file PassCache.py
+# @brief Cache of pass predictions, shared between overlapping windows.
+#
+#  Pass prediction works on fixed segments of time past the TLE epoch, see
+#  Pass.py. The cache keeps the computed segments, keyed on the hash of the
+#  TLE lines, the geodetic position of the site, the elevation mask, the
+#  sampling step, the tolerance and the segment index, so a window that
+#  overlaps earlier ones only computes the segments not seen before: asking
+#  every hour for the next 48 hours computes one new six-hour segment every
+#  sixth time.
+#
+#  The in-memory cache is an LRU of segments. With a path it is backed by a
+#  SQLite file, which other processes and later runs can share; misses are
+#  looked up there before they are computed.
+#
+#  A different element set for a NORAD number drops the segments of the
+#  previous one, in memory and in the file. Attached to a Catalog, the cache
+#  drops them as soon as the catalog changes, e.g.
+#
+#  cache = PassCache(path="passes.sqlite")
+#  cache.Attach(catalog)
+#  passes = cache.Passes(catalog["27424"], site, startUtc, endUtc, minElevationDeg=3.0)
+#
+# @author df_justforfun@163.com
+# @version 1.0
+# @date 2026-10-19
+
+import atexit
+import hashlib
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from pythonOrbitTools.Orbit.Catalog import Catalog
+from pythonOrbitTools.Orbit.Pass import PassPredictor
+
+##
+# @brief LRU cache of pass prediction segments, optionally backed by SQLite.
+class PassCache(object):
+
+    # Part of every on-disk key, increase when the segment layout changes.
+    FORMAT = 1
+
+    # region Properties
+
+    @property
+    def MaxSize(self):
+        return self._maxSize
+
+    @property
+    def Path(self):
+        return self._path
+
+    # endregion
+
+    ##
+    # @brief Creates a cache.
+    #
+    # @param maxSize Maximum number of segments held in memory.
+    # @param path Optional SQLite file backing the cache.
+    #
+    # @return
+    def __init__(self, maxSize=4096, path=None):
+        self._maxSize   = maxSize
+        self._path      = path
+        self._entries   = OrderedDict()
+        self._tles      = {}
+        self._lock      = threading.Lock()
+        self._db        = None
+
+        self._hits          = 0
+        self._misses        = 0
+        self._evictions     = 0
+        self._diskHits      = 0
+        self._invalidations = 0
+
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS segments "
+                             "(key TEXT PRIMARY KEY, norad TEXT NOT NULL, tle TEXT NOT NULL, data TEXT NOT NULL)")
+            self._db.execute("CREATE INDEX IF NOT EXISTS segments_norad ON segments (norad)")
+            self._db.commit()
+            atexit.register(self.Close)
+
+    ##
+    # @brief Hash of an element set: of its normalized lines, the name is not
+    #        part of it.
+    #
+    # @return
+    @staticmethod
+    def TleHash(satellite):
+        tle = satellite.Orbit.Tle
+
+        return hashlib.sha1("{}\n{}".format(tle.Line1.strip(), tle.Line2.strip()).encode("ascii")).hexdigest()
+
+    ##
+    # @brief Passes of a satellite over a site overlapping a UTC window,
+    #        computed from cached segments where possible. The arguments are
+    #        those of PassPredictor.
+    #
+    # @param satellite The satellite.
+    # @param site The site.
+    # @param startUtc Start of the window (UTC).
+    # @param endUtc End of the window (UTC).
+    # @param minElevationDeg Elevation mask, in degrees.
+    # @param step Sampling step, in minutes.
+    # @param tolerance Accuracy of the pass times, in seconds.
+    # @param segment Segment length, in minutes.
+    #
+    # @return A list of Pass, in time order.
+    def Passes(self, satellite, site, startUtc, endUtc, minElevationDeg=0.0, step=1.0, tolerance=1.0e-3, segment=360.0):
+        predictor = PassPredictor(satellite, site, minElevationDeg, step, tolerance, segment)
+        noradId   = Catalog.Key(satellite.Orbit.SatNoradId)
+        tleHash   = PassCache.TleHash(satellite)
+
+        self._Track(noradId, tleHash)
+
+        group = (noradId, tleHash, site.LatitudeRad, site.LongitudeRad, site.Altitude,
+                 minElevationDeg, predictor.Step, predictor.Tolerance, predictor.Segment)
+
+        return predictor.PassesByDateTime(startUtc, endUtc, lambda indices: self._Segments(predictor, group, indices))
+
+    ##
+    # @brief Drop the segments of NORAD numbers, in memory and in the file.
+    #
+    # @param noradIds NORAD numbers, int or string.
+    #
+    # @return
+    def Invalidate(self, noradIds):
+        keys = set(Catalog.Key(noradId) for noradId in noradIds)
+
+        with self._lock:
+            for key in keys:
+                self._tles.pop(key, None)
+
+            self._Drop(lambda group: group[0] in keys)
+
+            if self._db is not None:
+                self._db.executemany("DELETE FROM segments WHERE norad = ?", [(key,) for key in keys])
+                self._db.commit()
+
+    ##
+    # @brief Invalidate on every change of a catalog, see Catalog.Subscribe.
+    #
+    # @return
+    def Attach(self, catalog):
+        catalog.Subscribe(self.Invalidate)
+
+    def Detach(self, catalog):
+        catalog.Unsubscribe(self.Invalidate)
+
+    ##
+    # @brief Drop all segments held in memory. The SQLite file is kept.
+    #
+    # @return
+    def Clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tles.clear()
+
+    ##
+    # @brief Reset the counters.
+    #
+    # @return
+    def ResetCounters(self):
+        with self._lock:
+            self._hits          = 0
+            self._misses        = 0
+            self._evictions     = 0
+            self._diskHits      = 0
+            self._invalidations = 0
+
+    ##
+    # @brief Returns the counters as a dict; hits, misses and disk hits count
+    #        segments.
+    #
+    # @return
+    def Statistics(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+
+            return {
+                "size"          : len(self._entries),
+                "max_size"      : self._maxSize,
+                "hits"          : self._hits,
+                "misses"        : self._misses,
+                "evictions"     : self._evictions,
+                "disk_hits"     : self._diskHits,
+                "invalidations" : self._invalidations,
+                "hit_rate"      : self._hits / lookups if lookups else 0.0,
+            }
+
+    ##
+    # @brief Close the SQLite file, if any.
+    #
+    # @return
+    def Close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    # region Utility
+
+    ##
+    # @brief The segments of one predictor: from memory, from the file, the
+    #        rest computed in one batch and stored.
+    def _Segments(self, predictor, group, indices):
+        indices = list(indices)
+        found   = {}
+
+        with self._lock:
+            for index in indices:
+                stretches = self._entries.get((group, index))
+
+                if stretches is not None:
+                    self._entries.move_to_end((group, index))
+                    found[index] = stretches
+
+            self._hits   += len(found)
+            self._misses += len(indices) - len(found)
+
+        missing = [index for index in indices if index not in found]
+
+        if missing:
+            loaded   = self._Load(group, missing)
+            missing  = [index for index in missing if index not in loaded]
+            computed = dict(zip(missing, (tuple(s) for s in predictor.ComputeSegments(missing))))
+
+            self._Store(group, computed)
+            found.update(loaded)
+            found.update(computed)
+
+            with self._lock:
+                # Segments of an element set replaced meanwhile are not kept.
+                if self._tles.get(group[0]) == group[1]:
+                    for index in loaded.keys() | computed.keys():
+                        self._entries[(group, index)] = found[index]
+                        self._entries.move_to_end((group, index))
+
+                while len(self._entries) > self._maxSize:
+                    self._entries.popitem(last=False)
+                    self._evictions += 1
+
+        return [found[index] for index in indices]
+
+    ##
+    # @brief Record the element set in use for a NORAD number; the segments
+    #        of a different previous one are dropped.
+    def _Track(self, noradId, tleHash):
+        with self._lock:
+            previous = self._tles.get(noradId)
+
+            if previous == tleHash:
+                return
+
+            self._tles[noradId] = tleHash
+
+            if previous is None and self._db is None:
+                return
+
+            self._Drop(lambda group: group[0] == noradId and group[1] != tleHash)
+
+            if self._db is not None:
+                self._db.execute("DELETE FROM segments WHERE norad = ? AND tle != ?", (noradId, tleHash))
+                self._db.commit()
+
+    ##
+    # @brief Drop the segments of the groups matching; called with the lock
+    #        held.
+    def _Drop(self, match):
+        keys = [key for key in self._entries if match(key[0])]
+
+        for key in keys:
+            del self._entries[key]
+
+        self._invalidations += len(keys)
+
+    @classmethod
+    def _DiskKey(cls, group, index):
+        return json.dumps([cls.FORMAT] + list(group) + [index])
+
+    def _Load(self, group, indices):
+        with self._lock:
+            if self._db is None:
+                return {}
+
+            keys    = dict((PassCache._DiskKey(group, index), index) for index in indices)
+            loaded  = {}
+
+            # At most 500 parameters per statement, below the SQLite limit.
+            names = list(keys)
+
+            for i in range(0, len(names), 500):
+                chunk = names[i:i + 500]
+                rows  = self._db.execute("SELECT key, data FROM segments WHERE key IN ({})".format(
+                    ",".join("?" * len(chunk))), chunk)
+
+                for key, data in rows:
+                    loaded[keys[key]] = tuple(tuple(stretch) for stretch in json.loads(data))
+
+            self._diskHits += len(loaded)
+
+            return loaded
+
+    def _Store(self, group, segments):
+        with self._lock:
+            if self._db is not None and segments:
+                self._db.executemany("INSERT OR REPLACE INTO segments VALUES (?, ?, ?, ?)",
+                                     [(PassCache._DiskKey(group, index), group[0], group[1], json.dumps(stretches))
+                                      for index, stretches in segments.items()])
+                self._db.commit()
+
+    # endregion
+
+
+if __name__ == "__main__":
+    import os
+    import time
+    import datetime
+    import tempfile
+    from pythonOrbitTools.Core.Tle import Tle
+    from pythonOrbitTools.Core.Site import Site
+    from pythonOrbitTools.Orbit.Satellite import Satellite
+
+    line1 = "1 27424U 02022A   18232.63485883  .00000062  00000-0  23800-4 0  9991"
+    line2 = "2 27424  98.1977 172.8496 0000593 210.3660 252.0729 14.57127161866769"
+
+    satellite = Satellite(Tle(line1, line2, "AQUA"))
+    site      = Site().InitializeByDegLatAndDegLonAndKmAltAndName(34.7444, 113.7783, 0.07)
+    start     = datetime.datetime(2018, 8, 20, 16, 0, 0)
+    path      = os.path.join(tempfile.mkdtemp(), "passes.sqlite")
+    cache     = PassCache(path=path)
+
+    # A scheduler asking every hour for the next 48 hours.
+    for hour in range(6):
+        t0     = time.perf_counter()
+        utc    = start + datetime.timedelta(hours=hour)
+        passes = cache.Passes(satellite, site, utc, utc + datetime.timedelta(hours=48), minElevationDeg=3.0)
+        print("{} {:2d} passes in {:6.2f} ms".format(utc, len(passes), (time.perf_counter() - t0) * 1.0e3))
+
+    direct = PassPredictor(satellite, site, 3.0).PassesByDateTime(utc, utc + datetime.timedelta(hours=48))
+    print("equal to a direct prediction: {}".format(passes == direct))
+    print(cache.Statistics())
+
+    # Another process, or a later run, starts from the file.
+    other  = PassCache(path=path)
+    t0     = time.perf_counter()
+    passes = other.Passes(satellite, site, utc, utc + datetime.timedelta(hours=48), minElevationDeg=3.0)
+    print("from the file: {} passes in {:.2f} ms, {}".format(len(passes), (time.perf_counter() - t0) * 1.0e3,
+                                                               other.Statistics()["disk_hits"]))
+
+    # A new element set for the NORAD number drops the old one's segments.
+    later = Satellite(Tle(line1[:20] + "{:012.8f}".format(232.63485883 + 1.0) + line1[32:], line2, "AQUA"))
+    other.Passes(later, site, utc, utc + datetime.timedelta(hours=48), minElevationDeg=3.0)
+    print("after a new element set: {}".format(other.Statistics()))
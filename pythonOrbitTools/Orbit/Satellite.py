@@ -12,6 +12,9 @@ from pythonOrbitTools.Orbit.Orbit import Orbit
 # @brief Class to encapsulate a satellite
 class Satellite(object):
 
+    # The process-wide cache used by FromLines, created on first use.
+    _cache = None
+
     # region Properties
 
     @property
@@ -48,6 +51,65 @@ class Satellite(object):
             self._name = name
 
 
+    ##
+    # @brief A copy that can be propagated independently of this satellite,
+    #        e.g. by another thread: the element set and the model constants
+    #        are shared, the propagation state is not, see Orbit.Copy.
+    #
+    # @param name The name of the copy, also given to its Tle; None keeps
+    #        the name.
+    #
+    # @return A Satellite.
+    def Copy(self, name=None):
+        satellite = type(self).__new__(type(self))
+        satellite.__dict__.update(self.__dict__)
+
+        if name is None or name == self._orbit.SatName:
+            satellite._orbit = self._orbit.Copy()
+        else:
+            satellite._orbit = self._orbit.Copy(self._orbit.Tle.Copy(name))
+            satellite._name  = name or satellite._orbit.SatName
+
+        return satellite
+
+    ##
+    # @brief Returns the satellite for an element set from the process-wide
+    #        SatelliteCache, building and caching it on a miss. Every call
+    #        returns its own copy of the cached satellite, see Copy.
+    #
+    # @param line1 The first line of the TLE.
+    # @param line2 The second line of the TLE.
+    # @param name Satellite name, default value is "".
+    #
+    # @return 
+    @classmethod
+    def FromLines(cls, line1, line2, name=""):
+        return cls.Cache().Get(line1, line2, name)
+
+    ##
+    # @brief The process-wide cache used by FromLines.
+    #
+    # @return 
+    @classmethod
+    def Cache(cls):
+        if Satellite._cache is None:
+            from pythonOrbitTools.Orbit.SatelliteCache import SatelliteCache
+
+            Satellite._cache = SatelliteCache()
+
+        return Satellite._cache
+
+    ##
+    # @brief Replace the process-wide cache, e.g. with a larger or
+    #        disk-backed one.
+    #
+    # @param cache A SatelliteCache.
+    #
+    # @return 
+    @classmethod
+    def SetCache(cls, cache):
+        Satellite._cache = cache
+
     ##
     # @brief Returns the ECI position of the satellite.
     #
@@ -57,6 +119,16 @@ class Satellite(object):
     def PositionEciByDateTime(self, utc):
         return self.Orbit.PositionEciByDateTime(utc)
 
+    ##
+    # @brief Returns the ECI position of the satellite at the instant of a
+    #        TimeContext.
+    #
+    # @param context A TimeContext.
+    #
+    # @return The ECI location of the satellite at the given time.
+    def PositionEciByTimeContext(self, context):
+        return self.Orbit.PositionEciByTimeContext(context)
+
     ##
     # @brief Returns the ECI position of the satellite.
     #
@@ -65,3 +137,58 @@ class Satellite(object):
     # @return The ECI location of the satellite at the given time.
     def PositionEciByMpe(self, mpe):
         return self.Orbit.PositionEciByMpe(mpe)
+
+    ##
+    # @brief Returns the ECI positions of the satellite for an array of times.
+    #
+    # @param mpe The times of position calculation, in minutes-past-epoch.
+    # @param out Optional (position, velocity) arrays to write the result into.
+    # @param work Optional Workspace for the intermediate arrays.
+    # @param backend Propagation backend, see Kernels.
+    #
+    # @return (position, velocity) numpy arrays of shape (n, 3), in km and km/sec.
+    def PositionEciArrayByMpe(self, mpe, out=None, work=None, backend=None):
+        return self.Orbit.PositionEciArrayByMpe(mpe, out, work, backend)
+
+    ##
+    # @brief Returns the ECI positions of the satellite for an array of times
+    #        as VectorArray objects.
+    #
+    # @param mpe The times of position calculation, in minutes-past-epoch.
+    #
+    # @return (position, velocity) VectorArray objects, in km and km/sec.
+    def PositionVectorArrayByMpe(self, mpe):
+        return self.Orbit.PositionVectorArrayByMpe(mpe)
+
+    ##
+    # @brief Propagate the satellite over a long span in fixed-size chunks,
+    #        see Ephemeris.IterEphemeris.
+    #
+    # @param startMpe Start time, in minutes past the TLE epoch.
+    # @param endMpe End time, in minutes past the TLE epoch, included.
+    # @param stepMin Step between samples, in minutes.
+    # @param chunk Maximum number of samples per chunk.
+    # @param site Optional ground station; the chunks then have look angles.
+    # @param reuse Yield views into the same buffers for every chunk.
+    # @param precision "float64", or "float32" to store positions, velocities
+    #        and look angles in single precision.
+    #
+    # @return A generator of EphemerisChunk.
+    def IterEphemeris(self, startMpe, endMpe, stepMin, chunk=None, site=None, reuse=False, precision="float64"):
+        from pythonOrbitTools.Orbit import Ephemeris
+
+        return Ephemeris.IterEphemeris(self, startMpe, endMpe, stepMin, chunk or Ephemeris.CHUNK, site, reuse, precision)
+
+    ##
+    # @brief IterEphemeris over a UTC time window.
+    #
+    # @param startUtc Start of the window (UTC).
+    # @param endUtc End of the window (UTC), included.
+    # @param stepSec Step between samples, in seconds.
+    #
+    # @return A generator of EphemerisChunk.
+    def IterEphemerisByDateTime(self, startUtc, endUtc, stepSec, chunk=None, site=None, reuse=False, precision="float64"):
+        from pythonOrbitTools.Orbit import Ephemeris
+
+        return Ephemeris.IterEphemerisByDateTime(self, startUtc, endUtc, stepSec, chunk or Ephemeris.CHUNK, site, reuse,
+                                                 precision)
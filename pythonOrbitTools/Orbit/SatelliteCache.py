@@ -0,0 +1,217 @@
+##
+# @file SatelliteCache.py
+# @brief Size-bounded LRU cache of initialized Satellite objects.
+#
+#  The cache is keyed on the normalized TLE lines (surrounding white space
+#  removed), so a hit skips the element parsing, the mean motion recovery of
+#  Orbit and the SGP4/SDP4 initialization entirely, whatever name the element
+#  set is asked for under. Satellite.FromLines() uses one process-wide
+#  instance.
+#
+#  Cached satellites are never handed out. Every Get returns a copy sharing
+#  the immutable elements and model constants, with its own name and its own
+#  mutable propagation state (Kepler warm start, SDP4 resonance integrator),
+#  so callers on different threads do not interfere.
+#
+#  With a path the cache is backed by a shelve file. Misses are looked up
+#  there before a satellite is built, and newly built satellites are written
+#  to it, so that other processes start warm. Unpickling a satellite is only
+#  somewhat cheaper than building it; the in-memory cache is what makes hits
+#  cheap.
+#
+# @author df_justforfun@163.com
+# @version 1.0
+# @date 2026-10-19
+
+import atexit
+import pickle
+import shelve
+import threading
+from collections import OrderedDict
+from pythonOrbitTools.Core.Tle import Tle
+from pythonOrbitTools.Orbit.Satellite import Satellite
+
+##
+# @brief LRU cache of Satellite objects keyed on the TLE lines.
+class SatelliteCache(object):
+
+    # Part of every on-disk key, increase when the pickled layout changes.
+    FORMAT = 4
+
+    # region Properties
+
+    @property
+    def MaxSize(self):
+        return self._maxSize
+
+    @property
+    def Path(self):
+        return self._path
+
+    # endregion
+
+    ##
+    # @brief Creates a cache.
+    #
+    # @param maxSize Maximum number of satellites held in memory.
+    # @param path Optional shelve file backing the cache.
+    #
+    # @return
+    def __init__(self, maxSize=1024, path=None):
+        self._maxSize   = maxSize
+        self._path      = path
+        self._entries   = OrderedDict()
+        self._lock      = threading.Lock()
+        self._shelf     = None
+
+        self._hits      = 0
+        self._misses    = 0
+        self._evictions = 0
+        self._diskHits  = 0
+
+        if path is not None:
+            self._shelf = shelve.open(path, protocol=pickle.HIGHEST_PROTOCOL)
+            atexit.register(self.Close)
+
+    ##
+    # @brief Normalize the lines into a cache key.
+    #
+    # @return
+    @staticmethod
+    def Key(line1, line2):
+        return (line1.strip(), line2.strip())
+
+    ##
+    # @brief Returns the satellite for an element set, building it on a miss.
+    #
+    # @param line1 The first line of the TLE.
+    # @param line2 The second line of the TLE.
+    # @param name Satellite name, default value is "".
+    #
+    # @return A Satellite of its own, see Satellite.Copy.
+    def Get(self, line1, line2, name=""):
+        key  = SatelliteCache.Key(line1, line2)
+        name = name.strip()
+
+        with self._lock:
+            satellite = self._entries.get(key)
+
+            if satellite is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return satellite.Copy(name)
+
+            self._misses += 1
+
+        satellite = self._Load(key)
+
+        if satellite is None:
+            satellite = Satellite(Tle(key[0], key[1], name))
+            self._Store(key, satellite)
+
+        with self._lock:
+            # Another thread may have built the same satellite meanwhile.
+            satellite = self._entries.setdefault(key, satellite)
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self._maxSize:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+        return satellite.Copy(name)
+
+    ##
+    # @brief Drop all satellites held in memory. The shelve file is kept.
+    #
+    # @return
+    def Clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    ##
+    # @brief Reset the hit/miss/eviction counters.
+    #
+    # @return
+    def ResetCounters(self):
+        with self._lock:
+            self._hits      = 0
+            self._misses    = 0
+            self._evictions = 0
+            self._diskHits  = 0
+
+    ##
+    # @brief Returns the counters as a dict.
+    #
+    # @return
+    def Statistics(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+
+            return {
+                "size"      : len(self._entries),
+                "max_size"  : self._maxSize,
+                "hits"      : self._hits,
+                "misses"    : self._misses,
+                "evictions" : self._evictions,
+                "disk_hits" : self._diskHits,
+                "hit_rate"  : self._hits / lookups if lookups else 0.0,
+            }
+
+    ##
+    # @brief Close the shelve file, if any.
+    #
+    # @return
+    def Close(self):
+        with self._lock:
+            if self._shelf is not None:
+                self._shelf.close()
+                self._shelf = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    # region Utility
+
+    @classmethod
+    def _DiskKey(cls, key):
+        return "{}\n{}".format(cls.FORMAT, "\n".join(key))
+
+    def _Load(self, key):
+        with self._lock:
+            if self._shelf is None:
+                return None
+
+            try:
+                satellite = self._shelf.get(SatelliteCache._DiskKey(key))
+            except (pickle.UnpicklingError, AttributeError, EOFError, ImportError):
+                # Written by an incompatible version, rebuild it.
+                return None
+
+            if satellite is not None:
+                self._diskHits += 1
+
+            return satellite
+
+    def _Store(self, key, satellite):
+        with self._lock:
+            if self._shelf is not None:
+                self._shelf[SatelliteCache._DiskKey(key)] = satellite
+                self._shelf.sync()
+
+    # endregion
+
+
+if __name__ == "__main__":
+    import time
+
+    line1 = "1 27424U 02022A   18232.63485883  .00000062  00000-0  23800-4 0  9991"
+    line2 = "2 27424  98.1977 172.8496 0000593 210.3660 252.0729 14.57127161866769"
+
+    cache = SatelliteCache(maxSize=16)
+
+    for i in range(3):
+        t0 = time.perf_counter()
+        cache.Get(line1, line2 + "  ", "AQUA")
+        print("{:8.1f} us".format((time.perf_counter() - t0) * 1.0e6))
+
+    print(cache.Statistics())
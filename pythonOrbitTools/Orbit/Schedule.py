@@ -0,0 +1,329 @@
+##
+# @file Schedule.py
+# @brief Assignment of predicted passes to the antennas of ground stations.
+#
+#  A PassScheduler collects passes per site, e.g. from PassPredictor or
+#  PassCache, and assigns them to the antennas of each site without
+#  conflicts: an antenna tracks one pass at a time and needs a setup gap
+#  (slew, reconfiguration) between the loss of one pass and the acquisition
+#  of the next. Every pass has a weight, by default the priority of its
+#  satellite times its duration in minutes, and the scheduler maximizes the
+#  weight of the assigned passes.
+#
+#  Each site is scheduled on its own. Its antennas are filled one after the
+#  other, each with the best set of the passes left over, found by weighted
+#  interval scheduling in O(n log n); for one antenna this is the optimum,
+#  for k antennas it is within a factor 1 - (1 - 1/k)^k of it and usually
+#  much closer. The passes of a site are also held in an IntervalTree for
+#  conflict queries, e.g.
+#
+#  scheduler = PassScheduler({"ZZ": 2, "KS": 1}, setupSec=120.0, priorities={"27424": 5.0})
+#  scheduler.Add("ZZ", cache.Passes(satellite, siteZZ, startUtc, endUtc, minElevationDeg=3.0))
+#  assignments, unassigned = scheduler.Schedule()
+#
+# @author df_justforfun@163.com
+# @version 1.0
+# @date 2026-10-19
+
+import bisect
+import datetime
+from pythonOrbitTools.Core.IntervalTree import IntervalTree
+
+##
+# @brief A pass assigned to an antenna of a site.
+class Assignment(object):
+
+    __slots__ = ("_site", "_antenna", "_pass", "_weight")
+
+    ##
+    # @brief
+    #
+    # @param site The site key given to the scheduler.
+    # @param antenna Index of the antenna, from 0.
+    # @param p The Pass.
+    # @param weight The weight of the pass.
+    #
+    # @return
+    def __init__(self, site, antenna, p, weight):
+        self._site    = site
+        self._antenna = antenna
+        self._pass    = p
+        self._weight  = weight
+
+    # region Properties
+
+    @property
+    def Site(self):
+        return self._site
+
+    @property
+    def Antenna(self):
+        return self._antenna
+
+    @property
+    def Pass(self):
+        return self._pass
+
+    @property
+    def Weight(self):
+        return self._weight
+
+    # endregion
+
+    def __repr__(self):
+        return "Assignment({!r}, {}, {!r})".format(self._site, self._antenna, self._pass)
+
+
+##
+# @brief Assigns passes to the antennas of several sites.
+class PassScheduler(object):
+
+    # region Properties
+
+    @property
+    ##
+    # @brief Number of antennas per site.
+    #
+    # @return A dict site -> count.
+    def Antennas(self):
+        return dict(self._antennas)
+
+    @property
+    def Sites(self):
+        return list(self._antennas)
+
+    # endregion
+
+    ##
+    # @brief Creates a scheduler.
+    #
+    # @param antennas Number of antennas per site, a dict site -> count; the
+    #        sites can be any hashable keys, e.g. Site.Name.
+    # @param setupSec Least time between two passes on one antenna, in
+    #        seconds; a number, or a dict site -> seconds.
+    # @param priorities Optional dict NORAD number -> priority, default 1.0.
+    # @param weight Optional function (site, pass) -> weight replacing the
+    #        default priority * duration in minutes.
+    #
+    # @return
+    def __init__(self, antennas, setupSec=0.0, priorities=None, weight=None):
+        for site, count in antennas.items():
+            if count < 0:
+                raise ValueError("antennas: {!r}".format(site))
+
+        self._antennas   = dict(antennas)
+        self._setup      = dict(setupSec) if isinstance(setupSec, dict) else dict.fromkeys(antennas, setupSec)
+        self._priorities = dict((str(k).strip(), v) for k, v in (priorities or {}).items())
+        self._weight     = weight
+        self._passes     = dict((site, []) for site in antennas)
+        self._trees      = {}
+
+    ##
+    # @brief Add the passes of a site.
+    #
+    # @param site A site given to the constructor.
+    # @param passes Pass objects; only NoradId, Aos and Los are used.
+    #
+    # @return
+    def Add(self, site, passes):
+        if site not in self._antennas:
+            raise ValueError("site: {!r}".format(site))
+
+        self._passes[site].extend(passes)
+        self._trees.pop(site, None)
+
+    ##
+    # @brief The passes added for a site.
+    #
+    # @return A list of Pass.
+    def Passes(self, site):
+        return list(self._passes[site])
+
+    ##
+    # @brief The weight of a pass.
+    #
+    # @return
+    def Weight(self, site, p):
+        if self._weight is not None:
+            return self._weight(site, p)
+
+        return self._priorities.get(str(p.NoradId).strip(), 1.0) * (p.Los - p.Aos).total_seconds() / 60.0
+
+    ##
+    # @brief The passes of a site as an IntervalTree over [Aos, Los).
+    #
+    # @return
+    def Index(self, site):
+        tree = self._trees.get(site)
+
+        if tree is None:
+            tree = IntervalTree((p.Aos, p.Los, p) for p in self._passes[site])
+            self._trees[site] = tree
+
+        return tree
+
+    ##
+    # @brief The passes of a site overlapping a time window.
+    #
+    # @param site The site.
+    # @param startUtc Start of the window (UTC).
+    # @param endUtc End of the window (UTC).
+    #
+    # @return A list of Pass.
+    def Conflicts(self, site, startUtc, endUtc):
+        return self.Index(site).Overlapping(startUtc, endUtc)
+
+    ##
+    # @brief Assign the passes of all sites.
+    #
+    # @return (assignments, unassigned): a list of Assignment ordered by site,
+    #         antenna and AOS, and a list of (site, Pass) not assigned.
+    def Schedule(self):
+        assignments = []
+        unassigned  = []
+
+        for site in self._antennas:
+            assigned, left = self.ScheduleSite(site)
+            assignments   += assigned
+            unassigned    += [(site, p) for p in left]
+
+        return assignments, unassigned
+
+    ##
+    # @brief Assign the passes of one site, one antenna after the other.
+    #
+    # @return (assignments, unassigned passes).
+    def ScheduleSite(self, site):
+        passes = self._passes[site]
+
+        if not passes:
+            return [], []
+
+        # Times in seconds from the earliest AOS; the end of every pass is
+        # moved on by the setup gap, so compatible passes do not overlap.
+        origin  = min(p.Aos for p in passes)
+        setup   = self._setup.get(site, 0.0)
+        items   = [((p.Aos - origin).total_seconds(), (p.Los - origin).total_seconds() + setup, self.Weight(site, p), i)
+                   for i, p in enumerate(passes)]
+
+        # Sorted by end for the recurrence, ties broken by start and order.
+        items.sort(key=lambda item: (item[1], item[0], item[3]))
+
+        assignments = []
+
+        for antenna in range(self._antennas[site]):
+            if not items:
+                break
+
+            chosen = PassScheduler._Best(items)
+            taken  = set(chosen)
+
+            assignments += [Assignment(site, antenna, passes[items[j][3]], items[j][2]) for j in chosen]
+            items        = [item for j, item in enumerate(items) if j not in taken]
+
+        assignments.sort(key=lambda a: (a.Antenna, a.Pass.Aos))
+
+        return assignments, sorted((passes[item[3]] for item in items), key=lambda p: p.Aos)
+
+    # region Utility
+
+    ##
+    # @brief Weighted interval scheduling of items (start, end, weight, i)
+    #        sorted by end.
+    #
+    # @return The indices into items of the best compatible set, in order.
+    @staticmethod
+    def _Best(items):
+        n     = len(items)
+        ends  = [item[1] for item in items]
+        best  = [0.0] * (n + 1) # best[j]: best weight of the first j items
+        prev  = [0] * n
+
+        for j, (start, end, weight, i) in enumerate(items):
+            # Items before j ending no later than it starts.
+            prev[j]     = bisect.bisect_right(ends, start, 0, j)
+            best[j + 1] = max(best[j], weight + best[prev[j]])
+
+        chosen = []
+        j      = n
+
+        while j > 0:
+            if best[j] == best[j - 1]:
+                j -= 1
+            else:
+                chosen.append(j - 1)
+                j = prev[j - 1]
+
+        chosen.reverse()
+
+        return chosen
+
+    # endregion
+
+
+if __name__ == "__main__":
+    import time
+    import random
+    from pythonOrbitTools.Core.Tle import Tle
+    from pythonOrbitTools.Core.Site import Site
+    from pythonOrbitTools.Orbit.Pass import Pass
+    from pythonOrbitTools.Orbit.Satellite import Satellite
+    from pythonOrbitTools.Orbit.PassCache import PassCache
+
+    line1 = "1 27424U 02022A   18232.63485883  .00000062  00000-0  23800-4 0  9991"
+    line2 = "2 27424  98.1977 172.8496 0000593 210.3660 252.0729 14.57127161866769"
+
+    # Satellites in the plane of the one of tle.txt, 30 degrees apart.
+    satellites = [Satellite(Tle("1 {:05d}".format(90000 + i) + line1[7:],
+                                "2 {:05d}".format(90000 + i) + line2[7:43] + "{:8.4f}".format((252.0729 + 30.0 * i) % 360.0) + line2[51:],
+                                "SAT{}".format(i)))
+                  for i in range(12)]
+    sites      = {"ZZ" : Site().InitializeByDegLatAndDegLonAndKmAltAndName(34.7444, 113.7783, 0.07, "ZZ"),
+                  "KS" : Site().InitializeByDegLatAndDegLonAndKmAltAndName(39.5000, 75.9800, 1.30, "KS")}
+    startUtc   = datetime.datetime(2018, 8, 20, 16, 0, 0)
+    endUtc     = startUtc + datetime.timedelta(days=1)
+
+    cache      = PassCache()
+    scheduler  = PassScheduler({"ZZ": 2, "KS": 1}, setupSec=120.0, priorities={"90000": 5.0})
+
+    for name, site in sites.items():
+        for satellite in satellites:
+            scheduler.Add(name, cache.Passes(satellite, site, startUtc, endUtc, minElevationDeg=3.0))
+
+    assignments, unassigned = scheduler.Schedule()
+    print("{} passes, {} assigned, {} unassigned".format(sum(len(scheduler.Passes(s)) for s in sites),
+                                                         len(assignments), len(unassigned)))
+
+    for a in assignments[:6]:
+        p = a.Pass
+        print("    {} #{} {} {} .. {} max {:5.2f} deg".format(a.Site, a.Antenna, p.NoradId, p.Aos.strftime("%H:%M:%S"),
+                                                             p.Los.strftime("%H:%M:%S"), p.MaxElevationDeg))
+
+    site, p = unassigned[0]
+    print("    {} {} unassigned, conflicts with {}".format(site, p.NoradId, sorted(q.NoradId for q in scheduler.Conflicts(site, p.Aos, p.Los) if q is not p)))
+
+    # Scale: 30000 random passes a day over 10 sites of 3 antennas.
+    r         = random.Random(1)
+    names     = ["S{}".format(i) for i in range(10)]
+    scheduler = PassScheduler(dict.fromkeys(names, 3), setupSec=60.0)
+
+    for i in range(30000):
+        aos = startUtc + datetime.timedelta(seconds=r.uniform(0.0, 86400.0))
+        scheduler.Add(names[i % 10], [Pass("{:05d}".format(r.randrange(3000)), aos, aos + datetime.timedelta(seconds=r.uniform(120.0, 900.0)),
+                                           aos, 0.5)])
+
+    t0                      = time.perf_counter()
+    assignments, unassigned = scheduler.Schedule()
+    print("30000 passes: {} assigned in {:.2f} s".format(len(assignments), time.perf_counter() - t0))
+
+    # No antenna holds two passes closer than the setup gap.
+    clash = 0
+
+    for name in names:
+        for antenna in range(3):
+            mine  = [a.Pass for a in assignments if a.Site == name and a.Antenna == antenna]
+            gap   = datetime.timedelta(seconds=60.0)
+            tree  = IntervalTree((p.Aos, p.Los + gap, p) for p in mine)
+            clash += sum(len(tree.Overlapping(p.Aos, p.Los + gap)) - 1 for p in mine)
+
+    print("conflicts: {}".format(clash))
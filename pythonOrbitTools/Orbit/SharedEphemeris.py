@@ -0,0 +1,630 @@
+##
+# @file SharedEphemeris.py
+# @brief Ephemeris tables shared by the processes of one host.
+#
+#  One producer process propagates every satellite once and publishes its
+#  ECI positions and velocities, sampled at a fixed step over a rolling
+#  window, into shared memory (multiprocessing.shared_memory) or into a
+#  memory-mapped file. Readers in other processes attach to it by name and
+#  interpolate positions straight from the shared tables: cubic Hermite
+#  interpolation from the positions and velocities of the two neighbouring
+#  samples, e.g. within 7 m for a LEO satellite sampled every minute. Needs
+#  numpy.
+#
+#  Every table slot has a sequence counter (a seqlock): the producer makes
+#  it odd before it writes the slot and even again afterwards, and a reader
+#  retries when the counter was odd or changed while it read. A reader thus
+#  sees a table either wholly before or wholly after a new element set,
+#  never a mix. The slots are only written by the producer; the stores are
+#  ordered on x86-64, the usual host for this.
+#
+#  With precision="float32" the tables are stored in single precision, half
+#  the memory of a catalog: propagation and interpolation still run in
+#  double precision, only the samples are rounded, to a relative 6e-8
+#  (about 0.5 m in LEO, 2.5 m at GEO distance). The interpolated positions
+#  move by as much, the velocities by about 1e-5 km/sec, both well below the
+#  interpolation error.
+#
+#  Layout, little-endian 8-byte fields except the tables:
+#    header    int64[8]  : MAGIC, FORMAT, capacity, samples, version, table item size (8 or 4), 0, 0
+#              float64[8]: step in minutes, 0, ...
+#    directory int64[capacity, 4]  : sequence, NORAD number (-1 empty), TLE hash, 0
+#              float64[capacity, 2]: first sample time (POSIX seconds, UTC), 0
+#    tables    float64 or float32[capacity, samples, 6]: x, y, z (km), vx, vy, vz (km/sec)
+#
+#  e.g.
+#  producer = SharedEphemeris.Create("ephemeris", capacity=1024, samples=2881, stepMin=1.0)
+#  producer.Publish(satellite, startUtc)
+#  reader   = SharedEphemeris.Attach("ephemeris")          # in another process
+#  pos, vel = reader.Interpolate(27424, utc)
+#
+# @author df_justforfun@163.com
+# @version 1.0
+# @date 2026-10-19
+
+import os
+import mmap
+import atexit
+import time
+import hashlib
+import datetime
+from pythonOrbitTools.Core.Workspace import Workspace
+
+_EPOCH = datetime.datetime(1970, 1, 1)
+
+##
+# @brief Ephemeris tables in shared memory, written by one producer.
+class SharedEphemeris(object):
+
+    MAGIC  = 0x4F5445504845 # "EPHETO"
+    FORMAT = 2
+
+    # Table precisions, the default first.
+    PRECISIONS = ("float64", "float32")
+
+    # Attempts of a reader before it gives up on a slot being rewritten.
+    MAX_RETRY = 10000
+
+    # region Properties
+
+    @property
+    def Name(self):
+        return self._name
+
+    @property
+    def Capacity(self):
+        return self._capacity
+
+    @property
+    def Samples(self):
+        return self._samples
+
+    @property
+    ##
+    # @brief Step between samples, in minutes.
+    #
+    # @return
+    def Step(self):
+        return self._step
+
+    @property
+    ##
+    # @brief Changes whenever a satellite is added to or removed from a slot.
+    #
+    # @return
+    def Version(self):
+        return int(self._header[4])
+
+    @property
+    def IsProducer(self):
+        return self._producer
+
+    @property
+    ##
+    # @brief "float64" or "float32", the precision of the tables.
+    #
+    # @return
+    def Precision(self):
+        return self._tables.dtype.name
+
+    # endregion
+
+    ##
+    # @brief Use Create or Attach.
+    #
+    # @return
+    def __init__(self, name, handle, buffer, producer):
+        import numpy as np
+
+        self._name     = name
+        self._handle   = handle
+        self._buffer   = buffer
+        self._producer = producer
+
+        self._header   = np.ndarray((8,), np.int64, buffer, 0)
+
+        if self._header[0] != SharedEphemeris.MAGIC or self._header[1] != SharedEphemeris.FORMAT:
+            raise ValueError("name: not a shared ephemeris of format {}".format(SharedEphemeris.FORMAT))
+
+        self._capacity = int(self._header[2])
+        self._samples  = int(self._header[3])
+        dtype          = np.float64 if int(self._header[5]) == 8 else np.float32
+        self._step     = float(np.ndarray((8,), np.float64, buffer, 64)[0])
+
+        offset          = 128
+        self._directory = np.ndarray((self._capacity, 4), np.int64, buffer, offset)
+        offset         += self._capacity * 32
+        self._starts    = np.ndarray((self._capacity, 2), np.float64, buffer, offset)
+        offset         += self._capacity * 16
+        self._tables    = np.ndarray((self._capacity, self._samples, 6), dtype, buffer, offset)
+
+        self._slots     = {}
+        self._version   = None
+        self._work      = Workspace()
+
+    ##
+    # @brief Create the shared tables; the caller is the producer, and they
+    #        are removed when it closes them or exits.
+    #
+    # @param name Shared memory name, None for a generated one; ignored with path.
+    # @param capacity Number of satellites.
+    # @param samples Number of samples per satellite.
+    # @param stepMin Step between samples, in minutes.
+    # @param path Optional file to memory-map instead of shared memory.
+    # @param precision "float64", or "float32" for tables of half the size.
+    #
+    # @return
+    @classmethod
+    def Create(cls, name=None, capacity=1024, samples=2881, stepMin=1.0, path=None, precision="float64"):
+        import numpy as np
+
+        if capacity < 1:
+            raise ValueError("capacity")
+
+        if samples < 2:
+            raise ValueError("samples")
+
+        if stepMin <= 0.0:
+            raise ValueError("stepMin")
+
+        if precision not in SharedEphemeris.PRECISIONS:
+            raise ValueError("precision")
+
+        size = SharedEphemeris.Size(capacity, samples, precision)
+
+        if path is not None:
+            with open(path, "wb") as f:
+                f.truncate(size)
+
+            handle = open(path, "r+b")
+            buffer = mmap.mmap(handle.fileno(), size)
+            name   = path
+        else:
+            from multiprocessing import shared_memory
+
+            handle = shared_memory.SharedMemory(name=name, create=True, size=size)
+            buffer = handle.buf
+            name   = handle.name
+
+        header    = np.ndarray((8,), np.int64, buffer, 0)
+        header[:] = (SharedEphemeris.MAGIC, SharedEphemeris.FORMAT, capacity, samples, 0,
+                     np.dtype(precision).itemsize, 0, 0)
+        np.ndarray((8,), np.float64, buffer, 64)[0] = stepMin
+
+        ephemeris = cls(name, handle, buffer, True)
+        ephemeris._directory[:, 0] = 0
+        ephemeris._directory[:, 1] = -1
+
+        atexit.register(ephemeris.Close)
+
+        return ephemeris
+
+    ##
+    # @brief Attach to tables created by a producer, as a reader.
+    #
+    # @param name The Name of the producer: a shared memory name, or the
+    #        path of the memory-mapped file.
+    #
+    # @return
+    @classmethod
+    def Attach(cls, name):
+        # A file, or on Linux the file of the shared memory block, mapped
+        # directly.
+        for path in (name, os.path.join("/dev/shm", name.lstrip("/"))):
+            if os.path.isfile(path):
+                handle = open(path, "rb")
+                buffer = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+
+                return cls(name, handle, buffer, False)
+
+        from multiprocessing import shared_memory
+
+        try:
+            handle = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            # Before Python 3.13 every process attaching registers the block
+            # with its resource tracker, which would remove it at exit.
+            from multiprocessing import resource_tracker
+
+            handle = shared_memory.SharedMemory(name=name)
+            resource_tracker.unregister(handle._name, "shared_memory")
+
+        return cls(name, handle, handle.buf, False)
+
+    ##
+    # @brief Bytes needed for capacity satellites of samples samples.
+    #
+    # @return
+    @staticmethod
+    def Size(capacity, samples, precision="float64"):
+        return 128 + capacity * (32 + 16 + samples * (24 if precision == "float32" else 48))
+
+    # region Producer
+
+    ##
+    # @brief Propagate a satellite over the window starting at startUtc and
+    #        publish it, replacing its previous table, e.g. of an older
+    #        element set. A satellite the model cannot propagate over the
+    #        window (decayed) is removed and the ValueError raised.
+    #
+    # @param satellite The satellite.
+    # @param startUtc Time of the first sample (UTC).
+    #
+    # @return The slot index.
+    def Publish(self, satellite, startUtc):
+        import numpy as np
+
+        self._CheckProducer()
+
+        orbit   = satellite.Orbit
+        noradId = int(orbit.SatNoradId)
+        slot    = self._Slot(noradId)
+
+        if slot is None:
+            free = np.flatnonzero(self._directory[:, 1] == -1)
+
+            if free.size == 0:
+                raise ValueError("capacity: no free slot for {}".format(noradId))
+
+            slot = int(free[0])
+
+        first   = orbit.TPlusEpoch(startUtc).total_seconds() / 60.0
+        mpe     = self._work.Get("mpe", self._samples)
+        np.multiply(np.arange(self._samples, dtype=np.float64), self._step, out=mpe)
+        mpe    += first
+
+        table   = self._tables[slot]
+        entry   = self._directory[slot]
+        added   = entry[1] != noradId
+
+        entry[0] += 1 # odd: being written
+
+        try:
+            entry[1] = noradId
+            entry[2] = SharedEphemeris.TleHash(satellite)
+            self._starts[slot, 0] = (startUtc - _EPOCH).total_seconds()
+
+            if table.dtype == np.float64:
+                orbit.PositionEciArrayByMpe(mpe, (table[:, 0:3], table[:, 3:6]), self._work)
+            else:
+                # Propagated in double precision, rounded when stored.
+                pos = self._work.Get("pos", 3 * self._samples).reshape(self._samples, 3)
+                vel = self._work.Get("vel", 3 * self._samples).reshape(self._samples, 3)
+
+                orbit.PositionEciArrayByMpe(mpe, (pos, vel), self._work)
+                np.copyto(table[:, 0:3], pos, casting="same_kind")
+                np.copyto(table[:, 3:6], vel, casting="same_kind")
+        except ValueError:
+            entry[1] = -1
+            added    = True
+            raise
+        finally:
+            entry[0] += 1 # even: consistent
+
+            if added:
+                self._header[4] += 1
+                self._slots = {}
+
+        return slot
+
+    ##
+    # @brief Publish satellites over a new window, e.g. once per step of the
+    #        rolling window. Decayed satellites are removed and skipped.
+    #
+    # @param satellites The satellites.
+    # @param startUtc Time of the first sample (UTC).
+    #
+    # @return The NORAD numbers skipped.
+    def Roll(self, satellites, startUtc):
+        skipped = []
+
+        for satellite in satellites:
+            try:
+                self.Publish(satellite, startUtc)
+            except ValueError:
+                skipped.append(int(satellite.Orbit.SatNoradId))
+
+        return skipped
+
+    ##
+    # @brief Remove the table of a satellite.
+    #
+    # @return True if there was one.
+    def Remove(self, noradId):
+        self._CheckProducer()
+
+        slot = self._Slot(int(noradId))
+
+        if slot is None:
+            return False
+
+        entry     = self._directory[slot]
+        entry[0] += 1
+        entry[1]  = -1
+        entry[0] += 1
+
+        self._header[4] += 1
+        self._slots      = {}
+
+        return True
+
+    # endregion
+
+    ##
+    # @brief Hash of the normalized TLE lines, as an int64.
+    #
+    # @return
+    @staticmethod
+    def TleHash(satellite):
+        tle    = satellite.Orbit.Tle
+        digest = hashlib.sha1("{}\n{}".format(tle.Line1.strip(), tle.Line2.strip()).encode("ascii")).digest()
+
+        return int.from_bytes(digest[:8], "little", signed=True)
+
+    ##
+    # @brief The NORAD numbers published.
+    #
+    # @return A list of int.
+    def NoradIds(self):
+        return [int(n) for n in self._directory[:, 1] if n != -1]
+
+    ##
+    # @brief The window and element set of a satellite's table.
+    #
+    # @return (first sample time (UTC), last sample time (UTC), TLE hash).
+    def Window(self, noradId):
+        def read(slot):
+            start = _EPOCH + datetime.timedelta(seconds=float(self._starts[slot, 0]))
+
+            return start, start + datetime.timedelta(minutes=self._step * (self._samples - 1)), int(self._directory[slot, 2])
+
+        return self._Read(int(noradId), read)
+
+    ##
+    # @brief Interpolated ECI position and velocity of a satellite.
+    #
+    # @param noradId NORAD number.
+    # @param utc The time (UTC), within the window.
+    #
+    # @return (position, velocity) numpy arrays of shape (3,), in km and km/sec.
+    def Interpolate(self, noradId, utc):
+        import numpy as np
+
+        offset = (utc - _EPOCH).total_seconds()
+
+        def read(slot):
+            x = (offset - self._starts[slot, 0]) / 60.0 / self._step
+
+            if not 0.0 <= x <= self._samples - 1:
+                raise ValueError("utc: outside of the window")
+
+            # Plain floats: for one time numpy costs more than the sums.
+            i       = min(int(x), self._samples - 2)
+            s       = x - i
+            h       = self._step * 60.0
+            a, b    = self._tables[slot, i].tolist(), self._tables[slot, i + 1].tolist()
+            s2, s3  = s * s, s * s * s
+            h00, h10, h01, h11 = 2.0 * s3 - 3.0 * s2 + 1.0, (s3 - 2.0 * s2 + s) * h, 3.0 * s2 - 2.0 * s3, (s3 - s2) * h
+            d00, d10, d01, d11 = (6.0 * s2 - 6.0 * s) / h, 3.0 * s2 - 4.0 * s + 1.0, (6.0 * s - 6.0 * s2) / h, 3.0 * s2 - 2.0 * s
+
+            return (np.array([h00 * a[k] + h10 * a[k + 3] + h01 * b[k] + h11 * b[k + 3] for k in range(3)]),
+                    np.array([d00 * a[k] + d10 * a[k + 3] + d01 * b[k] + d11 * b[k + 3] for k in range(3)]))
+
+        return self._Read(int(noradId), read)
+
+    ##
+    # @brief Interpolated ECI positions and velocities of a satellite for an
+    #        array of times, computed straight from the shared table.
+    #
+    # @param noradId NORAD number.
+    # @param startUtc Reference time (UTC).
+    # @param minutes Sample times, in minutes after startUtc, within the window.
+    # @param out Optional (position, velocity) arrays of shape (n, 3).
+    #
+    # @return (position, velocity) numpy arrays of shape (n, 3), in km and km/sec.
+    def InterpolateArray(self, noradId, startUtc, minutes, out=None):
+        import numpy as np
+
+        minutes = np.asarray(minutes, dtype=np.float64)
+        offset  = (startUtc - _EPOCH).total_seconds()
+
+        if out is None:
+            out = (np.empty((minutes.shape[0], 3)), np.empty((minutes.shape[0], 3)))
+
+        def read(slot):
+            return self._Hermite(slot, (offset - self._starts[slot, 0]) / 60.0 + minutes, out)
+
+        return self._Read(int(noradId), read)
+
+    ##
+    # @brief Detach; the producer also removes the shared memory or file.
+    #
+    # @return
+    def Close(self):
+        if self._handle is None:
+            return
+
+        # Drop the views before the buffer is released.
+        self._header = self._directory = self._starts = self._tables = None
+        self._work.Clear()
+
+        if isinstance(self._buffer, mmap.mmap):
+            self._buffer.close()
+            self._handle.close()
+
+            if self._producer:
+                os.remove(self._name)
+        else:
+            self._handle.close()
+
+            if self._producer:
+                self._handle.unlink()
+
+        self._handle = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.Close()
+
+    def __contains__(self, noradId):
+        return self._Slot(int(noradId)) is not None
+
+    # region Utility
+
+    def _CheckProducer(self):
+        if not self._producer:
+            raise ValueError("not the producer")
+
+    ##
+    # @brief The slot of a NORAD number, None if unpublished; the map is
+    #        rebuilt when the directory version changed.
+    def _Slot(self, noradId):
+        version = int(self._header[4])
+
+        if version != self._version:
+            norads        = self._directory[:, 1].tolist()
+            self._slots   = dict((n, i) for i, n in enumerate(norads) if n != -1)
+            self._version = version
+
+        return self._slots.get(noradId)
+
+    ##
+    # @brief Run read(slot) on the table of a satellite under the seqlock; a
+    #        ValueError of read, e.g. from a torn window start, is retried
+    #        unless the table was left unchanged.
+    def _Read(self, noradId, read):
+        for attempt in range(SharedEphemeris.MAX_RETRY):
+            slot = self._Slot(noradId)
+
+            if slot is None:
+                raise KeyError(noradId)
+
+            sequence = int(self._directory[slot, 0])
+
+            if sequence & 1 or self._directory[slot, 1] != noradId:
+                # Being written, or moved to another slot.
+                self._version = None
+                time.sleep(0)
+                continue
+
+            try:
+                result = read(slot)
+            except ValueError:
+                if int(self._directory[slot, 0]) == sequence:
+                    raise
+                continue
+
+            if int(self._directory[slot, 0]) == sequence:
+                return result
+
+        raise RuntimeError("table of {} rewritten {} times while read".format(noradId, SharedEphemeris.MAX_RETRY))
+
+    ##
+    # @brief Cubic Hermite interpolation of a table at fractional sample
+    #        indices.
+    def _Hermite(self, slot, minutes, out):
+        import numpy as np
+
+        x = minutes / self._step
+
+        if x.size and (x.min() < 0.0 or x.max() > self._samples - 1):
+            raise ValueError("utc: outside of the window")
+
+        i       = np.minimum(x.astype(np.int64), self._samples - 2)
+        s       = (x - i)[:, None]
+        h       = self._step * 60.0 # seconds
+        table   = self._tables[slot]
+        a, b    = table[i].astype(np.float64, copy=False), table[i + 1].astype(np.float64, copy=False)
+        p0, v0  = a[:, 0:3], a[:, 3:6] * h
+        p1, v1  = b[:, 0:3], b[:, 3:6] * h
+
+        s2, s3  = s * s, s * s * s
+        pos, vel = out
+
+        pos[:] = (2.0 * s3 - 3.0 * s2 + 1.0) * p0 + (s3 - 2.0 * s2 + s) * v0 + (3.0 * s2 - 2.0 * s3) * p1 + (s3 - s2) * v1
+        vel[:] = ((6.0 * s2 - 6.0 * s) * p0 + (3.0 * s2 - 4.0 * s + 1.0) * v0 + (6.0 * s - 6.0 * s2) * p1
+                  + (3.0 * s2 - 2.0 * s) * v1) / h
+
+        return pos, vel
+
+    # endregion
+
+
+def _Reader(name, noradId, startUtc, count, queue):
+    import numpy as np
+
+    reader  = SharedEphemeris.Attach(name)
+    minutes = np.linspace(0.0, 1400.0, 50)
+    seen    = []
+
+    for i in range(count):
+        seen.append(reader.InterpolateArray(noradId, startUtc, minutes)[0])
+
+    reader.Close()
+    queue.put(seen)
+
+
+if __name__ == "__main__":
+    import multiprocessing
+    import numpy as np
+    from pythonOrbitTools.Core.Tle import Tle
+    from pythonOrbitTools.Orbit.Satellite import Satellite
+
+    line1 = "1 27424U 02022A   18232.63485883  .00000062  00000-0  23800-4 0  9991"
+    line2 = "2 27424  98.1977 172.8496 0000593 210.3660 252.0729 14.57127161866769"
+
+    satellite = Satellite(Tle(line1, line2, "AQUA"))
+    newer     = Satellite(Tle(line1[:20] + "{:012.8f}".format(232.63485883 + 0.5) + line1[32:], line2, "AQUA"))
+    startUtc  = datetime.datetime(2018, 8, 20, 16, 0, 0)
+
+    with SharedEphemeris.Create(capacity=16, samples=1441, stepMin=1.0) as producer:
+        t0 = time.perf_counter()
+        producer.Publish(satellite, startUtc)
+        print("{}: published 1441 samples in {:.2f} ms".format(producer.Name, (time.perf_counter() - t0) * 1.0e3))
+
+        # Interpolation error against propagation, between the samples.
+        minutes  = np.arange(0.0, 1440.0, 0.37)
+        pos, vel = producer.InterpolateArray(27424, startUtc, minutes)
+        p, v     = satellite.Orbit.PositionEciArrayByMpe(satellite.Orbit.TPlusEpoch(startUtc).total_seconds() / 60.0 + minutes)
+        print("interpolation error: {:.2e} km, {:.2e} km/sec".format(np.abs(pos - p).max(), np.abs(vel - v).max()))
+
+        # The same table in single precision: half the size, and the rounding
+        # far below the interpolation error.
+        with SharedEphemeris.Create(capacity=16, samples=1441, stepMin=1.0, precision="float32") as single:
+            single.Publish(satellite, startUtc)
+            p32, v32 = single.InterpolateArray(27424, startUtc, minutes)
+            print("float32: {} of {} bytes, deviation from float64 {:.2e} km, {:.2e} km/sec".format(
+                  SharedEphemeris.Size(16, 1441, "float32"), SharedEphemeris.Size(16, 1441),
+                  np.abs(p32 - pos).max(), np.abs(v32 - vel).max()))
+
+        times = [startUtc + datetime.timedelta(minutes=i * 1.37) for i in range(1000)]
+        t0    = time.perf_counter()
+        for utc in times:
+            p, v = producer.Interpolate(27424, utc)
+        print("Interpolate: {:.1f} us, equal to InterpolateArray: {}".format((time.perf_counter() - t0) * 1.0e3,
+              np.allclose(p, producer.InterpolateArray(27424, utc, [0.0])[0][0], rtol=0.0, atol=1.0e-9)))
+
+        # A reader in another process while the element set flips.
+        context = multiprocessing.get_context("spawn")
+        queue   = context.Queue()
+        worker  = context.Process(target=_Reader, args=(producer.Name, 27424, startUtc, 300, queue))
+        worker.start()
+
+        flips = 0
+
+        while worker.is_alive() and queue.empty():
+            producer.Publish(newer if flips % 2 else satellite, startUtc)
+            flips += 1
+
+        seen = queue.get()
+        worker.join()
+
+        expected = [s.Orbit.PositionEciArrayByMpe(s.Orbit.TPlusEpoch(startUtc).total_seconds() / 60.0
+                                                  + np.linspace(0.0, 1400.0, 50))[0]
+                    for s in (satellite, newer)]
+
+        # Each read matches one element set (to the interpolation error).
+        torn = sum(min(np.abs(pos - p).max() for p in expected) > 0.1 for pos in seen)
+        print("{} reads during {} updates, {} torn".format(len(seen), flips, torn))
@@ -0,0 +1,257 @@
+##
+# @file Timeline.py
+# @brief A satellite propagated from a sequence of element sets.
+#
+#  A TimelineSatellite holds the element sets of one NORAD number and
+#  propagates every sample time with the set whose epoch is nearest, i.e.
+#  it hands over from one set to the next midway between their epochs. Only
+#  the Orbit of the active set is kept: it is built when its segment is
+#  first needed and released when another segment becomes active, so weeks
+#  of element sets cost the memory of one model.
+#
+#  An array of times is split into segments and propagated with one array
+#  call per segment, e.g.
+#  timeline = TimelineSatellite.FromLines(entries)
+#  pos, vel = timeline.PositionEciArrayByDateTime(startUtc, numpy.arange(0.0, 20160.0, 1.0))
+#
+# @author df_justforfun@163.com
+# @version 1.0
+# @date 2026-10-19
+
+import bisect
+from pythonOrbitTools.Core.Tle import Tle
+from pythonOrbitTools.Orbit.Orbit import Orbit
+
+##
+# @brief A satellite with several element sets, each used around its epoch.
+class TimelineSatellite(object):
+
+    # region Properties
+
+    @property
+    def Name(self):
+        return self._name
+
+    @property
+    def NoradId(self):
+        return self._tles[0].NoradNum
+
+    @property
+    ##
+    # @brief The element sets, in epoch order.
+    #
+    # @return A list of Tle.
+    def Tles(self):
+        return list(self._tles)
+
+    @property
+    ##
+    # @brief The epochs of the element sets (UTC).
+    #
+    # @return A list of datetime.
+    def Epochs(self):
+        return list(self._epochs)
+
+    @property
+    ##
+    # @brief The times (UTC) of the hand-overs, one less than element sets.
+    #
+    # @return A list of datetime.
+    def HandOvers(self):
+        return list(self._handOvers)
+
+    @property
+    ##
+    # @brief Index of the element set whose Orbit is kept, None before the
+    #        first propagation.
+    #
+    # @return
+    def ActiveIndex(self):
+        return self._index
+
+    # endregion
+
+    ##
+    # @brief
+    #
+    # @param tles Element sets of one NORAD number, in any order. Of sets
+    #        with equal epochs the last one is used.
+    # @param name Optional satellite name, default the name of the latest set.
+    #
+    # @return
+    def __init__(self, tles, name=""):
+        tles = sorted(tles, key=lambda tle: tle.EpochJulian.Date)
+
+        if not tles:
+            raise ValueError("tles")
+
+        if len(set(tle.NoradNum.strip() for tle in tles)) != 1:
+            raise ValueError("tles: more than one NORAD number")
+
+        # Of sets with equal epochs keep the last one given.
+        tles = [tle for tle, after in zip(tles, tles[1:] + [None])
+                if after is None or after.EpochJulian.Date != tle.EpochJulian.Date]
+
+        self._tles      = tles
+        self._epochs    = [tle.EpochJulian.ToTime() for tle in tles]
+        self._handOvers = [a + (b - a) / 2 for a, b in zip(self._epochs, self._epochs[1:])]
+        self._name      = name or tles[-1].Name
+        self._index     = None
+        self._orbit     = None
+
+    ##
+    # @brief Build from element sets.
+    #
+    # @param entries (name, line1, line2) tuples of one NORAD number.
+    # @param name Optional satellite name.
+    #
+    # @return
+    @classmethod
+    def FromLines(cls, entries, name=""):
+        return cls([Tle(line1, line2, entryName) for entryName, line1, line2 in entries], name)
+
+    ##
+    # @brief Index of the element set used at a time.
+    #
+    # @param utc The time (UTC).
+    #
+    # @return
+    def Index(self, utc):
+        return bisect.bisect_right(self._handOvers, utc)
+
+    ##
+    # @brief The Orbit of an element set, which becomes the active one.
+    #
+    # @param index Index of the element set.
+    #
+    # @return
+    def OrbitAt(self, index):
+        if index != self._index:
+            # Release the previous model before building the next one.
+            self._orbit = None
+            self._orbit = Orbit(self._tles[index])
+            self._index = index
+
+        return self._orbit
+
+    ##
+    # @brief Returns the ECI position of the satellite.
+    #
+    # @param utc The time (UTC) of position calculation.
+    #
+    # @return The ECI location of the satellite at the given time.
+    def PositionEciByDateTime(self, utc):
+        return self.OrbitAt(self.Index(utc)).PositionEciByDateTime(utc)
+
+    ##
+    # @brief Returns the ECI position of the satellite at the instant of a
+    #        TimeContext.
+    #
+    # @param context A TimeContext.
+    #
+    # @return The ECI location of the satellite at the given time.
+    def PositionEciByTimeContext(self, context):
+        return self.OrbitAt(self.Index(context.Utc)).PositionEciByTimeContext(context)
+
+    ##
+    # @brief Index of the element set used at each of an array of times.
+    #
+    # @param startUtc Reference time (UTC).
+    # @param minutes Sample times, in minutes after startUtc.
+    #
+    # @return numpy integer array.
+    def IndexArray(self, startUtc, minutes):
+        import numpy as np
+
+        return np.searchsorted(self._Bounds(startUtc), minutes, side="right")
+
+    ##
+    # @brief Returns the ECI positions of the satellite for an array of times,
+    #        one array propagation per element set used. The element sets are
+    #        activated in epoch order.
+    #
+    # @param startUtc Reference time (UTC).
+    # @param minutes Sample times, in minutes after startUtc.
+    # @param out Optional (position, velocity) arrays to write the result into.
+    # @param work Optional Workspace for the intermediate arrays.
+    #
+    # @return (position, velocity) numpy arrays of shape (n, 3), in km and km/sec.
+    def PositionEciArrayByDateTime(self, startUtc, minutes, out=None, work=None):
+        import numpy as np
+
+        minutes = np.asarray(minutes, dtype=np.float64)
+        n       = minutes.shape[0]
+
+        if out is None:
+            pos, vel = np.zeros((n, 4))[:, :3], np.zeros((n, 4))[:, :3]
+        else:
+            pos, vel = out
+
+        if n > 1 and np.any(minutes[1:] < minutes[:-1]):
+            order    = np.argsort(minutes, kind="stable")
+            p, v     = self.PositionEciArrayByDateTime(startUtc, minutes[order], None, work)
+            pos[order], vel[order] = p, v
+
+            return pos, vel
+
+        # Sorted times: segment k is the slice between edges k and k + 1.
+        edges = [0] + np.searchsorted(minutes, self._Bounds(startUtc), side="left").tolist() + [n]
+
+        for index in range(len(self._tles)):
+            begin, end = edges[index], edges[index + 1]
+
+            if begin == end:
+                continue
+
+            orbit  = self.OrbitAt(index)
+            offset = (startUtc - orbit.EpochTime).total_seconds() / 60.0
+
+            orbit.PositionEciArrayByMpe(minutes[begin:end] + offset, (pos[begin:end], vel[begin:end]), work)
+
+        return pos, vel
+
+    # region Utility
+
+    ##
+    # @brief The hand-over times, in minutes after startUtc.
+    def _Bounds(self, startUtc):
+        import numpy as np
+
+        return np.array([(t - startUtc).total_seconds() / 60.0 for t in self._handOvers], dtype=np.float64)
+
+    # endregion
+
+
+if __name__ == "__main__":
+    import datetime
+    import numpy as np
+
+    line1 = "1 27424U 02022A   18232.63485883  .00000062  00000-0  23800-4 0  9991"
+    line2 = "2 27424  98.1977 172.8496 0000593 210.3660 252.0729 14.57127161866769"
+
+    # Synthetic later element sets: the same elements with the epoch moved
+    # on by two and four days, so that the hand-overs are easy to see.
+    entries  = [("AQUA", line1[:20] + "{:012.8f}".format(232.63485883 + days) + line1[32:], line2)
+                for days in (4.0, 0.0, 2.0)]
+    timeline = TimelineSatellite.FromLines(entries)
+    startUtc = datetime.datetime(2018, 8, 20, 0, 0, 0)
+    minutes  = np.arange(0.0, 7.0 * 1440.0, 0.5)
+
+    pos, vel = timeline.PositionEciArrayByDateTime(startUtc, minutes)
+    index    = timeline.IndexArray(startUtc, minutes)
+
+    print("epochs    : {}".format(", ".join(str(t) for t in timeline.Epochs)))
+    print("hand-overs: {}".format(", ".join(str(t) for t in timeline.HandOvers)))
+    print("samples per element set: {}".format(np.bincount(index).tolist()))
+
+    worst = 0.0
+
+    for i in range(0, len(minutes), 499):
+        eci   = timeline.PositionEciByDateTime(startUtc + datetime.timedelta(minutes=float(minutes[i])))
+        worst = max(worst, np.abs(pos[i] - (eci.Position.X, eci.Position.Y, eci.Position.Z)).max())
+
+    print("array vs scalar, max |dpos| = {:.3e} km".format(worst))
+
+    shuffled = np.random.default_rng(1).permutation(len(minutes))
+    p, v     = timeline.PositionEciArrayByDateTime(startUtc, minutes[shuffled])
+    print("shuffled times equal: {}".format(np.array_equal(p, pos[shuffled]) and np.array_equal(v, vel[shuffled])))
@@ -0,0 +1,328 @@
+##
+# @file Visibility.py
+# @brief A time index of the satellites above the mask at each site.
+#
+#  A VisibilityIndex predicts the passes of a set of satellites over a set of
+#  sites for a time horizon once, and then answers "which satellites are
+#  above the mask at site S at time t" and "during [t1, t2)" from sorted AOS
+#  and LOS lists, without any propagation: a bisection plus a scan of the
+#  passes that began within the last MAX_SHORT. The few longer passes
+#  (high orbits, passes cut at the horizon) are kept apart and scanned.
+#
+#  Advance moves the horizon forward: expired passes are dropped and only
+#  the passes of the new stretch of time are predicted. The predictions go
+#  through a PassCache, so moving on by less than a segment propagates
+#  nothing new. Built from a Catalog, the index follows it: the passes of
+#  the satellites the catalog adds, changes or removes are replaced.
+#
+#  Queries never block; Advance and the catalog updates build new tables
+#  and swap them in at once, e.g.
+#  index = VisibilityIndex(catalog, {"ZZ": site}, startUtc, horizonHours=48.0, minElevationDeg=3.0)
+#  index.VisibleAt("ZZ", utc), index.VisibleDuring("ZZ", startUtc, endUtc)
+#  index.Advance(startUtc + datetime.timedelta(hours=1))
+#
+# @author df_justforfun@163.com
+# @version 1.0
+# @date 2026-10-19
+
+import bisect
+import datetime
+import threading
+from pythonOrbitTools.Orbit.Catalog import Catalog
+from pythonOrbitTools.Orbit.PassCache import PassCache
+
+##
+# @brief Precomputed passes of satellites over sites, by time.
+class VisibilityIndex(object):
+
+    # Passes at most this long are found by the bisection, longer ones are
+    # scanned.
+    MAX_SHORT = datetime.timedelta(hours=1)
+
+    # region Properties
+
+    @property
+    def Start(self):
+        return self._state[0]
+
+    @property
+    def End(self):
+        return self._state[1]
+
+    @property
+    def Sites(self):
+        return list(self._sites)
+
+    @property
+    def MinElevationDeg(self):
+        return self._mask
+
+    @property
+    def Cache(self):
+        return self._cache
+
+    # endregion
+
+    ##
+    # @brief Builds the index for [startUtc, startUtc + horizonHours].
+    #
+    # @param satellites Satellites, or a Catalog to follow.
+    # @param sites Dict site name -> Site.
+    # @param startUtc Start of the horizon (UTC).
+    # @param horizonHours Length of the horizon, in hours.
+    # @param minElevationDeg Elevation mask, in degrees.
+    # @param step Sampling step of the pass prediction, in minutes.
+    # @param cache Optional PassCache, e.g. one backed by a file.
+    #
+    # @return
+    def __init__(self, satellites, sites, startUtc, horizonHours=48.0, minElevationDeg=0.0, step=1.0, cache=None):
+        if horizonHours <= 0.0:
+            raise ValueError("horizonHours")
+
+        self._catalog    = satellites if isinstance(satellites, Catalog) else None
+        self._satellites = None if self._catalog is not None else list(satellites)
+        self._sites      = dict(sites)
+        self._horizon    = datetime.timedelta(hours=horizonHours)
+        self._mask       = minElevationDeg
+        self._step       = step
+        self._cache      = cache or PassCache()
+        self._lock       = threading.Lock()
+
+        endUtc  = startUtc + self._horizon
+        passes  = self._Predict(self._Satellites(), startUtc, endUtc)
+
+        self._state = (startUtc, endUtc, dict((name, VisibilityIndex._Table(passes[name])) for name in self._sites))
+
+        if self._catalog is not None:
+            self._catalog.Subscribe(self.Refresh)
+
+    ##
+    # @brief Move the horizon on to [startUtc, startUtc + horizonHours].
+    #        Passes ended before startUtc are dropped, those of the new
+    #        stretch of time are predicted.
+    #
+    # @param startUtc New start of the horizon (UTC), not before the current.
+    #
+    # @return
+    def Advance(self, startUtc):
+        with self._lock:
+            start, end, tables = self._state
+
+            if startUtc < start:
+                raise ValueError("startUtc")
+
+            if startUtc == start:
+                return
+
+            endUtc = startUtc + self._horizon
+
+            # The passes overlapping [end, endUtc) are predicted again: those
+            # in progress at the old end are replaced, complete if they were
+            # cut there.
+            fresh   = self._Predict(self._Satellites(), max(end, startUtc), endUtc)
+            updated = {}
+
+            for name, table in tables.items():
+                kept          = [p for p in table[4] if startUtc < p.Los <= end]
+                updated[name] = VisibilityIndex._Table(kept + fresh.get(name, []))
+
+            self._state = (startUtc, endUtc, updated)
+
+    ##
+    # @brief Predict again the passes of satellites, e.g. after a new element
+    #        set; satellites no longer in the catalog are dropped. Called by
+    #        the catalog the index follows.
+    #
+    # @param noradIds NORAD numbers, int or string.
+    #
+    # @return
+    def Refresh(self, noradIds):
+        keys = set(Catalog.Key(noradId) for noradId in noradIds)
+
+        with self._lock:
+            start, end, tables = self._state
+
+            satellites  = [s for s in self._Satellites() if Catalog.Key(s.Orbit.SatNoradId) in keys]
+            fresh       = self._Predict(satellites, start, end)
+            updated     = {}
+
+            for name, table in tables.items():
+                kept          = [p for p in table[4] if Catalog.Key(p.NoradId) not in keys]
+                updated[name] = VisibilityIndex._Table(kept + fresh.get(name, []))
+
+            self._state = (start, end, updated)
+
+    ##
+    # @brief Stop following the catalog; its current satellites are kept.
+    #
+    # @return
+    def Detach(self):
+        if self._catalog is not None:
+            self._catalog.Unsubscribe(self.Refresh)
+            self._satellites = self._catalog.Satellites
+            self._catalog    = None
+
+    ##
+    # @brief The passes of a site within the horizon.
+    #
+    # @return A list of Pass, in AOS order.
+    def Passes(self, site):
+        return list(self._state[2][site][4])
+
+    ##
+    # @brief The passes in progress at a site at a time.
+    #
+    # @param site The site name.
+    # @param utc The time (UTC), within the horizon.
+    #
+    # @return A list of Pass; p.NoradId are the satellites above the mask.
+    def VisibleAt(self, site, utc):
+        start, end, tables = self._state
+
+        if not start <= utc <= end:
+            raise ValueError("utc")
+
+        aos, los, short, long, passes = tables[site]
+        found  = [p for p in long if p.Aos <= utc < p.Los]
+        first  = utc - VisibilityIndex.MAX_SHORT
+        i      = bisect.bisect_right(aos, utc) - 1
+
+        while i >= 0 and aos[i] > first:
+            if los[i] > utc:
+                found.append(short[i])
+            i -= 1
+
+        return found
+
+    ##
+    # @brief The passes at a site overlapping a time window.
+    #
+    # @param site The site name.
+    # @param startUtc Start of the window (UTC), within the horizon.
+    # @param endUtc End of the window (UTC), not included.
+    #
+    # @return A list of Pass.
+    def VisibleDuring(self, site, startUtc, endUtc):
+        start, end, tables = self._state
+
+        if not start <= startUtc <= endUtc <= end:
+            raise ValueError("startUtc, endUtc")
+
+        aos, los, short, long, passes = tables[site]
+        found  = [p for p in long if p.Aos < endUtc and p.Los > startUtc]
+        first  = startUtc - VisibilityIndex.MAX_SHORT
+        i      = bisect.bisect_left(aos, endUtc) - 1
+
+        while i >= 0 and aos[i] > first:
+            if los[i] > startUtc:
+                found.append(short[i])
+            i -= 1
+
+        return found
+
+    # region Utility
+
+    def _Satellites(self):
+        return self._catalog.Satellites if self._catalog is not None else self._satellites
+
+    ##
+    # @brief The passes of satellites overlapping [startUtc, endUtc), as a
+    #        dict site name -> list. Decayed satellites have none.
+    def _Predict(self, satellites, startUtc, endUtc):
+        passes = dict((name, []) for name in self._sites)
+
+        for name, site in self._sites.items():
+            for satellite in satellites:
+                try:
+                    passes[name] += self._cache.Passes(satellite, site, startUtc, endUtc, self._mask, self._step)
+                except ValueError:
+                    continue
+
+        return passes
+
+    ##
+    # @brief A table (aos, los, short, long, passes): the short passes sorted
+    #        by AOS with their AOS and LOS lists, the long ones, and all.
+    @staticmethod
+    def _Table(passes):
+        passes = sorted(passes, key=lambda p: (p.Aos, p.NoradId))
+        short  = [p for p in passes if p.Los - p.Aos <= VisibilityIndex.MAX_SHORT]
+        long   = [p for p in passes if p.Los - p.Aos > VisibilityIndex.MAX_SHORT]
+
+        return ([p.Aos for p in short], [p.Los for p in short], short, long, passes)
+
+    # endregion
+
+
+if __name__ == "__main__":
+    import time
+    import random
+    import numpy as np
+    from pythonOrbitTools.Core.Site import Site
+    from pythonOrbitTools.Core.Globals import Globals
+    from pythonOrbitTools.Orbit.Pass import PassPredictor
+
+    line1 = "1 27424U 02022A   18232.63485883  .00000062  00000-0  23800-4 0  9991"
+    line2 = "2 27424  98.1977 172.8496 0000593 210.3660 252.0729 14.57127161866769"
+
+    # Satellites in planes 20 degrees apart, 45 degrees apart within a plane.
+    entries  = [("SAT{}".format(i),
+                 "1 {:05d}".format(90000 + i) + line1[7:],
+                 "2 {:05d}".format(90000 + i) + line2[7:17] + "{:8.4f}".format((172.8496 + 20.0 * (i // 8)) % 360.0)
+                 + line2[25:43] + "{:8.4f}".format((252.0729 + 45.0 * i) % 360.0) + line2[51:])
+                for i in range(48)]
+    catalog  = Catalog.FromLines(entries)
+    sites    = {"ZZ" : Site().InitializeByDegLatAndDegLonAndKmAltAndName(34.7444, 113.7783, 0.07, "ZZ"),
+                "KS" : Site().InitializeByDegLatAndDegLonAndKmAltAndName(39.5000, 75.9800, 1.30, "KS")}
+    startUtc = datetime.datetime(2018, 8, 20, 16, 0, 0)
+
+    t0       = time.perf_counter()
+    index    = VisibilityIndex(catalog, sites, startUtc, horizonHours=48.0, minElevationDeg=3.0)
+    print("{} satellites, {} passes at ZZ, built in {:.2f} s".format(len(catalog), len(index.Passes("ZZ")),
+                                                                     time.perf_counter() - t0))
+
+    r     = random.Random(1)
+    times = [startUtc + datetime.timedelta(seconds=r.uniform(0.0, 48.0 * 3600.0 - 3600.0)) for i in range(2000)]
+
+    t0 = time.perf_counter()
+    for utc in times:
+        index.VisibleAt("ZZ", utc)
+    print("VisibleAt     {:6.2f} us".format((time.perf_counter() - t0) / len(times) * 1.0e6))
+
+    t0 = time.perf_counter()
+    for utc in times:
+        index.VisibleDuring("ZZ", utc, utc + datetime.timedelta(minutes=30))
+    print("VisibleDuring {:6.2f} us".format((time.perf_counter() - t0) / len(times) * 1.0e6))
+
+    # Against the elevations at some of the times, away from the crossings.
+    predictors = [PassPredictor(satellite, sites["ZZ"], 3.0) for satellite in catalog]
+    mismatches = 0
+
+    for utc in times[:50]:
+        visible = set()
+
+        for predictor in predictors:
+            orbit = predictor.Satellite.Orbit
+            el    = predictor.ElevationArray(np.array([orbit.TPlusEpoch(utc).total_seconds() / 60.0]))[0]
+
+            if el >= Globals.ToRadians(3.0):
+                visible.add(orbit.SatNoradId)
+
+        mismatches += visible != set(p.NoradId for p in index.VisibleAt("ZZ", utc))
+
+    print("mismatches against the elevations: {}".format(mismatches))
+
+    # Rolling forward against an index built at the new start.
+    for hours in (1, 7, 30):
+        t0 = time.perf_counter()
+        index.Advance(startUtc + datetime.timedelta(hours=hours))
+        elapsed = time.perf_counter() - t0
+        other   = VisibilityIndex(catalog, sites, index.Start, horizonHours=48.0, minElevationDeg=3.0, cache=index.Cache)
+        other.Detach()
+        print("advanced {:2d} h in {:7.2f} ms, equal to a new index: {}".format(hours, elapsed * 1.0e3,
+              all(index.Passes(name) == other.Passes(name) for name in sites)))
+
+    # A new element set for one satellite.
+    name, line1, line2 = entries[0]
+    catalog.Update([(name, line1[:20] + "{:012.8f}".format(232.63485883 + 0.01) + line1[32:], line2)], full=False)
+    print("after the update: {} passes of 90000 at ZZ".format(sum(p.NoradId == "90000" for p in index.Passes("ZZ"))))
@@ -0,0 +1,7 @@
+##
+# @file __init__.py
+# @brief The NORAD orbit models and the satellite/orbit classes built on
+#        them. The modules are imported individually, nothing is loaded here.
+# @author df_justforfun@163.com
+# @version 1.0
+# @date 2026-10-19
@@ -0,0 +1,85 @@
+##
+# @file __init__.py
+# @brief pythonOrbitTools: satellite orbits from NORAD two-line elements.
+#
+#  The names of the top-level API are resolved on first access (PEP 562), so
+#  `import pythonOrbitTools` is cheap and a program only pays for the modules
+#  it actually uses. The deep-space model and its kernels (NoradSDP4,
+#  DeepKernels), the numpy code paths and the instrumentation are never
+#  imported for a near-earth propagation.
+#
+#  The Orbit class is not exported here because its name is taken by the
+#  pythonOrbitTools.Orbit subpackage; use Satellite.Orbit or
+#  pythonOrbitTools.Orbit.Orbit.
+#
+#  e.g.
+#  import pythonOrbitTools as ot
+#  satellite = ot.Satellite(ot.Tle(line1, line2, name))
+#  site      = ot.Site().InitializeByDegLatAndDegLonAndKmAltAndName(34.7444, 113.7783, 0.07)
+#  topoLook  = site.GetLookAngle(satellite.PositionEciByMpe(0.0))
+#
+# @author df_justforfun@163.com
+# @version 1.0
+# @date 2026-10-19
+
+import importlib
+
+# Public name -> module defining it.
+_API = {
+    "Tle"           : "pythonOrbitTools.Core.Tle",
+    "Field"         : "pythonOrbitTools.Core.Tle",
+    "Unit"          : "pythonOrbitTools.Core.Tle",
+    "Site"          : "pythonOrbitTools.Core.Site",
+    "Julian"        : "pythonOrbitTools.Core.Julian",
+    "TimeContext"   : "pythonOrbitTools.Core.TimeContext",
+    "Vector"        : "pythonOrbitTools.Core.Vector",
+    "VectorArray"   : "pythonOrbitTools.Core.VectorArray",
+    "Workspace"     : "pythonOrbitTools.Core.Workspace",
+    "Eci"           : "pythonOrbitTools.Core.Eci",
+    "EciTime"       : "pythonOrbitTools.Core.Eci",
+    "Geo"           : "pythonOrbitTools.Core.Coord",
+    "GeoTime"       : "pythonOrbitTools.Core.Coord",
+    "Topo"          : "pythonOrbitTools.Core.Coord",
+    "TopoTime"      : "pythonOrbitTools.Core.Coord",
+    "Globals"       : "pythonOrbitTools.Core.Globals",
+    "Sun"           : "pythonOrbitTools.Core.Sun",
+    "Satellite"     : "pythonOrbitTools.Orbit.Satellite",
+    "SatelliteCache": "pythonOrbitTools.Orbit.SatelliteCache",
+    "Catalog"       : "pythonOrbitTools.Orbit.Catalog",
+    "TimelineSatellite": "pythonOrbitTools.Orbit.Timeline",
+    "EphemerisChunk": "pythonOrbitTools.Orbit.Ephemeris",
+    "Pass"          : "pythonOrbitTools.Orbit.Pass",
+    "PassPredictor" : "pythonOrbitTools.Orbit.Pass",
+    "PassCache"     : "pythonOrbitTools.Orbit.PassCache",
+    "PassScheduler" : "pythonOrbitTools.Orbit.Schedule",
+    "VisibilityIndex": "pythonOrbitTools.Orbit.Visibility",
+    "SharedEphemeris": "pythonOrbitTools.Orbit.SharedEphemeris",
+    "LunarSolarBatch": "pythonOrbitTools.Orbit.DeepSpace",
+    "IntervalTree"  : "pythonOrbitTools.Core.IntervalTree",
+    "DopplerProfile": "pythonOrbitTools.Orbit.Doppler",
+    "EclipseFinder" : "pythonOrbitTools.Orbit.Eclipse",
+    "ShadowModel"   : "pythonOrbitTools.Orbit.Eclipse",
+    "KeplerSolver"  : "pythonOrbitTools.Orbit.Kepler",
+    "KeplerMethod"  : "pythonOrbitTools.Orbit.Kepler",
+    "SetBackend"    : "pythonOrbitTools.Orbit.Kernels",
+    "GetBackend"    : "pythonOrbitTools.Orbit.Kernels",
+    "Instrument"    : "pythonOrbitTools.Orbit.Instrument",
+}
+
+__all__ = list(_API)
+
+
+def __getattr__(name):
+    moduleName = _API.get(name)
+
+    if moduleName is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+    value = getattr(importlib.import_module(moduleName), name)
+    globals()[name] = value # later lookups bypass __getattr__
+
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_API))